@@ -3,6 +3,8 @@ from django.contrib import admin
 
 from .models import (
     Availability,
+    AvailabilityRule,
+    AvailabilityRuleException,
     CulturalNotice,
     Event,
     Instrument,
@@ -125,6 +127,30 @@ class LeaderAvailabilityAdmin(admin.ModelAdmin):
         super().save_model(request, obj, form, change)
 
 
+class AvailabilityRuleExceptionInline(admin.TabularInline):
+    model = AvailabilityRuleException
+    extra = 0
+
+
+@admin.register(AvailabilityRule)
+class AvailabilityRuleAdmin(admin.ModelAdmin):
+    list_display = [
+        "leader",
+        "frequency",
+        "interval",
+        "start_date",
+        "until",
+        "start_time",
+        "end_time",
+        "is_public",
+        "is_active",
+    ]
+    list_filter = ["is_active", "is_public", "frequency"]
+    search_fields = ["leader__user__first_name", "leader__user__last_name", "notes"]
+    readonly_fields = ["created_at", "updated_at"]
+    inlines = [AvailabilityRuleExceptionInline]
+
+
 @admin.register(Instrument)
 class InstrumentAdmin(admin.ModelAdmin):
     list_display = ["display_name", "name", "type", "usage_count", "is_approved", "created_at"]
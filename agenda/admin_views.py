@@ -172,7 +172,7 @@ def reject_booking_request(request, pk):
 def admin_events_list(request):
     """Get all events for admin management"""
     try:
-        events = Event.objects.select_related("created_by", "approved_by").order_by("-event_date")
+        events = EventListSerializer.setup_eager_loading(Event.objects.order_by("-event_date"))
         serializer = EventListSerializer(events, many=True)
         return Response(serializer.data)
     except Exception:
@@ -6,3 +6,7 @@ class AgendaConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "agenda"
     verbose_name = "Agenda de Músicos"
+
+    def ready(self):
+        # Registra signals de sincronização (índice de conflitos etc.)
+        import agenda.signals  # noqa: F401
@@ -0,0 +1,214 @@
+# agenda/availability_rules.py
+"""
+Disponibilidades recorrentes (AvailabilityRule) expandidas sob demanda.
+
+Uma regra ("toda sexta, 20:00-02:00") substitui dezenas de linhas de
+LeaderAvailability. Nada é materializado: cada consulta expande só a janela
+que pediu, em um gerador.
+
+- Recorrência no estilo RRULE: FREQ (daily/weekly), INTERVAL, BYDAY (bits
+  de `weekdays`, bit 0 = segunda), DTSTART (`start_date`) e UNTIL. Regra
+  semanal sem dias marcados repete o dia da semana de `start_date`.
+- Exceções por data (AvailabilityRuleException, EXDATE) pulam a ocorrência.
+- Eventos do músico (criados ou como convidado, com o buffer de 40 minutos)
+  são descontados na expansão, com a mesma varredura da divisão das
+  disponibilidades avulsas (utils.subtract_busy_intervals), mas sem gravar
+  fragmentos.
+- As ocorrências saem como LeaderAvailability não salvas (id None), com
+  `availability_rule_id` preenchido, ordenadas por data e horário, para os
+  consumidores intercalarem com as linhas avulsas (merge_slots).
+
+Consumidores: listagem de leader-availabilities, available_musicians e a
+agenda pública (snapshot dos visitantes e consulta do dono). Alterações em
+regras/exceções invalidam a tag calendar:<id> do cache público
+(agenda/signals.py).
+"""
+
+import heapq
+from collections import defaultdict
+from datetime import datetime, timedelta
+from operator import attrgetter
+
+from django.db.models import ExpressionWrapper, F, IntegerField, Prefetch, Q
+from django.utils import timezone
+
+from .conflict_index import ACTIVE_EVENT_STATUSES, CONFLICT_BUFFER
+from .utils import subtract_busy_intervals
+
+MAX_EXPANSION_DAYS = 366
+WEEKDAY_COUNT = 7
+
+slot_order = attrgetter("date", "start_time")
+
+
+def weekdays_to_mask(weekdays) -> int:
+    """[0, 4] (segunda, sexta) -> bitmask de AvailabilityRule.weekdays."""
+    mask = 0
+    for weekday in weekdays:
+        mask |= 1 << weekday
+    return mask
+
+
+def mask_to_weekdays(mask: int) -> list[int]:
+    return [weekday for weekday in range(WEEKDAY_COUNT) if mask & (1 << weekday)]
+
+
+def occurrence_dates(rule, start_date, end_date, excluded=frozenset()):
+    """Gera as datas da regra em [start_date, end_date], pulando `excluded`."""
+    first = max(start_date, rule.start_date)
+    last = min(end_date, rule.until) if rule.until else end_date
+    if first > last:
+        return
+
+    weekdays = rule.weekdays
+    if rule.frequency == "weekly" and not weekdays:
+        weekdays = 1 << rule.start_date.weekday()
+    interval = max(rule.interval, 1)
+    # Semanas contadas a partir da segunda-feira da semana de DTSTART
+    anchor_week = rule.start_date - timedelta(days=rule.start_date.weekday())
+
+    day = first
+    while day <= last:
+        if weekdays and not weekdays & (1 << day.weekday()):
+            pass
+        elif rule.frequency == "weekly" and ((day - anchor_week).days // 7) % interval:
+            pass
+        elif rule.frequency == "daily" and (day - rule.start_date).days % interval:
+            pass
+        elif day not in excluded:
+            yield day
+        day += timedelta(days=1)
+
+
+def _occurrence(rule, day, start_time, end_time):
+    from .models import LeaderAvailability
+
+    slot = LeaderAvailability(
+        leader=rule.leader,
+        organization_id=rule.organization_id,
+        date=day,
+        start_time=start_time,
+        end_time=end_time,
+        notes=rule.notes,
+        is_public=rule.is_public,
+        is_active=True,
+        created_at=rule.created_at,
+        updated_at=rule.updated_at,
+    )
+    slot.combine_datetimes()
+    slot.availability_rule_id = rule.id
+    # Eventos já foram descontados na expansão
+    slot._cached_conflicts_count = 0
+    return slot
+
+
+def expand_rule(rule, start_date, end_date, busy_events=()):
+    """Ocorrências da regra na janela, sem os horários ocupados por `busy_events`."""
+    excluded = {exception.date for exception in rule.exceptions.all()}
+    occurrences = [
+        _occurrence(rule, day, rule.start_time, rule.end_time)
+        for day in occurrence_dates(rule, start_date, end_date, excluded)
+    ]
+    if not busy_events:
+        yield from occurrences
+        return
+
+    free = subtract_busy_intervals(
+        [(slot.start_datetime, slot.end_datetime) for slot in occurrences], busy_events
+    )
+    tz = timezone.get_current_timezone()
+    for idx, slot in enumerate(occurrences):
+        if idx not in free:
+            yield slot
+            continue
+        for start_min, end_min in free[idx]:
+            start = datetime.fromtimestamp(start_min * 60, tz=tz)
+            end = datetime.fromtimestamp(end_min * 60, tz=tz)
+            yield _occurrence(rule, start.date(), start.time(), end.time())
+
+
+def _busy_events_by_leader(rules, start_date, end_date) -> dict:
+    """{leader_id: [eventos ativos]} dos donos das regras na janela (duas queries)."""
+    from .models import Availability, Event
+
+    user_to_leader = {rule.leader.user_id: rule.leader_id for rule in rules}
+    if not user_to_leader:
+        return {}
+    leader_ids = set(user_to_leader.values())
+
+    tz = timezone.get_current_timezone()
+    window_start = datetime.combine(start_date, datetime.min.time(), tzinfo=tz)
+    # +1 dia: ocorrências que cruzam a meia-noite do último dia
+    window_end = datetime.combine(end_date + timedelta(days=2), datetime.min.time(), tzinfo=tz)
+    events = list(
+        Event.objects.filter(
+            status__in=ACTIVE_EVENT_STATUSES,
+            start_datetime__lt=window_end + CONFLICT_BUFFER,
+            end_datetime__gt=window_start - CONFLICT_BUFFER,
+        )
+        .filter(
+            Q(created_by_id__in=user_to_leader)
+            | Q(id__in=Availability.objects.filter(musician_id__in=leader_ids).values("event_id"))
+        )
+        .only("id", "created_by_id", "start_datetime", "end_datetime")
+    )
+    if not events:
+        return {}
+
+    busy = defaultdict(list)
+    for event in events:
+        if event.created_by_id in user_to_leader:
+            busy[user_to_leader[event.created_by_id]].append(event)
+    events_by_id = {event.id: event for event in events}
+    participants = Availability.objects.filter(
+        event_id__in=events_by_id, musician_id__in=leader_ids
+    ).values_list("event_id", "musician_id")
+    for event_id, leader_id in participants:
+        event = events_by_id[event_id]
+        if user_to_leader.get(event.created_by_id) != leader_id:
+            busy[leader_id].append(event)
+    return busy
+
+
+def rules_in_window(queryset, start_date, end_date):
+    """Regras ativas do queryset que podem ter ocorrências na janela."""
+    from .models import AvailabilityRuleException
+
+    queryset = queryset.filter(is_active=True, start_date__lte=end_date).filter(
+        Q(until__isnull=True) | Q(until__gte=start_date)
+    )
+    if start_date == end_date:
+        # Um dia só: descarta no banco as regras com BYDAY que não inclui o dia
+        bit = 1 << start_date.weekday()
+        queryset = queryset.annotate(
+            weekday_hit=ExpressionWrapper(F("weekdays").bitand(bit), output_field=IntegerField())
+        ).filter(Q(weekday_hit=bit) | Q(weekdays=0))
+    return queryset.select_related("leader__user").prefetch_related(
+        Prefetch(
+            "exceptions",
+            queryset=AvailabilityRuleException.objects.filter(
+                date__gte=start_date, date__lte=end_date
+            ),
+        )
+    )
+
+
+def iter_rule_slots(queryset, start_date, end_date):
+    """
+    Gera as ocorrências das regras do queryset em [start_date, end_date],
+    ordenadas por data e horário. A janela é limitada a MAX_EXPANSION_DAYS.
+    """
+    end_date = min(end_date, start_date + timedelta(days=MAX_EXPANSION_DAYS))
+    rules = list(rules_in_window(queryset, start_date, end_date))
+    if not rules:
+        return
+    busy = _busy_events_by_leader(rules, start_date, end_date)
+    yield from heapq.merge(
+        *(expand_rule(rule, start_date, end_date, busy.get(rule.leader_id, ())) for rule in rules),
+        key=slot_order,
+    )
+
+
+def merge_slots(availabilities, rule_slots):
+    """Intercala disponibilidades avulsas e ocorrências (ambas ordenadas por data/horário)."""
+    return heapq.merge(availabilities, rule_slots, key=slot_order)
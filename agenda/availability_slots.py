@@ -0,0 +1,181 @@
+# agenda/availability_slots.py
+"""
+Bitmap diário das disponibilidades públicas (MusicianDaySlots).
+
+Cada dia de cada músico vira 96 slots de 15 minutos, guardados em dois
+inteiros de 48 bits. slots_am cobre 00:00-12:00 (bit 0 = 00:00-00:15) e
+slots_pm cobre 12:00-24:00 (bit 0 = 12:00-12:15). Só há linha quando algum
+slot está livre.
+
+- Uma disponibilidade marca os slots que cobre por inteiro. Se cruza a
+  meia-noite, vale até 24:00 do próprio `date`, o mesmo recorte por data da
+  listagem de available_musicians.
+- "Quem está livre em X das 20:00 às 23:00" vira um AND bit a bit com a
+  máscara da janela, que marca todos os slots que a janela toca. A consulta
+  roda no banco sobre as linhas candidatas (Exists correlacionado, com o
+  índice único músico+data).
+- Manutenção: availability_days_changed((músico, data), ...) recalcula os
+  dias tocados. É chamada pelos signals de LeaderAvailability e pelos
+  caminhos em lote (bulk_create/UPDATE da divisão por eventos), que não
+  disparam signals. Também invalida a agenda pública desses músicos no
+  cache público. Para corrigir divergências:
+  python manage.py rebuild_availability_slots.
+"""
+
+from collections import defaultdict
+from datetime import time
+
+from django.db import transaction
+from django.db.models import BigIntegerField, Exists, ExpressionWrapper, F, OuterRef, Q
+
+SLOT_MINUTES = 15
+SLOTS_PER_HALF = 48
+HALF_MASK = (1 << SLOTS_PER_HALF) - 1
+MINUTES_PER_DAY = 24 * 60
+
+
+def _minutes(value: time) -> int:
+    return value.hour * 60 + value.minute
+
+
+def _split(mask: int) -> tuple[int, int]:
+    return mask & HALF_MASK, mask >> SLOTS_PER_HALF
+
+
+def availability_mask(start_time: time, end_time: time) -> tuple[int, int]:
+    """(am, pm) dos slots de 15 minutos inteiramente cobertos pela disponibilidade."""
+    start = _minutes(start_time)
+    end = _minutes(end_time)
+    if end <= start:
+        end = MINUTES_PER_DAY  # Cruza a meia-noite: conta até o fim do dia
+    first = -(-start // SLOT_MINUTES)
+    last = end // SLOT_MINUTES
+    if last <= first:
+        return 0, 0
+    return _split(((1 << (last - first)) - 1) << first)
+
+
+def window_mask(start_time: time, end_time: time) -> tuple[int, int]:
+    """(am, pm) de todos os slots que a janela [start, end) toca."""
+    start = _minutes(start_time)
+    end = _minutes(end_time) if end_time != time(0, 0) else MINUTES_PER_DAY
+    first = start // SLOT_MINUTES
+    last = -(-end // SLOT_MINUTES)
+    return _split(((1 << (last - first)) - 1) << first)
+
+
+def day_masks(rows) -> dict:
+    """{(leader_id, date): (am, pm)} a partir de (leader_id, date, start_time, end_time)."""
+    masks = defaultdict(lambda: (0, 0))
+    for leader_id, day, start_time, end_time in rows:
+        am, pm = availability_mask(start_time, end_time)
+        current_am, current_pm = masks[(leader_id, day)]
+        masks[(leader_id, day)] = (current_am | am, current_pm | pm)
+    return {key: value for key, value in masks.items() if any(value)}
+
+
+def _source_rows(queryset):
+    return queryset.filter(is_active=True, is_public=True).values_list(
+        "leader_id", "date", "start_time", "end_time"
+    )
+
+
+def availability_days_changed(scopes) -> None:
+    """
+    Recalcula o bitmap dos pares (leader_id, date) informados e invalida a
+    agenda pública dos músicos envolvidos.
+    """
+    from .models import LeaderAvailability, MusicianDaySlots
+    from .public_cache import public_cache
+
+    scopes = {(leader_id, day) for leader_id, day in scopes if leader_id and day}
+    if not scopes:
+        return
+
+    leader_ids = {leader_id for leader_id, _ in scopes}
+    days = {day for _, day in scopes}
+    masks = day_masks(
+        row
+        for row in _source_rows(
+            LeaderAvailability.objects.filter(leader_id__in=leader_ids, date__in=days)
+        )
+        if (row[0], row[1]) in scopes
+    )
+
+    with transaction.atomic():
+        empty = [scope for scope in scopes if scope not in masks]
+        if empty:
+            condition = Q()
+            for leader_id, day in empty:
+                condition |= Q(musician_id=leader_id, date=day)
+            MusicianDaySlots.objects.filter(condition).delete()
+        if masks:
+            MusicianDaySlots.objects.bulk_create(
+                [
+                    MusicianDaySlots(musician_id=leader_id, date=day, slots_am=am, slots_pm=pm)
+                    for (leader_id, day), (am, pm) in masks.items()
+                ],
+                update_conflicts=True,
+                unique_fields=["musician", "date"],
+                update_fields=["slots_am", "slots_pm"],
+            )
+
+    public_cache.invalidate(*(f"calendar:{leader_id}" for leader_id in leader_ids))
+
+
+def free_during(target_date, start_time: time, end_time: time) -> Exists:
+    """
+    Exists correlacionado (OuterRef("pk") de Musician): livre em todos os
+    slots da janela na data.
+    """
+    from .models import MusicianDaySlots
+
+    am, pm = window_mask(start_time, end_time)
+    # Sem output_field explícito o AND vira IntegerField, e o Postgres descarta
+    # comparações acima de 32 bits como fora do intervalo (consulta vazia)
+    return Exists(
+        MusicianDaySlots.objects.filter(musician=OuterRef("pk"), date=target_date)
+        .annotate(
+            am_hit=ExpressionWrapper(F("slots_am").bitand(am), output_field=BigIntegerField()),
+            pm_hit=ExpressionWrapper(F("slots_pm").bitand(pm), output_field=BigIntegerField()),
+        )
+        .filter(am_hit=am, pm_hit=pm)
+    )
+
+
+def rebuild_day_slots(*, dry_run: bool = False) -> int:
+    """
+    Recalcula a tabela inteira a partir de LeaderAvailability. Retorna quantas
+    linhas divergiam (criadas, alteradas ou removidas).
+    """
+    from .models import LeaderAvailability, MusicianDaySlots
+
+    expected = day_masks(_source_rows(LeaderAvailability.objects.all()).iterator(chunk_size=2000))
+    current = {
+        (row.musician_id, row.date): row
+        for row in MusicianDaySlots.objects.only("musician_id", "date", "slots_am", "slots_pm")
+    }
+
+    stale_rows = [
+        row for key, row in current.items() if (row.slots_am, row.slots_pm) != expected.get(key)
+    ]
+    missing = [key for key in expected if key not in current]
+    if dry_run:
+        return len(stale_rows) + len(missing)
+
+    with transaction.atomic():
+        to_delete = [row.pk for key, row in current.items() if key not in expected]
+        MusicianDaySlots.objects.filter(pk__in=to_delete).delete()
+        to_update = [row for row in stale_rows if (row.musician_id, row.date) in expected]
+        for row in to_update:
+            row.slots_am, row.slots_pm = expected[(row.musician_id, row.date)]
+        MusicianDaySlots.objects.bulk_update(to_update, ["slots_am", "slots_pm"], batch_size=500)
+        MusicianDaySlots.objects.bulk_create(
+            [
+                MusicianDaySlots(musician_id=leader_id, date=day, slots_am=am, slots_pm=pm)
+                for (leader_id, day) in missing
+                for am, pm in [expected[(leader_id, day)]]
+            ],
+            batch_size=500,
+        )
+    return len(stale_rows) + len(missing)
@@ -0,0 +1,228 @@
+# agenda/calendar_feed.py
+"""
+Feed iCalendar (ICS) da agenda pública do músico
+(GET /api/musicians/{id}/calendar-feed/).
+
+- Mesmo recorte dos visitantes da agenda pública: as consultas de
+  agenda/public_calendar.py, na janela máxima. Eventos privados aparecem
+  como "Ocupado", sem título nem local.
+- Streaming: um gerador escreve o cabeçalho e um VEVENT por linha do
+  queryset (iterator), sem montar o arquivo inteiro em memória.
+- Sync token: toda resposta traz X-Sync-Token. Reenviado em ?sync_token=,
+  o feed devolve só os eventos e disponibilidades alterados desde então.
+  Os que saíram do recorte vêm como STATUS:CANCELLED, com o mesmo UID.
+  Remoções físicas não deixam rastro, por isso gravam
+  Musician.calendar_reset_at (agenda/signals.py); tokens anteriores a ela
+  recebem o feed completo (X-Sync-Mode: full).
+- A consulta incremental começa SYNC_OVERLAP antes do token, para cobrir
+  transações que gravaram updated_at antes e só fizeram commit depois da
+  emissão. Repetições são inofensivas: o cliente substitui pelo UID.
+"""
+
+from datetime import UTC, datetime, timedelta
+
+from django.conf import settings
+from django.db.models import Q
+from django.utils import timezone
+from rest_framework.negotiation import BaseContentNegotiation
+
+from .public_calendar import (
+    MAX_DAYS_AHEAD,
+    MAX_DAYS_BACK,
+    calendar_availabilities,
+    calendar_events,
+    is_visible_to_visitors,
+)
+
+FEED_CONTENT_TYPE = "text/calendar; charset=utf-8"
+PRODID = "-//GigFlow//Agenda Publica//PT-BR"
+UID_DOMAIN = "gigflow"
+SYNC_OVERLAP = timedelta(minutes=5)
+ITERATOR_CHUNK_SIZE = 500
+MAX_LINE_OCTETS = 75
+
+
+class FeedContentNegotiation(BaseContentNegotiation):
+    """
+    Clientes de calendário mandam Accept: text/calendar; o feed não passa por
+    renderer (StreamingHttpResponse), então erros usam sempre o primeiro (JSON).
+    """
+
+    def select_parser(self, request, parsers):
+        return parsers[0]
+
+    def select_renderer(self, request, renderers, format_suffix=None):
+        return (renderers[0], renderers[0].media_type)
+
+
+# ----------------------------------------------------------------------
+# Sync token
+# ----------------------------------------------------------------------
+def make_sync_token(moment: datetime) -> str:
+    return str(int(moment.timestamp() * 1_000_000))
+
+
+def parse_sync_token(token) -> datetime | None:
+    """Instante codificado no token (None se ausente ou inválido)."""
+    try:
+        micros = int(token)
+    except (TypeError, ValueError):
+        return None
+    if micros <= 0:
+        return None
+    try:
+        return datetime.fromtimestamp(micros / 1_000_000, tz=UTC)
+    except (OverflowError, OSError, ValueError):
+        return None
+
+
+def delta_since(musician, token) -> datetime | None:
+    """
+    Início da consulta incremental, ou None quando o feed deve ser completo
+    (token ausente/inválido ou anterior à última remoção na agenda).
+    """
+    issued_at = parse_sync_token(token)
+    if issued_at is None:
+        return None
+    since = issued_at - SYNC_OVERLAP
+    if musician.calendar_reset_at and musician.calendar_reset_at >= since:
+        return None
+    return since
+
+
+# ----------------------------------------------------------------------
+# Formatação (RFC 5545)
+# ----------------------------------------------------------------------
+def escape_text(value) -> str:
+    return (
+        str(value or "")
+        .replace("\\", "\\\\")
+        .replace(";", "\\;")
+        .replace(",", "\\,")
+        .replace("\r\n", "\\n")
+        .replace("\n", "\\n")
+    )
+
+
+def fold_line(line: str) -> str:
+    """Quebra a linha em 75 octetos (continuação com espaço), sem partir caracteres UTF-8."""
+    parts, current, size = [], [], 0
+    for char in line:
+        length = len(char.encode())
+        # Linhas de continuação começam com um espaço (que conta no limite)
+        limit = MAX_LINE_OCTETS if not parts else MAX_LINE_OCTETS - 1
+        if size + length > limit:
+            parts.append("".join(current))
+            current, size = [], 0
+        current.append(char)
+        size += length
+    parts.append("".join(current))
+    return "\r\n ".join(parts) + "\r\n"
+
+
+def format_datetime(value: datetime) -> str:
+    return value.astimezone(UTC).strftime("%Y%m%dT%H%M%SZ")
+
+
+def _component(properties) -> str:
+    lines = ["BEGIN:VEVENT"]
+    lines.extend(f"{name}:{value}" for name, value in properties if value is not None)
+    lines.append("END:VEVENT")
+    return "".join(fold_line(line) for line in lines)
+
+
+def event_component(event) -> str:
+    visible = is_visible_to_visitors(event)
+    if event.is_private:
+        summary = "Ocupado"
+    else:
+        summary = event.get_status_display()
+    return _component(
+        [
+            ("UID", f"event-{event.id}@{UID_DOMAIN}"),
+            ("DTSTAMP", format_datetime(event.updated_at)),
+            ("LAST-MODIFIED", format_datetime(event.updated_at)),
+            ("DTSTART", format_datetime(event.start_datetime)),
+            ("DTEND", format_datetime(event.end_datetime)),
+            ("SUMMARY", escape_text(summary)),
+            ("STATUS", "CONFIRMED" if visible else "CANCELLED"),
+            ("TRANSP", "OPAQUE"),
+        ]
+    )
+
+
+def availability_component(availability) -> str:
+    listed = availability.is_active and availability.is_public
+    return _component(
+        [
+            ("UID", f"availability-{availability.id}@{UID_DOMAIN}"),
+            ("DTSTAMP", format_datetime(availability.updated_at)),
+            ("LAST-MODIFIED", format_datetime(availability.updated_at)),
+            ("DTSTART", format_datetime(availability.start_datetime)),
+            ("DTEND", format_datetime(availability.end_datetime)),
+            ("SUMMARY", "Disponível"),
+            ("DESCRIPTION", escape_text(availability.notes) if availability.notes else None),
+            ("STATUS", "CONFIRMED" if listed else "CANCELLED"),
+            ("TRANSP", "TRANSPARENT"),
+        ]
+    )
+
+
+# ----------------------------------------------------------------------
+# Feed
+# ----------------------------------------------------------------------
+def feed_querysets(musician, today, since=None):
+    """(eventos, disponibilidades) do feed completo ou alterados desde `since`."""
+    from .models import Availability, LeaderAvailability
+
+    start_date = today - timedelta(days=MAX_DAYS_BACK)
+    end_date = today + timedelta(days=MAX_DAYS_AHEAD)
+
+    if since is None:
+        events = calendar_events(musician, start_date, end_date, is_owner=False)
+        availabilities = calendar_availabilities(musician, today, end_date, public_only=True)
+        return events, availabilities
+
+    # Sem filtro de status: eventos que saíram do recorte viram CANCELLED.
+    # Convites novos trazem o evento para a agenda sem alterar o próprio evento.
+    invited_event_ids = Availability.objects.filter(
+        musician=musician, created_at__gte=since
+    ).values("event_id")
+    events = calendar_events(musician, start_date, end_date, is_owner=True).filter(
+        Q(updated_at__gte=since) | Q(id__in=invited_event_ids)
+    )
+    availabilities = LeaderAvailability.objects.filter(
+        leader=musician,
+        date__gte=today,
+        date__lte=end_date,
+        updated_at__gte=since,
+    ).order_by("date", "start_time")
+    return events, availabilities
+
+
+def iter_feed(musician, events, availabilities, *, sync_token: str):
+    """Gera o VCALENDAR em blocos (cabeçalho, um VEVENT por item, rodapé)."""
+    name = musician.user.get_full_name() or musician.user.username
+    header = [
+        "BEGIN:VCALENDAR",
+        "VERSION:2.0",
+        f"PRODID:{PRODID}",
+        "CALSCALE:GREGORIAN",
+        "METHOD:PUBLISH",
+        f"X-WR-CALNAME:{escape_text(f'Agenda de {name}')}",
+        f"X-WR-TIMEZONE:{settings.TIME_ZONE}",
+        f"X-GIGFLOW-SYNC-TOKEN:{sync_token}",
+    ]
+    yield "".join(fold_line(line) for line in header)
+
+    for event in events.iterator(chunk_size=ITERATOR_CHUNK_SIZE):
+        yield event_component(event)
+    for availability in availabilities.iterator(chunk_size=ITERATOR_CHUNK_SIZE):
+        yield availability_component(availability)
+
+    yield "END:VCALENDAR\r\n"
+
+
+def issue_sync_token() -> str:
+    """Token do instante atual (emitido antes das consultas do feed)."""
+    return make_sync_token(timezone.now())
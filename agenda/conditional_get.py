@@ -0,0 +1,80 @@
+# agenda/conditional_get.py
+"""
+GET condicional (ETag/Last-Modified) para os payloads que o PWA consulta em
+polling (listagem de eventos, agenda pública, perfil público, preferências
+de notificação).
+
+Cada recurso tem um carimbo de versão barato, calculado antes de consultar
+ou serializar o payload: a versão do cache de eventos do usuário, as versões
+de tags do cache público, `updated_at`... O ETag é um hash fraco do carimbo
+(`W/"..."`, que o GZip de proxies não invalida). Se o cliente reenviar o
+mesmo valor em If-None-Match (ou um If-Modified-Since não anterior ao
+Last-Modified), a resposta é 304 sem rodar a view nem o serializer.
+
+O carimbo é lido antes do payload. Uma alteração concorrente produz, no pior
+caso, um ETag antigo num payload novo, e a próxima requisição recebe 200.
+"""
+
+import functools
+import hashlib
+
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+from django.utils.http import http_date
+
+
+def make_etag(*parts) -> str:
+    """ETag fraco a partir das partes do carimbo de versão."""
+    digest = hashlib.sha1("|".join(str(part) for part in parts).encode()).hexdigest()
+    return f'W/"{digest[:32]}"'
+
+
+def _apply_validators(response, etag: str, last_modified, private: bool) -> None:
+    response["ETag"] = etag
+    if last_modified is not None:
+        response["Last-Modified"] = http_date(last_modified.timestamp())
+    # no-cache: o navegador guarda o payload, mas revalida a cada uso
+    if private:
+        patch_cache_control(response, no_cache=True, private=True)
+        patch_vary_headers(response, ("Authorization", "Cookie"))
+    else:
+        patch_cache_control(response, no_cache=True, public=True)
+
+
+def conditional_response(request, build, *, etag: str, last_modified=None, private: bool = True):
+    """
+    Responde 304 quando o cliente já tem a versão `etag`; senão chama
+    `build()` e anexa os validadores (apenas em respostas 200).
+    """
+    django_request = getattr(request, "_request", request)
+    not_modified = get_conditional_response(
+        django_request,
+        etag=etag,
+        last_modified=int(last_modified.timestamp()) if last_modified is not None else None,
+    )
+    if not_modified is not None:
+        _apply_validators(not_modified, etag, last_modified, private)
+        return not_modified
+
+    response = build()
+    if response.status_code == 200:
+        _apply_validators(response, etag, last_modified, private)
+    return response
+
+
+def conditional_view(stamp, *, private: bool = False):
+    """
+    Decorator para views funcionais GET. `stamp` recebe (request, **kwargs) e
+    devolve as partes do carimbo de versão do recurso.
+    """
+
+    def decorator(view):
+        @functools.wraps(view)
+        def wrapper(request, *args, **kwargs):
+            etag = make_etag(*stamp(request, **kwargs))
+            return conditional_response(
+                request, lambda: view(request, *args, **kwargs), etag=etag, private=private
+            )
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,240 @@
+# agenda/conflict_index.py
+"""
+Índice em memória de intervalos para detecção de conflitos de agenda.
+
+Mantém, por escopo (usuário participante ou organização), os eventos ativos
+(proposed/approved/confirmed) com o buffer de 40 minutos já aplicado, ordenados
+pelo início. Uma consulta de sobreposição vira duas buscas binárias + uma
+varredura curta, sem tocar no banco.
+
+Sincronização:
+- Signals de Event/Availability (agenda/signals.py) descartam o escopo local e
+  trocam o token de versão compartilhado no cache após o commit.
+- Cada processo compara seu token local com o do cache (uma leitura no Redis)
+  e reconstrói o escopo com uma única query quando estiver desatualizado.
+"""
+
+import bisect
+import heapq
+import threading
+import time as time_module
+import uuid
+from collections import OrderedDict
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Q
+
+ACTIVE_EVENT_STATUSES = ("proposed", "approved", "confirmed")
+CONFLICT_BUFFER_MINUTES = 40
+CONFLICT_BUFFER = timedelta(minutes=CONFLICT_BUFFER_MINUTES)
+
+SCOPE_USER = "u"
+SCOPE_ORGANIZATION = "o"
+
+
+def sweep_overlaps(slots, intervals) -> list[list[int]]:
+    """
+    Casa N slots candidatos com M intervalos em uma única varredura (sweep-line).
+
+    Args:
+        slots: lista de (start, end) em epoch-segundos
+        intervals: lista de (start, end) em epoch-segundos (buffer já aplicado)
+
+    Returns:
+        Para cada slot (na ordem recebida), os índices dos intervalos que o
+        sobrepõem, ordenados pelo início do intervalo.
+    """
+    points = [(start, 0, i) for i, (start, _end) in enumerate(slots)]
+    points += [(start, 1, j) for j, (start, _end) in enumerate(intervals)]
+    points.sort()
+
+    matches: list[list[int]] = [[] for _ in slots]
+    active_slots: set[int] = set()
+    active_intervals: set[int] = set()
+    slot_ends: list[tuple[int, int]] = []
+    interval_ends: list[tuple[int, int]] = []
+
+    # Cada par sobreposto é encontrado uma vez: quando o segundo dos dois começa,
+    # o primeiro ainda está ativo (termina depois desse ponto).
+    for point, kind, idx in points:
+        while slot_ends and slot_ends[0][0] <= point:
+            active_slots.discard(heapq.heappop(slot_ends)[1])
+        while interval_ends and interval_ends[0][0] <= point:
+            active_intervals.discard(heapq.heappop(interval_ends)[1])
+
+        if kind == 0:
+            matches[idx].extend(active_intervals)
+            active_slots.add(idx)
+            heapq.heappush(slot_ends, (slots[idx][1], idx))
+        else:
+            for slot_idx in active_slots:
+                matches[slot_idx].append(idx)
+            active_intervals.add(idx)
+            heapq.heappush(interval_ends, (intervals[idx][1], idx))
+
+    for found in matches:
+        found.sort(key=lambda j: (intervals[j][0], j))
+    return matches
+
+
+class _ScopeIntervals:
+    """Intervalos (com buffer) de um escopo, ordenados pelo início em epoch-segundos."""
+
+    __slots__ = ("version", "loaded_at", "starts", "entries", "max_span")
+
+    def __init__(self, version: str, rows):
+        buffer_seconds = int(CONFLICT_BUFFER.total_seconds())
+        entries = sorted(
+            (
+                int(start.timestamp()) - buffer_seconds,
+                int(end.timestamp()) + buffer_seconds,
+                event_id,
+            )
+            for event_id, start, end in rows
+            if start and end
+        )
+        self.version = version
+        self.loaded_at = time_module.monotonic()
+        self.entries = entries
+        self.starts = [entry[0] for entry in entries]
+        # Maior duração do escopo: limita a busca binária pela esquerda
+        self.max_span = max((entry[1] - entry[0] for entry in entries), default=0)
+
+    def overlapping(self, start: int, end: int) -> list[int]:
+        """IDs dos eventos cujo intervalo (com buffer) cruza [start, end)."""
+        lo = bisect.bisect_right(self.starts, start - self.max_span)
+        hi = bisect.bisect_left(self.starts, end)
+        return [event_id for _, entry_end, event_id in self.entries[lo:hi] if entry_end > start]
+
+
+class ConflictIndex:
+    """
+    Índice de conflitos por processo.
+
+    Escopos:
+    - usuário: eventos criados por ele ou em que seu perfil de músico tem availability
+    - organização: eventos da organização
+    """
+
+    version_ttl_seconds = 60 * 60 * 24
+    # Rede de segurança: reconstrói escopos antigos mesmo sem troca de versão
+    local_ttl_seconds = 60 * 10
+    # Escopos mantidos por processo; os menos usados recentemente saem primeiro (LRU)
+    max_scopes = 2000
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._scopes: OrderedDict[tuple[str, int], _ScopeIntervals] = OrderedDict()
+
+    # ------------------------------------------------------------------
+    # Versões compartilhadas
+    # ------------------------------------------------------------------
+    @staticmethod
+    def _version_key(scope: tuple[str, int]) -> str:
+        kind, scope_id = scope
+        return f"conflict_index:v1:{kind}{scope_id}:version"
+
+    def _current_version(self, scope: tuple[str, int]) -> str:
+        key = self._version_key(scope)
+        version = cache.get(key)
+        if version:
+            return version
+
+        cache.add(key, uuid.uuid4().hex, timeout=self.version_ttl_seconds)
+        return cache.get(key) or ""
+
+    # ------------------------------------------------------------------
+    # Carga
+    # ------------------------------------------------------------------
+    @staticmethod
+    def _load_rows(scope: tuple[str, int]):
+        from .models import Event
+
+        kind, scope_id = scope
+        queryset = Event.objects.filter(status__in=ACTIVE_EVENT_STATUSES)
+        if kind == SCOPE_ORGANIZATION:
+            queryset = queryset.filter(organization_id=scope_id)
+        else:
+            queryset = queryset.filter(
+                Q(created_by_id=scope_id) | Q(availabilities__musician__user_id=scope_id)
+            ).distinct()
+
+        return queryset.order_by().values_list("id", "start_datetime", "end_datetime")
+
+    def _get_scope(self, scope: tuple[str, int]) -> _ScopeIntervals:
+        version = self._current_version(scope)
+        with self._lock:
+            entry = self._scopes.get(scope)
+            if entry is not None:
+                self._scopes.move_to_end(scope)
+        if (
+            entry is not None
+            and entry.version == version
+            and time_module.monotonic() - entry.loaded_at < self.local_ttl_seconds
+        ):
+            return entry
+
+        entry = _ScopeIntervals(version, list(self._load_rows(scope)))
+        with self._lock:
+            self._scopes[scope] = entry
+            self._scopes.move_to_end(scope)
+            while len(self._scopes) > self.max_scopes:
+                self._scopes.popitem(last=False)
+        return entry
+
+    # ------------------------------------------------------------------
+    # API pública
+    # ------------------------------------------------------------------
+    def conflicting_event_ids(
+        self, start_dt, end_dt, *, user_id: int | None = None, organization_id: int | None = None
+    ) -> list[int]:
+        """
+        Retorna IDs de eventos ativos que conflitam com [start_dt, end_dt),
+        considerando o buffer de 40 minutos.
+        """
+        if organization_id is not None:
+            scope = (SCOPE_ORGANIZATION, organization_id)
+        elif user_id is not None:
+            scope = (SCOPE_USER, user_id)
+        else:
+            raise ValueError("Informe user_id ou organization_id.")
+
+        return self._get_scope(scope).overlapping(
+            int(start_dt.timestamp()), int(end_dt.timestamp())
+        )
+
+    def invalidate(self, *, user_ids=(), organization_ids=()) -> None:
+        """
+        Descarta os escopos locais imediatamente e troca as versões compartilhadas
+        após o commit (para outros processos não recarregarem dados não commitados).
+        """
+        scopes = [(SCOPE_USER, int(uid)) for uid in user_ids if uid]
+        scopes += [(SCOPE_ORGANIZATION, int(oid)) for oid in organization_ids if oid]
+        if not scopes:
+            return
+
+        self._discard(scopes)
+
+        def _bump():
+            cache.set_many(
+                {self._version_key(scope): uuid.uuid4().hex for scope in scopes},
+                timeout=self.version_ttl_seconds,
+            )
+            self._discard(scopes)
+
+        transaction.on_commit(_bump)
+
+    def _discard(self, scopes) -> None:
+        with self._lock:
+            for scope in scopes:
+                self._scopes.pop(scope, None)
+
+    def clear(self) -> None:
+        """Descarta todo o estado local (usado em testes)."""
+        with self._lock:
+            self._scopes.clear()
+
+
+conflict_index = ConflictIndex()
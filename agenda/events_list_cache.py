@@ -0,0 +1,267 @@
+# agenda/events_list_cache.py
+"""
+Cache da listagem de eventos (GET /api/events/).
+
+- Chave canônica: os query params são normalizados (ordem, duplicatas, flags
+  que não são "true", paginação padrão) para que consultas equivalentes
+  compartilhem a mesma entrada.
+- Versão por usuário: token aleatório trocado em lote com um único
+  cache.set_many (pipeline no Redis) para todos os participantes afetados.
+- Invalidação dirigida por eventos: os signals de Event/Availability
+  (agenda/signals.py) registram os eventos alterados; dentro de um lote
+  (uma requisição de escrita do EventViewSet) os participantes são
+  resolvidos com uma única query no fim.
+- Contadores de hit/miss/invalidação agregados entre processos no cache.
+"""
+
+import logging
+import threading
+import time as time_module
+import uuid
+from collections import Counter
+from contextlib import contextmanager
+from urllib.parse import urlencode
+
+from django.core.cache import cache
+from django.db import transaction
+
+logger = logging.getLogger(__name__)
+
+BOOLEAN_PARAMS = ("my_proposals", "pending_approval", "pending_responses", "past", "upcoming")
+STAT_NAMES = ("hits", "misses", "invalidations", "invalidated_users")
+
+
+def canonical_params(query_params, *, default_page_size: int = 20, max_page_size: int = 100) -> str:
+    """
+    Normaliza os filtros aceitos por EventViewSet.get_queryset em uma string estável.
+
+    Parâmetros desconhecidos são descartados (não alteram o resultado) e
+    valores equivalentes colapsam na mesma representação.
+    """
+    params: dict[str, str] = {}
+
+    for name in BOOLEAN_PARAMS:
+        # get_queryset só reage ao valor exato "true"
+        if query_params.get(name) == "true":
+            params[name] = "true"
+
+    status_raw = query_params.get("status")
+    if status_raw:
+        from .models import Event
+
+        valid = {choice[0] for choice in Event.STATUS_CHOICES}
+        statuses = sorted({value for value in status_raw.split(",") if value in valid})
+        if statuses:
+            params["status"] = ",".join(statuses)
+
+    search = query_params.get("search")
+    if search:
+        params["search"] = search
+
+    days_back = query_params.get("days_back")
+    if days_back and "past" in params:
+        try:
+            params["days_back"] = str(int(days_back))
+        except (TypeError, ValueError):
+            # Mantém o valor bruto: a view responde 400 e nada é cacheado
+            params["days_back"] = days_back
+
+    page = query_params.get("page")
+    if page:
+        try:
+            page_number = int(page)
+        except (TypeError, ValueError):
+            params["page"] = page
+        else:
+            if page_number != 1:
+                params["page"] = str(page_number)
+
+    # Modo keyset (agenda/pagination.py): o cursor substitui o número da página
+    cursor = query_params.get("cursor")
+    if cursor is not None:
+        params["cursor"] = cursor
+    elif query_params.get("pagination") == "cursor":
+        params["pagination"] = "cursor"
+    if "cursor" in params or "pagination" in params:
+        params.pop("page", None)
+        if query_params.get("count") == "true":
+            params["count"] = "true"
+
+    page_size = query_params.get("page_size")
+    if page_size:
+        try:
+            size = int(page_size)
+        except (TypeError, ValueError):
+            size = 0
+        if size > 0:
+            size = min(size, max_page_size)
+            if size != default_page_size:
+                params["page_size"] = str(size)
+
+    return urlencode(sorted(params.items()))
+
+
+class EventsListCache:
+    """Cache versionado por usuário da listagem de eventos."""
+
+    ttl_seconds = 30
+    version_ttl_seconds = 60 * 60 * 24
+    stats_ttl_seconds = 60 * 60 * 24 * 7
+    # Contadores locais são somados no cache compartilhado a cada intervalo
+    stats_flush_interval_seconds = 10
+
+    def __init__(self):
+        self._local = threading.local()
+        self._stats_lock = threading.Lock()
+        self._pending_stats: Counter = Counter()
+        self._last_stats_flush = time_module.monotonic()
+
+    # ------------------------------------------------------------------
+    # Chaves e versões
+    # ------------------------------------------------------------------
+    @staticmethod
+    def _version_key(user_id: int) -> str:
+        return f"events:list:v3:u{user_id}:version"
+
+    @staticmethod
+    def _stat_key(name: str) -> str:
+        return f"events:list:v3:stats:{name}"
+
+    def version(self, user_id: int) -> str:
+        """Versão atual da listagem do usuário (também serve de carimbo para o ETag)."""
+        key = self._version_key(user_id)
+        version = cache.get(key)
+        if version:
+            return version
+
+        cache.add(key, uuid.uuid4().hex, timeout=self.version_ttl_seconds)
+        return cache.get(key) or ""
+
+    def cache_key(self, user_id: int, query_params, **kwargs) -> str:
+        version = self.version(user_id)
+        return f"events:list:v3:u{user_id}:{version}:{canonical_params(query_params, **kwargs)}"
+
+    # ------------------------------------------------------------------
+    # Leitura/escrita
+    # ------------------------------------------------------------------
+    def get(self, cache_key: str):
+        data = cache.get(cache_key)
+        self._count("hits" if data is not None else "misses")
+        return data
+
+    def set(self, cache_key: str, data) -> None:
+        cache.set(cache_key, data, timeout=self.ttl_seconds)
+
+    # ------------------------------------------------------------------
+    # Invalidação
+    # ------------------------------------------------------------------
+    def invalidate(self, *, user_ids=(), event_ids=(), if_changed: bool = False) -> None:
+        """
+        Invalida a listagem dos usuários informados e dos participantes
+        (criador + convidados) dos eventos informados.
+
+        Dentro de batch() apenas acumula; fora dele resolve e aplica na hora.
+        Com if_changed=True os usuários só entram se algo mais for invalidado
+        no mesmo lote (fora de um lote é ignorado).
+        """
+        pending = getattr(self._local, "pending", None)
+        if pending is not None:
+            target = pending["followers"] if if_changed else pending["user_ids"]
+            target.update(uid for uid in user_ids if uid)
+            pending["event_ids"].update(eid for eid in event_ids if eid)
+            return
+
+        if not if_changed:
+            self._flush(set(user_ids), set(event_ids))
+
+    @contextmanager
+    def batch(self):
+        """
+        Agrupa as invalidações disparadas dentro do bloco: uma query de
+        participantes e um set_many no final. Blocos aninhados reutilizam o externo.
+        """
+        if getattr(self._local, "pending", None) is not None:
+            yield
+            return
+
+        self._local.pending = {"user_ids": set(), "event_ids": set(), "followers": set()}
+        try:
+            yield
+        finally:
+            pending = self._local.pending
+            self._local.pending = None
+            if pending["event_ids"] or pending["user_ids"]:
+                self._flush(pending["user_ids"] | pending["followers"], pending["event_ids"])
+
+    def _flush(self, user_ids: set, event_ids: set) -> None:
+        user_ids = {int(uid) for uid in user_ids if uid}
+        if event_ids:
+            from .models import Event
+
+            for created_by_id, participant_id in Event.objects.filter(id__in=event_ids).values_list(
+                "created_by_id", "availabilities__musician__user_id"
+            ):
+                user_ids.update(uid for uid in (created_by_id, participant_id) if uid)
+
+        if not user_ids:
+            return
+
+        self._bump(user_ids)
+        if transaction.get_connection().in_atomic_block:
+            # Troca de novo após o commit: leitores concorrentes podem ter
+            # cacheado o estado anterior com a versão nova
+            transaction.on_commit(lambda: self._bump(user_ids))
+
+    def _bump(self, user_ids: set) -> None:
+        cache.set_many(
+            {self._version_key(uid): uuid.uuid4().hex for uid in user_ids},
+            timeout=self.version_ttl_seconds,
+        )
+        self._count("invalidations")
+        self._count("invalidated_users", len(user_ids))
+
+    # ------------------------------------------------------------------
+    # Métricas
+    # ------------------------------------------------------------------
+    def _count(self, name: str, amount: int = 1) -> None:
+        now = time_module.monotonic()
+        with self._stats_lock:
+            self._pending_stats[name] += amount
+            if now - self._last_stats_flush < self.stats_flush_interval_seconds:
+                return
+            pending, self._pending_stats = self._pending_stats, Counter()
+            self._last_stats_flush = now
+        self._flush_stats(pending)
+
+    def _flush_stats(self, pending: Counter) -> None:
+        for name, amount in pending.items():
+            if not amount:
+                continue
+            key = self._stat_key(name)
+            try:
+                if not cache.add(key, amount, timeout=self.stats_ttl_seconds):
+                    cache.incr(key, amount)
+            except Exception:
+                logger.warning("Falha ao registrar métrica %s do cache de eventos", name)
+
+    def stats(self) -> dict:
+        """Totais agregados de todos os processos (inclui os pendentes deste)."""
+        with self._stats_lock:
+            pending, self._pending_stats = self._pending_stats, Counter()
+            self._last_stats_flush = time_module.monotonic()
+        self._flush_stats(pending)
+
+        stored = cache.get_many([self._stat_key(name) for name in STAT_NAMES])
+        totals = {name: int(stored.get(self._stat_key(name)) or 0) for name in STAT_NAMES}
+        lookups = totals["hits"] + totals["misses"]
+        totals["hit_ratio"] = round(totals["hits"] / lookups, 4) if lookups else 0.0
+        totals["ttl_seconds"] = self.ttl_seconds
+        return totals
+
+    def reset_stats(self) -> None:
+        with self._stats_lock:
+            self._pending_stats = Counter()
+        cache.delete_many([self._stat_key(name) for name in STAT_NAMES])
+
+
+events_list_cache = EventsListCache()
@@ -2,8 +2,25 @@
 """
 Utilitários relacionados a instrumentos.
 Centraliza definições de labels para evitar duplicação.
+
+Também mantém a camada de normalização usada no filtro por instrumento:
+cada Musician guarda em `instrument_keys` as chaves canônicas que devem
+encontrá-lo (já expandidas pelos aliases), e o filtro vira um único lookup
+de contenção indexado (GIN no Postgres). O mapa de aliases é compilado uma
+vez por processo a partir de INSTRUMENT_SEARCH_ALIASES, INSTRUMENT_LABELS e
+da tabela Instrument, e recompilado quando a versão compartilhada no cache
+muda (alteração na tabela Instrument em qualquer processo).
 """
 
+import re
+import threading
+import unicodedata
+import uuid
+
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.db.models import Q
+
 INSTRUMENT_LABELS = {
     "vocal": "Vocal",
     "guitar": "Guitarra",
@@ -47,3 +64,212 @@ def get_instrument_label(instrument_key: str) -> str:
     if not instrument_key:
         return "Sem instrumento"
     return INSTRUMENT_LABELS.get(instrument_key, instrument_key.capitalize())
+
+
+# Aliases de instrumentos para busca (termo buscado -> instrumentos que ele encontra)
+INSTRUMENT_SEARCH_ALIASES = {
+    "vocalista": ["vocal", "singer", "vocalist"],
+    "vocal": ["vocalista", "singer", "vocalist"],
+    "singer": ["vocal", "vocalista", "vocalist"],
+    "vocalist": ["vocal", "vocalista", "singer"],
+    "violao": ["acoustic_guitar", "violão"],
+    "violão": ["acoustic_guitar", "violao"],
+    "acoustic_guitar": ["violao", "violão", "violonista"],
+    "acoustic guitar": ["acoustic_guitar", "violao", "violão", "violonista"],
+    "violonista": ["acoustic_guitar", "violao", "violão"],
+    "guitarra": ["guitar", "electric_guitar"],
+    "guitar": ["guitarra", "electric_guitar"],
+    "baixo": ["bass", "bass_guitar"],
+    "bass": ["baixo", "bass_guitar", "contrabaixo"],
+    "bateria": ["drums"],
+    "drums": ["bateria"],
+    "teclado": ["keyboard", "piano", "synth"],
+    "keyboard": ["teclado", "piano", "synth"],
+    "percussao": ["percussion"],
+    "percussion": ["percussao"],
+    "cajon": ["cajón"],
+    "cajón": ["cajon"],
+    "saxofone": ["saxophone", "sax"],
+    "saxophone": ["saxofone", "sax"],
+    "sax": ["saxophone", "saxofone"],
+    "violin": ["violino", "violinista"],
+    "violino": ["violin", "violinista"],
+    "violinista": ["violin", "violino"],
+}
+
+_NON_KEY_CHARS = re.compile(r"[\W_]+")
+
+
+def instrument_key(value) -> str:
+    """Chave normalizada de um instrumento: sem acentos, minúsculas, "_" como separador."""
+    if not value:
+        return ""
+    text = unicodedata.normalize("NFKD", str(value).strip().lower())
+    text = "".join(c for c in text if not unicodedata.combining(c))
+    return _NON_KEY_CHARS.sub("_", text).strip("_")
+
+
+class InstrumentAliasMap:
+    """
+    Mapa compilado de aliases de instrumentos.
+
+    Grafias do mesmo instrumento (chave e label de INSTRUMENT_LABELS, name e
+    display_name da tabela Instrument) formam uma classe com uma chave
+    canônica. INSTRUMENT_SEARCH_ALIASES acrescenta arestas direcionais entre
+    classes: buscar "teclado" encontra quem toca piano, mas buscar "piano"
+    não encontra quem toca teclado.
+    """
+
+    def __init__(self, synonym_pairs=(), aliases=None):
+        self._parent = {}
+        for key, label in INSTRUMENT_LABELS.items():
+            self._union(key, instrument_key(label))
+        for name, display_name in synonym_pairs:
+            self._union(instrument_key(name), instrument_key(display_name))
+
+        # Chave canônica da classe: preferencialmente uma chave de INSTRUMENT_LABELS
+        members = {}
+        for key in list(self._parent):
+            members.setdefault(self._find(key), []).append(key)
+        self._canonical = {}
+        for group in members.values():
+            preferred = [key for key in group if key in INSTRUMENT_LABELS] or group
+            canonical = min(preferred)
+            for key in group:
+                self._canonical[key] = canonical
+
+        # matched_by[x] = classes cuja busca encontra a classe x
+        aliases = INSTRUMENT_SEARCH_ALIASES if aliases is None else aliases
+        self._matched_by = {}
+        for term, targets in aliases.items():
+            source = self.canonical(term)
+            for target in targets:
+                target = self.canonical(target)
+                if target and target != source:
+                    self._matched_by.setdefault(target, set()).add(source)
+
+    def _find(self, key):
+        self._parent.setdefault(key, key)
+        while self._parent[key] != key:
+            key = self._parent[key]
+        return key
+
+    def _union(self, a, b):
+        if a and b:
+            root_a, root_b = self._find(a), self._find(b)
+            if root_a != root_b:
+                self._parent[root_b] = root_a
+
+    def canonical(self, term) -> str:
+        """Chave canônica do termo ("" se vazio)."""
+        key = instrument_key(term)
+        return self._canonical.get(key, key)
+
+    def keys_for(self, instruments) -> list[str]:
+        """Chaves (ordenadas) pelas quais um músico com esses instrumentos é encontrado."""
+        keys = set()
+        for value in instruments:
+            canonical = self.canonical(value)
+            if canonical:
+                keys.add(canonical)
+                keys.update(self._matched_by.get(canonical, ()))
+        return sorted(keys)
+
+
+ALIASES_VERSION_KEY = "instrument_aliases:v1:version"
+ALIASES_VERSION_TTL = 60 * 60 * 24
+
+_alias_map = None
+_alias_map_version = None
+_alias_map_lock = threading.Lock()
+
+
+def _current_aliases_version() -> str:
+    version = cache.get(ALIASES_VERSION_KEY)
+    if version:
+        return version
+
+    cache.add(ALIASES_VERSION_KEY, uuid.uuid4().hex, timeout=ALIASES_VERSION_TTL)
+    return cache.get(ALIASES_VERSION_KEY) or ""
+
+
+def get_instrument_aliases() -> InstrumentAliasMap:
+    """Mapa de aliases do processo (recompilado quando a versão compartilhada muda)."""
+    global _alias_map, _alias_map_version
+    version = _current_aliases_version()
+    aliases = _alias_map
+    if aliases is None or _alias_map_version != version:
+        with _alias_map_lock:
+            if _alias_map is None or _alias_map_version != version:
+                from .models import Instrument
+
+                pairs = Instrument.objects.filter(is_approved=True).values_list(
+                    "name", "display_name"
+                )
+                _alias_map = InstrumentAliasMap(list(pairs))
+                _alias_map_version = version
+            aliases = _alias_map
+    return aliases
+
+
+def reset_instrument_aliases() -> None:
+    """
+    Descarta o mapa compilado deste processo e, após o commit, troca a versão
+    compartilhada para os demais processos recompilarem também.
+    """
+    global _alias_map
+    _alias_map = None
+
+    def _bump():
+        global _alias_map
+        cache.set(ALIASES_VERSION_KEY, uuid.uuid4().hex, timeout=ALIASES_VERSION_TTL)
+        _alias_map = None
+
+    transaction.on_commit(_bump)
+
+
+def _instrument_key_lookup(key: str, prefix: str = "") -> dict:
+    # SQLite não suporta lookup JSONField `contains`; cai para busca textual.
+    if connection.vendor == "sqlite":
+        return {f"{prefix}instrument_keys__icontains": f'"{key}"'}
+    return {f"{prefix}instrument_keys__contains": [key]}
+
+
+def rekey_musicians_for_instruments(terms) -> int:
+    """
+    Recalcula instrument_keys (e o documento de busca) dos músicos encontrados
+    por algum dos termos, antes ou depois da mudança de aliases. Cobre o caso
+    comum (instrumento novo/renomeado/removido); cadeias longas de aliases
+    ainda pedem `rebuild_musician_search`. Retorna quantos músicos mudaram.
+    """
+    from .models import Musician
+    from .musician_search import refresh_search_documents
+
+    terms = [term for term in terms if term]
+    keys = {instrument_key(term) for term in terms}
+    keys.update(get_instrument_aliases().keys_for(terms))
+    keys.discard("")
+    if not keys:
+        return 0
+
+    condition = Q()
+    for key in sorted(keys):
+        condition |= Q(**_instrument_key_lookup(key))
+    return refresh_search_documents(Musician.objects.filter(condition))
+
+
+def musician_instrument_keys(musician, aliases=None) -> list[str]:
+    """Valor de Musician.instrument_keys (aceita também instâncias de migrations)."""
+    aliases = aliases or get_instrument_aliases()
+    return aliases.keys_for([musician.instrument, *(musician.instruments or [])])
+
+
+def filter_by_instrument(queryset, term: str, prefix: str = ""):
+    """
+    Filtra músicos (ou modelos relacionados, via `prefix`, ex.: "leader__")
+    que são encontrados pela busca do instrumento `term`.
+    """
+    key = get_instrument_aliases().canonical(term)
+    if not key:
+        return queryset.none()
+    return queryset.filter(**_instrument_key_lookup(key, prefix))
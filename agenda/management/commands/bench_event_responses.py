@@ -0,0 +1,177 @@
+# agenda/management/commands/bench_event_responses.py
+"""
+Benchmark de concorrência: muitos convidados respondendo ao mesmo evento ao mesmo tempo.
+
+Cria um evento temporário com N convidados e dispara POST /events/{id}/set_availability/
+a partir de várias threads (cada uma com sua conexão), alternando available/unavailable.
+Ao final, confere se status e contadores do evento batem com as respostas gravadas e
+remove os dados criados.
+
+Rode contra o Postgres (com SQLite as escritas concorrentes se serializam no arquivo).
+
+Uso:
+    python manage.py bench_event_responses
+    python manage.py bench_event_responses --invitees 60 --threads 32 --rounds 6
+    python manage.py bench_event_responses --keep   # não remove os dados ao final
+"""
+
+import statistics
+import threading
+import time as time_module
+from datetime import date, time, timedelta
+from uuid import uuid4
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from agenda.models import Availability, Event, Musician
+from agenda.views import EventViewSet
+
+
+class Command(BaseCommand):
+    help = "Mede a vazão de set_availability com muitas threads no mesmo evento."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--invitees", type=int, default=40, help="Convidados do evento.")
+        parser.add_argument("--threads", type=int, default=16, help="Threads concorrentes.")
+        parser.add_argument(
+            "--rounds", type=int, default=5, help="Respostas enviadas por convidado."
+        )
+        parser.add_argument("--keep", action="store_true", help="Mantém evento e usuários criados.")
+
+    def handle(self, *args, **options):
+        invitees = options["invitees"]
+        threads = options["threads"]
+        rounds = options["rounds"]
+        if invitees < 1 or threads < 1 or rounds < 1:
+            raise CommandError("--invitees, --threads e --rounds devem ser positivos.")
+
+        prefix = f"bench_{uuid4().hex[:8]}"
+        try:
+            event, musicians = self._setup(prefix, invitees)
+            self.stdout.write(
+                f"Evento {event.pk}: {invitees} convidados, {threads} threads, "
+                f"{rounds} respostas por convidado ({connection.vendor})."
+            )
+            latencies, errors, elapsed = self._run(event, musicians, threads, rounds)
+            self._report(event, latencies, errors, elapsed)
+        finally:
+            if not options["keep"]:
+                Event.objects.filter(title=f"[BENCH] {prefix}").delete()
+                User.objects.filter(username__startswith=prefix).delete()
+
+    def _setup(self, prefix, invitees):
+        def create_user(username):
+            return User.objects.create_user(
+                username=username, email=f"{username}@bench.invalid", password=None
+            )
+
+        creator = create_user(f"{prefix}_lider")
+        Musician.objects.create(user=creator, instrument="vocal", role="leader")
+        musicians = [
+            Musician.objects.create(
+                user=create_user(f"{prefix}_{i}"),
+                instrument="guitar",
+            )
+            for i in range(invitees)
+        ]
+        event = Event.objects.create(
+            title=f"[BENCH] {prefix}",
+            location="Benchmark",
+            event_date=date.today() + timedelta(days=30),
+            start_time=time(20, 0),
+            end_time=time(23, 0),
+            created_by=creator,
+            status="proposed",
+        )
+        Availability.objects.bulk_create(
+            [Availability(musician=musician, event=event) for musician in musicians]
+        )
+        Event.refresh_availability_counters(event.pk)
+        return event, musicians
+
+    def _run(self, event, musicians, threads, rounds):
+        view = EventViewSet.as_view({"post": "set_availability"})
+        host = next((h for h in settings.ALLOWED_HOSTS if h and "*" not in h), "localhost")
+        factory = APIRequestFactory(SERVER_NAME=host.lstrip("."))
+        url = f"/api/events/{event.pk}/set_availability/"
+
+        # Cada convidado responde `rounds` vezes, alternando; as threads pegam da fila
+        jobs = [
+            (musician, "available" if (i + r) % 2 == 0 else "unavailable")
+            for r in range(rounds)
+            for i, musician in enumerate(musicians)
+        ]
+        lock = threading.Lock()
+        latencies = []
+        errors = []
+        start_barrier = threading.Barrier(threads + 1)
+
+        def worker():
+            start_barrier.wait()
+            try:
+                while True:
+                    with lock:
+                        if not jobs:
+                            return
+                        musician, response_value = jobs.pop()
+                    request = factory.post(url, {"response": response_value}, format="json")
+                    force_authenticate(request, user=musician.user)
+                    started = time_module.perf_counter()
+                    try:
+                        outcome = view(request, pk=event.pk).status_code
+                    except Exception as exc:  # ex.: deadlock propagado como 500
+                        outcome = type(exc).__name__
+                    took = time_module.perf_counter() - started
+                    with lock:
+                        latencies.append(took)
+                        if outcome != 200:
+                            errors.append(outcome)
+            finally:
+                connection.close()
+
+        workers = [threading.Thread(target=worker) for _ in range(threads)]
+        for thread in workers:
+            thread.start()
+        start_barrier.wait()
+        started = time_module.perf_counter()
+        for thread in workers:
+            thread.join()
+        return latencies, errors, time_module.perf_counter() - started
+
+    def _report(self, event, latencies, errors, elapsed):
+        total = len(latencies)
+        ordered = sorted(latencies)
+        p95 = ordered[min(total - 1, int(total * 0.95))] if ordered else 0.0
+        self.stdout.write(
+            f"  {total} respostas em {elapsed:.2f}s -> {total / elapsed:.1f} respostas/s"
+        )
+        if ordered:
+            self.stdout.write(
+                f"  latência: p50={statistics.median(ordered) * 1000:.1f}ms "
+                f"p95={p95 * 1000:.1f}ms max={ordered[-1] * 1000:.1f}ms"
+            )
+        if errors:
+            self.stdout.write(
+                self.style.WARNING(f"  {len(errors)} erro(s): {sorted(set(map(str, errors)))}")
+            )
+
+        event.refresh_from_db()
+        has_available = (
+            event.availabilities.exclude(musician__user=event.created_by)
+            .filter(response="available")
+            .exists()
+        )
+        expected_status = "confirmed" if has_available else "proposed"
+        stale = Event.rebuild_availability_counters([event.pk], dry_run=True)
+        if event.status != expected_status or stale:
+            raise CommandError(
+                f"Estado final inconsistente: status={event.status} (esperado {expected_status}), "
+                f"contadores divergentes={bool(stale)}."
+            )
+        self.stdout.write(
+            self.style.SUCCESS(f"  Estado final consistente (status={event.status}).")
+        )
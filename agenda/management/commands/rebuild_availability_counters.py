@@ -0,0 +1,54 @@
+# agenda/management/commands/rebuild_availability_counters.py
+"""
+Reconstrói ou verifica os contadores desnormalizados de Availability em Event
+(avail_pending_count, avail_available_count, avail_unavailable_count, avail_total_count).
+
+Uso:
+    python manage.py rebuild_availability_counters           # Corrige divergências
+    python manage.py rebuild_availability_counters --check   # Só verifica (falha se divergir)
+    python manage.py rebuild_availability_counters --event 12 --event 15
+"""
+
+from django.core.management.base import BaseCommand, CommandError
+
+from agenda.models import Event
+
+
+class Command(BaseCommand):
+    help = "Reconstrói ou verifica os contadores de disponibilidade dos eventos."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--check",
+            action="store_true",
+            help="Apenas verifica; retorna erro se algum evento estiver divergente.",
+        )
+        parser.add_argument(
+            "--event",
+            action="append",
+            type=int,
+            dest="event_ids",
+            help="Limita a um ou mais eventos (pode repetir).",
+        )
+
+    def handle(self, *args, **options):
+        check = options["check"]
+        stale = Event.rebuild_availability_counters(options["event_ids"], dry_run=check)
+
+        for event in stale[:20]:
+            summary = event.availability_summary
+            self.stdout.write(
+                f"  Evento {event.pk}: pending={summary['pending']} "
+                f"available={summary['available']} unavailable={summary['unavailable']} "
+                f"total={summary['total']}"
+            )
+        if len(stale) > 20:
+            self.stdout.write(f"  ... e mais {len(stale) - 20} evento(s)")
+
+        if check:
+            if stale:
+                raise CommandError(f"{len(stale)} evento(s) com contadores divergentes.")
+            self.stdout.write(self.style.SUCCESS("Contadores consistentes."))
+            return
+
+        self.stdout.write(self.style.SUCCESS(f"{len(stale)} evento(s) corrigido(s)."))
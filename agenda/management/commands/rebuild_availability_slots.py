@@ -0,0 +1,36 @@
+# agenda/management/commands/rebuild_availability_slots.py
+"""
+Reconstrói ou verifica o bitmap diário das disponibilidades públicas
+(MusicianDaySlots), usado pela janela de horário de available_musicians.
+
+Uso:
+    python manage.py rebuild_availability_slots           # Corrige divergências
+    python manage.py rebuild_availability_slots --check   # Só verifica (falha se divergir)
+"""
+
+from django.core.management.base import BaseCommand, CommandError
+
+from agenda.availability_slots import rebuild_day_slots
+
+
+class Command(BaseCommand):
+    help = "Reconstrói ou verifica o bitmap diário de disponibilidades dos músicos."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--check",
+            action="store_true",
+            help="Apenas verifica; retorna erro se algum dia estiver divergente.",
+        )
+
+    def handle(self, *args, **options):
+        check = options["check"]
+        stale = rebuild_day_slots(dry_run=check)
+
+        if check:
+            if stale:
+                raise CommandError(f"{stale} dia(s) de disponibilidade divergente(s).")
+            self.stdout.write(self.style.SUCCESS("Bitmap de disponibilidades consistente."))
+            return
+
+        self.stdout.write(self.style.SUCCESS(f"{stale} dia(s) corrigido(s)."))
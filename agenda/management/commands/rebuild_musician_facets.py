@@ -0,0 +1,36 @@
+# agenda/management/commands/rebuild_musician_facets.py
+"""
+Reconstrói ou verifica as contagens materializadas de facetas dos músicos
+(MusicianFacetCount: gênero, instrumento e cidade por escopo cidade/UF).
+
+Uso:
+    python manage.py rebuild_musician_facets           # Corrige divergências
+    python manage.py rebuild_musician_facets --check   # Só verifica (falha se divergir)
+"""
+
+from django.core.management.base import BaseCommand, CommandError
+
+from agenda.musician_facets import rebuild_facet_counts
+
+
+class Command(BaseCommand):
+    help = "Reconstrói ou verifica as contagens de facetas dos músicos."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--check",
+            action="store_true",
+            help="Apenas verifica; retorna erro se alguma contagem estiver divergente.",
+        )
+
+    def handle(self, *args, **options):
+        check = options["check"]
+        stale = rebuild_facet_counts(dry_run=check)
+
+        if check:
+            if stale:
+                raise CommandError(f"{stale} contagem(ns) de faceta divergente(s).")
+            self.stdout.write(self.style.SUCCESS("Contagens consistentes."))
+            return
+
+        self.stdout.write(self.style.SUCCESS(f"{stale} contagem(ns) corrigida(s)."))
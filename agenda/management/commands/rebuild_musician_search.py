@@ -0,0 +1,37 @@
+# agenda/management/commands/rebuild_musician_search.py
+"""
+Recalcula o documento de busca dos músicos (Musician.search_document) e as chaves
+de instrumento (Musician.instrument_keys) e regrava o índice de busca. Útil após
+updates em massa que não passam por Musician.save() ou após mudanças na tabela
+Instrument (novos aliases).
+
+Uso:
+    python manage.py rebuild_musician_search
+    python manage.py rebuild_musician_search --musician 12 --musician 15
+"""
+
+from django.core.management.base import BaseCommand
+
+from agenda.models import Musician
+from agenda.musician_search import refresh_search_documents
+
+
+class Command(BaseCommand):
+    help = "Recalcula o documento/índice de busca dos músicos."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--musician",
+            action="append",
+            type=int,
+            dest="musician_ids",
+            help="Limita a um ou mais músicos (pode repetir).",
+        )
+
+    def handle(self, *args, **options):
+        queryset = Musician.objects.all()
+        if options["musician_ids"]:
+            queryset = queryset.filter(pk__in=options["musician_ids"])
+
+        changed = refresh_search_documents(queryset, reindex=True)
+        self.stdout.write(self.style.SUCCESS(f"{changed} documento(s) atualizado(s)."))
@@ -0,0 +1,35 @@
+# agenda/management/commands/warm_musician_catalog.py
+"""
+Pré-aquece o cache do catálogo público de músicos (GET /api/musicians/catalog/):
+primeira página do catálogo geral e das cidades com mais músicos ativos.
+Pensado para rodar periodicamente (cron), em intervalo menor que o TTL
+suave de CATALOG_CACHE_TTLS.
+
+Uso:
+    python manage.py warm_musician_catalog
+    python manage.py warm_musician_catalog --top 50
+"""
+
+from django.core.management.base import BaseCommand
+
+from agenda.musician_catalog import warm_catalog
+
+
+class Command(BaseCommand):
+    help = "Pré-aquece o cache do catálogo público de músicos."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--top",
+            type=int,
+            default=20,
+            help="Quantidade de cidades (as com mais músicos ativos).",
+        )
+
+    def handle(self, *args, **options):
+        warmed = warm_catalog(top_cities=max(0, options["top"]))
+        for params in warmed[1:]:
+            self.stdout.write(f"  {params['city']}/{params.get('state', '')}")
+        self.stdout.write(
+            self.style.SUCCESS(f"{len(warmed)} página(s) aquecida(s) (catálogo geral + cidades).")
+        )
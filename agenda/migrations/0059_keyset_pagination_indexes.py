@@ -0,0 +1,31 @@
+# Generated by Django 5.2.12 on 2026-10-16 20:29
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("agenda", "0058_make_musician_request_phone_optional"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="event",
+            index=models.Index(fields=["event_date", "id"], name="agenda_even_event_d_c018cb_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="quoterequest",
+            index=models.Index(
+                fields=["musician", "created_at", "id"], name="agenda_quot_musicia_42da1a_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="quoterequest",
+            index=models.Index(
+                fields=["contractor", "created_at", "id"], name="agenda_quot_contrac_19b257_idx"
+            ),
+        ),
+    ]
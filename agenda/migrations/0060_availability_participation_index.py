@@ -0,0 +1,19 @@
+# Generated by Django 5.2.12 on 2026-10-16 20:33
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("agenda", "0059_keyset_pagination_indexes"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="availability",
+            index=models.Index(
+                fields=["musician", "response", "event"], name="agenda_avai_musicia_37a626_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,59 @@
+# Generated by Django 5.2.12 on 2026-10-16 20:41
+
+from django.db import migrations, models
+
+
+def backfill_counters(apps, schema_editor):
+    Event = apps.get_model("agenda", "Event")
+    Availability = apps.get_model("agenda", "Availability")
+
+    fields = {
+        "pending": "avail_pending_count",
+        "available": "avail_available_count",
+        "unavailable": "avail_unavailable_count",
+    }
+    counters: dict[int, dict[str, int]] = {}
+    grouped = (
+        Availability.objects.order_by()
+        .values_list("event_id", "response")
+        .annotate(total=models.Count("id"))
+    )
+    for event_id, response, total in grouped:
+        row = counters.setdefault(event_id, {"avail_total_count": 0})
+        if response in fields:
+            row[fields[response]] = row.get(fields[response], 0) + total
+        row["avail_total_count"] += total
+
+    for event_id, values in counters.items():
+        Event.objects.filter(pk=event_id).update(**values)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("agenda", "0060_availability_participation_index"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="event",
+            name="avail_available_count",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="event",
+            name="avail_pending_count",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="event",
+            name="avail_total_count",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="event",
+            name="avail_unavailable_count",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_counters, migrations.RunPython.noop),
+    ]
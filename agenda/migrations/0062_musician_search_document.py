@@ -0,0 +1,71 @@
+# Generated by Django 5.2.12 on 2026-10-16 21:20
+
+from django.db import migrations, models
+
+from agenda.musician_search import (
+    POSTGRES_SEARCH_CONFIG,
+    SQLITE_FTS_TABLE,
+    build_search_document,
+)
+
+POSTGRES_INDEX_NAME = "agenda_musician_search_gin"
+
+
+def _postgres_index():
+    from django.contrib.postgres.indexes import GinIndex
+    from django.contrib.postgres.search import SearchVector
+
+    # Mesma expressão usada em musician_search.search_musicians (o planner só usa o
+    # índice se a expressão da consulta for idêntica)
+    return GinIndex(
+        SearchVector("search_document", config=POSTGRES_SEARCH_CONFIG),
+        name=POSTGRES_INDEX_NAME,
+    )
+
+
+def create_search_index(apps, schema_editor):
+    Musician = apps.get_model("agenda", "Musician")
+
+    musicians = list(Musician.objects.select_related("user"))
+    for musician in musicians:
+        musician.search_document = build_search_document(musician)
+    Musician.objects.bulk_update(musicians, ["search_document"], batch_size=500)
+    documents = {musician.pk: musician.search_document for musician in musicians}
+
+    vendor = schema_editor.connection.vendor
+    if vendor == "postgresql":
+        schema_editor.add_index(Musician, _postgres_index())
+    elif vendor == "sqlite":
+        schema_editor.execute(
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {SQLITE_FTS_TABLE} USING fts5(document)"
+        )
+        with schema_editor.connection.cursor() as cursor:
+            cursor.executemany(
+                f"INSERT INTO {SQLITE_FTS_TABLE}(rowid, document) VALUES (%s, %s)",
+                list(documents.items()),
+            )
+
+
+def drop_search_index(apps, schema_editor):
+    Musician = apps.get_model("agenda", "Musician")
+    vendor = schema_editor.connection.vendor
+    if vendor == "postgresql":
+        schema_editor.remove_index(Musician, _postgres_index())
+    elif vendor == "sqlite":
+        schema_editor.execute(f"DROP TABLE IF EXISTS {SQLITE_FTS_TABLE}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("agenda", "0061_event_availability_counters"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="musician",
+            name="search_document",
+            field=models.TextField(blank=True, default="", editable=False),
+        ),
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -0,0 +1,54 @@
+# Generated by Django 5.2.12 on 2026-10-16 22:05
+
+from django.db import migrations, models
+
+from agenda.instrument_utils import InstrumentAliasMap, musician_instrument_keys
+
+POSTGRES_INDEX_NAME = "agenda_musician_instr_keys_gin"
+
+
+def _postgres_index():
+    from django.contrib.postgres.indexes import GinIndex
+
+    # jsonb_path_ops: menor e mais rápido, suficiente para o operador @> (contains)
+    return GinIndex(
+        fields=["instrument_keys"], name=POSTGRES_INDEX_NAME, opclasses=["jsonb_path_ops"]
+    )
+
+
+def populate_instrument_keys(apps, schema_editor):
+    Instrument = apps.get_model("agenda", "Instrument")
+    Musician = apps.get_model("agenda", "Musician")
+
+    aliases = InstrumentAliasMap(
+        list(Instrument.objects.filter(is_approved=True).values_list("name", "display_name"))
+    )
+    musicians = list(Musician.objects.only("id", "instrument", "instruments"))
+    for musician in musicians:
+        musician.instrument_keys = musician_instrument_keys(musician, aliases)
+    Musician.objects.bulk_update(musicians, ["instrument_keys"], batch_size=500)
+
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.add_index(Musician, _postgres_index())
+
+
+def drop_instrument_keys_index(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        Musician = apps.get_model("agenda", "Musician")
+        schema_editor.remove_index(Musician, _postgres_index())
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("agenda", "0062_musician_search_document"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="musician",
+            name="instrument_keys",
+            field=models.JSONField(blank=True, default=list, editable=False),
+        ),
+        migrations.RunPython(populate_instrument_keys, drop_instrument_keys_index),
+    ]
@@ -0,0 +1,80 @@
+# Generated by Django 5.2.12 on 2026-10-16 22:45
+
+from collections import Counter
+
+from django.db import migrations, models
+
+from agenda.musician_facets import FACET_SOURCE_FIELDS, facet_contributions
+
+
+def populate_facet_counts(apps, schema_editor):
+    Musician = apps.get_model("agenda", "Musician")
+    MusicianFacetCount = apps.get_model("agenda", "MusicianFacetCount")
+
+    counts = Counter()
+    for values in Musician.objects.filter(is_active=True).values(*FACET_SOURCE_FIELDS):
+        counts.update(facet_contributions(values))
+    MusicianFacetCount.objects.bulk_create(
+        [
+            MusicianFacetCount(facet=facet, value=value, city=city, state=state, count=count)
+            for (facet, value, city, state), count in counts.items()
+        ],
+        batch_size=500,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("agenda", "0063_musician_instrument_keys"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="MusicianFacetCount",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True, primary_key=True, serialize=False, verbose_name="ID"
+                    ),
+                ),
+                (
+                    "facet",
+                    models.CharField(
+                        choices=[
+                            ("genre", "Gênero"),
+                            ("instrument", "Instrumento"),
+                            ("city", "Cidade"),
+                        ],
+                        max_length=20,
+                    ),
+                ),
+                ("value", models.CharField(max_length=100)),
+                (
+                    "city",
+                    models.CharField(
+                        blank=True, default="", help_text="Cidade normalizada", max_length=100
+                    ),
+                ),
+                ("state", models.CharField(blank=True, default="", max_length=2)),
+                ("count", models.IntegerField(default=0)),
+            ],
+            options={
+                "verbose_name": "Contagem de faceta",
+                "verbose_name_plural": "Contagens de facetas",
+                "indexes": [
+                    models.Index(
+                        fields=["facet", "state", "city"], name="agenda_musi_facet_b4f79e_idx"
+                    )
+                ],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("facet", "value", "city", "state"),
+                        name="unique_musician_facet_scope",
+                    )
+                ],
+            },
+        ),
+        migrations.RunPython(populate_facet_counts, migrations.RunPython.noop),
+    ]
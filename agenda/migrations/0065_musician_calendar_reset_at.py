@@ -0,0 +1,18 @@
+# Generated by Django 5.2.12 on 2026-10-16 23:15
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("agenda", "0064_musician_facet_counts"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="musician",
+            name="calendar_reset_at",
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+    ]
@@ -0,0 +1,74 @@
+# Generated by Django 5.2.12 on 2026-10-16 23:22
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+from agenda.availability_slots import day_masks
+
+
+def populate_day_slots(apps, schema_editor):
+    LeaderAvailability = apps.get_model("agenda", "LeaderAvailability")
+    MusicianDaySlots = apps.get_model("agenda", "MusicianDaySlots")
+
+    rows = LeaderAvailability.objects.filter(is_active=True, is_public=True).values_list(
+        "leader_id", "date", "start_time", "end_time"
+    )
+    MusicianDaySlots.objects.bulk_create(
+        [
+            MusicianDaySlots(musician_id=leader_id, date=day, slots_am=am, slots_pm=pm)
+            for (leader_id, day), (am, pm) in day_masks(rows.iterator()).items()
+        ],
+        batch_size=500,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("agenda", "0065_musician_calendar_reset_at"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="MusicianDaySlots",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True, primary_key=True, serialize=False, verbose_name="ID"
+                    ),
+                ),
+                ("date", models.DateField()),
+                (
+                    "slots_am",
+                    models.BigIntegerField(
+                        default=0, help_text="Slots de 00:00 a 12:00 (bit 0 = 00:00)"
+                    ),
+                ),
+                (
+                    "slots_pm",
+                    models.BigIntegerField(
+                        default=0, help_text="Slots de 12:00 a 24:00 (bit 0 = 12:00)"
+                    ),
+                ),
+                (
+                    "musician",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="day_slots",
+                        to="agenda.musician",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Slots do dia",
+                "verbose_name_plural": "Slots dos dias",
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("musician", "date"), name="unique_musician_day_slots"
+                    )
+                ],
+            },
+        ),
+        migrations.RunPython(populate_day_slots, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,133 @@
+# Generated by Django 5.2.12 on 2026-10-16 23:35
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("agenda", "0066_musician_day_slots"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="AvailabilityRule",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True, primary_key=True, serialize=False, verbose_name="ID"
+                    ),
+                ),
+                (
+                    "frequency",
+                    models.CharField(
+                        choices=[("daily", "Diária"), ("weekly", "Semanal")],
+                        default="weekly",
+                        max_length=10,
+                    ),
+                ),
+                (
+                    "interval",
+                    models.PositiveSmallIntegerField(
+                        default=1, help_text="Repete a cada N dias/semanas (INTERVAL)"
+                    ),
+                ),
+                (
+                    "weekdays",
+                    models.PositiveSmallIntegerField(
+                        default=0,
+                        help_text="Dias da semana (BYDAY) em bits: bit 0 = segunda ... bit 6 = domingo",
+                    ),
+                ),
+                ("start_date", models.DateField(help_text="Primeira data da regra (DTSTART)")),
+                (
+                    "until",
+                    models.DateField(
+                        blank=True, help_text="Última data (UNTIL); vazio = sem fim", null=True
+                    ),
+                ),
+                ("start_time", models.TimeField(help_text="Hora de início de cada ocorrência")),
+                (
+                    "end_time",
+                    models.TimeField(
+                        help_text="Hora de término (menor que o início = cruza meia-noite)"
+                    ),
+                ),
+                ("notes", models.TextField(blank=True, null=True)),
+                ("is_public", models.BooleanField(default=False)),
+                ("is_active", models.BooleanField(default=True)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                (
+                    "leader",
+                    models.ForeignKey(
+                        help_text="Músico dono da regra",
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="availability_rules",
+                        to="agenda.musician",
+                    ),
+                ),
+                (
+                    "organization",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="availability_rules",
+                        to="agenda.organization",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Regra de disponibilidade",
+                "verbose_name_plural": "Regras de disponibilidade",
+                "ordering": ["start_time", "id"],
+            },
+        ),
+        migrations.CreateModel(
+            name="AvailabilityRuleException",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True, primary_key=True, serialize=False, verbose_name="ID"
+                    ),
+                ),
+                ("date", models.DateField()),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                (
+                    "rule",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="exceptions",
+                        to="agenda.availabilityrule",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Exceção de regra de disponibilidade",
+                "verbose_name_plural": "Exceções de regras de disponibilidade",
+                "ordering": ["date"],
+            },
+        ),
+        migrations.AddIndex(
+            model_name="availabilityrule",
+            index=models.Index(
+                fields=["leader", "is_active"], name="agenda_avai_leader__853170_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="availabilityrule",
+            index=models.Index(
+                fields=["is_active", "start_date"], name="agenda_avai_is_acti_c900dc_idx"
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="availabilityruleexception",
+            constraint=models.UniqueConstraint(
+                fields=("rule", "date"), name="unique_availability_rule_date"
+            ),
+        ),
+    ]
@@ -8,6 +8,8 @@ from django.contrib.auth.models import User
 from django.core.exceptions import ValidationError
 from django.core.validators import MinValueValidator
 from django.db import models, transaction
+from django.db.models.functions import Coalesce, Greatest
+from django.dispatch import Signal
 from django.utils import timezone
 
 
@@ -69,6 +71,16 @@ class Instrument(models.Model):
     def __str__(self):
         return self.display_name
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Nomes persistidos: aliases antigos também podem ter músicos a re-chavear
+        instance._persisted_alias_terms = (
+            instance.__dict__.get("name"),
+            instance.__dict__.get("display_name"),
+        )
+        return instance
+
     @staticmethod
     def normalize_name(name: str) -> str:
         """Normaliza nome do instrumento (lowercase, sem acentos)."""
@@ -335,6 +347,16 @@ class Musician(models.Model):
         default=0, help_text="Total de avaliações recebidas"
     )
 
+    # Texto normalizado para busca (agenda/musician_search.py); recalculado no save()
+    search_document = models.TextField(blank=True, default="", editable=False)
+    # Chaves canônicas de instrumento já expandidas por aliases (agenda/instrument_utils.py).
+    # JSONField e não ArrayField: ArrayField só existe no Postgres e dev/testes rodam em
+    # SQLite; como jsonb com GIN jsonb_path_ops, o @> usa o índice do mesmo jeito.
+    instrument_keys = models.JSONField(default=list, blank=True, editable=False)
+    # Última remoção de evento/disponibilidade da agenda: sync tokens do feed
+    # ICS anteriores a ela recebem o feed completo (agenda/calendar_feed.py)
+    calendar_reset_at = models.DateTimeField(null=True, blank=True, editable=False)
+
     created_at = models.DateTimeField(auto_now_add=True)
 
     class Meta:
@@ -361,12 +383,125 @@ class Musician(models.Model):
             from .utils import normalize_uf
 
             self.state = normalize_uf(self.state) or self.state[:2]
-        super().save(*args, **kwargs)
+
+        from .instrument_utils import musician_instrument_keys
+        from .musician_facets import FACET_SOURCE_FIELDS
+        from .musician_search import MUSICIAN_SEARCH_FIELDS, build_search_document
+
+        # Campos derivados só são recalculados quando as fontes podem ter mudado
+        # (ex.: save(update_fields=["average_rating"]) não lê self.user)
+        update_fields = kwargs.get("update_fields")
+        if update_fields is None or set(update_fields) & set(MUSICIAN_SEARCH_FIELDS):
+            self.search_document = build_search_document(self)
+        if update_fields is None or set(update_fields) & {"instrument", "instruments"}:
+            self.instrument_keys = musician_instrument_keys(self)
+        if update_fields is not None:
+            derived = set()
+            if set(update_fields) & set(MUSICIAN_SEARCH_FIELDS):
+                derived.add("search_document")
+            if set(update_fields) & {"instrument", "instruments"}:
+                derived.add("instrument_keys")
+            if derived:
+                kwargs["update_fields"] = {*update_fields, *derived}
+
+        if update_fields is not None and not set(update_fields) & set(FACET_SOURCE_FIELDS):
+            super().save(*args, **kwargs)
+            return
+        self._save_with_facet_counts(*args, **kwargs)
+
+    def _save_with_facet_counts(self, *args, **kwargs):
+        """save() + delta das contagens de facetas (MusicianFacetCount) na mesma transação."""
+        from .musician_facets import (
+            FACET_SOURCE_FIELDS,
+            apply_facet_delta,
+            facet_contributions,
+            locked_facet_snapshot,
+            snapshot_from_values,
+        )
+
+        update_fields = kwargs.get("update_fields")
+        with transaction.atomic():
+            # Delta a partir da linha gravada (com lock), não dos valores carregados
+            # na instância: outro save do mesmo músico pode ter passado no meio
+            old = None if self._state.adding else locked_facet_snapshot(self.pk)
+            super().save(*args, **kwargs)
+
+            # Só os campos gravados (update_fields ou os carregados) mudaram no banco
+            saved = set(update_fields) if update_fields is not None else set(self.__dict__)
+            current = snapshot_from_values(
+                {
+                    field: getattr(self, field) if field in saved else (old or {}).get(field)
+                    for field in FACET_SOURCE_FIELDS
+                }
+            )
+            apply_facet_delta(facet_contributions(old), facet_contributions(current))
 
     def __str__(self):
         return f"{self.user.get_full_name() or self.user.username} - {self.get_instrument_label()}"
 
 
+class MusicianFacetCount(models.Model):
+    """
+    Contagem materializada de músicos ativos por faceta (gênero, instrumento,
+    cidade) em cada escopo cidade/UF. Mantida por Musician.save/delete
+    (agenda/musician_facets.py).
+    """
+
+    FACET_CHOICES = [
+        ("genre", "Gênero"),
+        ("instrument", "Instrumento"),
+        ("city", "Cidade"),
+    ]
+
+    facet = models.CharField(max_length=20, choices=FACET_CHOICES)
+    value = models.CharField(max_length=100)
+    city = models.CharField(max_length=100, blank=True, default="", help_text="Cidade normalizada")
+    state = models.CharField(max_length=2, blank=True, default="")
+    count = models.IntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["facet", "value", "city", "state"], name="unique_musician_facet_scope"
+            ),
+        ]
+        indexes = [
+            models.Index(fields=["facet", "state", "city"]),
+        ]
+        verbose_name = "Contagem de faceta"
+        verbose_name_plural = "Contagens de facetas"
+
+    def __str__(self):
+        return f"{self.facet}={self.value} ({self.city}/{self.state}): {self.count}"
+
+
+class MusicianDaySlots(models.Model):
+    """
+    Bitmap do dia com as disponibilidades públicas ativas do músico: 96 slots
+    de 15 minutos em dois inteiros de 48 bits (agenda/availability_slots.py).
+    """
+
+    musician = models.ForeignKey(Musician, on_delete=models.CASCADE, related_name="day_slots")
+    date = models.DateField()
+    slots_am = models.BigIntegerField(default=0, help_text="Slots de 00:00 a 12:00 (bit 0 = 00:00)")
+    slots_pm = models.BigIntegerField(default=0, help_text="Slots de 12:00 a 24:00 (bit 0 = 12:00)")
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["musician", "date"], name="unique_musician_day_slots"),
+        ]
+        verbose_name = "Slots do dia"
+        verbose_name_plural = "Slots dos dias"
+
+    def __str__(self):
+        return f"{self.musician_id} {self.date}: {self.slots_am:012x}/{self.slots_pm:012x}"
+
+
+# Status do evento alterado por Event.apply_status_change (UPDATE sem save(), logo
+# sem pre_save/post_save). Argumentos: instance, previous_status, update_fields.
+event_status_changed = Signal()
+
+
 class Event(models.Model):
     """
     Representa uma proposta de evento/show na agenda.
@@ -449,9 +584,22 @@ class Event(models.Model):
     # Motivo da rejeição
     rejection_reason = models.TextField(blank=True, null=True)
 
+    # Contadores desnormalizados de Availability (mantidos por Availability.save/delete;
+    # reconstruir com: python manage.py rebuild_availability_counters)
+    avail_pending_count = models.PositiveIntegerField(default=0)
+    avail_available_count = models.PositiveIntegerField(default=0)
+    avail_unavailable_count = models.PositiveIntegerField(default=0)
+    avail_total_count = models.PositiveIntegerField(default=0)
+
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    AVAILABILITY_COUNTER_FIELDS = {
+        "pending": "avail_pending_count",
+        "available": "avail_available_count",
+        "unavailable": "avail_unavailable_count",
+    }
+
     class Meta:
         ordering = ["-event_date", "-start_time"]
         verbose_name = "Evento"
@@ -459,6 +607,8 @@ class Event(models.Model):
         indexes = [
             models.Index(fields=["event_date", "status"]),
             models.Index(fields=["status"]),
+            # Paginação keyset da listagem: (event_date, id)
+            models.Index(fields=["event_date", "id"]),
         ]
 
     def clean(self):
@@ -502,6 +652,16 @@ class Event(models.Model):
 
             self.end_datetime = timezone.make_aware(datetime.combine(end_date, self.end_time))
 
+        # Contadores são mantidos só via UPDATE com F(): um save() de uma instância
+        # carregada antes de uma resposta não pode sobrescrevê-los com valor velho
+        if self.pk and not self._state.adding and kwargs.get("update_fields") is None:
+            counter_fields = {"avail_total_count", *self.AVAILABILITY_COUNTER_FIELDS.values()}
+            kwargs["update_fields"] = [
+                field.name
+                for field in self._meta.concrete_fields
+                if not field.primary_key and field.name not in counter_fields
+            ]
+
         super().save(*args, **kwargs)
 
     def __str__(self):
@@ -509,6 +669,126 @@ class Event(models.Model):
             f"{self.title} - {self.event_date.strftime('%d/%m/%Y')} - {self.get_status_display()}"
         )
 
+    @property
+    def availability_summary(self) -> dict[str, int]:
+        return {
+            "pending": self.avail_pending_count,
+            "available": self.avail_available_count,
+            "unavailable": self.avail_unavailable_count,
+            "total": self.avail_total_count,
+        }
+
+    @classmethod
+    def apply_availability_change(cls, event_id, old_response=None, new_response=None) -> None:
+        """
+        Ajusta os contadores do evento com F() (atômico no banco).
+        old_response=None => criação; new_response=None => remoção.
+        Decrementos param em 0: um contador defasado (ex.: delete em SQL cru) não
+        viola o CHECK do PositiveIntegerField; rebuild_availability_counters corrige.
+        """
+        if old_response == new_response:
+            return
+
+        changes = {}
+        if old_response in cls.AVAILABILITY_COUNTER_FIELDS:
+            name = cls.AVAILABILITY_COUNTER_FIELDS[old_response]
+            changes[name] = Greatest(models.F(name) - 1, 0)
+        if new_response in cls.AVAILABILITY_COUNTER_FIELDS:
+            name = cls.AVAILABILITY_COUNTER_FIELDS[new_response]
+            changes[name] = models.F(name) + 1
+        if old_response is None:
+            changes["avail_total_count"] = models.F("avail_total_count") + 1
+        elif new_response is None:
+            changes["avail_total_count"] = Greatest(models.F("avail_total_count") - 1, 0)
+
+        if changes:
+            cls.objects.filter(pk=event_id).update(**changes)
+
+    @classmethod
+    def refresh_availability_counters(cls, event_id) -> None:
+        """
+        Recalcula os contadores de um evento em um único UPDATE com subqueries.
+        Usado após escritas em lote (bulk_create não passa por Availability.save).
+        """
+
+        def count(**filters):
+            subquery = (
+                Availability.objects.filter(event=models.OuterRef("pk"), **filters)
+                .order_by()
+                .values("event")
+                .annotate(total=models.Count("id"))
+                .values("total")
+            )
+            return Coalesce(models.Subquery(subquery), 0)
+
+        changes = {
+            field: count(response=response)
+            for response, field in cls.AVAILABILITY_COUNTER_FIELDS.items()
+        }
+        changes["avail_total_count"] = count()
+        cls.objects.filter(pk=event_id).update(**changes)
+
+    @classmethod
+    def rebuild_availability_counters(cls, event_ids=None, *, dry_run: bool = False) -> list:
+        """
+        Recalcula os contadores a partir de Availability (uma query agrupada +
+        bulk_update). Retorna os eventos que estavam divergentes (já corrigidos
+        em memória; no banco apenas se dry_run=False).
+        """
+        events = cls.objects.all()
+        if event_ids is not None:
+            events = events.filter(pk__in=event_ids)
+
+        grouped = (
+            Availability.objects.filter(event__in=events)
+            .order_by()
+            .values_list("event_id", "response")
+            .annotate(total=models.Count("id"))
+        )
+        expected: dict[int, dict[str, int]] = {}
+        for event_id, response, total in grouped:
+            row = expected.setdefault(event_id, {})
+            row[response] = row.get(response, 0) + total
+            row["total"] = row.get("total", 0) + total
+
+        counter_fields = [*cls.AVAILABILITY_COUNTER_FIELDS.values(), "avail_total_count"]
+        stale = []
+        for event in events.only("pk", *counter_fields).iterator():
+            row = expected.get(event.pk, {})
+            values = {
+                field: row.get(response, 0)
+                for response, field in cls.AVAILABILITY_COUNTER_FIELDS.items()
+            }
+            values["avail_total_count"] = row.get("total", 0)
+            if any(getattr(event, field) != value for field, value in values.items()):
+                for field, value in values.items():
+                    setattr(event, field, value)
+                stale.append(event)
+
+        if stale and not dry_run:
+            cls.objects.bulk_update(stale, counter_fields, batch_size=500)
+        return stale
+
+    def apply_status_change(self, candidates, changes, previous_status) -> bool:
+        """
+        Aplica `changes` com um único UPDATE condicional sobre `candidates` (queryset
+        deste evento já filtrado pelo estado esperado). Retorna False se nenhuma
+        linha casou. Se casou, recarrega a instância e, quando o status muda,
+        envia event_status_changed com o status anterior explícito.
+        """
+        if not candidates.update(**changes):
+            return False
+
+        self.refresh_from_db()
+        if self.status != previous_status:
+            event_status_changed.send(
+                sender=Event,
+                instance=self,
+                previous_status=previous_status,
+                update_fields=frozenset(field.removesuffix("_id") for field in changes),
+            )
+        return True
+
     def can_be_approved(self):
         """Compat: aprovação foi substituída por confirmação via convites."""
         return self.status == "proposed"
@@ -598,15 +878,40 @@ class Availability(models.Model):
         ordering = ["event__event_date", "musician__user__first_name"]
         verbose_name = "Disponibilidade"
         verbose_name_plural = "Disponibilidades"
+        indexes = [
+            # Subquery de participação da listagem de eventos (index-only scan)
+            models.Index(fields=["musician", "response", "event"]),
+        ]
 
     def __str__(self):
         return f"{self.musician} - {self.event.title} - {self.get_response_display()}"
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Resposta persistida: base para o delta dos contadores do evento
+        instance._persisted_response = instance.__dict__.get("response")
+        return instance
+
     def save(self, *args, **kwargs):
-        """Atualiza responded_at quando muda de pending"""
+        """Atualiza responded_at quando muda de pending e os contadores do evento"""
         if self.response != "pending" and not self.responded_at:
             self.responded_at = timezone.now()
-        super().save(*args, **kwargs)
+
+        adding = self._state.adding
+        old_response = None if adding else getattr(self, "_persisted_response", None)
+        with transaction.atomic():
+            if not adding and old_response is None:
+                # Instância não veio do banco (ex.: pk atribuído manualmente)
+                old_response = (
+                    Availability.objects.filter(pk=self.pk)
+                    .values_list("response", flat=True)
+                    .first()
+                )
+            super().save(*args, **kwargs)
+            if adding or old_response is not None:
+                Event.apply_availability_change(self.event_id, old_response, self.response)
+        self._persisted_response = self.response
 
 
 class LeaderAvailability(models.Model):
@@ -657,6 +962,16 @@ class LeaderAvailability(models.Model):
             models.Index(fields=["leader", "date"]),
         ]
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Dia persistido: mudar data/músico também recalcula o bitmap do dia antigo
+        instance._persisted_day_scope = (
+            instance.__dict__.get("leader_id"),
+            instance.__dict__.get("date"),
+        )
+        return instance
+
     def clean(self):
         """Validações customizadas"""
         errors = {}
@@ -708,6 +1023,14 @@ class LeaderAvailability(models.Model):
         if errors:
             raise ValidationError(errors)
 
+        self.combine_datetimes()
+        super().save(*args, **kwargs)
+
+    def combine_datetimes(self):
+        """
+        Preenche start_datetime/end_datetime a partir de date + horários.
+        Chamado pelo save() e por caminhos de bulk_create (que não passam pelo save).
+        """
         if self.date and self.start_time:
             self.start_datetime = timezone.make_aware(datetime.combine(self.date, self.start_time))
         if self.date and self.end_time:
@@ -720,7 +1043,6 @@ class LeaderAvailability(models.Model):
                 else self.date
             )
             self.end_datetime = timezone.make_aware(datetime.combine(end_date, self.end_time))
-        super().save(*args, **kwargs)
 
     def __str__(self):
         return f"{self.leader.user.get_full_name()} - {self.date.strftime('%d/%m/%Y')} {self.start_time.strftime('%H:%M')}-{self.end_time.strftime('%H:%M')}"
@@ -755,6 +1077,82 @@ class LeaderAvailability(models.Model):
         return self.get_conflicting_events().exists()
 
 
+class AvailabilityRule(models.Model):
+    """
+    Disponibilidade recorrente (estilo RRULE: FREQ, INTERVAL, BYDAY, UNTIL).
+    Não gera linhas de LeaderAvailability: as ocorrências são expandidas sob
+    demanda, só na janela consultada (agenda/availability_rules.py).
+    """
+
+    FREQUENCY_CHOICES = [
+        ("daily", "Diária"),
+        ("weekly", "Semanal"),
+    ]
+
+    leader = models.ForeignKey(
+        Musician,
+        on_delete=models.CASCADE,
+        related_name="availability_rules",
+        help_text="Músico dono da regra",
+    )
+    organization = models.ForeignKey(
+        Organization,
+        on_delete=models.CASCADE,
+        related_name="availability_rules",
+        null=True,
+        blank=True,
+    )
+    frequency = models.CharField(max_length=10, choices=FREQUENCY_CHOICES, default="weekly")
+    interval = models.PositiveSmallIntegerField(
+        default=1, help_text="Repete a cada N dias/semanas (INTERVAL)"
+    )
+    weekdays = models.PositiveSmallIntegerField(
+        default=0, help_text="Dias da semana (BYDAY) em bits: bit 0 = segunda ... bit 6 = domingo"
+    )
+    start_date = models.DateField(help_text="Primeira data da regra (DTSTART)")
+    until = models.DateField(
+        null=True, blank=True, help_text="Última data (UNTIL); vazio = sem fim"
+    )
+    start_time = models.TimeField(help_text="Hora de início de cada ocorrência")
+    end_time = models.TimeField(help_text="Hora de término (menor que o início = cruza meia-noite)")
+    notes = models.TextField(blank=True, null=True)
+    is_public = models.BooleanField(default=False)
+    is_active = models.BooleanField(default=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ["start_time", "id"]
+        verbose_name = "Regra de disponibilidade"
+        verbose_name_plural = "Regras de disponibilidade"
+        indexes = [
+            models.Index(fields=["leader", "is_active"]),
+            models.Index(fields=["is_active", "start_date"]),
+        ]
+
+    def __str__(self):
+        return f"{self.leader} - {self.get_frequency_display()} {self.start_time}-{self.end_time}"
+
+
+class AvailabilityRuleException(models.Model):
+    """Data em que a regra recorrente não vale (EXDATE)."""
+
+    rule = models.ForeignKey(AvailabilityRule, on_delete=models.CASCADE, related_name="exceptions")
+    date = models.DateField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ["date"]
+        constraints = [
+            models.UniqueConstraint(fields=["rule", "date"], name="unique_availability_rule_date"),
+        ]
+        verbose_name = "Exceção de regra de disponibilidade"
+        verbose_name_plural = "Exceções de regras de disponibilidade"
+
+    def __str__(self):
+        return f"{self.rule_id} sem {self.date}"
+
+
 class EventInstrument(models.Model):
     """
     Instrumentos necessários para um evento.
@@ -1152,6 +1550,9 @@ class QuoteRequest(models.Model):
             models.Index(fields=["status", "created_at"]),
             models.Index(fields=["musician", "status"]),
             models.Index(fields=["contractor", "status"]),
+            # Paginação keyset das listas de pedidos: (created_at, id)
+            models.Index(fields=["musician", "created_at", "id"]),
+            models.Index(fields=["contractor", "created_at", "id"]),
         ]
 
     def __str__(self):
@@ -0,0 +1,244 @@
+# agenda/musician_catalog.py
+"""
+Catálogo público de músicos com facetas (GET /api/musicians/catalog/).
+
+Uma consulta agrupada sobre o conjunto filtrado devolve as combinações
+(instrumento, gêneros, cidade, UF, faixa de avaliação) com a contagem de
+cada uma; dela saem, em Python, o total e as contagens de todas as facetas.
+A página em si é só a lista ordenada de ids (um SELECT id ... LIMIT).
+
+O resultado (total, ids da página e facetas) fica no cache público
+(agenda/public_cache.py, tag "musicians") com chave canônica dos filtros; a
+serialização dos músicos da página é feita por requisição (URLs absolutas
+dependem do host).
+`python manage.py warm_musician_catalog` pré-aquece a primeira página do
+catálogo geral e das cidades com mais músicos (contagens de
+agenda/musician_facets.py).
+"""
+
+from collections import Counter
+from decimal import Decimal, InvalidOperation
+from urllib.parse import urlencode
+
+from django.db import connection
+from django.db.models import Case, Count, IntegerField, Value, When
+
+from .instrument_utils import filter_by_instrument, get_instrument_aliases, get_instrument_label
+from .musician_facets import normalize_city_scope, normalize_state_scope
+from .musician_search import search_musicians, search_terms
+from .public_cache import public_cache
+from .serializers.utils import normalize_genre_value
+
+CATALOG_CACHE_TTLS = {"soft_ttl": 5 * 60, "hard_ttl": 30 * 60}
+CATALOG_CACHE_TAGS = ("musicians",)
+CACHE_KEY_PREFIX = "musicians:catalog:v1"
+DEFAULT_PAGE_SIZE = 24
+MAX_PAGE_SIZE = 100
+MAX_PAGE = 500
+
+# Faixas de avaliação (mesma semântica do filtro min_rating: "a partir de")
+RATING_BUCKETS = (4, 3, 2, 1)
+
+
+def canonical_catalog_params(query_params) -> dict:
+    """
+    Normaliza os filtros aceitos pelo catálogo. Valores equivalentes colapsam
+    na mesma representação (e na mesma chave de cache).
+    """
+    params = {}
+
+    city = normalize_city_scope(query_params.get("city"))
+    if city:
+        params["city"] = city
+    state = normalize_state_scope(query_params.get("state"))
+    if state:
+        params["state"] = state
+
+    instrument = get_instrument_aliases().canonical(query_params.get("instrument") or "")
+    if instrument and instrument != "all":
+        params["instrument"] = instrument
+
+    terms = search_terms(query_params.get("search") or "")
+    if terms:
+        params["search"] = " ".join(terms)
+
+    genre = normalize_genre_value(query_params.get("genre") or "")
+    if genre:
+        params["genre"] = genre
+
+    try:
+        min_rating = Decimal(query_params.get("min_rating") or "0")
+    except InvalidOperation:
+        min_rating = Decimal(0)
+    if 0 < min_rating <= 5:
+        params["min_rating"] = str(min_rating.normalize())
+
+    params["page"] = _bounded_int(query_params.get("page"), 1, 1, MAX_PAGE)
+    params["page_size"] = _bounded_int(
+        query_params.get("page_size") or query_params.get("limit"),
+        DEFAULT_PAGE_SIZE,
+        1,
+        MAX_PAGE_SIZE,
+    )
+    return params
+
+
+def _bounded_int(value, default: int, lower: int, upper: int) -> int:
+    try:
+        number = int(value)
+    except (TypeError, ValueError):
+        return default
+    return max(lower, min(number, upper))
+
+
+def catalog_cache_key(params: dict) -> str:
+    return f"{CACHE_KEY_PREFIX}:{urlencode(sorted(params.items()))}"
+
+
+def filtered_musicians(params: dict):
+    """Músicos ativos que atendem aos filtros (já canônicos)."""
+    from .models import Musician
+
+    queryset = Musician.objects.filter(is_active=True)
+    if "city" in params:
+        queryset = queryset.filter(city__iexact=params["city"])
+    if "state" in params:
+        queryset = queryset.filter(state__iexact=params["state"])
+    if "instrument" in params:
+        queryset = filter_by_instrument(queryset, params["instrument"])
+    if "search" in params:
+        queryset = search_musicians(queryset, params["search"])
+    if "genre" in params:
+        # SQLite não suporta lookup JSONField `contains`; cai para busca textual.
+        if connection.vendor == "sqlite":
+            queryset = queryset.filter(musical_genres__icontains=f'"{params["genre"]}"')
+        else:
+            queryset = queryset.filter(musical_genres__contains=[params["genre"]])
+    if "min_rating" in params:
+        queryset = queryset.filter(average_rating__gte=Decimal(params["min_rating"]))
+    return queryset
+
+
+def _rating_bucket():
+    whens = [
+        When(average_rating__gte=threshold, then=Value(threshold)) for threshold in RATING_BUCKETS
+    ]
+    return Case(
+        When(total_ratings=0, then=Value(0)), *whens, default=Value(0), output_field=IntegerField()
+    )
+
+
+def compute_facets(queryset) -> tuple[int, dict]:
+    """
+    Total e facetas do conjunto filtrado numa única consulta agrupada.
+    Retorna (total, facetas).
+    """
+    rows = (
+        queryset.order_by()
+        .annotate(rating_bucket=_rating_bucket())
+        .values("instrument", "musical_genres", "city", "state", "rating_bucket")
+        .annotate(total=Count("id"))
+    )
+
+    total = 0
+    instruments, genres, cities, states, ratings = (Counter() for _ in range(5))
+    for row in rows:
+        count = row["total"]
+        total += count
+        if row["instrument"]:
+            instruments[row["instrument"]] += count
+        row_genres = row["musical_genres"] if isinstance(row["musical_genres"], list) else []
+        for genre in {normalize_genre_value(g) for g in row_genres if isinstance(g, str)}:
+            if genre:
+                genres[genre] += count
+        city = " ".join((row["city"] or "").split())
+        state = (row["state"] or "").upper()
+        if city:
+            cities[(city, state)] += count
+        if state:
+            states[state] += count
+        ratings[row["rating_bucket"]] += count
+
+    def ranked(counter):
+        return sorted(counter.items(), key=lambda item: (-item[1], item[0]))
+
+    facets = {
+        "instruments": [
+            {"value": value, "label": get_instrument_label(value), "count": count}
+            for value, count in ranked(instruments)
+        ],
+        "genres": [{"value": value, "count": count} for value, count in ranked(genres)],
+        "cities": [
+            {"city": city, "state": state, "count": count}
+            for (city, state), count in ranked(cities)
+        ],
+        "states": [{"value": value, "count": count} for value, count in ranked(states)],
+        # Cumulativo: "4+" inclui todos com média >= 4
+        "ratings": [
+            {
+                "min_rating": threshold,
+                "count": sum(c for bucket, c in ratings.items() if bucket >= threshold),
+            }
+            for threshold in RATING_BUCKETS
+        ],
+    }
+    return total, facets
+
+
+def build_catalog_page(params: dict) -> dict:
+    """Total, ids ordenados da página pedida e facetas (sem cache)."""
+    queryset = filtered_musicians(params)
+    total, facets = compute_facets(queryset)
+
+    ordering = ("-average_rating", "user__first_name", "id")
+    if "search" in params:
+        ordering = ("-search_rank", *ordering)
+    page_size = params["page_size"]
+    offset = (params["page"] - 1) * page_size
+    ids = []
+    if offset < total:
+        ids = list(
+            queryset.order_by(*ordering).values_list("id", flat=True)[offset : offset + page_size]
+        )
+    return {"count": total, "ids": ids, "facets": facets}
+
+
+def get_catalog_page(params: dict, *, refresh: bool = False) -> dict:
+    """
+    build_catalog_page com cache SWR (agenda/public_cache.py), invalidado por
+    qualquer alteração de músico. refresh=True recalcula e regrava.
+    """
+    key = catalog_cache_key(params)
+    if refresh:
+        data = build_catalog_page(params)
+        public_cache.set(key, data, tags=CATALOG_CACHE_TAGS, **CATALOG_CACHE_TTLS)
+        return data
+    return public_cache.get_or_compute(
+        key, lambda: build_catalog_page(params), tags=CATALOG_CACHE_TAGS, **CATALOG_CACHE_TTLS
+    )
+
+
+def warm_catalog(top_cities: int = 20) -> list[dict]:
+    """
+    Recalcula a primeira página do catálogo geral e das `top_cities` cidades
+    com mais músicos ativos. Retorna os filtros aquecidos.
+    """
+    from .musician_facets import city_facet_counts
+
+    targets = [{}]
+    seen = set()
+    for city, state, _ in city_facet_counts():
+        scope = (normalize_city_scope(city), state)
+        if scope in seen:
+            continue
+        seen.add(scope)
+        targets.append({"city": city, "state": state})
+        if len(targets) > top_cities:
+            break
+
+    warmed = []
+    for filters in targets:
+        params = canonical_catalog_params(filters)
+        get_catalog_page(params, refresh=True)
+        warmed.append(params)
+    return warmed
@@ -0,0 +1,191 @@
+# agenda/musician_facets.py
+"""
+Contagens materializadas de facetas do catálogo de músicos.
+
+Cada músico ativo contribui com +1 em MusicianFacetCount para:
+- ("genre", gênero normalizado) por gênero de `musical_genres`;
+- ("instrument", instrumento principal);
+- ("city", cidade como cadastrada).
+sempre no escopo (cidade normalizada, UF) do músico. Somar as linhas de um
+escopo dá a contagem da faceta sem varrer Musician.
+
+Manutenção incremental: Musician.save relê a linha gravada com
+select_for_update e aplica a diferença entre as contribuições dela e as novas
+(F() + linhas criadas sob demanda); a remoção desconta as da linha lida (com
+lock) no pre_delete. Edições simultâneas do mesmo músico aplicam os deltas em
+série. Updates em massa não passam por aí; para corrigir:
+python manage.py rebuild_musician_facets.
+"""
+
+from collections import Counter
+
+from django.db import transaction
+from django.db.models import F, Sum
+
+from .serializers.utils import normalize_genre_value
+
+FACET_GENRE = "genre"
+FACET_INSTRUMENT = "instrument"
+FACET_CITY = "city"
+
+# Campos de Musician que alteram as contribuições
+FACET_SOURCE_FIELDS = ("is_active", "city", "state", "instrument", "musical_genres")
+
+MAX_VALUE_LENGTH = 100
+
+
+def normalize_city_scope(city) -> str:
+    return " ".join(str(city or "").strip().lower().split())[:MAX_VALUE_LENGTH]
+
+
+def normalize_state_scope(state) -> str:
+    return str(state or "").strip().upper()[:2]
+
+
+def locked_facet_snapshot(musician_id) -> dict | None:
+    """
+    Valores gravados de FACET_SOURCE_FIELDS do músico, travando a linha até o fim
+    da transação (None se a linha não existe). Base do delta das contagens.
+    """
+    from .models import Musician
+
+    values = (
+        Musician.objects.select_for_update()
+        .filter(pk=musician_id)
+        .values(*FACET_SOURCE_FIELDS)
+        .first()
+    )
+    return snapshot_from_values(values) if values is not None else None
+
+
+def snapshot_from_values(values: dict) -> dict:
+    snapshot = {field: values.get(field) for field in FACET_SOURCE_FIELDS}
+    # Cópia: a lista da instância pode ser alterada in-place antes do próximo save
+    if isinstance(snapshot["musical_genres"], list):
+        snapshot["musical_genres"] = list(snapshot["musical_genres"])
+    return snapshot
+
+
+def facet_contributions(snapshot) -> Counter:
+    """Linhas (facet, value, city, state) => incremento de um músico."""
+    rows = Counter()
+    if not snapshot or not snapshot["is_active"]:
+        return rows
+
+    scope = (normalize_city_scope(snapshot["city"]), normalize_state_scope(snapshot["state"]))
+    genres = snapshot["musical_genres"] if isinstance(snapshot["musical_genres"], list) else []
+    for genre in {normalize_genre_value(g) for g in genres if isinstance(g, str)}:
+        if genre:
+            rows[(FACET_GENRE, genre[:MAX_VALUE_LENGTH], *scope)] += 1
+
+    instrument = (snapshot["instrument"] or "").strip()
+    if instrument:
+        rows[(FACET_INSTRUMENT, instrument[:MAX_VALUE_LENGTH], *scope)] += 1
+
+    city = " ".join(str(snapshot["city"] or "").split())
+    if city:
+        rows[(FACET_CITY, city[:MAX_VALUE_LENGTH], *scope)] += 1
+    return rows
+
+
+def apply_facet_delta(old_rows: Counter, new_rows: Counter) -> None:
+    """Aplica new_rows - old_rows em MusicianFacetCount."""
+    from .models import MusicianFacetCount
+
+    delta = Counter(new_rows)
+    delta.subtract(old_rows)
+    delta = {key: diff for key, diff in delta.items() if diff}
+    if not delta:
+        return
+
+    def lookup(key):
+        facet, value, city, state = key
+        return {"facet": facet, "value": value, "city": city, "state": state}
+
+    # Ordem fixa das linhas: saves concorrentes travam na mesma sequência (sem deadlock).
+    # Linhas que chegam a 0 ficam (as leituras filtram count > 0): apagá-las aqui
+    # perderia o incremento de um save concorrente que já passou do bulk_create.
+    # Quem limpa é rebuild_facet_counts.
+    keys = sorted(delta)
+    with transaction.atomic():
+        # Cria as linhas que ainda não existem (concorrência resolvida pela unique)
+        MusicianFacetCount.objects.bulk_create(
+            [MusicianFacetCount(**lookup(key), count=0) for key in keys if delta[key] > 0],
+            ignore_conflicts=True,
+        )
+        for key in keys:
+            MusicianFacetCount.objects.filter(**lookup(key)).update(count=F("count") + delta[key])
+
+
+def facet_counts(facet: str, city: str | None = None, state: str | None = None):
+    """
+    Contagens de uma faceta no escopo, como [(value, count)] ordenado por
+    contagem desc e valor.
+    """
+    from .models import MusicianFacetCount
+
+    queryset = MusicianFacetCount.objects.filter(facet=facet, count__gt=0)
+    if city:
+        queryset = queryset.filter(city=normalize_city_scope(city))
+    if state:
+        queryset = queryset.filter(state=normalize_state_scope(state))
+    rows = queryset.values("value").annotate(total=Sum("count")).order_by("-total", "value")
+    return [(row["value"], row["total"]) for row in rows]
+
+
+def city_facet_counts(state: str | None = None):
+    """Cidades com músicos ativos: [(city, state, count)]."""
+    from .models import MusicianFacetCount
+
+    queryset = MusicianFacetCount.objects.filter(facet=FACET_CITY, count__gt=0)
+    if state:
+        queryset = queryset.filter(state=normalize_state_scope(state))
+    rows = (
+        queryset.values("value", "state")
+        .annotate(total=Sum("count"))
+        .order_by("-total", "value", "state")
+    )
+    return [(row["value"], row["state"], row["total"]) for row in rows]
+
+
+def rebuild_facet_counts(*, dry_run: bool = False) -> int:
+    """
+    Recalcula a tabela inteira a partir de Musician. Retorna quantas linhas
+    divergiam (criadas, alteradas ou removidas).
+    """
+    from .models import Musician, MusicianFacetCount
+
+    expected = Counter()
+    for values in (
+        Musician.objects.filter(is_active=True)
+        .values(*FACET_SOURCE_FIELDS)
+        .iterator(chunk_size=1000)
+    ):
+        expected.update(facet_contributions(values))
+
+    current = {
+        (row.facet, row.value, row.city, row.state): row for row in MusicianFacetCount.objects.all()
+    }
+    stale_rows = [row for key, row in current.items() if row.count != expected.get(key, 0)]
+    missing = {key: count for key, count in expected.items() if key not in current}
+    if dry_run:
+        return len(stale_rows) + len(missing)
+
+    with transaction.atomic():
+        for row in stale_rows:
+            row.count = expected.get((row.facet, row.value, row.city, row.state), 0)
+        MusicianFacetCount.objects.bulk_update(
+            [row for row in stale_rows if row.count > 0], ["count"], batch_size=500
+        )
+        # Inclui as linhas zeradas deixadas por apply_facet_delta
+        MusicianFacetCount.objects.filter(
+            pk__in=[row.pk for key, row in current.items() if expected.get(key, 0) <= 0]
+        ).delete()
+        MusicianFacetCount.objects.bulk_create(
+            [
+                MusicianFacetCount(facet=facet, value=value, city=city, state=state, count=count)
+                for (facet, value, city, state), count in missing.items()
+            ],
+            batch_size=500,
+        )
+    return len(stale_rows) + len(missing)
@@ -0,0 +1,162 @@
+# agenda/musician_search.py
+"""
+Busca textual de músicos.
+
+Cada Musician guarda um `search_document` desnormalizado: nome, usuário,
+instagram, bio, instrumentos e gêneros, sem acentos, em minúsculas e com
+qualquer pontuação (inclusive "_") virando espaço. A busca casa cada palavra
+digitada como prefixo de alguma palavra do documento (todas precisam casar)
+e devolve um `search_rank` para ordenar.
+
+Índices:
+- Postgres: GIN sobre to_tsvector('simple', search_document); consulta com
+  to_tsquery prefixada e ts_rank.
+- SQLite (dev/testes): tabela FTS5 `agenda_musician_search` (rowid = id do
+  músico) mantida pelo código; consulta com MATCH e bm25.
+- Outros bancos: AND de icontains sobre o documento, sem rank.
+
+Sincronização: Musician.save recalcula o documento; signals de Musician/User
+(agenda/signals.py) mantêm a FTS5 e propagam mudanças de nome/usuário.
+Para reconstruir tudo (inclusive Musician.instrument_keys):
+python manage.py rebuild_musician_search.
+"""
+
+import re
+import unicodedata
+
+from django.db import connection
+from django.db.models import F, Value
+from django.db.models.expressions import RawSQL
+
+SQLITE_FTS_TABLE = "agenda_musician_search"
+POSTGRES_SEARCH_CONFIG = "simple"
+MAX_SEARCH_TERMS = 8
+
+USER_SEARCH_FIELDS = ("first_name", "last_name", "username")
+MUSICIAN_SEARCH_FIELDS = ("instagram", "bio", "instrument", "instruments", "musical_genres")
+
+_NON_WORD = re.compile(r"[\W_]+")
+
+
+def fold_search_text(value) -> str:
+    """Remove acentos, converte para minúsculas e troca pontuação/_ por espaço."""
+    if not value:
+        return ""
+    text = unicodedata.normalize("NFKD", str(value).lower())
+    text = "".join(c for c in text if not unicodedata.combining(c))
+    return " ".join(_NON_WORD.sub(" ", text).split())
+
+
+def build_search_document(musician, user=None) -> str:
+    """Monta o documento de busca (aceita também instâncias de migrations)."""
+    user = user if user is not None else musician.user
+    parts = [getattr(user, field, "") for field in USER_SEARCH_FIELDS]
+    for field in MUSICIAN_SEARCH_FIELDS:
+        value = getattr(musician, field, None)
+        if isinstance(value, (list, tuple)):
+            parts.extend(value)
+        else:
+            parts.append(value)
+
+    words = []
+    for part in parts:
+        words.extend(fold_search_text(part).split())
+    # Palavras repetidas não mudam o resultado; mantém a primeira ocorrência
+    return " ".join(dict.fromkeys(words))
+
+
+def search_terms(query: str) -> list[str]:
+    """Palavras da busca já normalizadas (no máximo MAX_SEARCH_TERMS)."""
+    return list(dict.fromkeys(fold_search_text(query).split()))[:MAX_SEARCH_TERMS]
+
+
+def search_musicians(queryset, query: str):
+    """
+    Filtra `queryset` (de Musician) pela busca e anota `search_rank`
+    (maior = mais relevante). Não altera a ordenação.
+    """
+    terms = search_terms(query)
+    if not terms:
+        return queryset.annotate(search_rank=Value(0.0))
+
+    vendor = connection.vendor
+    if vendor == "postgresql":
+        from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector
+
+        vector = SearchVector("search_document", config=POSTGRES_SEARCH_CONFIG)
+        tsquery = SearchQuery(
+            " & ".join(f"{term}:*" for term in terms),
+            search_type="raw",
+            config=POSTGRES_SEARCH_CONFIG,
+        )
+        return queryset.annotate(
+            search_vector=vector, search_rank=SearchRank(F("search_vector"), tsquery)
+        ).filter(search_vector=tsquery)
+
+    if vendor == "sqlite":
+        match = " AND ".join(f'"{term}"*' for term in terms)
+        table = queryset.model._meta.db_table
+        # rank do FTS5 é bm25 (menor = melhor); invertido para manter "maior = melhor"
+        rank = RawSQL(
+            f"SELECT -rank FROM {SQLITE_FTS_TABLE} WHERE {SQLITE_FTS_TABLE} MATCH %s "
+            f'AND rowid = "{table}"."id"',
+            (match,),
+        )
+        return queryset.annotate(search_rank=rank).filter(search_rank__isnull=False)
+
+    for term in terms:
+        queryset = queryset.filter(search_document__icontains=term)
+    return queryset.annotate(search_rank=Value(0.0))
+
+
+def index_documents(documents: dict[int, str]) -> None:
+    """Grava {musician_id: documento} no índice FTS5 (no-op fora do SQLite)."""
+    if not documents or connection.vendor != "sqlite":
+        return
+    with connection.cursor() as cursor:
+        cursor.executemany(
+            f"INSERT OR REPLACE INTO {SQLITE_FTS_TABLE}(rowid, document) VALUES (%s, %s)",
+            list(documents.items()),
+        )
+
+
+def unindex_musicians(musician_ids) -> None:
+    """Remove músicos do índice FTS5 (no-op fora do SQLite)."""
+    musician_ids = list(musician_ids)
+    if not musician_ids or connection.vendor != "sqlite":
+        return
+    with connection.cursor() as cursor:
+        cursor.executemany(
+            f"DELETE FROM {SQLITE_FTS_TABLE} WHERE rowid = %s",
+            [(musician_id,) for musician_id in musician_ids],
+        )
+
+
+def refresh_search_documents(queryset, *, reindex: bool = False) -> int:
+    """
+    Recalcula e grava o documento (e as instrument_keys) dos músicos do queryset
+    (bulk_update + índice). Com reindex=True regrava no índice também os
+    documentos que não mudaram. Retorna quantos músicos mudaram.
+    """
+    from .instrument_utils import get_instrument_aliases, musician_instrument_keys
+
+    aliases = get_instrument_aliases()
+    stale = []
+    documents = {}
+    for musician in queryset.select_related("user").iterator(chunk_size=500):
+        document = build_search_document(musician)
+        instrument_keys = musician_instrument_keys(musician, aliases)
+        if document != musician.search_document or instrument_keys != musician.instrument_keys:
+            musician.search_document = document
+            musician.instrument_keys = instrument_keys
+            stale.append(musician)
+            documents[musician.pk] = document
+        elif reindex:
+            documents[musician.pk] = document
+
+    if stale:
+        queryset.model.objects.bulk_update(
+            stale, ["search_document", "instrument_keys"], batch_size=500
+        )
+    index_documents(documents)
+    return len(stale)
@@ -1,7 +1,153 @@
+import base64
+import json
+
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
 from rest_framework.pagination import PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
 
 
 class StandardResultsSetPagination(PageNumberPagination):
     page_size = 20
     page_size_query_param = "page_size"
     max_page_size = 100
+
+
+class KeysetPagination(StandardResultsSetPagination):
+    """
+    Paginação por número de página (padrão) com modo keyset opcional.
+
+    Modo keyset (?pagination=cursor ou ?cursor=...):
+    - filtra a partir da última linha vista usando a chave composta `ordering`
+      (ex.: event_date, id), então páginas profundas custam o mesmo que a primeira
+    - sem COUNT(*), a menos que ?count=true
+    - resposta: {"next", "previous", "results"[, "count"]}
+    """
+
+    ordering = ("-created_at", "-id")
+    cursor_query_param = "cursor"
+    mode_query_param = "pagination"
+    count_query_param = "count"
+    invalid_cursor_message = "Cursor inválido."
+
+    def is_keyset_request(self, request) -> bool:
+        params = request.query_params
+        return self.cursor_query_param in params or params.get(self.mode_query_param) == "cursor"
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.keyset = self.is_keyset_request(request)
+        if not self.keyset:
+            return super().paginate_queryset(queryset, request, view)
+
+        self.request = request
+        self.keyset_page_size = self.get_page_size(request)
+        if not self.keyset_page_size:
+            return None
+
+        fields = [(name.lstrip("-"), name.startswith("-")) for name in self.ordering]
+        model = queryset.model
+        position, reverse = self._decode_cursor(request, model, fields)
+
+        queryset = queryset.order_by(*self.ordering)
+        self.total_count = None
+        if request.query_params.get(self.count_query_param) == "true":
+            self.total_count = queryset.count()
+
+        if reverse:
+            queryset = queryset.reverse()
+        if position is not None:
+            queryset = queryset.filter(self._after(fields, position, reverse))
+
+        rows = list(queryset[: self.keyset_page_size + 1])
+        has_more = len(rows) > self.keyset_page_size
+        rows = rows[: self.keyset_page_size]
+        if reverse:
+            rows.reverse()
+
+        first_page = position is None and not reverse
+        self.has_next = has_more if not reverse else True
+        self.has_previous = (not first_page) if not reverse else has_more
+        self.first_row = rows[0] if rows else None
+        self.last_row = rows[-1] if rows else None
+        self.fields = fields
+        return rows
+
+    # ------------------------------------------------------------------
+    # Cursor
+    # ------------------------------------------------------------------
+    @staticmethod
+    def _after(fields, position, reverse: bool) -> Q:
+        """
+        Filtro "depois de position" na ordem pedida:
+        (a > va) OR (a = va AND b > vb) ..., invertendo o sentido por campo.
+        """
+        condition = Q()
+        for index, (name, descending) in enumerate(fields):
+            forward_desc = descending != reverse
+            step = Q(**{f"{name}__{'lt' if forward_desc else 'gt'}": position[index]})
+            for prev_index in range(index):
+                step &= Q(**{fields[prev_index][0]: position[prev_index]})
+            condition |= step
+        return condition
+
+    def _decode_cursor(self, request, model, fields):
+        raw = request.query_params.get(self.cursor_query_param)
+        if not raw:
+            return None, False
+        try:
+            padded = raw + "=" * (-len(raw) % 4)
+            payload = json.loads(base64.urlsafe_b64decode(padded.encode()).decode())
+            values = payload["v"]
+            if len(values) != len(fields):
+                raise ValueError
+            position = [
+                model._meta.get_field(name).to_python(value)
+                for (name, _desc), value in zip(fields, values)
+            ]
+            return position, bool(payload.get("r"))
+        except Exception:
+            raise NotFound(self.invalid_cursor_message)
+
+    def _encode_cursor(self, row, reverse: bool) -> str:
+        values = []
+        for name, _desc in self.fields:
+            value = getattr(row, name)
+            values.append(value.isoformat() if hasattr(value, "isoformat") else value)
+        payload = {"v": values}
+        if reverse:
+            payload["r"] = 1
+        return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode().rstrip("=")
+
+    def _link(self, row, reverse: bool):
+        url = self.request.build_absolute_uri()
+        url = remove_query_param(url, self.mode_query_param)
+        return replace_query_param(url, self.cursor_query_param, self._encode_cursor(row, reverse))
+
+    def get_next_link(self):
+        if not getattr(self, "keyset", False):
+            return super().get_next_link()
+        if not self.has_next or self.last_row is None:
+            return None
+        return self._link(self.last_row, reverse=False)
+
+    def get_previous_link(self):
+        if not getattr(self, "keyset", False):
+            return super().get_previous_link()
+        if not self.has_previous or self.first_row is None:
+            return None
+        return self._link(self.first_row, reverse=True)
+
+    def get_paginated_response(self, data):
+        if not getattr(self, "keyset", False):
+            return super().get_paginated_response(data)
+
+        payload = {"next": self.get_next_link(), "previous": self.get_previous_link()}
+        if self.total_count is not None:
+            payload["count"] = self.total_count
+        payload["results"] = data
+        return Response(payload)
+
+
+class EventKeysetPagination(KeysetPagination):
+    ordering = ("-event_date", "-id")
@@ -0,0 +1,262 @@
+# agenda/public_cache.py
+"""
+Cache stale-while-revalidate dos endpoints públicos de músicos/patrocinadores.
+
+- TTL suave e TTL rígido: até `soft_ttl` a entrada é servida como fresca;
+  entre `soft_ttl` e `hard_ttl` é servida como está e um único worker a
+  recalcula em segundo plano; depois de `hard_ttl` o cache a descarta.
+- Single-flight: o recálculo (em segundo plano ou num miss) só roda com o
+  lock `cache.add` (SET NX no Redis) da chave. Num miss, quem não pegou o
+  lock espera a entrada aparecer por até `wait_seconds` antes de calcular
+  por conta própria.
+- Invalidação por tags: cada entrada guarda a versão das suas tags
+  ("musicians", "musician:12", "sponsors"...). Os signals de
+  Musician/User/Organization (agenda/signals.py) trocam a versão das tags
+  afetadas; entradas com versão antiga contam como miss (nunca como stale).
+"""
+
+import functools
+import logging
+import threading
+import time as time_module
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+from urllib.parse import urlencode
+
+from django.core.cache import cache
+from django.db import close_old_connections, connections, transaction
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "public:v1"
+
+
+# Só o que define URIs absolutas (host/esquema, inclusive atrás do proxy)
+_REQUEST_META_KEYS = ("SCRIPT_NAME", "SERVER_NAME", "SERVER_PORT", "HTTP_HOST", "wsgi.url_scheme")
+
+
+def _request_environ(request, query: str) -> dict:
+    """Environ WSGI de um GET anônimo com o caminho e os query params da chave."""
+    meta = request.META
+    environ = {key: meta[key] for key in _REQUEST_META_KEYS if key in meta}
+    environ.update(
+        {key: value for key, value in meta.items() if key.startswith("HTTP_X_FORWARDED_")}
+    )
+    environ.update(
+        {
+            "REQUEST_METHOD": "GET",
+            "PATH_INFO": request.path_info,
+            "QUERY_STRING": query,
+        }
+    )
+    return environ
+
+
+def _detached_request(environ: dict):
+    """Requisição nova e independente da original (pode rodar em outra thread)."""
+    from django.core.handlers.wsgi import WSGIRequest
+    from rest_framework.request import Request
+
+    return Request(WSGIRequest({**environ, "wsgi.input": BytesIO()}))
+
+
+def _run_in_background(func) -> None:
+    """Executa `func` no pool de refresh (fora do ciclo da requisição)."""
+    public_cache.executor().submit(func)
+
+
+class PublicCache:
+    """Cache SWR com single-flight e invalidação por tags."""
+
+    lock_seconds = 30
+    wait_seconds = 2.0
+    wait_interval_seconds = 0.05
+    tag_version_ttl_seconds = 60 * 60 * 24 * 7
+    max_background_workers = 2
+
+    def __init__(self):
+        self._executor = None
+        self._executor_lock = threading.Lock()
+
+    # ------------------------------------------------------------------
+    # Chaves e versões de tags
+    # ------------------------------------------------------------------
+    @staticmethod
+    def _entry_key(key: str) -> str:
+        return f"{KEY_PREFIX}:entry:{key}"
+
+    @staticmethod
+    def _lock_key(key: str) -> str:
+        return f"{KEY_PREFIX}:lock:{key}"
+
+    @staticmethod
+    def _tag_key(tag: str) -> str:
+        return f"{KEY_PREFIX}:tag:{tag}"
+
+    def _tag_versions(self, tags) -> dict:
+        """Versões atuais das tags (cria as que faltam)."""
+        keys = {tag: self._tag_key(tag) for tag in tags}
+        stored = cache.get_many(keys.values())
+        missing = {key: uuid.uuid4().hex for key in keys.values() if key not in stored}
+        for key, version in missing.items():
+            cache.add(key, version, timeout=self.tag_version_ttl_seconds)
+        if missing:
+            stored.update(cache.get_many(missing.keys()))
+        return {tag: stored.get(key, "") for tag, key in keys.items()}
+
+    def stamp(self, *tags) -> str:
+        """Carimbo com as versões das tags (muda a cada invalidação de qualquer uma)."""
+        versions = self._tag_versions(tags)
+        return ":".join(versions[tag] for tag in tags)
+
+    # ------------------------------------------------------------------
+    # Leitura/escrita
+    # ------------------------------------------------------------------
+    def get_or_compute(self, key: str, compute, *, tags=(), soft_ttl: int, hard_ttl: int):
+        """
+        Valor da chave: fresco ou stale (com refresh em segundo plano); num
+        miss (ou tag invalidada) calcula com single-flight.
+        """
+        tags = tuple(tags)
+        entry = cache.get(self._entry_key(key))
+        if entry is not None and entry["tags"] == self._tag_versions(tags):
+            if self._now() >= entry["fresh_until"] and self._acquire(key):
+                _run_in_background(
+                    functools.partial(
+                        self._refresh_in_background, key, compute, tags, soft_ttl, hard_ttl
+                    )
+                )
+            return entry["value"]
+
+        if self._acquire(key):
+            try:
+                return self._compute_and_store(key, compute, tags, soft_ttl, hard_ttl)
+            finally:
+                self._release(key)
+
+        # Outro worker está calculando: espera a entrada nova aparecer
+        deadline = time_module.monotonic() + self.wait_seconds
+        while time_module.monotonic() < deadline:
+            self._sleep(self.wait_interval_seconds)
+            entry = cache.get(self._entry_key(key))
+            if entry is not None and entry["tags"] == self._tag_versions(tags):
+                return entry["value"]
+        return self._compute_and_store(key, compute, tags, soft_ttl, hard_ttl)
+
+    def set(self, key: str, value, *, tags=(), soft_ttl: int, hard_ttl: int) -> None:
+        self._store(key, value, self._tag_versions(tuple(tags)), soft_ttl, hard_ttl)
+
+    def _compute_and_store(self, key, compute, tags, soft_ttl, hard_ttl):
+        # Versões lidas antes do cálculo: uma invalidação no meio descarta o resultado
+        versions = self._tag_versions(tags)
+        value = compute()
+        if value is not None:
+            self._store(key, value, versions, soft_ttl, hard_ttl)
+        return value
+
+    def _store(self, key, value, versions, soft_ttl, hard_ttl) -> None:
+        entry = {
+            "value": value,
+            "tags": versions,
+            "fresh_until": self._now() + soft_ttl,
+        }
+        cache.set(self._entry_key(key), entry, timeout=hard_ttl)
+
+    def _refresh_in_background(self, key, compute, tags, soft_ttl, hard_ttl) -> None:
+        close_old_connections()
+        try:
+            self._compute_and_store(key, compute, tags, soft_ttl, hard_ttl)
+        except Exception:
+            logger.exception("Falha ao recalcular cache público %s", key)
+        finally:
+            self._release(key)
+            connections.close_all()
+
+    @staticmethod
+    def _now() -> float:
+        return time_module.time()
+
+    @staticmethod
+    def _sleep(seconds: float) -> None:
+        time_module.sleep(seconds)
+
+    def _acquire(self, key: str) -> bool:
+        return cache.add(self._lock_key(key), 1, timeout=self.lock_seconds)
+
+    def _release(self, key: str) -> None:
+        cache.delete(self._lock_key(key))
+
+    def executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            with self._executor_lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=self.max_background_workers,
+                        thread_name_prefix="public-cache",
+                    )
+        return self._executor
+
+    # ------------------------------------------------------------------
+    # Invalidação
+    # ------------------------------------------------------------------
+    def invalidate(self, *tags) -> None:
+        """Troca a versão das tags (entradas que as usam viram miss)."""
+        tags = {tag for tag in tags if tag}
+        if not tags:
+            return
+        self._bump(tags)
+        if transaction.get_connection().in_atomic_block:
+            # Troca de novo após o commit: leitores concorrentes podem ter
+            # cacheado o estado anterior com a versão nova
+            transaction.on_commit(lambda: self._bump(tags))
+
+    def _bump(self, tags: set) -> None:
+        cache.set_many(
+            {self._tag_key(tag): uuid.uuid4().hex for tag in tags},
+            timeout=self.tag_version_ttl_seconds,
+        )
+
+    # ------------------------------------------------------------------
+    # Decorator de views
+    # ------------------------------------------------------------------
+    def cached_view(self, name: str, *, soft_ttl: int, hard_ttl: int, tags):
+        """
+        Decorator para views funcionais GET públicas. `tags` recebe
+        (request, **kwargs) e devolve as tags da resposta. Só respostas 200
+        são cacheadas; a chave é o nome + kwargs da URL + query params.
+
+        A view roda sobre uma requisição nova e anônima montada só com essas
+        entradas (e host/esquema): a original já pode ter sido respondida
+        quando o refresh roda em segundo plano, e o resultado é compartilhado.
+        """
+
+        def decorator(view):
+            @functools.wraps(view)
+            def wrapper(request, *args, **kwargs):
+                from rest_framework.response import Response
+
+                params = urlencode(sorted(request.query_params.items()))
+                url_kwargs = ":".join(f"{k}={v}" for k, v in sorted(kwargs.items()))
+                key = f"{name}:{url_kwargs}:{params}"
+                environ = _request_environ(request, params)
+                responses = {}
+
+                def compute():
+                    response = view(_detached_request(environ), *args, **kwargs)
+                    responses["response"] = response
+                    return response.data if response.status_code == 200 else None
+
+                data = self.get_or_compute(
+                    key, compute, tags=tags(request, **kwargs), soft_ttl=soft_ttl, hard_ttl=hard_ttl
+                )
+                if data is None:
+                    return responses["response"]
+                return Response(data)
+
+            return wrapper
+
+        return decorator
+
+
+public_cache = PublicCache()
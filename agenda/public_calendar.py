@@ -0,0 +1,165 @@
+# agenda/public_calendar.py
+"""
+Agenda pública do músico (GET /api/musicians/{id}/public-calendar/).
+
+Visitantes (quem não é o dono) leem um snapshot já serializado com os
+eventos visíveis e as disponibilidades públicas do músico:
+
+- O snapshot cobre a janela máxima aceita pelo endpoint (365 dias para trás
+  e para frente a partir do dia em que foi montado). Cada requisição só
+  recorta os itens da janela pedida, sem consultar o banco.
+- Fica no cache público (agenda/public_cache.py). A chave inclui o dia e a
+  versão da listagem de eventos do usuário do músico, que os signals de
+  Event/Availability trocam para o criador e os participantes. As tags são
+  musician:<id> (perfil) e calendar:<id> (signals de LeaderAvailability e
+  das regras recorrentes, que entram expandidas na janela do snapshot).
+  Uma alteração só remonta, na próxima leitura, os snapshots dos músicos
+  que ela toca.
+- Conflitos das disponibilidades com eventos de outros membros da
+  organização não trocam versões; o TTL suave limita esse atraso.
+
+O dono continua com a consulta ao vivo (inclui propostas e, com
+include_private=true, as disponibilidades privadas).
+"""
+
+from datetime import timedelta
+
+from django.db.models import Q
+
+from .availability_rules import iter_rule_slots, merge_slots
+from .events_list_cache import events_list_cache
+from .public_cache import public_cache
+
+MAX_DAYS_BACK = 365
+MAX_DAYS_AHEAD = 365
+SNAPSHOT_CACHE_TTLS = {"soft_ttl": 10 * 60, "hard_ttl": 24 * 60 * 60}
+VISITOR_EVENT_STATUSES = ("confirmed", "approved")
+PRIVATE_EVENT_STATUSES = ("proposed", "confirmed", "approved")
+
+
+def calendar_tags(musician_id: int) -> tuple[str, str]:
+    """Tags do cache público que versionam a agenda do músico."""
+    return (f"musician:{musician_id}", f"calendar:{musician_id}")
+
+
+def is_visible_to_visitors(event) -> bool:
+    """Mesma regra do filtro de visitantes de calendar_events, para um evento já carregado."""
+    if event.is_private:
+        return event.status in PRIVATE_EVENT_STATUSES
+    return event.status in VISITOR_EVENT_STATUSES
+
+
+def calendar_events(musician, start_date, end_date, *, is_owner: bool):
+    """Eventos do músico (criados ou como convidado) na janela, ordenados."""
+    from .models import Availability, Event
+
+    # Subquery para não perder eventos por JOIN em availabilities
+    availability_event_ids = Availability.objects.filter(
+        musician=musician,
+        event__event_date__gte=start_date,
+        event__event_date__lte=end_date,
+    ).values("event_id")
+
+    queryset = Event.objects.filter(event_date__gte=start_date, event_date__lte=end_date).filter(
+        Q(created_by_id=musician.user_id) | Q(id__in=availability_event_ids)
+    )
+
+    # Visitantes só veem confirmados/aprovados (privados aparecem como bloqueio)
+    if not is_owner:
+        queryset = queryset.filter(
+            Q(status__in=VISITOR_EVENT_STATUSES)
+            | Q(is_private=True, status__in=PRIVATE_EVENT_STATUSES)
+        )
+
+    # Contagens de disponibilidade são colunas desnormalizadas de Event
+    return queryset.order_by("event_date", "start_time")
+
+
+def calendar_availabilities(musician, today, end_date, *, public_only: bool):
+    """Disponibilidades ativas do músico de hoje até end_date, ordenadas."""
+    from .models import LeaderAvailability
+
+    queryset = LeaderAvailability.objects.filter(
+        leader=musician,
+        is_active=True,
+        date__gte=today,
+        date__lte=end_date,
+    ).order_by("date", "start_time")
+    if public_only:
+        queryset = queryset.filter(is_public=True)
+    return queryset
+
+
+def calendar_rule_slots(musician, today, end_date, *, public_only: bool):
+    """Ocorrências das regras recorrentes do músico de hoje até end_date (gerador)."""
+    from .models import AvailabilityRule
+
+    rules = AvailabilityRule.objects.filter(leader=musician)
+    if public_only:
+        rules = rules.filter(is_public=True)
+    return iter_rule_slots(rules, today, end_date)
+
+
+def calendar_slots(musician, today, end_date, *, public_only: bool):
+    """Disponibilidades avulsas e ocorrências das regras, intercaladas por data/horário."""
+    availabilities = calendar_availabilities(
+        musician, today, end_date, public_only=public_only
+    ).select_related("leader__user", "organization")
+    return merge_slots(
+        availabilities, calendar_rule_slots(musician, today, end_date, public_only=public_only)
+    )
+
+
+def build_snapshot(musician, today) -> dict:
+    """Visão de visitante da janela máxima, já serializada (sem cache)."""
+    from .serializers import LeaderAvailabilitySerializer, PublicCalendarEventSerializer
+
+    events = calendar_events(
+        musician,
+        today - timedelta(days=MAX_DAYS_BACK),
+        today + timedelta(days=MAX_DAYS_AHEAD),
+        is_owner=False,
+    )
+    availabilities = calendar_slots(
+        musician, today, today + timedelta(days=MAX_DAYS_AHEAD), public_only=True
+    )
+
+    # Sem request: a URL do avatar é absolutizada na leitura (depende do host)
+    return {
+        "events": list(PublicCalendarEventSerializer(events, many=True).data),
+        "availabilities": list(LeaderAvailabilitySerializer(availabilities, many=True).data),
+    }
+
+
+def get_snapshot(musician, today) -> dict:
+    """build_snapshot via cache público (chave com a versão dos eventos e o dia)."""
+    version = events_list_cache.version(musician.user_id)
+    key = f"calendar:snapshot:{musician.id}:{version}:{today.isoformat()}"
+    return public_cache.get_or_compute(
+        key,
+        lambda: build_snapshot(musician, today),
+        tags=calendar_tags(musician.id),
+        **SNAPSHOT_CACHE_TTLS,
+    )
+
+
+def visitor_calendar(snapshot: dict, request, *, start_date, end_date, days_ahead: int) -> dict:
+    """Recorta o snapshot na janela pedida (mesmo formato de PublicCalendarSerializer)."""
+    start, end = start_date.isoformat(), end_date.isoformat()
+    availabilities = []
+    for item in snapshot["availabilities"]:
+        if item["date"] > end:
+            break
+        if item["leader_avatar_url"]:
+            item = {
+                **item,
+                "leader_avatar_url": request.build_absolute_uri(item["leader_avatar_url"]),
+            }
+        availabilities.append(item)
+
+    return {
+        "events": [item for item in snapshot["events"] if start <= item["event_date"] <= end],
+        "availabilities": availabilities,
+        "is_owner": False,
+        "days_ahead": days_ahead,
+    }
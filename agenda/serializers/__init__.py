@@ -20,7 +20,11 @@ from .admin import (
     OrganizationSerializer,
     PremiumPortalItemSerializer,
 )
-from .availability import AvailabilitySerializer, LeaderAvailabilitySerializer
+from .availability import (
+    AvailabilityRuleSerializer,
+    AvailabilitySerializer,
+    LeaderAvailabilitySerializer,
+)
 from .connections import (
     ConnectionSerializer,
     MusicianBadgeSerializer,
@@ -61,6 +65,7 @@ __all__ = [
     "MusicianPublicSerializer",
     # availability
     "AvailabilitySerializer",
+    "AvailabilityRuleSerializer",
     "LeaderAvailabilitySerializer",
     # events
     "EventListSerializer",
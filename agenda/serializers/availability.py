@@ -1,6 +1,7 @@
 from rest_framework import serializers
 
-from ..models import Availability, LeaderAvailability, Musician
+from ..availability_rules import mask_to_weekdays, weekdays_to_mask
+from ..models import Availability, AvailabilityRule, LeaderAvailability, Musician
 from ..validators import sanitize_string
 from .musician import MusicianSerializer
 
@@ -54,6 +55,7 @@ class LeaderAvailabilitySerializer(serializers.ModelSerializer):
     leader_avatar_url = serializers.SerializerMethodField()
     has_conflicts = serializers.SerializerMethodField()
     conflicting_events_count = serializers.SerializerMethodField()
+    rule_id = serializers.SerializerMethodField()
 
     class Meta:
         model = LeaderAvailability
@@ -74,6 +76,7 @@ class LeaderAvailabilitySerializer(serializers.ModelSerializer):
             "is_public",
             "has_conflicts",
             "conflicting_events_count",
+            "rule_id",
             "created_at",
             "updated_at",
         ]
@@ -152,6 +155,10 @@ class LeaderAvailabilitySerializer(serializers.ModelSerializer):
             obj._cached_conflicts_count = obj.get_conflicting_events().count()
         return obj._cached_conflicts_count
 
+    def get_rule_id(self, obj) -> int | None:
+        """Regra recorrente que gerou a ocorrência (None para disponibilidades avulsas)."""
+        return getattr(obj, "availability_rule_id", None)
+
     def validate(self, data):
         """Validações customizadas"""
         errors = {}
@@ -183,3 +190,79 @@ class LeaderAvailabilitySerializer(serializers.ModelSerializer):
             raise serializers.ValidationError(errors)
 
         return data
+
+
+class WeekdaysField(serializers.ListField):
+    """Lista de dias da semana na API (0 = segunda ... 6 = domingo), bitmask no modelo"""
+
+    child = serializers.IntegerField(min_value=0, max_value=6)
+
+    def to_internal_value(self, data):
+        return weekdays_to_mask(super().to_internal_value(data))
+
+    def to_representation(self, value):
+        return mask_to_weekdays(value)
+
+
+class AvailabilityRuleSerializer(serializers.ModelSerializer):
+    """Serializer das disponibilidades recorrentes"""
+
+    weekdays = WeekdaysField(required=False)
+    exception_dates = serializers.SerializerMethodField()
+
+    class Meta:
+        model = AvailabilityRule
+        fields = [
+            "id",
+            "leader",
+            "frequency",
+            "interval",
+            "weekdays",
+            "start_date",
+            "until",
+            "start_time",
+            "end_time",
+            "notes",
+            "is_public",
+            "is_active",
+            "exception_dates",
+            "created_at",
+            "updated_at",
+        ]
+        read_only_fields = ["id", "leader", "created_at", "updated_at"]
+
+    def get_exception_dates(self, obj) -> list[str]:
+        return [exception.date.isoformat() for exception in obj.exceptions.all()]
+
+    def validate(self, data):
+        """Validações customizadas"""
+        errors = {}
+
+        def current(field):
+            if field in data:
+                return data[field]
+            return getattr(self.instance, field, None)
+
+        start_time, end_time = current("start_time"), current("end_time")
+        if start_time and end_time and end_time == start_time:
+            errors["end_time"] = "Horário de término deve ser posterior ao início."
+
+        start_date, until = current("start_date"), current("until")
+        if start_date and until and until < start_date:
+            errors["until"] = "A data final deve ser igual ou posterior à data inicial."
+
+        if "interval" in data and data["interval"] < 1:
+            errors["interval"] = "O intervalo deve ser de pelo menos 1."
+
+        if "notes" in data:
+            try:
+                data["notes"] = sanitize_string(
+                    data.get("notes"), max_length=1000, allow_empty=True
+                )
+            except serializers.ValidationError as e:
+                errors["notes"] = str(e.detail[0])
+
+        if errors:
+            raise serializers.ValidationError(errors)
+
+        return data
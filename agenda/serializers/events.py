@@ -1,13 +1,20 @@
 from datetime import datetime
 from typing import Any
 
+from django.db.models import F, Prefetch
 from django.utils import timezone
 from rest_framework import serializers
 
-from ..models import Event, EventInstrument, EventLog, Musician, MusicianRating
+from ..models import Availability, Event, EventInstrument, EventLog, Musician, MusicianRating
 from ..validators import sanitize_string, validate_not_empty_string
 from .availability import AvailabilitySerializer, LeaderAvailabilitySerializer
 
+# Último convidado que aceitou: respostas mais recentes primeiro, depois ordem alfabética
+LATEST_AVAILABLE_ORDERING = (
+    F("responded_at").desc(nulls_last=True),
+    "musician__user__first_name",
+)
+
 
 class EventListSerializer(serializers.ModelSerializer):
     """Serializer simplificado para listagem de eventos"""
@@ -40,6 +47,22 @@ class EventListSerializer(serializers.ModelSerializer):
             "created_by",
         ]
 
+    @staticmethod
+    def setup_eager_loading(queryset):
+        """
+        Relações usadas pela serialização, em número constante de queries:
+        criador/aprovador via JOIN e o último convidado que aceitou (usado no
+        approval_label quando approved_by está vazio) via Prefetch fatiado.
+        """
+        latest_available = (
+            Availability.objects.filter(response="available")
+            .select_related("musician__user")
+            .order_by(*LATEST_AVAILABLE_ORDERING)
+        )
+        return queryset.select_related("created_by", "approved_by").prefetch_related(
+            Prefetch("availabilities", queryset=latest_available[:1], to_attr="latest_available")
+        )
+
     def get_created_by_name(self, obj) -> str:
         return obj.created_by.get_full_name() if obj.created_by else "Sistema"
 
@@ -54,17 +77,14 @@ class EventListSerializer(serializers.ModelSerializer):
                 name = obj.approved_by.get_full_name() or obj.approved_by.username
                 return f"Confirmado por {name}"
 
-            # Busca o último músico que aceitou
-            last_available = (
-                obj.availabilities.filter(response="available", responded_at__isnull=False)
-                .order_by("-responded_at")
-                .first()
-            )
-
-            if not last_available:
+            # Busca o último músico que aceitou (pré-carregado por setup_eager_loading)
+            if hasattr(obj, "latest_available"):
+                last_available = obj.latest_available[0] if obj.latest_available else None
+            else:
                 last_available = (
                     obj.availabilities.filter(response="available")
                     .select_related("musician__user")
+                    .order_by(*LATEST_AVAILABLE_ORDERING)
                     .first()
                 )
 
@@ -80,33 +100,8 @@ class EventListSerializer(serializers.ModelSerializer):
         return obj.get_status_display()
 
     def get_availability_summary(self, obj) -> dict[str, int]:
-        """
-        Retorna resumo das disponibilidades.
-        Usa valores pré-anotados se disponíveis (otimização N+1),
-        caso contrário calcula com uma única iteração.
-        """
-        # Verifica se os valores foram pré-anotados no queryset
-        if hasattr(obj, "avail_pending"):
-            return {
-                "pending": obj.avail_pending or 0,
-                "available": obj.avail_available or 0,
-                "unavailable": obj.avail_unavailable or 0,
-                "total": obj.avail_total or 0,
-            }
-
-        # Fallback: calcula com uma única iteração (evita 5 queries)
-        summary = {
-            "pending": 0,
-            "available": 0,
-            "unavailable": 0,
-            "total": 0,
-        }
-        for availability in obj.availabilities.all():
-            response = availability.response
-            if response in summary:
-                summary[response] += 1
-            summary["total"] += 1
-        return summary
+        """Resumo das disponibilidades (contadores desnormalizados em Event)."""
+        return obj.availability_summary
 
 
 class EventLogSerializer(serializers.ModelSerializer):
@@ -236,17 +231,14 @@ class EventDetailSerializer(serializers.ModelSerializer):
                 name = obj.approved_by.get_full_name() or obj.approved_by.username
                 return f"Confirmado por {name}"
 
-            # Busca o último músico que aceitou
-            last_available = (
-                obj.availabilities.filter(response="available", responded_at__isnull=False)
-                .order_by("-responded_at")
-                .first()
-            )
-
-            if not last_available:
+            # Busca o último músico que aceitou (pré-carregado por setup_eager_loading)
+            if hasattr(obj, "latest_available"):
+                last_available = obj.latest_available[0] if obj.latest_available else None
+            else:
                 last_available = (
                     obj.availabilities.filter(response="available")
                     .select_related("musician__user")
+                    .order_by(*LATEST_AVAILABLE_ORDERING)
                     .first()
                 )
 
@@ -600,33 +592,9 @@ class OwnerCalendarEventSerializer(serializers.ModelSerializer):
             "updated_at",
         ]
 
-    def get_availability_summary(self, obj):
-        """
-        Retorna resumo das disponibilidades.
-        Calcula apenas uma vez (otimização N+1).
-        """
-        # Verifica se foi pré-anotado no queryset
-        if hasattr(obj, "avail_pending"):
-            return {
-                "pending": obj.avail_pending or 0,
-                "available": obj.avail_available or 0,
-                "unavailable": obj.avail_unavailable or 0,
-                "total": obj.avail_total or 0,
-            }
-
-        # Fallback: calcula com uma única iteração
-        summary = {
-            "pending": 0,
-            "available": 0,
-            "unavailable": 0,
-            "total": 0,
-        }
-        for availability in obj.availabilities.all():
-            response = availability.response
-            if response in summary:
-                summary[response] += 1
-            summary["total"] += 1
-        return summary
+    def get_availability_summary(self, obj) -> dict[str, int]:
+        """Resumo das disponibilidades (contadores desnormalizados em Event)."""
+        return obj.availability_summary
 
 
 class PublicCalendarSerializer(serializers.Serializer):
@@ -4,9 +4,10 @@ import logging
 
 from django.conf import settings
 from django.core.mail import EmailMessage, send_mail
-from django.template.loader import render_to_string
 from django.utils.html import strip_tags
 
+from notifications.services.email_service import get_email_template
+
 logger = logging.getLogger(__name__)
 
 
@@ -51,8 +52,7 @@ class EmailService:
             subject = "⭐ Nova Solicitação de Acesso - GigFlow"
 
             # Renderizar template HTML
-            html_message = render_to_string(
-                "emails/new_request_admin.html",
+            html_message = get_email_template("emails/new_request_admin.html").render(
                 {
                     "musician_request": musician_request,
                     "frontend_url": getattr(settings, "FRONTEND_URL", "http://localhost:5173"),
@@ -89,8 +89,7 @@ class EmailService:
         try:
             subject = "🎉 Seu Acesso ao GigFlow foi Aprovado!"
 
-            html_message = render_to_string(
-                "emails/request_approved.html",
+            html_message = get_email_template("emails/request_approved.html").render(
                 {
                     "musician_request": musician_request,
                     "credentials": credentials,
@@ -125,8 +124,7 @@ class EmailService:
         try:
             subject = "💬 Sobre sua solicitação de acesso ao GigFlow"
 
-            html_message = render_to_string(
-                "emails/request_rejected.html",
+            html_message = get_email_template("emails/request_rejected.html").render(
                 {
                     "musician_request": musician_request,
                     "rejection_reason": rejection_reason
@@ -163,8 +161,7 @@ class EmailService:
             subject = "🎉 Bem-vindo ao GigFlow!"
             template = "emails/welcome_musician.html"
 
-            html_message = render_to_string(
-                template,
+            html_message = get_email_template(template).render(
                 {
                     "user": user,
                     "frontend_url": getattr(settings, "FRONTEND_URL", "http://localhost:5173"),
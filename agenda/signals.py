@@ -0,0 +1,228 @@
+# agenda/signals.py
+"""
+Signals internos do app agenda (sincronização de índices/caches derivados).
+Notificações ficam em notifications/signals.py.
+"""
+
+from collections import Counter
+
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_delete
+from django.dispatch import receiver
+from django.utils import timezone
+
+from . import availability_slots, musician_facets, musician_search
+from .conflict_index import conflict_index
+from .events_list_cache import events_list_cache
+from .instrument_utils import rekey_musicians_for_instruments, reset_instrument_aliases
+from .models import (
+    Availability,
+    AvailabilityRule,
+    AvailabilityRuleException,
+    Event,
+    Instrument,
+    LeaderAvailability,
+    Musician,
+    Organization,
+    event_status_changed,
+)
+from .public_cache import public_cache
+
+
+def _availability_user_id(availability):
+    if Availability.musician.is_cached(availability):
+        return availability.musician.user_id
+    return (
+        Musician.objects.filter(pk=availability.musician_id)
+        .values_list("user_id", flat=True)
+        .first()
+    )
+
+
+@receiver(post_save, sender=Event)
+@receiver(event_status_changed, sender=Event)
+def sync_on_event_save(sender, instance, **kwargs):
+    """Evento criado/alterado: invalida criador, participantes e organização."""
+    user_ids = {instance.created_by_id}
+    user_ids.update(instance.availabilities.values_list("musician__user_id", flat=True))
+    conflict_index.invalidate(user_ids=user_ids, organization_ids=[instance.organization_id])
+    events_list_cache.invalidate(user_ids=user_ids)
+
+
+@receiver(post_delete, sender=Event)
+def sync_on_event_delete(sender, instance, **kwargs):
+    """Participantes já foram invalidados pelo delete em cascata das availabilities."""
+    conflict_index.invalidate(
+        user_ids=[instance.created_by_id], organization_ids=[instance.organization_id]
+    )
+    events_list_cache.invalidate(user_ids=[instance.created_by_id])
+
+
+@receiver(post_save, sender=Availability)
+def sync_on_availability_save(sender, instance, created, **kwargs):
+    """
+    Novo convite adiciona o evento ao escopo do músico (a resposta não importa
+    para conflitos). Qualquer resposta altera contadores e visibilidade na
+    listagem de todos os participantes.
+    """
+    if created:
+        user_id = _availability_user_id(instance)
+        conflict_index.invalidate(user_ids=[user_id])
+        events_list_cache.invalidate(user_ids=[user_id], event_ids=[instance.event_id])
+    else:
+        events_list_cache.invalidate(event_ids=[instance.event_id])
+
+
+@receiver(post_delete, sender=Availability)
+def sync_on_availability_delete(sender, instance, **kwargs):
+    user_id = _availability_user_id(instance)
+    conflict_index.invalidate(user_ids=[user_id])
+    # Em deletes em cascata do evento cada availability cobre o próprio músico
+    events_list_cache.invalidate(user_ids=[user_id], event_ids=[instance.event_id])
+
+
+@receiver(post_delete, sender=Availability)
+def update_event_counters_on_availability_delete(sender, instance, **kwargs):
+    """Remoções (inclusive em cascata) descontam dos contadores do evento."""
+    response = getattr(instance, "_persisted_response", None) or instance.response
+    Event.apply_availability_change(instance.event_id, response, None)
+
+
+@receiver(post_save, sender=Musician)
+def sync_search_index_on_musician_save(sender, instance, update_fields=None, **kwargs):
+    """Musician.save já recalculou o documento; só espelha no índice FTS5 (SQLite)."""
+    if update_fields is not None and "search_document" not in update_fields:
+        return  # ex.: só contadores/avaliação
+    musician_search.index_documents({instance.pk: instance.search_document})
+
+
+@receiver(post_delete, sender=Musician)
+def sync_search_index_on_musician_delete(sender, instance, **kwargs):
+    musician_search.unindex_musicians([instance.pk])
+
+
+@receiver(pre_delete, sender=Musician)
+def lock_facets_on_musician_delete(sender, instance, **kwargs):
+    """Lê (com lock, na transação do delete) os valores que a remoção vai descontar."""
+    instance._persisted_facets = musician_facets.locked_facet_snapshot(instance.pk)
+
+
+@receiver(post_delete, sender=Musician)
+def update_facet_counts_on_musician_delete(sender, instance, **kwargs):
+    """Remoções (inclusive em cascata do User) descontam das contagens de facetas."""
+    persisted = getattr(instance, "_persisted_facets", None)
+    musician_facets.apply_facet_delta(musician_facets.facet_contributions(persisted), Counter())
+
+
+@receiver(post_save, sender=User)
+def sync_search_index_on_user_save(sender, instance, created, update_fields=None, **kwargs):
+    """Nome/usuário fazem parte do documento de busca do músico."""
+    if created:
+        return
+    if update_fields is not None and not set(update_fields) & set(
+        musician_search.USER_SEARCH_FIELDS
+    ):
+        return  # ex.: login atualizando só last_login
+    musician_search.refresh_search_documents(Musician.objects.filter(user=instance))
+
+
+@receiver(post_save, sender=Musician)
+@receiver(post_delete, sender=Musician)
+def invalidate_public_cache_on_musician_change(sender, instance, **kwargs):
+    """Perfil público do músico e listagens/catálogo públicos."""
+    public_cache.invalidate("musicians", f"musician:{instance.pk}")
+
+
+@receiver(post_save, sender=User)
+def invalidate_public_cache_on_user_save(sender, instance, created, update_fields=None, **kwargs):
+    """Nome/usuário aparecem nos payloads públicos do músico."""
+    if created:
+        return
+    if update_fields is not None and not set(update_fields) & set(
+        musician_search.USER_SEARCH_FIELDS
+    ):
+        return  # ex.: login atualizando só last_login
+    musician_ids = list(Musician.objects.filter(user=instance).values_list("id", flat=True))
+    if musician_ids:
+        public_cache.invalidate("musicians", *(f"musician:{pk}" for pk in musician_ids))
+
+
+@receiver(post_save, sender=Organization)
+@receiver(post_delete, sender=Organization)
+def invalidate_public_cache_on_organization_change(sender, instance, **kwargs):
+    public_cache.invalidate("sponsors")
+
+
+@receiver(post_save, sender=LeaderAvailability)
+@receiver(post_delete, sender=LeaderAvailability)
+def sync_day_slots_on_leader_availability_change(sender, instance, **kwargs):
+    """Bitmap do dia (antigo e novo) e agenda pública do músico."""
+    scopes = {(instance.leader_id, instance.date)}
+    persisted = getattr(instance, "_persisted_day_scope", None)
+    if persisted:
+        scopes.add(persisted)
+    availability_slots.availability_days_changed(scopes)
+    instance._persisted_day_scope = (instance.leader_id, instance.date)
+
+
+@receiver(post_save, sender=AvailabilityRule)
+@receiver(post_delete, sender=AvailabilityRule)
+@receiver(post_save, sender=AvailabilityRuleException)
+@receiver(post_delete, sender=AvailabilityRuleException)
+def invalidate_public_calendar_on_availability_rule_change(sender, instance, **kwargs):
+    """Regras recorrentes são expandidas na agenda pública (snapshot e ETag)."""
+    if sender is AvailabilityRule:
+        leader_id = instance.leader_id
+    else:
+        # Na remoção em cascata a regra já pode ter saído (o signal dela invalida)
+        leader_id = (
+            AvailabilityRule.objects.filter(pk=instance.rule_id)
+            .values_list("leader_id", flat=True)
+            .first()
+        )
+    if leader_id:
+        public_cache.invalidate(f"calendar:{leader_id}")
+
+
+@receiver(post_delete, sender=Event)
+@receiver(post_delete, sender=Availability)
+@receiver(post_delete, sender=LeaderAvailability)
+def mark_calendar_reset_on_delete(sender, instance, **kwargs):
+    """
+    Remoções não deixam rastro para o sync token do feed ICS
+    (agenda/calendar_feed.py): tokens anteriores passam a receber o feed completo.
+    """
+    if sender is Event:
+        musicians = Musician.objects.filter(user_id=instance.created_by_id)
+    elif sender is Availability:
+        musicians = Musician.objects.filter(pk=instance.musician_id)
+    else:
+        musicians = Musician.objects.filter(pk=instance.leader_id)
+    # update() direto: não é alteração de perfil (sem signals de Musician)
+    musicians.update(calendar_reset_at=timezone.now())
+
+
+@receiver(post_save, sender=Instrument)
+def reset_aliases_on_instrument_save(sender, instance, update_fields=None, **kwargs):
+    """
+    Nomes novos/alterados mudam o mapa de aliases (deste e, após o commit, dos
+    demais processos); os músicos afetados são re-chaveados após o commit.
+    """
+    if update_fields is not None and set(update_fields) <= {"usage_count"}:
+        return
+    terms = {instance.name, instance.display_name}
+    terms.update(getattr(instance, "_persisted_alias_terms", ()))
+    instance._persisted_alias_terms = (instance.name, instance.display_name)
+    _instrument_aliases_changed(terms)
+
+
+@receiver(post_delete, sender=Instrument)
+def reset_aliases_on_instrument_delete(sender, instance, **kwargs):
+    _instrument_aliases_changed({instance.name, instance.display_name})
+
+
+def _instrument_aliases_changed(terms):
+    reset_instrument_aliases()
+    # Registrado depois do bump de versão: re-chaveia já com o mapa novo
+    transaction.on_commit(lambda: rekey_musicians_for_instruments(terms))
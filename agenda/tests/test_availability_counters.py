@@ -0,0 +1,115 @@
+# agenda/tests/test_availability_counters.py
+"""
+Testes dos contadores desnormalizados de Availability em Event.
+"""
+
+from datetime import date, time, timedelta
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from agenda.models import Availability, Event, Musician
+
+
+class AvailabilityCountersTest(APITestCase):
+    def setUp(self):
+        self.creator = User.objects.create_user(
+            username="sara", email="sara@test.com", password="senha123"
+        )
+        Musician.objects.create(user=self.creator, instrument="vocal", role="member")
+        self.guests = []
+        for i in range(3):
+            user = User.objects.create_user(
+                username=f"convidado{i}", email=f"convidado{i}@test.com", password="senha123"
+            )
+            self.guests.append(Musician.objects.create(user=user, instrument="drums"))
+        self.event = Event.objects.create(
+            title="Show",
+            location="Bar",
+            event_date=date.today() + timedelta(days=4),
+            start_time=time(20, 0),
+            end_time=time(22, 0),
+            created_by=self.creator,
+            status="proposed",
+        )
+
+    def _summary(self):
+        self.event.refresh_from_db()
+        return self.event.availability_summary
+
+    def test_create_update_delete_keep_counters(self):
+        first = Availability.objects.create(musician=self.guests[0], event=self.event)
+        Availability.objects.create(musician=self.guests[1], event=self.event)
+        self.assertEqual(
+            self._summary(), {"pending": 2, "available": 0, "unavailable": 0, "total": 2}
+        )
+
+        first.response = "available"
+        first.save()
+        self.assertEqual(
+            self._summary(), {"pending": 1, "available": 1, "unavailable": 0, "total": 2}
+        )
+
+        Availability.objects.get(pk=first.pk).delete()
+        self.assertEqual(
+            self._summary(), {"pending": 1, "available": 0, "unavailable": 0, "total": 1}
+        )
+
+    def test_stale_event_save_does_not_overwrite_counters(self):
+        stale = Event.objects.get(pk=self.event.pk)
+        Availability.objects.create(musician=self.guests[0], event=self.event)
+
+        stale.title = "Show renomeado"
+        stale.save()
+
+        self.assertEqual(self._summary()["total"], 1)
+        self.assertEqual(self.event.title, "Show renomeado")
+
+    def test_drifted_counters_do_not_go_negative(self):
+        availability = Availability.objects.create(musician=self.guests[0], event=self.event)
+        # Contadores defasados (ex.: backfill falho) não podem quebrar escritas
+        Event.objects.filter(pk=self.event.pk).update(avail_pending_count=0, avail_total_count=0)
+
+        availability.response = "available"
+        availability.save()
+        Availability.objects.get(pk=availability.pk).delete()
+
+        self.assertEqual(
+            self._summary(), {"pending": 0, "available": 0, "unavailable": 0, "total": 0}
+        )
+
+    def test_set_availability_updates_counters_read_by_list(self):
+        Availability.objects.create(musician=self.guests[0], event=self.event)
+        Availability.objects.create(musician=self.guests[1], event=self.event)
+
+        self.client.force_authenticate(user=self.guests[0].user)
+        response = self.client.post(
+            f"/api/events/{self.event.id}/set_availability/",
+            {"response": "unavailable"},
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        self.client.force_authenticate(user=self.creator)
+        response = self.client.get("/api/events/")
+        self.assertEqual(
+            response.data["results"][0]["availability_summary"],
+            {"pending": 1, "available": 0, "unavailable": 1, "total": 2},
+        )
+
+    def test_command_checks_and_rebuilds(self):
+        Availability.objects.create(musician=self.guests[0], event=self.event)
+        Event.objects.filter(pk=self.event.pk).update(avail_pending_count=7, avail_total_count=9)
+
+        with self.assertRaises(CommandError):
+            call_command("rebuild_availability_counters", "--check", stdout=StringIO())
+
+        call_command("rebuild_availability_counters", stdout=StringIO())
+        self.assertEqual(
+            self._summary(), {"pending": 1, "available": 0, "unavailable": 0, "total": 1}
+        )
+        call_command("rebuild_availability_counters", "--check", stdout=StringIO())
@@ -0,0 +1,232 @@
+# agenda/tests/test_availability_rules.py
+"""
+Testes das disponibilidades recorrentes (AvailabilityRule) e da expansão sob
+demanda (agenda/availability_rules.py).
+"""
+
+from datetime import date, time, timedelta
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import SimpleTestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from agenda.availability_rules import occurrence_dates, weekdays_to_mask
+from agenda.models import AvailabilityRule, Event, LeaderAvailability, Musician
+
+MONDAY = date(2026, 10, 5)
+FRIDAY = MONDAY + timedelta(days=4)
+
+
+def _make_musician(username, first_name=""):
+    user = User.objects.create_user(
+        username=username,
+        email=f"{username}@test.com",
+        password="senha12345",
+        first_name=first_name,
+    )
+    return Musician.objects.create(user=user, instrument="vocal")
+
+
+class OccurrenceDatesTest(SimpleTestCase):
+    def _dates(self, start=MONDAY, end=MONDAY + timedelta(days=34), excluded=(), **fields):
+        fields.setdefault("start_date", MONDAY)
+        rule = AvailabilityRule(start_time=time(20, 0), end_time=time(23, 0), **fields)
+        return list(occurrence_dates(rule, start, end, set(excluded)))
+
+    def test_weekly_by_day_with_interval(self):
+        self.assertEqual(
+            self._dates(weekdays=weekdays_to_mask([4]), interval=2),
+            [FRIDAY, FRIDAY + timedelta(days=14), FRIDAY + timedelta(days=28)],
+        )
+        self.assertEqual(
+            self._dates(weekdays=weekdays_to_mask([0, 4]), end=FRIDAY + timedelta(days=3)),
+            [MONDAY, FRIDAY, FRIDAY + timedelta(days=3)],
+        )
+
+    def test_weekly_without_days_repeats_start_weekday(self):
+        self.assertEqual(
+            self._dates(start_date=FRIDAY, end=FRIDAY + timedelta(days=14)),
+            [FRIDAY, FRIDAY + timedelta(days=7), FRIDAY + timedelta(days=14)],
+        )
+
+    def test_daily_until_and_exceptions(self):
+        self.assertEqual(
+            self._dates(
+                frequency="daily",
+                interval=2,
+                until=MONDAY + timedelta(days=6),
+                excluded=[MONDAY + timedelta(days=2)],
+            ),
+            [MONDAY, MONDAY + timedelta(days=4), MONDAY + timedelta(days=6)],
+        )
+
+    def test_window_before_start_date_is_empty(self):
+        self.assertEqual(
+            self._dates(start_date=FRIDAY, start=MONDAY, end=MONDAY + timedelta(days=3)), []
+        )
+
+
+class AvailabilityRuleApiTest(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.sara = _make_musician("sara", "Sara")
+        self.client.force_authenticate(user=self.sara.user)
+        self.day = date.today() + timedelta(days=3)
+        self.rule = AvailabilityRule.objects.create(
+            leader=self.sara,
+            weekdays=weekdays_to_mask([self.day.weekday()]),
+            start_date=date.today(),
+            start_time=time(18, 0),
+            end_time=time(23, 0),
+            notes="Toda semana",
+            is_public=True,
+        )
+        self.list_url = reverse("leader-availability-list")
+
+    def _slots(self, **params):
+        response = self.client.get(self.list_url, params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [
+            (item["date"], item["start_time"][:5], item["end_time"][:5], item["rule_id"])
+            for item in response.data
+        ]
+
+    def test_list_expands_rule_only_inside_window(self):
+        LeaderAvailability.objects.create(
+            leader=self.sara, date=self.day, start_time=time(9, 0), end_time=time(11, 0)
+        )
+        day = self.day.isoformat()
+        self.assertEqual(
+            self._slots(date=day),
+            [(day, "09:00", "11:00", None), (day, "18:00", "23:00", self.rule.id)],
+        )
+
+        upcoming = self._slots(upcoming="true")
+        rule_dates = [item[0] for item in upcoming if item[3] == self.rule.id]
+        self.assertEqual(len(rule_dates), len(range(3, 91, 7)))
+        self.assertEqual(rule_dates, sorted(rule_dates))
+        # Nada é materializado
+        self.assertEqual(LeaderAvailability.objects.count(), 1)
+        self.assertEqual(self._slots(past="true"), [])
+
+    def test_events_are_subtracted_lazily(self):
+        Event.objects.create(
+            title="Show",
+            location="Bar",
+            event_date=self.day,
+            start_time=time(20, 0),
+            end_time=time(21, 0),
+            created_by=self.sara.user,
+            status="confirmed",
+        )
+        day = self.day.isoformat()
+        self.assertEqual(
+            self._slots(date=day),
+            [(day, "18:00", "19:20", self.rule.id), (day, "21:40", "23:00", self.rule.id)],
+        )
+
+    def test_exceptions_skip_and_restore_dates(self):
+        url = reverse("availability-rule-exceptions", args=[self.rule.id])
+        day = self.day.isoformat()
+
+        response = self.client.post(url, {"date": day}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["exception_dates"], [day])
+        self.assertEqual(self._slots(date=day), [])
+
+        response = self.client.delete(f"{url}?date={day}")
+        self.assertEqual(response.data["exception_dates"], [])
+        self.assertEqual(len(self._slots(date=day)), 1)
+
+    def test_rules_are_private_to_owner(self):
+        response = self.client.post(
+            reverse("availability-rule-list"),
+            {
+                "weekdays": [0, 2],
+                "start_date": date.today().isoformat(),
+                "start_time": "10:00",
+                "end_time": "12:00",
+            },
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data["weekdays"], [0, 2])
+        self.assertEqual(response.data["leader"], self.sara.id)
+
+        other = _make_musician("beto")
+        self.client.force_authenticate(user=other.user)
+        detail = reverse("availability-rule-detail", args=[self.rule.id])
+        self.assertEqual(self.client.get(detail).status_code, status.HTTP_404_NOT_FOUND)
+
+        # Mas as ocorrências públicas aparecem para os outros músicos
+        day = self.day.isoformat()
+        self.assertEqual(
+            self._slots(date=day, public="true"), [(day, "18:00", "23:00", self.rule.id)]
+        )
+
+    def test_available_musicians_counts_rules(self):
+        other = _make_musician("beto")
+        bia = _make_musician("bia", "Bia")
+        # Regra + avulsa contíguas cobrem a janela juntas
+        AvailabilityRule.objects.create(
+            leader=bia,
+            frequency="daily",
+            start_date=date.today(),
+            start_time=time(18, 0),
+            end_time=time(21, 0),
+            is_public=True,
+        )
+        LeaderAvailability.objects.create(
+            leader=bia,
+            date=self.day,
+            start_time=time(21, 0),
+            end_time=time(23, 30),
+            is_public=True,
+        )
+        self.client.force_authenticate(user=other.user)
+        url = reverse("leader-availability-available-musicians")
+
+        response = self.client.get(url, {"date": self.day.isoformat()})
+        flags = {item["musician_name"]: item["has_availability"] for item in response.data}
+        self.assertEqual(flags, {"Sara": True, "Bia": True})
+        sara = next(item for item in response.data if item["musician_name"] == "Sara")
+        self.assertEqual(sara["availability_slots"][0]["rule_id"], self.rule.id)
+
+        response = self.client.get(
+            url, {"date": self.day.isoformat(), "start_time": "20:00", "end_time": "23:15"}
+        )
+        flags = {item["musician_name"]: item["has_availability"] for item in response.data}
+        self.assertEqual(flags, {"Bia": True, "Sara": False})
+
+    def test_public_calendar_expands_rules_and_invalidates(self):
+        AvailabilityRule.objects.create(
+            leader=self.sara,
+            frequency="daily",
+            start_date=date.today(),
+            start_time=time(8, 0),
+            end_time=time(9, 0),
+            is_public=False,
+        )
+        self.client.force_authenticate(user=None)
+        url = reverse("musician-public-calendar", args=[self.sara.id])
+
+        response = self.client.get(url, {"days_ahead": 30})
+        items = response.data["availabilities"]
+        self.assertTrue(items)
+        self.assertTrue(all(item["rule_id"] == self.rule.id for item in items))
+        self.assertIn(self.day.isoformat(), [item["date"] for item in items])
+
+        self.rule.is_active = False
+        self.rule.save()
+        response = self.client.get(url, {"days_ahead": 30})
+        self.assertEqual(response.data["availabilities"], [])
+
+        # Dono com include_private vê também a regra privada
+        self.client.force_authenticate(user=self.sara.user)
+        response = self.client.get(url, {"days_ahead": 30, "include_private": "true"})
+        self.assertEqual(
+            {item["start_time"][:5] for item in response.data["availabilities"]}, {"08:00"}
+        )
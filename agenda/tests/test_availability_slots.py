@@ -0,0 +1,209 @@
+# agenda/tests/test_availability_slots.py
+"""
+Testes do bitmap diário de disponibilidades (MusicianDaySlots) e da janela de
+horário de available_musicians.
+"""
+
+from datetime import date, time, timedelta
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import SimpleTestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from agenda.availability_slots import availability_mask, window_mask
+from agenda.models import Event, LeaderAvailability, Musician, MusicianDaySlots
+
+
+def _make_musician(username, first_name="", **fields):
+    user = User.objects.create_user(
+        username=username,
+        email=f"{username}@test.com",
+        password="senha12345",
+        first_name=first_name,
+    )
+    fields.setdefault("instrument", "vocal")
+    return Musician.objects.create(user=user, **fields)
+
+
+class SlotMaskTest(SimpleTestCase):
+    def test_availability_marks_only_fully_covered_slots(self):
+        self.assertEqual(availability_mask(time(0, 0), time(0, 30)), (0b11, 0))
+        self.assertEqual(availability_mask(time(0, 10), time(0, 40)), (0b10, 0))
+        self.assertEqual(availability_mask(time(10, 5), time(10, 20)), (0, 0))
+        self.assertEqual(availability_mask(time(12, 0), time(12, 15)), (0, 1))
+
+    def test_availability_crossing_midnight_is_clipped_to_end_of_day(self):
+        am, pm = availability_mask(time(22, 0), time(2, 0))
+        self.assertEqual(am, 0)
+        self.assertEqual(pm, 0b11111111 << 40)
+
+    def test_window_touches_partial_slots(self):
+        self.assertEqual(window_mask(time(0, 10), time(0, 20)), (0b11, 0))
+        self.assertEqual(window_mask(time(23, 45), time(0, 0)), (0, 1 << 47))
+        am, pm = window_mask(time(11, 0), time(13, 0))
+        self.assertEqual(am, 0b1111 << 44)
+        self.assertEqual(pm, 0b1111)
+
+
+class DaySlotsMaintenanceTest(APITestCase):
+    def setUp(self):
+        self.musician = _make_musician("sara", first_name="Sara")
+        self.day = date.today() + timedelta(days=3)
+
+    def _slots(self, day=None):
+        row = MusicianDaySlots.objects.filter(musician=self.musician, date=day or self.day).first()
+        return (row.slots_am, row.slots_pm) if row else None
+
+    def _create(self, start, end, day=None, **fields):
+        fields.setdefault("is_public", True)
+        return LeaderAvailability.objects.create(
+            leader=self.musician, date=day or self.day, start_time=start, end_time=end, **fields
+        )
+
+    def test_signals_keep_bitmap_in_sync(self):
+        availability = self._create(time(14, 0), time(15, 0))
+        self.assertEqual(self._slots(), (0, 0b1111 << 8))
+
+        private = self._create(time(9, 0), time(10, 0), is_public=False)
+        self.assertEqual(self._slots(), (0, 0b1111 << 8))
+
+        private.is_public = True
+        private.save()
+        self.assertEqual(self._slots(), (0b1111 << 36, 0b1111 << 8))
+
+        # Mudar a data recalcula o dia antigo e o novo
+        availability.date = self.day + timedelta(days=1)
+        availability.save()
+        self.assertEqual(self._slots(), (0b1111 << 36, 0))
+        self.assertEqual(self._slots(availability.date), (0, 0b1111 << 8))
+
+        private.delete()
+        self.assertIsNone(self._slots())
+
+    def test_bulk_import_and_split_update_bitmap(self):
+        Event.objects.create(
+            title="Show",
+            location="Bar",
+            event_date=self.day,
+            start_time=time(16, 0),
+            end_time=time(17, 0),
+            created_by=self.musician.user,
+            status="confirmed",
+        )
+        self.client.force_authenticate(user=self.musician.user)
+        payload = {
+            "availabilities": [
+                {
+                    "date": self.day.isoformat(),
+                    "start_time": "14:00",
+                    "end_time": "20:00",
+                    "is_public": True,
+                }
+            ]
+        }
+        response = self.client.post(reverse("leader-availability-bulk"), payload, format="json")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+        # Sobram 14:00-15:20 e 17:40-20:00 (buffer de 40 minutos)
+        expected = availability_mask(time(14, 0), time(15, 20))[1] | (
+            availability_mask(time(17, 40), time(20, 0))[1]
+        )
+        self.assertEqual(self._slots(), (0, expected))
+
+    def test_rebuild_command_checks_and_fixes(self):
+        self._create(time(20, 0), time(23, 0))
+        call_command("rebuild_availability_slots", "--check", stdout=StringIO())
+
+        MusicianDaySlots.objects.update(slots_pm=1)
+        MusicianDaySlots.objects.create(
+            musician=self.musician, date=self.day + timedelta(days=1), slots_am=0, slots_pm=1
+        )
+        with self.assertRaises(CommandError):
+            call_command("rebuild_availability_slots", "--check", stdout=StringIO())
+
+        call_command("rebuild_availability_slots", stdout=StringIO())
+        call_command("rebuild_availability_slots", "--check", stdout=StringIO())
+        self.assertEqual(self._slots(), availability_mask(time(20, 0), time(23, 0)))
+        self.assertIsNone(self._slots(self.day + timedelta(days=1)))
+
+
+class AvailableMusiciansWindowTest(APITestCase):
+    def setUp(self):
+        self.owner = _make_musician("dono", first_name="Dono")
+        self.client.force_authenticate(user=self.owner.user)
+        self.day = date.today() + timedelta(days=5)
+        self.url = reverse("leader-availability-available-musicians")
+
+        self.ana = _make_musician("ana", first_name="Ana")
+        self.bia = _make_musician("bia", first_name="Bia")
+        self.caio = _make_musician("caio", first_name="Caio")
+        self.duda = _make_musician("duda", first_name="Duda")
+        # Ana cobre a janela em duas disponibilidades contíguas
+        self._create(self.ana, time(18, 0), time(21, 0))
+        self._create(self.ana, time(21, 0), time(23, 30))
+        # Bia só cobre parte da janela
+        self._create(self.bia, time(19, 0), time(22, 0))
+        # Caio cobre, mas é privado
+        self._create(self.caio, time(18, 0), time(23, 59), is_public=False)
+
+    def _create(self, musician, start, end, is_public=True):
+        return LeaderAvailability.objects.create(
+            leader=musician, date=self.day, start_time=start, end_time=end, is_public=is_public
+        )
+
+    def _get(self, **params):
+        response = self.client.get(self.url, {"date": self.day.isoformat(), **params})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.data
+
+    def test_without_window_keeps_date_semantics(self):
+        data = self._get()
+        self.assertEqual(
+            [(item["musician_name"], item["has_availability"]) for item in data],
+            [("Ana", True), ("Bia", True), ("Caio", False), ("Duda", False)],
+        )
+        self.assertEqual(data[0]["start_time"], "18:00")
+        self.assertEqual(data[0]["availability_count"], 2)
+
+    def test_window_requires_full_coverage(self):
+        data = self._get(start_time="20:00", end_time="23:00")
+        self.assertEqual(
+            [(item["musician_name"], item["has_availability"]) for item in data],
+            [("Ana", True), ("Bia", False), ("Caio", False), ("Duda", False)],
+        )
+        self.assertEqual(data[0]["start_time"], "18:00")
+        # Bia continua vendo seus horários, só não está livre na janela inteira
+        self.assertIsNone(data[1]["start_time"])
+        self.assertEqual(data[1]["availability_count"], 1)
+
+        data = self._get(start_time="19:00", end_time="20:00", only_available="true")
+        self.assertEqual([item["musician_name"] for item in data], ["Ana", "Bia"])
+
+    def test_invalid_window_is_rejected(self):
+        for params in (
+            {"start_time": "20:00"},
+            {"start_time": "20h", "end_time": "22:00"},
+            {"start_time": "22:00", "end_time": "20:00"},
+        ):
+            response = self.client.get(self.url, {"date": self.day.isoformat(), **params})
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST, params)
+
+        data = self._get(start_time="22:00", end_time="00:00")
+        self.assertEqual(len(data), 4)
+
+    def test_pagination_is_sorted_in_database(self):
+        first = self._get(page_size=2)
+        self.assertEqual(first["count"], 4)
+        self.assertEqual([item["musician_name"] for item in first["results"]], ["Ana", "Bia"])
+
+        with self.assertNumQueries(4):
+            # Regras recorrentes da data, contagem, página ordenada e
+            # disponibilidades só da página
+            second = self._get(page_size=2, page=2)
+        self.assertEqual([item["musician_name"] for item in second["results"]], ["Caio", "Duda"])
+        self.assertIsNone(second["next"])
@@ -0,0 +1,156 @@
+# agenda/tests/test_calendar_feed.py
+"""
+Testes do feed iCalendar da agenda pública (agenda/calendar_feed.py).
+"""
+
+from datetime import date, time, timedelta
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import SimpleTestCase
+from django.utils import timezone
+from rest_framework.test import APITestCase
+
+from agenda.calendar_feed import fold_line, parse_sync_token
+from agenda.models import Availability, Event, LeaderAvailability, Musician
+
+
+class FeedFormattingTest(SimpleTestCase):
+    def test_fold_line_respects_octets_without_splitting_characters(self):
+        folded = fold_line("SUMMARY:" + "á" * 80)
+        lines = folded.split("\r\n")[:-1]
+        self.assertGreater(len(lines), 1)
+        self.assertTrue(all(len(line.encode()) <= 75 for line in lines))
+        self.assertTrue(all(line.startswith(" ") for line in lines[1:]))
+        self.assertEqual("".join(line[1:] for line in lines[1:]), "á" * (80 - 33))
+
+    def test_invalid_sync_tokens_are_ignored(self):
+        for token in (None, "", "abc", "-5", "9" * 40):
+            self.assertIsNone(parse_sync_token(token))
+
+
+class CalendarFeedTest(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(
+            username="sara", email="sara@test.com", password="senha12345", first_name="Sara"
+        )
+        self.musician = Musician.objects.create(user=self.user, instrument="vocal")
+        self.other = User.objects.create_user(
+            username="beto", email="beto@test.com", password="senha12345"
+        )
+        self.url = f"/api/musicians/{self.musician.id}/calendar-feed/"
+        self.future_date = date.today() + timedelta(days=7)
+
+    def _create_event(self, created_by=None, **fields):
+        fields.setdefault("status", "confirmed")
+        return Event.objects.create(
+            title="Show secreto",
+            location="Bar",
+            event_date=self.future_date,
+            start_time=time(20, 0),
+            end_time=time(22, 0),
+            created_by=created_by or self.user,
+            **fields,
+        )
+
+    def _age(self, *objects):
+        """Empurra updated_at para antes do próximo sync token."""
+        for obj in objects:
+            type(obj).objects.filter(pk=obj.pk).update(
+                updated_at=timezone.now() - timedelta(hours=1)
+            )
+
+    def _fetch(self, **params):
+        response = self.client.get(self.url, params, HTTP_ACCEPT="text/calendar")
+        self.assertEqual(response.status_code, 200)
+        body = b"".join(response.streaming_content).decode()
+        return response, body
+
+    def test_full_feed_streams_visitor_view(self):
+        confirmed = self._create_event()
+        private = self._create_event(status="proposed", is_private=True)
+        proposed = self._create_event(status="proposed")
+        LeaderAvailability.objects.create(
+            leader=self.musician,
+            date=self.future_date,
+            start_time=time(14, 0),
+            end_time=time(18, 0),
+            notes="Tarde livre, centro",
+            is_public=True,
+        )
+
+        response, body = self._fetch()
+
+        self.assertTrue(response.streaming)
+        self.assertEqual(response["Content-Type"], "text/calendar; charset=utf-8")
+        self.assertEqual(response["X-Sync-Mode"], "full")
+        self.assertTrue(body.startswith("BEGIN:VCALENDAR\r\n"))
+        self.assertTrue(body.endswith("END:VCALENDAR\r\n"))
+        self.assertIn(f"UID:event-{confirmed.id}@gigflow", body)
+        self.assertIn(f"UID:event-{private.id}@gigflow", body)
+        self.assertNotIn(f"UID:event-{proposed.id}@gigflow", body)
+        self.assertIn("SUMMARY:Ocupado", body)
+        self.assertNotIn("Show secreto", body)
+        self.assertIn("DESCRIPTION:Tarde livre\\, centro", body)
+        self.assertIn(f"X-GIGFLOW-SYNC-TOKEN:{response['X-Sync-Token']}", body)
+
+    def test_if_none_match_returns_304(self):
+        self._create_event()
+        response, _ = self._fetch()
+
+        not_modified = self.client.get(self.url, HTTP_IF_NONE_MATCH=response["ETag"])
+        self.assertEqual(not_modified.status_code, 304)
+
+        self._create_event(status="approved")
+        changed = self.client.get(self.url, HTTP_IF_NONE_MATCH=response["ETag"])
+        self.assertEqual(changed.status_code, 200)
+
+    def test_sync_token_returns_only_changes(self):
+        unchanged = self._create_event()
+        changed = self._create_event(status="approved")
+        self._age(unchanged, changed)
+        response, _ = self._fetch()
+        token = response["X-Sync-Token"]
+
+        changed.status = "cancelled"
+        changed.save()
+        invited = self._create_event(created_by=self.other)
+        self._age(invited)
+        Availability.objects.create(musician=self.musician, event=invited, response="pending")
+
+        response, body = self._fetch(sync_token=token)
+
+        self.assertEqual(response["X-Sync-Mode"], "delta")
+        self.assertNotIn(f"UID:event-{unchanged.id}@", body)
+        self.assertIn(f"UID:event-{changed.id}@gigflow\r\n", body)
+        self.assertIn("STATUS:CANCELLED", body)
+        self.assertIn(f"UID:event-{invited.id}@gigflow", body)
+
+    def test_deletions_force_full_feed(self):
+        event = self._create_event()
+        remaining = self._create_event()
+        self._age(event, remaining)
+        token = self._fetch()[0]["X-Sync-Token"]
+
+        deleted_id = event.id
+        event.delete()
+
+        response, body = self._fetch(sync_token=token)
+        self.assertEqual(response["X-Sync-Mode"], "full")
+        self.assertIn(f"UID:event-{remaining.id}@gigflow", body)
+        self.assertNotIn(f"UID:event-{deleted_id}@", body)
+
+        # Passada a margem de sobreposição, o novo token volta a valer para deltas
+        Musician.objects.filter(pk=self.musician.pk).update(
+            calendar_reset_at=timezone.now() - timedelta(hours=1)
+        )
+        response, _ = self._fetch(sync_token=response["X-Sync-Token"])
+        self.assertEqual(response["X-Sync-Mode"], "delta")
+
+    def test_unknown_musician_returns_json_404(self):
+        response = self.client.get(
+            "/api/musicians/999999/calendar-feed/", HTTP_ACCEPT="text/calendar"
+        )
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(response["Content-Type"], "application/json")
@@ -0,0 +1,124 @@
+# agenda/tests/test_conditional_get.py
+"""
+Testes do GET condicional (ETag/Last-Modified) dos endpoints em polling
+(agenda/conditional_get.py).
+"""
+
+from datetime import date, time, timedelta
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.urls import reverse
+from rest_framework.test import APITestCase
+
+from agenda.models import Event, LeaderAvailability, Musician
+
+
+class ConditionalGetTest(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(
+            username="sara", email="sara@test.com", password="senha12345", first_name="Sara"
+        )
+        self.musician = Musician.objects.create(user=self.user, instrument="vocal", bio="MPB")
+        self.future_date = date.today() + timedelta(days=7)
+
+    def _create_event(self, **fields):
+        fields.setdefault("status", "confirmed")
+        return Event.objects.create(
+            title="Show",
+            location="Bar",
+            event_date=self.future_date,
+            start_time=time(20, 0),
+            end_time=time(22, 0),
+            created_by=self.user,
+            **fields,
+        )
+
+    def assertRevalidates(self, url, expected_queries=None):
+        """Primeira resposta traz o ETag; reenviá-lo devolve 304. Retorna o ETag."""
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        etag = response["ETag"]
+        self.assertTrue(etag.startswith('W/"'))
+        self.assertIn("no-cache", response["Cache-Control"])
+
+        if expected_queries is None:
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        else:
+            with self.assertNumQueries(expected_queries):
+                response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response["ETag"], etag)
+        self.assertEqual(response.content, b"")
+        return etag
+
+    def assertChanged(self, url, etag):
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+        return response
+
+    def test_events_list(self):
+        self.client.force_authenticate(user=self.user)
+        url = "/api/events/?upcoming=true"
+
+        etag = self.assertRevalidates(url, expected_queries=0)
+        # Outros filtros são outro recurso
+        self.assertEqual(self.client.get("/api/events/", HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+        self._create_event()
+        response = self.assertChanged(url, etag)
+        self.assertEqual(response.data["count"], 1)
+        self.assertIn("Authorization", response["Vary"])
+
+    def test_public_calendar(self):
+        url = reverse("musician-public-calendar", args=[self.musician.id])
+        event = self._create_event(status="proposed")
+
+        etag = self.assertRevalidates(url)
+        self.assertEqual(self.client.get(url + "?days_ahead=60").status_code, 200)
+
+        LeaderAvailability.objects.create(
+            leader=self.musician,
+            date=self.future_date,
+            start_time=time(14, 0),
+            end_time=time(18, 0),
+            is_public=True,
+        )
+        etag = self.assertChanged(url, etag)["ETag"]
+
+        event.status = "confirmed"
+        event.save()
+        response = self.assertChanged(url, etag)
+        self.assertEqual([item["id"] for item in response.data["events"]], [event.id])
+
+        # Dono vê outro payload: outro ETag
+        self.client.force_authenticate(user=self.user)
+        self.assertChanged(url, response["ETag"])
+
+    def test_public_profile(self):
+        url = f"/api/musicians/public/{self.musician.id}/"
+
+        etag = self.assertRevalidates(url, expected_queries=0)
+        self.assertIn("public", self.client.get(url)["Cache-Control"])
+
+        self.musician.bio = "Samba"
+        self.musician.save()
+        self.assertEqual(self.assertChanged(url, etag).data["bio"], "Samba")
+
+    def test_notification_preferences(self):
+        self.client.force_authenticate(user=self.user)
+        url = "/api/notifications/preferences/"
+
+        # Primeira leitura cria as preferências e não tem carimbo prévio
+        self.assertEqual(self.client.get(url).status_code, 200)
+        etag = self.assertRevalidates(url, expected_queries=1)
+
+        last_modified = self.client.get(url)["Last-Modified"]
+        response = self.client.get(url, HTTP_IF_MODIFIED_SINCE=last_modified)
+        self.assertEqual(response.status_code, 304)
+
+        self.client.patch(url, {"notify_event_reminders": False}, format="json")
+        response = self.assertChanged(url, etag)
+        self.assertFalse(response.data["notify_event_reminders"])
@@ -0,0 +1,218 @@
+# agenda/tests/test_conflict_index.py
+"""
+Testes do índice em memória de conflitos usado pelo preview_conflicts.
+"""
+
+from datetime import date, datetime, time, timedelta
+from unittest.mock import patch
+
+from django.contrib.auth.models import User
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from agenda.conflict_index import ConflictIndex, conflict_index
+from agenda.models import Availability, Event, Musician
+
+
+class ConflictIndexTest(APITestCase):
+    def setUp(self):
+        conflict_index.clear()
+        self.creator = User.objects.create_user(
+            username="sara", email="sara@test.com", password="senha123"
+        )
+        self.guest = User.objects.create_user(
+            username="roberto", email="roberto@test.com", password="senha123"
+        )
+        self.creator_musician = Musician.objects.create(
+            user=self.creator, instrument="vocal", role="member"
+        )
+        self.guest_musician = Musician.objects.create(
+            user=self.guest, instrument="drums", role="member"
+        )
+        self.base_date = date.today() + timedelta(days=6)
+
+    def _create_event(self, start=time(20, 0), end=time(22, 0), **kwargs):
+        defaults = {
+            "title": "Evento existente",
+            "location": "Casa",
+            "event_date": self.base_date,
+            "start_time": start,
+            "end_time": end,
+            "created_by": self.creator,
+            "status": "confirmed",
+        }
+        defaults.update(kwargs)
+        return Event.objects.create(**defaults)
+
+    def _ids(self, user, day, start, end):
+        start_dt = timezone.make_aware(datetime.combine(day, start))
+        end_dt = timezone.make_aware(datetime.combine(day, end))
+        return conflict_index.conflicting_event_ids(start_dt, end_dt, user_id=user.id)
+
+    def test_buffer_is_applied(self):
+        event = self._create_event()
+        # Termina às 22:00 + 40min de buffer => 22:30 ainda conflita, 22:41 não
+        self.assertEqual(
+            self._ids(self.creator, self.base_date, time(22, 30), time(23, 30)), [event.id]
+        )
+        self.assertEqual(self._ids(self.creator, self.base_date, time(22, 41), time(23, 30)), [])
+
+    def test_event_crossing_midnight(self):
+        event = self._create_event(start=time(23, 0), end=time(2, 0))
+        next_day = self.base_date + timedelta(days=1)
+        self.assertEqual(self._ids(self.creator, next_day, time(1, 0), time(3, 0)), [event.id])
+
+    def test_index_follows_event_and_availability_changes(self):
+        event = self._create_event()
+        self.assertEqual(self._ids(self.guest, self.base_date, time(21, 0), time(23, 0)), [])
+
+        Availability.objects.create(musician=self.guest_musician, event=event, response="pending")
+        self.assertEqual(
+            self._ids(self.guest, self.base_date, time(21, 0), time(23, 0)), [event.id]
+        )
+
+        event.status = "cancelled"
+        event.save()
+        self.assertEqual(self._ids(self.creator, self.base_date, time(21, 0), time(23, 0)), [])
+        self.assertEqual(self._ids(self.guest, self.base_date, time(21, 0), time(23, 0)), [])
+
+    def test_preview_without_conflicts_skips_database_after_warmup(self):
+        self._create_event()
+        self.client.force_authenticate(user=self.creator)
+        payload = {
+            "event_date": (self.base_date + timedelta(days=3)).isoformat(),
+            "start_time": "21:00",
+            "end_time": "23:00",
+        }
+        self.client.post("/api/events/preview_conflicts/", payload, format="json")
+
+        with self.assertNumQueries(0):
+            response = self.client.post("/api/events/preview_conflicts/", payload, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertFalse(response.data["has_conflicts"])
+        self.assertEqual(response.data["count"], 0)
+
+    def test_local_scopes_are_capped_with_lru_eviction(self):
+        event = self._create_event()
+        with patch.object(ConflictIndex, "max_scopes", 2):
+            self._ids(self.creator, self.base_date, time(21, 0), time(23, 0))
+            self._ids(self.guest, self.base_date, time(21, 0), time(23, 0))
+            # Uso recente mantém o escopo do criador; o do convidado sai
+            self._ids(self.creator, self.base_date, time(21, 0), time(23, 0))
+            conflict_index.conflicting_event_ids(
+                timezone.now(), timezone.now() + timedelta(hours=1), organization_id=1
+            )
+
+            self.assertEqual(list(conflict_index._scopes), [("u", self.creator.id), ("o", 1)])
+            with self.assertNumQueries(0):
+                self.assertEqual(
+                    self._ids(self.creator, self.base_date, time(21, 0), time(23, 0)),
+                    [event.id],
+                )
+
+    def test_preview_ignores_other_users_events(self):
+        outsider = User.objects.create_user(
+            username="carlos", email="carlos@test.com", password="senha123"
+        )
+        self._create_event(created_by=outsider)
+        self.client.force_authenticate(user=self.creator)
+
+        payload = {
+            "event_date": self.base_date.isoformat(),
+            "start_time": "21:00",
+            "end_time": "23:00",
+        }
+        response = self.client.post("/api/events/preview_conflicts/", payload, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertFalse(response.data["has_conflicts"])
+
+
+class PreviewConflictsBatchTest(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="sara", email="sara@test.com", password="senha123"
+        )
+        self.guest = User.objects.create_user(
+            username="roberto", email="roberto@test.com", password="senha123"
+        )
+        Musician.objects.create(user=self.user, instrument="vocal", role="member")
+        self.guest_musician = Musician.objects.create(
+            user=self.guest, instrument="drums", role="member"
+        )
+        self.client.force_authenticate(user=self.user)
+        self.base_date = date.today() + timedelta(days=10)
+        self.url = "/api/events/preview_conflicts_batch/"
+
+    def _event(self, day_offset, start, end, created_by=None, status_value="proposed"):
+        return Event.objects.create(
+            title="Show",
+            location="Casa",
+            event_date=self.base_date + timedelta(days=day_offset),
+            start_time=start,
+            end_time=end,
+            created_by=created_by or self.user,
+            status=status_value,
+        )
+
+    def _slot(self, day_offset, start, end):
+        return {
+            "event_date": (self.base_date + timedelta(days=day_offset)).isoformat(),
+            "start_time": start,
+            "end_time": end,
+        }
+
+    def test_batch_matches_each_slot_with_constant_queries(self):
+        first = self._event(0, time(20, 0), time(22, 0))
+        overnight = self._event(7, time(23, 0), time(2, 0))
+        self._event(14, time(20, 0), time(22, 0), status_value="cancelled")
+        invited = self._event(21, time(18, 0), time(19, 0), created_by=self.guest)
+        Availability.objects.create(
+            musician=self.user.musician_profile, event=invited, response="pending"
+        )
+
+        slots = [
+            self._slot(0, "21:00", "23:00"),
+            self._slot(8, "01:00", "03:00"),
+            self._slot(14, "20:00", "22:00"),
+            self._slot(21, "19:30", "21:00"),
+            self._slot(28, "20:00", "22:00"),
+        ]
+        # Range query + prefetch do approval_label
+        with self.assertNumQueries(2):
+            response = self.client.post(self.url, {"slots": slots}, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        results = response.data["results"]
+        self.assertEqual(len(results), 5)
+        self.assertEqual([c["id"] for c in results[0]["conflicts"]], [first.id])
+        self.assertEqual([c["id"] for c in results[1]["conflicts"]], [overnight.id])
+        self.assertFalse(results[2]["has_conflicts"])
+        self.assertEqual([c["id"] for c in results[3]["conflicts"]], [invited.id])
+        self.assertFalse(results[4]["has_conflicts"])
+        self.assertEqual(response.data["conflicting_slots"], 3)
+
+    def test_batch_ignores_events_outside_user_scope(self):
+        self._event(0, time(20, 0), time(22, 0), created_by=self.guest)
+
+        response = self.client.post(
+            self.url, {"slots": [self._slot(0, "21:00", "23:00")]}, format="json"
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertFalse(response.data["results"][0]["has_conflicts"])
+
+    def test_batch_validates_payload(self):
+        response = self.client.post(self.url, {"slots": []}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        response = self.client.post(
+            self.url, {"slots": [{"event_date": "x", "start_time": "20:00"}]}, format="json"
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        too_many = [self._slot(0, "20:00", "21:00")] * 101
+        response = self.client.post(self.url, {"slots": too_many}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
@@ -0,0 +1,245 @@
+# agenda/tests/test_event_confirmation.py
+"""
+Testes da confirmação de eventos via UPDATE condicional (sem select_for_update).
+"""
+
+import threading
+from datetime import date, time, timedelta
+from unittest import skipUnless
+from unittest.mock import patch
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import TransactionTestCase
+from rest_framework import status
+from rest_framework.exceptions import ValidationError
+from rest_framework.test import APIClient, APITestCase
+
+from agenda.models import Availability, Event, EventLog, Musician
+from agenda.views import EventViewSet
+from notifications import signals as notification_signals
+from notifications.models import NotificationLog, NotificationType
+
+
+class EventConfirmationTest(APITestCase):
+    def setUp(self):
+        self.creator = User.objects.create_user(
+            username="lider", email="lider@test.com", password="senha123"
+        )
+        self.creator_musician = Musician.objects.create(user=self.creator, instrument="vocal")
+        self.guests = []
+        for i in range(2):
+            user = User.objects.create_user(
+                username=f"musico{i}", email=f"musico{i}@test.com", password="senha123"
+            )
+            self.guests.append(Musician.objects.create(user=user, instrument="bass"))
+
+        self.event = Event.objects.create(
+            title="Show",
+            location="Bar",
+            event_date=date.today() + timedelta(days=5),
+            start_time=time(20, 0),
+            end_time=time(22, 0),
+            created_by=self.creator,
+            status="proposed",
+        )
+        Availability.objects.create(
+            musician=self.creator_musician, event=self.event, response="available"
+        )
+        for guest in self.guests:
+            Availability.objects.create(musician=guest, event=self.event)
+
+    def _respond(self, guest, response_value):
+        self.client.force_authenticate(user=guest.user)
+        return self.client.post(
+            f"/api/events/{self.event.id}/set_availability/",
+            {"response": response_value},
+            format="json",
+        )
+
+    def test_confirm_and_unconfirm_follow_invitee_responses(self):
+        response = self._respond(self.guests[0], "available")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["status"], "confirmed")
+        self.event.refresh_from_db()
+        self.assertEqual(self.event.approved_by, self.guests[0].user)
+        self.assertIsNotNone(self.event.approved_at)
+
+        response = self._respond(self.guests[0], "unavailable")
+        self.assertEqual(response.data["status"], "proposed")
+        self.event.refresh_from_db()
+        self.assertIsNone(self.event.approved_by)
+        self.assertIsNone(self.event.approved_at)
+        self.assertEqual(EventLog.objects.filter(event=self.event, action="approved").count(), 1)
+
+    def test_second_acceptance_keeps_first_approver(self):
+        self._respond(self.guests[0], "available")
+        self.event.refresh_from_db()
+        approved_at = self.event.approved_at
+
+        response = self._respond(self.guests[1], "available")
+
+        self.assertEqual(response.data["status"], "confirmed")
+        self.event.refresh_from_db()
+        self.assertEqual(self.event.approved_by, self.guests[0].user)
+        self.assertEqual(self.event.approved_at, approved_at)
+        self.assertEqual(EventLog.objects.filter(event=self.event, action="approved").count(), 1)
+
+    def test_creator_acceptance_alone_does_not_confirm(self):
+        Availability.objects.filter(musician__in=self.guests).update(response="unavailable")
+
+        EventViewSet()._check_and_confirm_event(self.event)
+
+        self.event.refresh_from_db()
+        self.assertEqual(self.event.status, "proposed")
+
+    def test_cancelled_event_is_left_untouched(self):
+        Event.objects.filter(pk=self.event.pk).update(status="cancelled")
+
+        self._respond(self.guests[0], "available")
+
+        self.event.refresh_from_db()
+        self.assertEqual(self.event.status, "cancelled")
+        self.assertIsNone(self.event.approved_by)
+
+    def test_retries_when_event_changes_between_read_and_update(self):
+        Availability.objects.filter(musician=self.guests[0]).update(response="available")
+        original = EventViewSet._should_confirm_condition
+        calls = []
+
+        def racing_condition(event_id, snapshot):
+            # Outra requisição confirma o evento depois da leitura desta tentativa
+            if not calls:
+                Event.objects.filter(pk=event_id).update(
+                    status="confirmed", approved_by=self.creator
+                )
+            calls.append(snapshot["status"])
+            return original(event_id, snapshot)
+
+        with patch.object(
+            EventViewSet, "_should_confirm_condition", staticmethod(racing_condition)
+        ):
+            EventViewSet()._check_and_confirm_event(self.event)
+
+        self.assertEqual(calls, ["proposed", "confirmed"])
+        self.event.refresh_from_db()
+        self.assertEqual(self.event.status, "confirmed")
+        self.assertEqual(self.event.approved_by, self.creator)
+        self.assertFalse(EventLog.objects.filter(event=self.event, action="approved").exists())
+
+    def test_gives_up_after_max_attempts(self):
+        def always_racing(event_id, snapshot):
+            flipped = "confirmed" if snapshot["status"] == "proposed" else "proposed"
+            Event.objects.filter(pk=event_id).update(status=flipped)
+            return None
+
+        with patch.object(EventViewSet, "_should_confirm_condition", staticmethod(always_racing)):
+            with self.assertRaises(ValidationError):
+                EventViewSet()._check_and_confirm_event(self.event)
+
+    def test_confirmation_notifies_with_explicit_previous_status(self):
+        # Sobra de um save() anterior no mapa do pre_save não decide mais nada
+        notification_signals._event_previous_status[self.event.pk] = "confirmed"
+        self.addCleanup(notification_signals._event_previous_status.pop, self.event.pk, None)
+
+        self._respond(self.guests[0], "available")
+
+        self.assertTrue(
+            NotificationLog.objects.filter(
+                user=self.guests[0].user, notification_type=NotificationType.EVENT_CONFIRMED
+            ).exists()
+        )
+
+    def test_unchanged_status_sends_no_notification(self):
+        confirmed = NotificationLog.objects.filter(
+            notification_type=NotificationType.EVENT_CONFIRMED
+        )
+        self._respond(self.guests[0], "available")
+        sent = confirmed.count()
+
+        self._respond(self.guests[1], "available")
+
+        self.assertGreater(sent, 0)
+        self.assertEqual(confirmed.count(), sent)
+
+
+@skipUnless(connection.vendor == "postgresql", "depende do lock de linha do Postgres")
+class EventConfirmationConcurrencyTest(TransactionTestCase):
+    """
+    Respostas simultâneas ao mesmo evento: o status final segue as respostas
+    gravadas (ver EventViewSet._check_and_confirm_event).
+    """
+
+    def setUp(self):
+        creator = User.objects.create_user(
+            username="lider", email="lider@test.com", password="senha123"
+        )
+        Musician.objects.create(user=creator, instrument="vocal")
+        self.event = Event.objects.create(
+            title="Show",
+            location="Bar",
+            event_date=date.today() + timedelta(days=5),
+            start_time=time(20, 0),
+            end_time=time(22, 0),
+            created_by=creator,
+            status="proposed",
+        )
+        self.guests = []
+        for i in range(8):
+            user = User.objects.create_user(
+                username=f"musico{i}", email=f"musico{i}@test.com", password="senha123"
+            )
+            guest = Musician.objects.create(user=user, instrument="bass")
+            Availability.objects.create(musician=guest, event=self.event)
+            self.guests.append(guest)
+
+    def _respond_concurrently(self, responses):
+        barrier = threading.Barrier(len(responses))
+        errors = []
+
+        def respond(guest, value):
+            client = APIClient()
+            client.force_authenticate(user=guest.user)
+            try:
+                barrier.wait()
+                result = client.post(
+                    f"/api/events/{self.event.id}/set_availability/",
+                    {"response": value},
+                    format="json",
+                )
+                if result.status_code != status.HTTP_200_OK:
+                    errors.append(result.status_code)
+            finally:
+                connection.close()
+
+        threads = [
+            threading.Thread(target=respond, args=(guest, value))
+            for guest, value in zip(self.guests, responses)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(errors, [])
+        self.event.refresh_from_db()
+
+    def test_last_acceptance_withdrawn_leaves_event_proposed(self):
+        self._respond_concurrently(["available"] * len(self.guests))
+        self.assertEqual(self.event.status, "confirmed")
+
+        self._respond_concurrently(["unavailable"] * len(self.guests))
+
+        self.assertEqual(self.event.status, "proposed")
+        self.assertIsNone(self.event.approved_by)
+        self.assertEqual(self.event.avail_unavailable_count, len(self.guests))
+
+    def test_single_acceptance_among_refusals_confirms(self):
+        responses = ["unavailable"] * (len(self.guests) - 1) + ["available"]
+
+        self._respond_concurrently(responses)
+
+        self.assertEqual(self.event.status, "confirmed")
+        # Quem confirma depende da ordem: o próprio convidado (confirmed_by) ou,
+        # se a recusa de outro recalcular primeiro, o criador.
+        self.assertIn(self.event.approved_by, {self.guests[-1].user, self.event.created_by})
+        self.assertEqual(self.event.avail_available_count, 1)
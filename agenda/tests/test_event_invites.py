@@ -4,9 +4,12 @@ Testes do novo fluxo de criação de eventos com convites de músicos.
 """
 
 from datetime import date, time, timedelta
+from unittest.mock import patch
 
 from django.contrib.auth.models import User
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from rest_framework import status
 from rest_framework.test import APIClient, APITestCase
@@ -19,6 +22,7 @@ from agenda.models import (
     Musician,
     Organization,
 )
+from notifications.models import NotificationLog
 
 
 class EventInviteFlowTest(APITestCase):
@@ -282,3 +286,83 @@ class EventInviteFlowTest(APITestCase):
 
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertFalse(response.data["can_approve"])
+
+
+class BulkInvitationTest(APITestCase):
+    """Convites em lote: queries constantes e um único job de notificação"""
+
+    def setUp(self):
+        self.creator = User.objects.create_user(
+            username="sara", email="sara@test.com", password="senha123", first_name="Sara"
+        )
+        self.creator_musician = Musician.objects.create(
+            user=self.creator, instrument="vocal", role="member", is_active=True
+        )
+        self.band = []
+        for i in range(15):
+            user = User.objects.create_user(
+                username=f"banda{i}", email=f"banda{i}@test.com", password="senha123"
+            )
+            self.band.append(Musician.objects.create(user=user, instrument="guitar"))
+        self.client.force_authenticate(user=self.creator)
+        self.url = reverse("event-list")
+
+    def _payload(self, musicians):
+        return {
+            "title": "Show com banda",
+            "location": "Teatro",
+            "event_date": (date.today() + timedelta(days=5)).isoformat(),
+            "start_time": "20:00",
+            "end_time": "23:00",
+            "is_solo": False,
+            "invited_musicians": [m.id for m in musicians],
+        }
+
+    def _create_counting_queries(self, musicians):
+        with patch("agenda.views.events.enqueue_invitations_created") as enqueue:
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.post(self.url, self._payload(musicians), format="json")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        return response, len(queries.captured_queries), enqueue
+
+    def test_invitation_cost_does_not_grow_with_band_size(self):
+        _response, small, _enqueue = self._create_counting_queries(self.band[:2])
+        response, large, enqueue = self._create_counting_queries(self.band)
+
+        self.assertEqual(large, small)
+        enqueue.assert_called_once()
+        event_id, musician_ids = enqueue.call_args.args
+        self.assertEqual(event_id, response.data["id"])
+        self.assertEqual(sorted(musician_ids), sorted(m.id for m in self.band))
+
+        event = Event.objects.get(pk=response.data["id"])
+        self.assertEqual(
+            event.availability_summary,
+            {"pending": 15, "available": 1, "unavailable": 0, "total": 16},
+        )
+
+    def test_update_only_invites_new_musicians(self):
+        response, _queries, _enqueue = self._create_counting_queries(self.band[:2])
+        event_id = response.data["id"]
+
+        with patch("agenda.views.events.enqueue_invitations_created") as enqueue:
+            response = self.client.put(
+                reverse("event-detail", args=[event_id]),
+                self._payload(self.band[:4]),
+                format="json",
+            )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(sorted(enqueue.call_args.args[1]), sorted(m.id for m in self.band[2:4]))
+        self.assertEqual(Availability.objects.filter(event_id=event_id).count(), 5)
+
+    def test_invites_are_written_to_outbox_without_sending(self):
+        with patch("notifications.services.base.NotificationService.deliver") as deliver:
+            response = self.client.post(self.url, self._payload(self.band[:3]), format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        deliver.assert_not_called()
+        logs = NotificationLog.objects.filter(object_id=response.data["id"])
+        self.assertEqual({log.user for log in logs}, {m.user for m in self.band[:3]})
+        self.assertEqual({log.status for log in logs}, {"pending"})
+        self.assertEqual({log.notification_type for log in logs}, {"event_invite"})
@@ -6,11 +6,14 @@ Testes de filtros da listagem de eventos.
 from datetime import date, time, timedelta
 
 from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from rest_framework import status
 from rest_framework.test import APITestCase
 
-from agenda.models import Event, Membership, Musician, Organization
+from agenda.models import Availability, Event, Membership, Musician, Organization
 
 
 class PastEventsFilterTest(APITestCase):
@@ -65,3 +68,70 @@ class PastEventsFilterTest(APITestCase):
         self.assertIn(within_range.id, returned_ids)
         self.assertNotIn(out_of_range.id, returned_ids)
         self.assertNotIn(_future.id, returned_ids)
+
+
+class ParticipationScopeTest(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.creator = User.objects.create_user(
+            username="sara", email="sara@test.com", password="senha123"
+        )
+        Musician.objects.create(user=self.creator, instrument="vocal", role="member")
+        self.guests = []
+        for i in range(3):
+            user = User.objects.create_user(
+                username=f"convidado{i}", email=f"convidado{i}@test.com", password="senha123"
+            )
+            self.guests.append(Musician.objects.create(user=user, instrument="drums"))
+
+    def _event(self, **kwargs):
+        defaults = {
+            "title": "Show",
+            "location": "Bar",
+            "event_date": date.today() + timedelta(days=3),
+            "start_time": time(20, 0),
+            "end_time": time(22, 0),
+            "created_by": self.creator,
+            "status": "proposed",
+        }
+        defaults.update(kwargs)
+        return Event.objects.create(**defaults)
+
+    def test_summary_counts_all_participants_without_distinct(self):
+        event = self._event()
+        responses = ["pending", "available", "unavailable"]
+        for musician, response in zip(self.guests, responses):
+            Availability.objects.create(musician=musician, event=event, response=response)
+
+        self.client.force_authenticate(user=self.guests[0].user)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse("event-list"))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            response.data["results"][0]["availability_summary"],
+            {"pending": 1, "available": 1, "unavailable": 1, "total": 3},
+        )
+        self.assertFalse(any("DISTINCT" in q["sql"] for q in queries))
+
+    def test_unavailable_participation_is_hidden_from_list(self):
+        event = self._event()
+        Availability.objects.create(musician=self.guests[0], event=event, response="unavailable")
+
+        self.client.force_authenticate(user=self.guests[0].user)
+        response = self.client.get(reverse("event-list"))
+        self.assertEqual(response.data["results"], [])
+
+        response = self.client.get(reverse("event-detail", args=[event.id]))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_pending_responses_filter(self):
+        waiting = self._event()
+        answered = self._event()
+        Availability.objects.create(musician=self.guests[0], event=waiting, response="pending")
+        Availability.objects.create(musician=self.guests[0], event=answered, response="available")
+
+        self.client.force_authenticate(user=self.creator)
+        response = self.client.get(f"{reverse('event-list')}?pending_responses=true")
+
+        self.assertEqual([e["id"] for e in response.data["results"]], [waiting.id])
@@ -0,0 +1,134 @@
+# agenda/tests/test_events_list_cache.py
+"""
+Testes do cache da listagem de eventos (chave canônica, invalidação e métricas).
+"""
+
+from datetime import date, time, timedelta
+from unittest.mock import patch
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.http import QueryDict
+from django.test import SimpleTestCase
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from agenda.events_list_cache import canonical_params, events_list_cache
+from agenda.models import Availability, Event, Musician
+
+
+class CanonicalParamsTest(SimpleTestCase):
+    def _key(self, query):
+        return canonical_params(QueryDict(query))
+
+    def test_equivalent_queries_share_key(self):
+        self.assertEqual(
+            self._key("upcoming=true&status=confirmed,proposed"),
+            self._key("status=proposed,confirmed,proposed&upcoming=true&foo=bar"),
+        )
+        self.assertEqual(self._key(""), self._key("page=1&page_size=20&past=false"))
+        self.assertEqual(self._key("page_size=500"), self._key("page_size=100"))
+        self.assertEqual(self._key("status=invalid"), self._key(""))
+        self.assertEqual(self._key("days_back=7"), self._key(""))
+
+    def test_distinct_queries_keep_distinct_keys(self):
+        self.assertNotEqual(self._key("past=true"), self._key("upcoming=true"))
+        self.assertNotEqual(self._key("past=true&days_back=7"), self._key("past=true"))
+        self.assertNotEqual(self._key("page=2"), self._key(""))
+        self.assertNotEqual(self._key("search=Bar"), self._key("search=Pub"))
+
+
+class EventsListCacheTest(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.creator = User.objects.create_user(
+            username="sara", email="sara@test.com", password="senha123"
+        )
+        self.guest = User.objects.create_user(
+            username="roberto", email="roberto@test.com", password="senha123"
+        )
+        Musician.objects.create(user=self.creator, instrument="vocal", role="member")
+        self.guest_musician = Musician.objects.create(
+            user=self.guest, instrument="drums", role="member"
+        )
+        self.event = Event.objects.create(
+            title="Show",
+            location="Bar",
+            event_date=date.today() + timedelta(days=5),
+            start_time=time(20, 0),
+            end_time=time(22, 0),
+            created_by=self.creator,
+            status="proposed",
+        )
+        self.availability = Availability.objects.create(
+            musician=self.guest_musician, event=self.event, response="pending"
+        )
+
+    def _list(self, user, query=""):
+        self.client.force_authenticate(user=user)
+        return self.client.get(f"/api/events/{query}")
+
+    def test_equivalent_queries_hit_same_entry(self):
+        events_list_cache.reset_stats()
+        self._list(self.creator, "?upcoming=true&page=1")
+        self._list(self.creator, "?page_size=20&upcoming=true")
+
+        stats = events_list_cache.stats()
+        self.assertEqual(stats["misses"], 1)
+        self.assertEqual(stats["hits"], 1)
+
+    def test_response_change_invalidates_other_participants(self):
+        self.assertEqual(self._list(self.creator).data["results"][0]["status"], "proposed")
+
+        self.client.force_authenticate(user=self.guest)
+        response = self.client.post(
+            f"/api/events/{self.event.id}/set_availability/",
+            {"response": "available"},
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        self.assertEqual(self._list(self.creator).data["results"][0]["status"], "confirmed")
+
+    def test_write_request_bumps_versions_with_single_set_many(self):
+        self.client.force_authenticate(user=self.guest)
+        with patch.object(cache, "set_many", wraps=cache.set_many) as set_many:
+            self.client.post(
+                f"/api/events/{self.event.id}/set_availability/",
+                {"response": "available"},
+                format="json",
+            )
+
+        version_calls = [
+            call for call in set_many.call_args_list if "events:list" in next(iter(call.args[0]))
+        ]
+        self.assertEqual(len(version_calls), 1)
+        self.assertEqual(len(version_calls[0].args[0]), 2)
+
+    def test_preview_does_not_invalidate(self):
+        self._list(self.creator)
+        events_list_cache.reset_stats()
+
+        self.client.post(
+            "/api/events/preview_conflicts/",
+            {
+                "event_date": self.event.event_date.isoformat(),
+                "start_time": "10:00",
+                "end_time": "11:00",
+            },
+            format="json",
+        )
+        self._list(self.creator)
+
+        self.assertEqual(events_list_cache.stats()["hits"], 1)
+
+    def test_cache_stats_requires_staff(self):
+        self.client.force_authenticate(user=self.creator)
+        response = self.client.get("/api/events/cache-stats/")
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+        staff = User.objects.create_user(username="admin", password="senha123", is_staff=True)
+        self.client.force_authenticate(user=staff)
+        response = self.client.get("/api/events/cache-stats/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn("hit_ratio", response.data)
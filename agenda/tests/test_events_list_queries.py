@@ -0,0 +1,86 @@
+# agenda/tests/test_events_list_queries.py
+"""
+Regressão de N+1 na listagem de eventos (approval_label e availability_summary).
+"""
+
+from datetime import date, time, timedelta
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from agenda.models import Availability, Event, Musician
+
+
+class EventsListQueryCountTest(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.creator = User.objects.create_user(
+            username="sara", email="sara@test.com", password="senha123", first_name="Sara"
+        )
+        Musician.objects.create(user=self.creator, instrument="vocal", role="member")
+        self.guests = []
+        for name in ("Ana", "Bruno"):
+            user = User.objects.create_user(
+                username=name.lower(),
+                email=f"{name.lower()}@test.com",
+                password="senha123",
+                first_name=name,
+            )
+            self.guests.append(Musician.objects.create(user=user, instrument="drums"))
+        self.client.force_authenticate(user=self.creator)
+
+    def _confirmed_events(self, count):
+        """Eventos confirmados sem approved_by: approval_label depende das availabilities."""
+        base = date.today() + timedelta(days=1)
+        now = timezone.now()
+        for i in range(count):
+            event = Event.objects.create(
+                title=f"Show {i}",
+                location="Bar",
+                event_date=base + timedelta(days=i),
+                start_time=time(20, 0),
+                end_time=time(22, 0),
+                created_by=self.creator,
+                status="confirmed",
+            )
+            Availability.objects.create(
+                musician=self.guests[0],
+                event=event,
+                response="available",
+                responded_at=now - timedelta(hours=1),
+            )
+            Availability.objects.create(
+                musician=self.guests[1], event=event, response="available", responded_at=now
+            )
+
+    def _list_queries(self):
+        cache.clear()
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get("/api/events/?page_size=100")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response, len(queries.captured_queries)
+
+    def test_page_of_100_confirmed_events_uses_constant_queries(self):
+        self._confirmed_events(5)
+        _response, small = self._list_queries()
+
+        self._confirmed_events(95)
+        response, large = self._list_queries()
+
+        self.assertEqual(len(response.data["results"]), 100)
+        self.assertEqual(large, small)
+        self.assertLessEqual(large, 8)
+        # O último a aceitar (responded_at mais recente) aparece no rótulo
+        self.assertEqual(
+            {event["approval_label"] for event in response.data["results"]},
+            {"Confirmado por Bruno"},
+        )
+        self.assertEqual(
+            response.data["results"][0]["availability_summary"],
+            {"pending": 0, "available": 2, "unavailable": 0, "total": 2},
+        )
@@ -0,0 +1,182 @@
+# agenda/tests/test_instrument_keys.py
+"""
+Testes das chaves canônicas de instrumento (Musician.instrument_keys) e do
+mapa de aliases compilado em agenda/instrument_utils.py.
+"""
+
+from datetime import date, time, timedelta
+from io import StringIO
+from unittest import skipUnless
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from rest_framework.test import APITestCase
+
+from agenda.instrument_utils import (
+    ALIASES_VERSION_KEY,
+    InstrumentAliasMap,
+    filter_by_instrument,
+    get_instrument_aliases,
+    instrument_key,
+)
+from agenda.models import Instrument, LeaderAvailability, Musician
+
+
+class InstrumentAliasMapTest(TestCase):
+    def test_instrument_key_folds_spelling(self):
+        self.assertEqual(instrument_key("  Violão "), "violao")
+        self.assertEqual(instrument_key("Acoustic guitar"), "acoustic_guitar")
+        self.assertEqual(instrument_key("Produtor(a)"), "produtor_a")
+        self.assertEqual(instrument_key(None), "")
+
+    def test_labels_and_instrument_rows_share_a_canonical_key(self):
+        aliases = InstrumentAliasMap([("zabumba", "Zabumba"), ("zabumba", "Bumbo nordestino")])
+
+        self.assertEqual(aliases.canonical("Violão"), "acoustic_guitar")
+        self.assertEqual(aliases.canonical("Contrabaixo acústico"), "double_bass")
+        self.assertEqual(aliases.canonical("zabumba"), aliases.canonical("bumbo nordestino"))
+
+    def test_aliases_are_directional(self):
+        aliases = InstrumentAliasMap()
+
+        # "teclado" encontra quem toca piano; "piano" não encontra quem toca teclado
+        self.assertIn("keyboard", aliases.keys_for(["piano"]))
+        self.assertNotIn("piano", aliases.keys_for(["keyboard"]))
+        self.assertEqual(aliases.keys_for(["violonista"]), ["acoustic_guitar", "violonista"])
+
+
+class MusicianInstrumentKeysTest(TestCase):
+    def _musician(self, username, instrument, instruments=None):
+        user = User.objects.create_user(
+            username=username, email=f"{username}@test.com", password="senha12345"
+        )
+        return Musician.objects.create(
+            user=user, instrument=instrument, instruments=instruments or []
+        )
+
+    def _filter(self, term):
+        return set(filter_by_instrument(Musician.objects.all(), term).values_list("id", flat=True))
+
+    def test_save_keeps_keys_in_sync(self):
+        musician = self._musician("ana", "vocal", ["Violão"])
+        self.assertEqual(self._filter("violao"), {musician.id})
+
+        musician.instruments = ["bateria"]
+        musician.save(update_fields=["instruments"])
+
+        self.assertEqual(self._filter("violao"), set())
+        self.assertEqual(self._filter("drums"), {musician.id})
+        self.assertEqual(self._filter("cantora"), set())
+        self.assertEqual(self._filter("vocalista"), {musician.id})
+
+    @skipUnless(connection.vendor == "postgresql", "índice GIN só existe no Postgres")
+    def test_postgres_filter_uses_gin_index(self):
+        musician = self._musician("ana", "vocal", ["Violão"])
+        with connection.cursor() as cursor:
+            cursor.execute("SET LOCAL enable_seqscan = off")
+            cursor.execute("SET LOCAL enable_indexscan = off")
+        queryset = filter_by_instrument(Musician.objects.all(), "violao")
+
+        self.assertEqual(set(queryset.values_list("id", flat=True)), {musician.id})
+        self.assertIn("agenda_musician_instr_keys_gin", queryset.explain())
+
+    def test_exact_keys_do_not_match_substrings(self):
+        self._musician("bia", "double_bass")
+
+        self.assertEqual(self._filter("bass"), set())
+        self.assertEqual(self._filter("contrabaixo acustico"), {Musician.objects.get().id})
+
+    def test_new_instrument_rows_apply_after_rebuild(self):
+        musician = self._musician("caio", "zabumba")
+        Instrument.objects.create(name="bumbo", display_name="Zabumba")
+        self.assertEqual(get_instrument_aliases().canonical("zabumba"), "bumbo")
+        self.assertEqual(self._filter("bumbo"), set())
+
+        call_command("rebuild_musician_search", stdout=StringIO())
+
+        self.assertEqual(self._filter("bumbo"), {musician.id})
+        Instrument.objects.filter(name="bumbo").delete()
+        self.assertEqual(get_instrument_aliases().canonical("zabumba"), "zabumba")
+
+    def test_instrument_changes_rekey_affected_musicians_after_commit(self):
+        musician = self._musician("caio", "zabumba")
+        other = self._musician("dani", "vocal")
+
+        with self.captureOnCommitCallbacks(execute=True):
+            instrument = Instrument.objects.create(name="bumbo", display_name="Zabumba")
+        self.assertEqual(self._filter("bumbo"), {musician.id})
+
+        with self.captureOnCommitCallbacks(execute=True):
+            instrument.display_name = "Bumbo nordestino"
+            instrument.save()
+        self.assertEqual(self._filter("bumbo"), set())
+        self.assertEqual(self._filter("zabumba"), {musician.id})
+
+        with self.captureOnCommitCallbacks(execute=True):
+            instrument.delete()
+        self.assertEqual(self._filter("zabumba"), {musician.id})
+        self.assertEqual(self._filter("vocal"), {other.id})
+
+    def test_shared_version_change_recompiles_in_other_processes(self):
+        aliases = get_instrument_aliases()
+        # Outro processo alterou a tabela Instrument: só a versão no cache muda aqui
+        Instrument.objects.bulk_create([Instrument(name="bumbo", display_name="Zabumba")])
+        self.assertIs(get_instrument_aliases(), aliases)
+
+        cache.set(ALIASES_VERSION_KEY, "outro-processo")
+
+        self.assertIsNot(get_instrument_aliases(), aliases)
+        self.assertEqual(get_instrument_aliases().canonical("zabumba"), "bumbo")
+
+    def test_usage_count_updates_keep_compiled_map(self):
+        aliases = get_instrument_aliases()
+        Instrument.objects.get(name="violao").increment_usage()
+        instrument = Instrument.objects.get(name="violao")
+        instrument.save(update_fields=["usage_count"])
+
+        self.assertIs(get_instrument_aliases(), aliases)
+
+
+class InstrumentFilterEndpointsTest(APITestCase):
+    def setUp(self):
+        self.viewer = User.objects.create_user(
+            username="viewer", email="viewer@test.com", password="senha12345"
+        )
+        Musician.objects.create(user=self.viewer, instrument="vocal")
+        user = User.objects.create_user(
+            username="tecladista", email="tec@test.com", password="senha12345"
+        )
+        self.pianist = Musician.objects.create(
+            user=user, instrument="vocal", instruments=["piano"], city="Uberlândia"
+        )
+        self.target_date = date.today() + timedelta(days=3)
+        LeaderAvailability.objects.create(
+            leader=self.pianist,
+            date=self.target_date,
+            start_time=time(18, 0),
+            end_time=time(23, 0),
+            is_public=True,
+        )
+
+    def test_all_views_use_instrument_keys(self):
+        self.client.force_authenticate(user=self.viewer)
+        urls = (
+            "/api/musicians/?instrument=teclado",
+            "/api/musicians/all/?instrument=teclado",
+            "/api/leader-availabilities/?instrument=teclado&public=true",
+            f"/api/leader-availabilities/available_musicians/?date={self.target_date}"
+            "&instrument=teclado",
+        )
+        for url in urls:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200, url)
+            payload = response.data
+            if isinstance(payload, dict):
+                payload = payload["results"]
+            self.assertEqual(len(payload), 1, url)
+
+        response = self.client.get("/api/musicians/?instrument=sintetizador")
+        self.assertEqual(len(response.data["results"]), 0)
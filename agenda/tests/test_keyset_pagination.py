@@ -0,0 +1,151 @@
+# agenda/tests/test_keyset_pagination.py
+"""
+Testes da paginação keyset (?pagination=cursor) de eventos, pedidos de orçamento e conexões.
+"""
+
+from datetime import date, time, timedelta
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from agenda.models import Connection, ContractorProfile, Event, Musician, QuoteRequest
+
+
+def _walk(client, url):
+    """Segue os links next e devolve os ids na ordem vista."""
+    ids, pages = [], 0
+    while url:
+        response = client.get(url)
+        assert response.status_code == status.HTTP_200_OK, response.data
+        ids += [item["id"] for item in response.data["results"]]
+        url = response.data["next"]
+        pages += 1
+    return ids, pages
+
+
+class EventKeysetPaginationTest(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(
+            username="sara", email="sara@test.com", password="senha123"
+        )
+        Musician.objects.create(user=self.user, instrument="vocal", role="member")
+        self.client.force_authenticate(user=self.user)
+
+        base = date.today() + timedelta(days=1)
+        # Datas repetidas forçam o desempate por id
+        self.events = [
+            Event.objects.create(
+                title=f"Show {i}",
+                location="Bar",
+                event_date=base + timedelta(days=i // 3),
+                start_time=time(20, 0),
+                end_time=time(22, 0),
+                created_by=self.user,
+                status="proposed",
+            )
+            for i in range(11)
+        ]
+        self.expected = [
+            e.id for e in sorted(self.events, key=lambda e: (e.event_date, e.id), reverse=True)
+        ]
+
+    def test_walks_all_pages_in_keyset_order(self):
+        ids, pages = _walk(self.client, "/api/events/?pagination=cursor&page_size=4")
+        self.assertEqual(ids, self.expected)
+        self.assertEqual(pages, 3)
+
+    def test_previous_link_returns_same_page(self):
+        first = self.client.get("/api/events/?pagination=cursor&page_size=4")
+        self.assertIsNone(first.data["previous"])
+        second = self.client.get(first.data["next"])
+        back = self.client.get(second.data["previous"])
+
+        self.assertEqual(
+            [e["id"] for e in back.data["results"]], [e["id"] for e in first.data["results"]]
+        )
+
+    def test_count_is_optional(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get("/api/events/?pagination=cursor&page_size=4")
+        self.assertNotIn("count", response.data)
+        self.assertFalse(any('"__count"' in q["sql"] for q in queries))
+
+        response = self.client.get("/api/events/?pagination=cursor&page_size=4&count=true")
+        self.assertEqual(response.data["count"], 11)
+
+    def test_page_number_mode_is_default(self):
+        response = self.client.get("/api/events/?page_size=4&page=2")
+        self.assertEqual(response.data["count"], 11)
+        self.assertEqual([e["id"] for e in response.data["results"]], self.expected[4:8])
+
+    def test_invalid_cursor_returns_404(self):
+        response = self.client.get("/api/events/?cursor=nao-e-cursor")
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
+class QuoteAndConnectionKeysetPaginationTest(APITestCase):
+    def setUp(self):
+        self.contractor_user = User.objects.create_user(
+            username="contratante", email="contratante@test.com", password="senha123"
+        )
+        self.contractor = ContractorProfile.objects.create(
+            user=self.contractor_user, name="Empresa", city="Sao Paulo", state="SP"
+        )
+        self.musician_user = User.objects.create_user(
+            username="musico", email="musico@test.com", password="senha123"
+        )
+        self.musician = Musician.objects.create(
+            user=self.musician_user, instrument="guitar", is_active=True
+        )
+
+    def test_quote_requests_cursor_mode(self):
+        quotes = [
+            QuoteRequest.objects.create(
+                contractor=self.contractor,
+                musician=self.musician,
+                event_date=timezone.localdate() + timedelta(days=5),
+                event_type=f"Evento {i}",
+                location_city="Sao Paulo",
+                location_state="SP",
+                status="pending",
+            )
+            for i in range(5)
+        ]
+        # Mesmo created_at para todos: só o id desempata
+        QuoteRequest.objects.update(created_at=timezone.now())
+        expected = sorted((q.id for q in quotes), reverse=True)
+
+        self.client.force_authenticate(user=self.musician_user)
+        ids, pages = _walk(self.client, "/api/quotes/musician/?pagination=cursor&page_size=2")
+        self.assertEqual(ids, expected)
+        self.assertEqual(pages, 3)
+
+        self.client.force_authenticate(user=self.contractor_user)
+        ids, _pages = _walk(self.client, "/api/quotes/contractor/?pagination=cursor&page_size=2")
+        self.assertEqual(ids, expected)
+
+    def test_connections_cursor_mode(self):
+        targets = [
+            Musician.objects.create(
+                user=User.objects.create_user(
+                    username=f"alvo{i}", email=f"alvo{i}@test.com", password="senha123"
+                ),
+                instrument="bass",
+            )
+            for i in range(3)
+        ]
+        connections = [
+            Connection.objects.create(follower=self.musician, target=target) for target in targets
+        ]
+
+        self.client.force_authenticate(user=self.musician_user)
+        ids, pages = _walk(self.client, "/api/connections/?pagination=cursor&page_size=2")
+
+        self.assertEqual(ids, sorted((c.id for c in connections), reverse=True))
+        self.assertEqual(pages, 2)
@@ -7,12 +7,14 @@ Cobre criação, listagem, filtros e permissões.
 from datetime import date, time, timedelta
 
 from django.contrib.auth.models import User
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from rest_framework import status
 from rest_framework.test import APIClient, APITestCase
 
-from agenda.models import LeaderAvailability, Membership, Musician, Organization
+from agenda.models import Event, LeaderAvailability, Membership, Musician, Organization
 
 
 class LeaderAvailabilityModelTest(TestCase):
@@ -394,6 +396,99 @@ class LeaderAvailabilityAPITest(APITestCase):
         for r in results:
             self.assertEqual(r["leader"], self.musician.id)
 
+    def test_bulk_create_splits_around_events(self):
+        """Importação em lote fragmenta disponibilidades ao redor de eventos existentes"""
+        day = date.today() + timedelta(days=3)
+        Event.objects.create(
+            title="Show",
+            location="Bar",
+            event_date=day,
+            start_time=time(16, 0),
+            end_time=time(17, 0),
+            created_by=self.user,
+            status="confirmed",
+        )
+        payload = {
+            "availabilities": [
+                {"date": day.isoformat(), "start_time": "14:00", "end_time": "20:00"},
+                {
+                    "date": (day + timedelta(days=1)).isoformat(),
+                    "start_time": "10:00",
+                    "end_time": "12:00",
+                },
+            ]
+        }
+        response = self.client.post(reverse("leader-availability-bulk"), payload, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data["created"], 2)
+        self.assertEqual(response.data["split"], 1)
+        slots = [
+            (a["date"], a["start_time"], a["end_time"]) for a in response.data["availabilities"]
+        ]
+        self.assertEqual(
+            slots,
+            [
+                (day.isoformat(), "14:00", "15:20"),
+                (day.isoformat(), "17:40", "20:00"),
+                ((day + timedelta(days=1)).isoformat(), "10:00", "12:00"),
+            ],
+        )
+        self.assertEqual(
+            LeaderAvailability.objects.filter(leader=self.musician, is_active=True).count(), 3
+        )
+
+    def test_bulk_create_uses_constant_queries(self):
+        """Número de queries não cresce com a quantidade de disponibilidades"""
+        start = date.today() + timedelta(days=1)
+        for offset in range(0, 30, 2):
+            Event.objects.create(
+                title="Show",
+                location="Bar",
+                event_date=start + timedelta(days=offset),
+                start_time=time(19, 0),
+                end_time=time(21, 0),
+                created_by=self.user,
+                status="confirmed",
+            )
+
+        def payload(days):
+            return {
+                "availabilities": [
+                    {
+                        "date": (start + timedelta(days=offset)).isoformat(),
+                        "start_time": "18:00",
+                        "end_time": "23:30",
+                    }
+                    for offset in range(days)
+                ]
+            }
+
+        url = reverse("leader-availability-bulk")
+        with CaptureQueriesContext(connection) as small:
+            self.client.post(url, payload(2), format="json")
+        LeaderAvailability.objects.all().delete()
+        with CaptureQueriesContext(connection) as large:
+            response = self.client.post(url, payload(30), format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data["split"], 15)
+        self.assertEqual(len(large.captured_queries), len(small.captured_queries))
+
+    def test_bulk_create_validates_payload(self):
+        url = reverse("leader-availability-bulk")
+        response = self.client.post(url, {"availabilities": []}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        past = (date.today() - timedelta(days=1)).isoformat()
+        response = self.client.post(
+            url,
+            {"availabilities": [{"date": past, "start_time": "10:00", "end_time": "12:00"}]},
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(LeaderAvailability.objects.exists())
+
 
 class LeaderAvailabilityInstrumentsTest(APITestCase):
     """Testes do endpoint de instrumentos"""
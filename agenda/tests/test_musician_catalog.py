@@ -0,0 +1,139 @@
+# agenda/tests/test_musician_catalog.py
+"""
+Testes do catálogo público com facetas (agenda/musician_catalog.py).
+"""
+
+from decimal import Decimal
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APITestCase
+
+from agenda.models import Musician
+from agenda.musician_catalog import canonical_catalog_params, catalog_cache_key
+
+
+def _make_musician(username, **fields):
+    user = User.objects.create_user(
+        username=username, email=f"{username}@test.com", password="senha12345", first_name=username
+    )
+    fields.setdefault("instrument", "vocal")
+    return Musician.objects.create(user=user, **fields)
+
+
+class MusicianCatalogTest(APITestCase):
+    url = "/api/musicians/catalog/"
+
+    def setUp(self):
+        cache.clear()
+        self.ana = _make_musician(
+            "ana",
+            musical_genres=["mpb", "samba"],
+            city="Uberlândia",
+            state="MG",
+            average_rating=Decimal("4.50"),
+            total_ratings=3,
+        )
+        self.bia = _make_musician(
+            "bia",
+            instrument="guitar",
+            musical_genres=["rock"],
+            city="Uberlândia",
+            state="MG",
+            average_rating=Decimal("3.20"),
+            total_ratings=1,
+        )
+        self.caio = _make_musician("caio", musical_genres=["mpb"], city="Santos", state="SP")
+        _make_musician(
+            "inativo", musical_genres=["mpb"], city="Santos", state="SP", is_active=False
+        )
+
+    def test_results_and_facets_of_filtered_set(self):
+        response = self.client.get(self.url, {"genre": "MPB"})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["count"], 2)
+        self.assertEqual([m["id"] for m in response.data["results"]], [self.ana.id, self.caio.id])
+        facets = response.data["facets"]
+        self.assertEqual(facets["instruments"], [{"value": "vocal", "label": "Vocal", "count": 2}])
+        self.assertEqual(
+            facets["genres"], [{"value": "mpb", "count": 2}, {"value": "samba", "count": 1}]
+        )
+        self.assertEqual(
+            facets["cities"],
+            [
+                {"city": "Santos", "state": "SP", "count": 1},
+                {"city": "Uberlândia", "state": "MG", "count": 1},
+            ],
+        )
+        self.assertEqual(
+            facets["states"], [{"value": "MG", "count": 1}, {"value": "SP", "count": 1}]
+        )
+        self.assertEqual(
+            facets["ratings"],
+            [
+                {"min_rating": 4, "count": 1},
+                {"min_rating": 3, "count": 1},
+                {"min_rating": 2, "count": 1},
+                {"min_rating": 1, "count": 1},
+            ],
+        )
+
+    def test_filters_and_pagination(self):
+        response = self.client.get(self.url, {"state": "mg", "page_size": 1})
+        self.assertEqual(response.data["count"], 2)
+        self.assertEqual([m["id"] for m in response.data["results"]], [self.ana.id])
+        self.assertIn("page=2", response.data["next"])
+        self.assertIsNone(response.data["previous"])
+
+        response = self.client.get(response.data["next"])
+        self.assertEqual([m["id"] for m in response.data["results"]], [self.bia.id])
+        self.assertIsNone(response.data["next"])
+        self.assertNotIn("page=", response.data["previous"])
+
+        response = self.client.get(self.url, {"instrument": "guitarra", "min_rating": "3"})
+        self.assertEqual([m["id"] for m in response.data["results"]], [self.bia.id])
+        response = self.client.get(self.url, {"search": "caio", "min_rating": "abc"})
+        self.assertEqual([m["id"] for m in response.data["results"]], [self.caio.id])
+
+    def test_equivalent_params_share_cache_entry(self):
+        first = canonical_catalog_params({"city": " UBERLÂNDIA ", "instrument": "Violão"})
+        second = canonical_catalog_params(
+            {"city": "uberlândia", "instrument": "acoustic guitar", "page": "1", "foo": "x"}
+        )
+        self.assertEqual(catalog_cache_key(first), catalog_cache_key(second))
+
+        self.client.get(self.url, {"city": "Uberlândia"})
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(self.url, {"city": "uberlândia"})
+        self.assertEqual(response.data["count"], 2)
+        # Cache hit: só busca os músicos da página
+        self.assertEqual(len(ctx.captured_queries), 1)
+
+    def test_warm_command_caches_top_cities(self):
+        out = StringIO()
+        call_command("warm_musician_catalog", "--top", "1", stdout=out)
+
+        self.assertIn("2 página(s)", out.getvalue())
+        for filters, expected_queries in (
+            ({"city": "Uberlândia", "state": "MG"}, 1),
+            ({}, 1),
+            ({"city": "Santos", "state": "SP"}, 3),
+        ):
+            with CaptureQueriesContext(connection) as ctx:
+                self.client.get(self.url, filters)
+            self.assertEqual(len(ctx.captured_queries), expected_queries, filters)
+
+    def test_musician_changes_invalidate_cached_pages(self):
+        response = self.client.get(self.url, {"state": "SP"})
+        self.assertEqual(response.data["count"], 1)
+
+        self.bia.state = "SP"
+        self.bia.save()
+
+        response = self.client.get(self.url, {"state": "SP"})
+        self.assertEqual(response.data["count"], 2)
@@ -0,0 +1,161 @@
+# agenda/tests/test_musician_facets.py
+"""
+Testes das contagens materializadas de facetas (MusicianFacetCount).
+"""
+
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APITestCase
+
+from agenda.models import Musician, MusicianFacetCount
+from agenda.musician_facets import (
+    FACET_CITY,
+    FACET_GENRE,
+    FACET_INSTRUMENT,
+    city_facet_counts,
+    facet_counts,
+    rebuild_facet_counts,
+)
+
+
+def _make_musician(username, **fields):
+    user = User.objects.create_user(
+        username=username, email=f"{username}@test.com", password="senha12345"
+    )
+    fields.setdefault("instrument", "vocal")
+    return Musician.objects.create(user=user, **fields)
+
+
+class MusicianFacetCountTest(TestCase):
+    def setUp(self):
+        self.ana = _make_musician(
+            "ana", musical_genres=["MPB", "samba"], city="Uberlândia", state="MG"
+        )
+        self.bia = _make_musician(
+            "bia", instrument="guitar", musical_genres=["mpb"], city="uberlândia", state="MG"
+        )
+        self.caio = _make_musician("caio", musical_genres=["rock"], city="Santos", state="SP")
+
+    def assertConsistent(self):
+        self.assertEqual(rebuild_facet_counts(dry_run=True), 0)
+
+    def test_counts_per_scope(self):
+        self.assertEqual(facet_counts(FACET_GENRE), [("mpb", 2), ("rock", 1), ("samba", 1)])
+        self.assertEqual(facet_counts(FACET_GENRE, city="UBERLÂNDIA"), [("mpb", 2), ("samba", 1)])
+        self.assertEqual(facet_counts(FACET_INSTRUMENT, state="sp"), [("vocal", 1)])
+        self.assertEqual(
+            facet_counts(FACET_CITY, state="MG"), [("Uberlândia", 1), ("uberlândia", 1)]
+        )
+        self.assertEqual(
+            city_facet_counts(),
+            [("Santos", "SP", 1), ("Uberlândia", "MG", 1), ("uberlândia", "MG", 1)],
+        )
+        self.assertConsistent()
+
+    def test_save_applies_incremental_delta(self):
+        self.ana.musical_genres.append("forró")
+        self.ana.city = "Santos"
+        self.ana.state = "SP"
+        self.ana.save(update_fields=["musical_genres", "city", "state"])
+
+        self.assertEqual(
+            facet_counts(FACET_GENRE, state="SP"),
+            [("forró", 1), ("mpb", 1), ("rock", 1), ("samba", 1)],
+        )
+        self.assertEqual(facet_counts(FACET_GENRE, state="MG"), [("mpb", 1)])
+        self.assertConsistent()
+
+        # Salvar campos que não afetam facetas não toca na tabela
+        with CaptureQueriesContext(connection) as ctx:
+            self.bia.bio = "Guitarrista"
+            self.bia.save(update_fields=["bio"])
+        self.assertFalse(any("musicianfacetcount" in q["sql"] for q in ctx.captured_queries))
+
+    def test_deactivation_and_delete_remove_contributions(self):
+        self.caio.is_active = False
+        self.caio.save()
+        self.assertFalse(MusicianFacetCount.objects.filter(state="SP", count__gt=0).exists())
+        self.assertEqual(facet_counts(FACET_GENRE, state="SP"), [])
+
+        self.bia.user.delete()
+        self.assertEqual(facet_counts(FACET_INSTRUMENT), [("vocal", 1)])
+        self.assertConsistent()
+
+    def test_rebuild_removes_zero_rows(self):
+        self.caio.is_active = False
+        self.caio.save()
+        self.assertTrue(MusicianFacetCount.objects.filter(state="SP", count=0).exists())
+
+        self.assertEqual(rebuild_facet_counts(), 0)
+        self.assertFalse(MusicianFacetCount.objects.filter(state="SP").exists())
+
+    def test_instance_with_deferred_fields(self):
+        musician = Musician.objects.only("id", "user", "city").get(pk=self.ana.pk)
+        musician.city = "Araguari"
+        musician.save()
+
+        self.assertEqual(facet_counts(FACET_GENRE, city="araguari"), [("mpb", 1), ("samba", 1)])
+        self.assertConsistent()
+
+    def test_stale_instance_delta_uses_saved_row(self):
+        first = Musician.objects.get(pk=self.caio.pk)
+        second = Musician.objects.get(pk=self.caio.pk)
+        first.city = "Campinas"
+        first.save(update_fields=["city"])
+
+        second.musical_genres = ["choro"]
+        second.save(update_fields=["musical_genres"])
+
+        self.assertEqual(facet_counts(FACET_GENRE, city="campinas"), [("choro", 1)])
+        self.assertEqual(facet_counts(FACET_GENRE, city="santos"), [])
+        self.assertConsistent()
+
+        second.delete()
+        self.assertEqual(facet_counts(FACET_CITY, state="SP"), [])
+        self.assertConsistent()
+
+    def test_rebuild_command_fixes_bulk_updates(self):
+        Musician.objects.filter(pk=self.caio.pk).update(musical_genres=["choro"])
+
+        with self.assertRaises(CommandError):
+            call_command("rebuild_musician_facets", "--check", stdout=StringIO())
+
+        out = StringIO()
+        call_command("rebuild_musician_facets", stdout=out)
+        self.assertIn("2 contagem(ns) corrigida(s)", out.getvalue())
+        self.assertEqual(facet_counts(FACET_GENRE, state="SP"), [("choro", 1)])
+        self.assertConsistent()
+
+
+class MusicianFacetEndpointsTest(APITestCase):
+    def setUp(self):
+        _make_musician("ana", musical_genres=["mpb"], city="Santos", state="SP")
+        _make_musician("bia", instrument="guitar", musical_genres=["mpb", "rock"], state="MG")
+
+    def test_facets_endpoint_returns_all_facets(self):
+        with self.assertNumQueries(3):
+            response = self.client.get("/api/musicians/facets/?state=SP")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["genres"], [{"value": "mpb", "count": 1}])
+        self.assertEqual(
+            response.data["instruments"], [{"value": "vocal", "label": "Vocal", "count": 1}]
+        )
+        self.assertEqual(response.data["cities"], [{"city": "Santos", "state": "SP", "count": 1}])
+
+    def test_genres_and_instruments_use_facet_counts(self):
+        self.assertEqual(self.client.get("/api/musicians/genres/").data, ["mpb", "rock"])
+        self.assertEqual(self.client.get("/api/musicians/genres/?state=sp").data, ["mpb"])
+
+        self.client.force_authenticate(user=User.objects.get(username="ana"))
+        response = self.client.get("/api/musicians/instruments/")
+        self.assertEqual(
+            [(item["value"], item["count"]) for item in response.data],
+            [("guitar", 1), ("vocal", 1)],
+        )
@@ -0,0 +1,141 @@
+# agenda/tests/test_musician_search_index.py
+"""
+Testes do documento/índice de busca de músicos (agenda/musician_search.py).
+"""
+
+from io import StringIO
+from unittest import skipUnless
+from unittest.mock import patch
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from rest_framework.test import APITestCase
+
+from agenda.models import Musician
+from agenda.musician_search import build_search_document, search_musicians
+
+
+class MusicianSearchIndexTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="joao_sanfona",
+            email="joao@test.com",
+            password="senha12345",
+            first_name="João",
+            last_name="Araújo",
+        )
+        self.musician = Musician.objects.create(
+            user=self.user,
+            instrument="accordion",
+            instruments=["accordion", "acoustic_guitar"],
+            bio="Forró pé-de-serra e xote",
+            musical_genres=["forro", "pop_rock"],
+            instagram="@joao.sanfona",
+        )
+        other = User.objects.create_user(
+            username="maria", email="maria@test.com", password="senha12345", first_name="Maria"
+        )
+        self.other = Musician.objects.create(user=other, instrument="vocal", bio="MPB e samba")
+
+    def _search(self, query):
+        return set(search_musicians(Musician.objects.all(), query).values_list("id", flat=True))
+
+    def test_document_is_accent_folded_and_split(self):
+        document = build_search_document(self.musician).split()
+
+        self.assertIn("joao", document)
+        self.assertIn("araujo", document)
+        self.assertIn("forro", document)
+        self.assertIn("acoustic", document)
+        self.assertIn("rock", document)
+        self.assertEqual(len(document), len(set(document)))
+
+    def test_search_matches_prefixes_without_accents(self):
+        self.assertEqual(self._search("FORRÓ"), {self.musician.id})
+        self.assertEqual(self._search("arau"), {self.musician.id})
+        self.assertEqual(self._search("pop_rock"), {self.musician.id})
+        self.assertEqual(self._search("samba"), {self.other.id})
+
+    def test_all_terms_must_match(self):
+        self.assertEqual(self._search("joao xote"), {self.musician.id})
+        self.assertEqual(self._search("joao samba"), set())
+
+    def test_user_rename_updates_document(self):
+        self.user.first_name = "Sebastião"
+        self.user.save()
+
+        self.assertEqual(self._search("sebastiao"), {self.musician.id})
+        self.assertEqual(self._search("araujo"), {self.musician.id})
+
+        self.user.username = "tiao_do_fole"
+        self.user.save(update_fields=["username"])
+        self.assertEqual(self._search("fole"), {self.musician.id})
+
+    def test_musician_update_and_delete_keep_index_in_sync(self):
+        self.musician.musical_genres = ["sertanejo"]
+        self.musician.bio = ""
+        self.musician.save(update_fields=["musical_genres", "bio"])
+
+        self.assertEqual(self._search("forro"), set())
+        self.assertEqual(self._search("sertanejo"), {self.musician.id})
+
+        self.musician.delete()
+        self.assertEqual(self._search("sertanejo"), set())
+
+    def test_unrelated_update_fields_skip_derived_fields(self):
+        musician = Musician.objects.get(pk=self.musician.pk)
+        musician.total_ratings = 3
+
+        with (
+            patch("agenda.musician_search.build_search_document") as build,
+            patch("agenda.instrument_utils.musician_instrument_keys") as keys,
+        ):
+            musician.save(update_fields=["total_ratings"])
+
+        build.assert_not_called()
+        keys.assert_not_called()
+        self.assertFalse(Musician.user.is_cached(musician))
+        self.assertEqual(self._search("sanfona"), {self.musician.id})
+
+    @skipUnless(connection.vendor == "postgresql", "índice GIN só existe no Postgres")
+    def test_postgres_query_uses_gin_index(self):
+        # Sem seq scan nem index scan o planner só responde pelo índice da migration 0062 se a
+        # expressão da consulta for a mesma do índice
+        with connection.cursor() as cursor:
+            cursor.execute("SET LOCAL enable_seqscan = off")
+            cursor.execute("SET LOCAL enable_indexscan = off")
+        queryset = search_musicians(Musician.objects.all(), "joao xote")
+
+        self.assertEqual(set(queryset.values_list("id", flat=True)), {self.musician.id})
+        self.assertIn("agenda_musician_search_gin", queryset.explain())
+
+    def test_rebuild_command_fixes_bulk_updates(self):
+        Musician.objects.filter(pk=self.other.pk).update(bio="Choro e chorinho")
+        self.assertEqual(self._search("choro"), set())
+
+        out = StringIO()
+        call_command("rebuild_musician_search", stdout=out)
+
+        self.assertIn("1 documento(s)", out.getvalue())
+        self.assertEqual(self._search("choro"), {self.other.id})
+
+
+class MusicianSearchEndpointsTest(APITestCase):
+    def setUp(self):
+        for username, bio in (("ana", "Violão e voz"), ("bia", "Voz, violão e violão de 7")):
+            user = User.objects.create_user(
+                username=username, email=f"{username}@test.com", password="senha12345"
+            )
+            Musician.objects.create(user=user, instrument="vocal", bio=bio, city="Uberlândia")
+
+    def test_both_views_use_the_search_index(self):
+        for url in ("/api/musicians/?search=violao", "/api/musicians/all/?search=violao"):
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200, url)
+            payload = response.data.get("results", response.data)
+            self.assertEqual(len(payload), 2, url)
+
+        response = self.client.get("/api/musicians/all/?search=violao%207")
+        self.assertEqual(len(response.data["results"]), 1)
@@ -0,0 +1,163 @@
+# agenda/tests/test_public_cache.py
+"""
+Testes do cache stale-while-revalidate dos endpoints públicos (agenda/public_cache.py).
+"""
+
+from unittest.mock import patch
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.test import APIRequestFactory, APITestCase
+
+from agenda import public_cache as public_cache_module
+from agenda.models import Musician, Organization
+from agenda.public_cache import public_cache
+
+TTLS = {"soft_ttl": 60, "hard_ttl": 600}
+
+
+def _run_inline(func):
+    func()
+
+
+class PublicCacheTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.calls = []
+
+    def _compute(self, value):
+        def compute():
+            self.calls.append(value)
+            return value
+
+        return compute
+
+    def test_fresh_entry_is_served_without_recomputing(self):
+        self.assertEqual(public_cache.get_or_compute("k", self._compute("a"), **TTLS), "a")
+        self.assertEqual(public_cache.get_or_compute("k", self._compute("b"), **TTLS), "a")
+        self.assertEqual(self.calls, ["a"])
+
+    def test_stale_entry_is_served_and_refreshed_in_background(self):
+        public_cache.get_or_compute("k", self._compute("a"), **TTLS)
+
+        with (
+            patch.object(public_cache, "_now", return_value=10**10),
+            patch.object(public_cache_module, "_run_in_background", side_effect=_run_inline),
+        ):
+            # Stale: devolve o valor antigo e recalcula fora da requisição
+            self.assertEqual(public_cache.get_or_compute("k", self._compute("b"), **TTLS), "a")
+
+        self.assertEqual(public_cache.get_or_compute("k", self._compute("c"), **TTLS), "b")
+        self.assertEqual(self.calls, ["a", "b"])
+
+    def test_only_one_background_refresh_per_key(self):
+        public_cache.get_or_compute("k", self._compute("a"), **TTLS)
+
+        with (
+            patch.object(public_cache, "_now", return_value=10**10),
+            patch.object(public_cache_module, "_run_in_background") as background,
+        ):
+            public_cache.get_or_compute("k", self._compute("b"), **TTLS)
+            public_cache.get_or_compute("k", self._compute("b"), **TTLS)
+
+        self.assertEqual(background.call_count, 1)
+
+    def test_miss_waits_for_worker_holding_the_lock(self):
+        self.assertTrue(public_cache._acquire("k"))
+
+        def other_worker_finishes(_seconds):
+            public_cache.set("k", "from-other", **TTLS)
+
+        with patch.object(public_cache, "_sleep", side_effect=other_worker_finishes):
+            value = public_cache.get_or_compute("k", self._compute("mine"), **TTLS)
+
+        self.assertEqual(value, "from-other")
+        self.assertEqual(self.calls, [])
+
+    def test_tag_invalidation_turns_entry_into_miss(self):
+        public_cache.get_or_compute("k", self._compute("a"), tags=["t"], **TTLS)
+        public_cache.invalidate("other")
+        self.assertEqual(
+            public_cache.get_or_compute("k", self._compute("b"), tags=["t"], **TTLS), "a"
+        )
+
+        public_cache.invalidate("t")
+        self.assertEqual(
+            public_cache.get_or_compute("k", self._compute("b"), tags=["t"], **TTLS), "b"
+        )
+
+    def test_cached_view_computes_on_a_detached_anonymous_request(self):
+        seen = []
+
+        @public_cache.cached_view("probe", tags=lambda request: ("probe",), **TTLS)
+        def view(request):
+            seen.append(request)
+            return Response({"url": request.build_absolute_uri(), "user": str(request.user)})
+
+        http_request = APIRequestFactory().get(
+            "/api/probe/", {"b": "2", "a": "1"}, HTTP_X_FORWARDED_PROTO="https"
+        )
+        original = Request(http_request)
+        original.user = User.objects.create_user(username="ana", password="senha12345")
+
+        # Mesma URI absoluta da original (host/esquema do proxy), query na ordem da chave
+        self.assertTrue(original.build_absolute_uri().startswith("https://testserver"))
+        uri = original.build_absolute_uri("/api/probe/?a=1&b=2")
+        expected = {"url": uri, "user": "AnonymousUser"}
+        self.assertEqual(view(original).data, expected)
+
+        with (
+            patch.object(public_cache, "_now", return_value=10**10),
+            patch.object(public_cache_module, "_run_in_background", side_effect=_run_inline),
+        ):
+            self.assertEqual(view(original).data, expected)
+
+        self.assertEqual(len(seen), 2)
+        self.assertNotIn(original, seen)
+        self.assertIsNot(seen[0], seen[1])
+
+
+class PublicEndpointsInvalidationTest(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(
+            username="ana", email="ana@test.com", password="senha12345", first_name="Ana"
+        )
+        self.musician = Musician.objects.create(
+            user=self.user, instrument="vocal", city="Santos", state="SP", bio="MPB"
+        )
+
+    def test_profile_and_list_follow_musician_and_user_changes(self):
+        profile_url = f"/api/musicians/public/{self.musician.id}/"
+        self.assertEqual(self.client.get(profile_url).data["bio"], "MPB")
+        self.assertEqual(self.client.get("/api/musicians/all/").data["count"], 1)
+
+        self.client.force_authenticate(user=self.user)
+        self.client.patch("/api/musicians/me/", {"bio": "Samba"}, format="json")
+        self.client.force_authenticate(user=None)
+        self.assertEqual(self.client.get(profile_url).data["bio"], "Samba")
+
+        self.user.first_name = "Aninha"
+        self.user.save()
+        self.assertEqual(self.client.get(profile_url).data["full_name"], "Aninha")
+        results = self.client.get("/api/musicians/all/").data["results"]
+        self.assertEqual(results[0]["full_name"], "Aninha")
+
+        self.musician.is_active = False
+        self.musician.save()
+        self.assertEqual(self.client.get(profile_url).status_code, 404)
+        self.assertEqual(self.client.get("/api/musicians/all/").data["count"], 0)
+
+    def test_sponsors_follow_organization_changes(self):
+        url = "/api/organizations/sponsors/?city=Santos&state=SP"
+        self.assertEqual(self.client.get(url).data, [])
+        self.assertEqual(self.client.get("/api/organizations/sponsors/").status_code, 400)
+
+        Organization.objects.create(
+            name="Loja de Som", owner=self.user, is_sponsor=True, city="Santos", state="SP"
+        )
+
+        self.assertEqual([org["name"] for org in self.client.get(url).data], ["Loja de Som"])
@@ -6,6 +6,7 @@ Testes do endpoint public_calendar do MusicianViewSet.
 from datetime import date, time, timedelta
 
 from django.contrib.auth.models import User
+from django.core.cache import cache
 from django.urls import reverse
 from rest_framework import status
 from rest_framework.test import APIClient, APITestCase
@@ -15,6 +16,7 @@ from agenda.models import Availability, Event, LeaderAvailability, Musician
 
 class PublicCalendarTests(APITestCase):
     def setUp(self):
+        cache.clear()
         self.client = APIClient()
         self.future_date = date.today() + timedelta(days=7)
 
@@ -47,12 +49,18 @@ class PublicCalendarTests(APITestCase):
         )
 
     def _create_event(
-        self, created_by, status, musician=None, title="Show Teste", is_private=False
+        self,
+        created_by,
+        status,
+        musician=None,
+        title="Show Teste",
+        is_private=False,
+        event_date=None,
     ):
         event = Event.objects.create(
             title=title,
             location="Local Teste",
-            event_date=self.future_date,
+            event_date=event_date or self.future_date,
             start_time=time(20, 0),
             end_time=time(22, 0),
             status=status,
@@ -272,3 +280,50 @@ class PublicCalendarTests(APITestCase):
         availability_ids = [item["id"] for item in response.data["availabilities"]]
         self.assertNotIn(private_availability.id, availability_ids)
         self.assertIn(public_availability.id, availability_ids)
+
+    def test_visitor_reads_window_from_snapshot(self):
+        """Visitantes recortam o snapshot: só a busca do músico vai ao banco."""
+        near = self._create_event(created_by=self.user_owner, status="confirmed")
+        far = self._create_event(
+            created_by=self.user_owner,
+            status="confirmed",
+            event_date=date.today() + timedelta(days=40),
+        )
+        availability = self._create_leader_availability(is_public=True)
+        url = reverse("musician-public-calendar", args=[self.musician_owner.id])
+
+        response = self.client.get(url, {"days_ahead": 60})
+        self.assertEqual([item["id"] for item in response.data["events"]], [near.id, far.id])
+
+        with self.assertNumQueries(1):
+            response = self.client.get(url, {"days_ahead": 30})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertFalse(response.data["is_owner"])
+        self.assertEqual(response.data["days_ahead"], 30)
+        self.assertEqual([item["id"] for item in response.data["events"]], [near.id])
+        self.assertNotIn("title", response.data["events"][0])
+        self.assertEqual(
+            [item["id"] for item in response.data["availabilities"]], [availability.id]
+        )
+        self.assertEqual(response.data["availabilities"][0]["leader_name"], "Owner User")
+
+    def test_snapshot_follows_event_and_availability_changes(self):
+        """Convites, respostas e disponibilidades remontam o snapshot do músico."""
+        url = reverse("musician-public-calendar", args=[self.musician_owner.id])
+        self.assertEqual(self.client.get(url).data["events"], [])
+
+        event = self._create_event(
+            created_by=self.user_other, status="confirmed", musician=self.musician_owner
+        )
+        self.assertEqual([item["id"] for item in self.client.get(url).data["events"]], [event.id])
+
+        availability = self._create_leader_availability(is_public=True)
+        response = self.client.get(url)
+        self.assertEqual(
+            [item["id"] for item in response.data["availabilities"]], [availability.id]
+        )
+
+        event.status = "cancelled"
+        event.save()
+        self.assertEqual(self.client.get(url).data["events"], [])
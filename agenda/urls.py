@@ -84,9 +84,11 @@ from .view_functions import (  # Musician Request views; Quote Request views; Pu
     list_all_musicians_public,
     list_available_musical_genres,
     list_contractor_quote_requests,
+    list_musician_facets,
     list_musician_quote_requests,
     list_musician_requests,
     list_musicians_by_city,
+    list_musicians_catalog,
     list_quote_proposals,
     list_sponsors,
     musician_confirm_booking,
@@ -99,6 +101,7 @@ from .view_functions import (  # Musician Request views; Quote Request views; Pu
     validate_invite_token,
 )
 from .views import (
+    AvailabilityRuleViewSet,
     AvailabilityViewSet,
     BadgeViewSet,
     ConnectionViewSet,
@@ -114,6 +117,7 @@ router.register("musicians", MusicianViewSet, basename="musician")
 router.register("events", EventViewSet, basename="event")
 router.register("availabilities", AvailabilityViewSet, basename="availability")
 router.register("leader-availabilities", LeaderAvailabilityViewSet, basename="leader-availability")
+router.register("availability-rules", AvailabilityRuleViewSet, basename="availability-rule")
 router.register("connections", ConnectionViewSet, basename="connection")
 router.register("badges", BadgeViewSet, basename="badge")
 router.register("instruments", InstrumentViewSet, basename="instrument")
@@ -268,6 +272,8 @@ urlpatterns = [
         list_available_musical_genres,
         name="musicians-genres",
     ),
+    path("musicians/facets/", list_musician_facets, name="musicians-facets"),
+    path("musicians/catalog/", list_musicians_catalog, name="musicians-catalog"),
     path("organizations/sponsors/", list_sponsors, name="sponsors"),
     path("musicians/all/", list_all_musicians_public, name="musicians-all"),
     path("analytics/pwa/", collect_pwa_analytics, name="analytics-pwa"),
@@ -502,6 +508,9 @@ EVENTS:
 - POST   /api/events/{id}/set_availability/ - Marca disponibilidade
 - GET    /api/events/my_events/    - Eventos do usuário
 - GET    /api/events/pending_my_response/ - Eventos aguardando resposta
+- POST   /api/events/preview_conflicts/       - Conflitos de um horário
+- POST   /api/events/preview_conflicts_batch/ - Conflitos de vários horários
+- GET    /api/events/cache-stats/  - Métricas do cache da listagem (staff)
 
 AVAILABILITIES:
 - GET    /api/availabilities/      - Lista suas disponibilidades
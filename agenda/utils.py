@@ -3,10 +3,13 @@
 Funções utilitárias compartilhadas para o app agenda.
 """
 
-from datetime import timedelta
+from datetime import datetime, timedelta
 
+from django.db import transaction
 from django.utils import timezone
 
+from .availability_slots import availability_days_changed
+
 # ---------------------------------------------------------------------------
 # Normalização de UF
 # ---------------------------------------------------------------------------
@@ -82,6 +85,75 @@ def normalize_uf(value: str | None) -> str:
     return ""
 
 
+def _epoch_minutes(value) -> int:
+    """Converte datetime aware em minutos desde a epoch (inteiro)."""
+    return int(value.timestamp()) // 60
+
+
+def subtract_busy_intervals(spans, events, buffer_minutes: int = 40) -> dict:
+    """
+    Remove dos intervalos (start_datetime, end_datetime) os horários ocupados
+    pelos eventos, com buffer. Não grava nada.
+
+    Os eventos (com buffer) são ordenados e mesclados em intervalos ocupados
+    disjuntos, e os intervalos ordenados são percorridos em uma única varredura
+    com ponteiro monotônico.
+
+    Returns:
+        {índice em spans: [(início, fim) em minutos desde a epoch, ...]} apenas
+        para os intervalos que cruzam algum evento (lista vazia = todo ocupado)
+    """
+    # Intervalos ocupados (com buffer), ordenados e mesclados
+    busy_starts: list[int] = []
+    busy_ends: list[int] = []
+    for ev_start, ev_end in sorted(
+        (
+            _epoch_minutes(ev.start_datetime) - buffer_minutes,
+            _epoch_minutes(ev.end_datetime) + buffer_minutes,
+        )
+        for ev in events
+    ):
+        if busy_ends and ev_start <= busy_ends[-1]:
+            busy_ends[-1] = max(busy_ends[-1], ev_end)
+        else:
+            busy_starts.append(ev_start)
+            busy_ends.append(ev_end)
+
+    span_starts = [_epoch_minutes(start) for start, _ in spans]
+    span_ends = [_epoch_minutes(end) for _, end in spans]
+    order = sorted(range(len(spans)), key=span_starts.__getitem__)
+
+    free_slots: dict[int, list[tuple[int, int]]] = {}
+    total_busy = len(busy_starts)
+    pointer = 0
+    for idx in order:
+        start, end = span_starts[idx], span_ends[idx]
+
+        # Intervalos ocupados que terminam antes deste início não servem para os próximos
+        while pointer < total_busy and busy_ends[pointer] <= start:
+            pointer += 1
+        if pointer == total_busy or busy_starts[pointer] >= end:
+            continue  # Sem conflito: mantém o intervalo como está
+
+        slots = []
+        cursor = start
+        j = pointer
+        while j < total_busy and busy_starts[j] < end:
+            # Se há espaço antes do evento, cria slot
+            if busy_starts[j] > cursor:
+                slots.append((cursor, busy_starts[j]))
+            # Move cursor após o evento
+            cursor = max(cursor, busy_ends[j])
+            j += 1
+
+        # Sobra final
+        if cursor < end:
+            slots.append((cursor, end))
+        free_slots[idx] = slots
+
+    return free_slots
+
+
 def split_availability_with_events(availability, events, LeaderAvailabilityModel):
     """
     Divide uma disponibilidade removendo os intervalos ocupados por eventos.
@@ -95,73 +167,83 @@ def split_availability_with_events(availability, events, LeaderAvailabilityModel
     Returns:
         Lista de novas disponibilidades criadas (pode ser vazia)
     """
-    if not events:
-        return []
+    return split_availabilities_with_events([availability], events, LeaderAvailabilityModel)
 
-    tz = timezone.get_current_timezone()
-    start = availability.start_datetime
-    end = availability.end_datetime
-    buffer = timedelta(minutes=40)
-
-    # Ordena eventos por início
-    events = sorted(events, key=lambda e: e.start_datetime)
 
-    new_slots = []
-    cursor = start
+def split_availabilities_with_events(availabilities, events, LeaderAvailabilityModel):
+    """
+    Versão em lote de split_availability_with_events.
 
-    for ev in events:
-        ev_start = ev.start_datetime - buffer
-        ev_end = ev.end_datetime + buffer
+    Todos os horários viram inteiros (minutos desde a epoch) e as sobras saem de
+    subtract_busy_intervals (buffer de 40 minutos). Apenas disponibilidades que
+    realmente cruzam algum evento são desativadas; tudo é gravado em uma
+    transação com um UPDATE + um bulk_create, independente da quantidade de
+    registros.
 
-        # Se há espaço antes do evento, cria slot
-        if ev_start > cursor:
-            new_slots.append((cursor, min(ev_start, end)))
+    Args:
+        availabilities: Instâncias de LeaderAvailability (já salvas) a dividir
+        events: Eventos que ocupam a agenda do(s) dono(s) das disponibilidades
+        LeaderAvailabilityModel: Classe do modelo LeaderAvailability
 
-        # Move cursor após o evento
-        if ev_end > cursor:
-            cursor = max(cursor, ev_end)
+    Returns:
+        Lista de novas disponibilidades criadas (pode ser vazia)
+    """
+    availabilities = [a for a in availabilities if a.start_datetime and a.end_datetime]
+    if not availabilities or not events:
+        return []
 
-    # Sobra final
-    if cursor < end:
-        new_slots.append((cursor, end))
+    free_slots = subtract_busy_intervals(
+        [(a.start_datetime, a.end_datetime) for a in availabilities], events
+    )
 
-    # Desativa disponibilidade original
-    availability.is_active = False
-    availability.save(update_fields=["is_active"])
+    if not free_slots:
+        return []
 
-    # Cria novas disponibilidades com as sobras
-    objs = []
+    tz = timezone.get_current_timezone()
     now = timezone.now()
+    objs = []
 
-    for slot_start, slot_end in new_slots:
-        if slot_end <= slot_start:
-            continue
-
-        # Preenche todos os campos para evitar problemas com bulk_create
-        # bulk_create não preenche auto_now/auto_now_add automaticamente
-        date_value = slot_start.astimezone(tz).date()
-        start_time = slot_start.astimezone(tz).time()
-        end_time = slot_end.astimezone(tz).time()
-
-        objs.append(
-            LeaderAvailabilityModel(
-                leader=availability.leader,
-                organization=availability.organization,
-                date=date_value,
-                start_time=start_time,
-                end_time=end_time,
-                start_datetime=slot_start,
-                end_datetime=slot_end,
-                notes=availability.notes,
-                is_public=availability.is_public,
-                is_active=True,
-                created_at=now,
-                updated_at=now,
+    for idx, slots in free_slots.items():
+        availability = availabilities[idx]
+        availability.is_active = False
+
+        for slot_start_min, slot_end_min in slots:
+            # Preenche todos os campos para evitar problemas com bulk_create
+            # bulk_create não preenche auto_now/auto_now_add automaticamente
+            slot_start = datetime.fromtimestamp(slot_start_min * 60, tz=tz)
+            slot_end = datetime.fromtimestamp(slot_end_min * 60, tz=tz)
+            objs.append(
+                LeaderAvailabilityModel(
+                    leader_id=availability.leader_id,
+                    organization_id=availability.organization_id,
+                    date=slot_start.date(),
+                    start_time=slot_start.time(),
+                    end_time=slot_end.time(),
+                    start_datetime=slot_start,
+                    end_datetime=slot_end,
+                    notes=availability.notes,
+                    is_public=availability.is_public,
+                    is_active=True,
+                    created_at=now,
+                    updated_at=now,
+                )
             )
-        )
 
-    if objs:
-        LeaderAvailabilityModel.objects.bulk_create(objs)
+    with transaction.atomic():
+        # Desativa as disponibilidades originais que cruzam eventos
+        LeaderAvailabilityModel.objects.filter(
+            pk__in=[availabilities[idx].pk for idx in free_slots]
+        ).update(is_active=False, updated_at=now)
+
+        # Cria novas disponibilidades com as sobras
+        if objs:
+            LeaderAvailabilityModel.objects.bulk_create(objs)
+
+    # UPDATE e bulk_create não disparam signals: recalcula o bitmap dos dias tocados
+    availability_days_changed(
+        [(availabilities[idx].leader_id, availabilities[idx].date) for idx in free_slots]
+        + [(obj.leader_id, obj.date) for obj in objs]
+    )
 
     return objs
 
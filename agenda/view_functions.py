@@ -7,14 +7,11 @@ Mantem compatibilidade com as rotas em agenda/urls.py.
 import logging
 import secrets
 import unicodedata
-from collections import Counter
 from datetime import date, timedelta
 
 from django.conf import settings
-from django.core.cache import cache
 from django.core.mail import send_mail
 from django.db import connection
-from django.db.models import Q
 from django.shortcuts import get_object_or_404
 from django.template.loader import render_to_string
 from django.utils import timezone
@@ -24,6 +21,7 @@ from rest_framework.decorators import api_view, permission_classes, throttle_cla
 from rest_framework.pagination import PageNumberPagination
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
 
 from notifications.services.email_service import send_rejection_email
 from notifications.services.quote_notifications import (
@@ -33,6 +31,7 @@ from notifications.services.quote_notifications import (
     notify_reservation_created,
 )
 
+from .conditional_get import conditional_view
 from .image_processing import (
     MAX_AVATAR_BYTES,
     MAX_AVATAR_SIZE,
@@ -40,6 +39,7 @@ from .image_processing import (
     MAX_COVER_SIZE,
     _process_profile_image,
 )
+from .instrument_utils import filter_by_instrument, get_instrument_label
 from .models import (
     Booking,
     BookingEvent,
@@ -57,6 +57,11 @@ from .models import (
     QuoteProposal,
     QuoteRequest,
 )
+from .musician_catalog import canonical_catalog_params, get_catalog_page
+from .musician_facets import FACET_GENRE, FACET_INSTRUMENT, city_facet_counts, facet_counts
+from .musician_search import search_musicians
+from .pagination import KeysetPagination
+from .public_cache import public_cache
 from .serializers import (
     BookingEventSerializer,
     BookingSerializer,
@@ -164,50 +169,6 @@ def normalize_genre_value(value: str) -> str:
     return " ".join(value.strip().lower().split())
 
 
-# Aliases de instrumentos para busca
-INSTRUMENT_SEARCH_ALIASES = {
-    "vocalista": ["vocal", "singer", "vocalist"],
-    "vocal": ["vocalista", "singer", "vocalist"],
-    "singer": ["vocal", "vocalista", "vocalist"],
-    "vocalist": ["vocal", "vocalista", "singer"],
-    "violao": ["acoustic_guitar", "violão"],
-    "violão": ["acoustic_guitar", "violao"],
-    "acoustic_guitar": ["violao", "violão", "violonista"],
-    "acoustic guitar": ["acoustic_guitar", "violao", "violão", "violonista"],
-    "violonista": ["acoustic_guitar", "violao", "violão"],
-    "guitarra": ["guitar", "electric_guitar"],
-    "guitar": ["guitarra", "electric_guitar"],
-    "baixo": ["bass", "bass_guitar"],
-    "bass": ["baixo", "bass_guitar", "contrabaixo"],
-    "bateria": ["drums"],
-    "drums": ["bateria"],
-    "teclado": ["keyboard", "piano", "synth"],
-    "keyboard": ["teclado", "piano", "synth"],
-    "percussao": ["percussion"],
-    "percussion": ["percussao"],
-    "cajon": ["cajón"],
-    "cajón": ["cajon"],
-    "saxofone": ["saxophone", "sax"],
-    "saxophone": ["saxofone", "sax"],
-    "sax": ["saxophone", "saxofone"],
-    "violin": ["violino", "violinista"],
-    "violino": ["violin", "violinista"],
-    "violinista": ["violin", "violino"],
-}
-
-
-def expand_instrument_search(term: str) -> list:
-    """Expande termo de busca de instrumento para incluir aliases."""
-    term_normalized = normalize_search_text(term)
-    terms = [term, term_normalized]
-
-    # Adiciona aliases se existirem
-    if term_normalized in INSTRUMENT_SEARCH_ALIASES:
-        terms.extend(INSTRUMENT_SEARCH_ALIASES[term_normalized])
-
-    return list(set(terms))  # Remove duplicados
-
-
 # =============================================================================
 # Image uploads
 # =============================================================================
@@ -879,13 +840,12 @@ def list_contractor_quote_requests(request):
     queryset = (
         QuoteRequest.objects.filter(contractor=contractor)
         .select_related("musician__user", "contractor")
-        .order_by("-created_at")
+        .order_by("-created_at", "-id")
     )
     if status_filter:
         queryset = queryset.filter(status=status_filter)
 
-    paginator = PageNumberPagination()
-    paginator.page_size = 20
+    paginator = KeysetPagination()
     page = paginator.paginate_queryset(queryset, request)
     serializer = QuoteRequestSerializer(page, many=True, context={"request": request})
     return paginator.get_paginated_response(serializer.data)
@@ -906,13 +866,12 @@ def list_musician_quote_requests(request):
     queryset = (
         QuoteRequest.objects.filter(musician=musician)
         .select_related("musician__user", "contractor")
-        .order_by("-created_at")
+        .order_by("-created_at", "-id")
     )
     if status_filter:
         queryset = queryset.filter(status=status_filter)
 
-    paginator = PageNumberPagination()
-    paginator.page_size = 20
+    paginator = KeysetPagination()
     page = paginator.paginate_queryset(queryset, request)
     serializer = QuoteRequestSerializer(page, many=True, context={"request": request})
     return paginator.get_paginated_response(serializer.data)
@@ -1242,9 +1201,7 @@ def list_musicians_by_city(request):
 
     instrument = request.query_params.get("instrument")
     if instrument:
-        queryset = queryset.filter(
-            Q(instrument__iexact=instrument) | Q(instruments__icontains=instrument)
-        )
+        queryset = filter_by_instrument(queryset, instrument)
 
     genre = normalize_genre_value(request.query_params.get("genre") or "")
     if genre:
@@ -1269,6 +1226,9 @@ def list_musicians_by_city(request):
 @api_view(["GET"])
 @permission_classes([AllowAny])
 @throttle_classes([PublicRateThrottle])
+@public_cache.cached_view(
+    "sponsors", soft_ttl=60 * 60, hard_ttl=6 * 60 * 60, tags=lambda request: ("sponsors",)
+)
 def list_sponsors(request):
     city = request.query_params.get("city")
     state = request.query_params.get("state")
@@ -1279,11 +1239,6 @@ def list_sponsors(request):
             status=status.HTTP_400_BAD_REQUEST,
         )
 
-    cache_key = f"sponsors_{city.lower()}_{state.lower()}"
-    cached = cache.get(cache_key)
-    if cached:
-        return Response(cached)
-
     queryset = Organization.objects.filter(
         is_sponsor=True,
         city__iexact=city,
@@ -1296,13 +1251,15 @@ def list_sponsors(request):
         sponsors = sponsors[day_offset:] + sponsors[:day_offset]
 
     serializer = OrganizationPublicSerializer(sponsors, many=True, context={"request": request})
-    cache.set(cache_key, serializer.data, 60 * 60)  # 1 hour
     return Response(serializer.data)
 
 
 @api_view(["GET"])
 @permission_classes([AllowAny])
 @throttle_classes([PublicRateThrottle])
+@public_cache.cached_view(
+    "musicians:all", soft_ttl=60, hard_ttl=10 * 60, tags=lambda request: ("musicians",)
+)
 def list_all_musicians_public(request):
     """Lista músicos de todas as cidades (catálogo público)"""
     city = request.query_params.get("city")
@@ -1319,12 +1276,6 @@ def list_all_musicians_public(request):
         limit = default_limit
     limit = max(1, min(limit, max_limit))
 
-    params_key = "&".join(f"{k}={v}" for k, v in sorted(request.GET.items()))
-    cache_key = f"musicians:all:v1:{params_key}"
-    cached = cache.get(cache_key)
-    if cached is not None:
-        return Response(cached)
-
     queryset = Musician.objects.filter(is_active=True).select_related("user")
 
     if city:
@@ -1334,31 +1285,11 @@ def list_all_musicians_public(request):
 
     # Busca por instrumento com normalização e aliases
     if instrument:
-        instrument_terms = expand_instrument_search(instrument)
-        instrument_q = Q()
-        for term in instrument_terms:
-            instrument_q |= Q(instrument__iexact=term)
-            instrument_q |= Q(instruments__icontains=term)
-        queryset = queryset.filter(instrument_q)
-
-    # Busca geral mais abrangente (nome, instrumento, bio)
+        queryset = filter_by_instrument(queryset, instrument)
+
+    # Busca geral (nome, instrumento, bio, gêneros) pelo índice de busca
     if search:
-        search_normalized = normalize_search_text(search)
-        genre_search = search_normalized.replace(" ", "_")
-        queryset = queryset.filter(
-            Q(user__first_name__icontains=search)
-            | Q(user__last_name__icontains=search)
-            | Q(user__first_name__icontains=search_normalized)
-            | Q(user__last_name__icontains=search_normalized)
-            | Q(instrument__icontains=search)
-            | Q(instrument__icontains=search_normalized)
-            | Q(instruments__icontains=search)
-            | Q(instruments__icontains=search_normalized)
-            | Q(bio__icontains=search)
-            | Q(musical_genres__icontains=search)
-            | Q(musical_genres__icontains=search_normalized)
-            | Q(musical_genres__icontains=genre_search)
-        )
+        queryset = search_musicians(queryset, search)
 
     if genre:
         # SQLite não suporta lookup JSONField `contains`; cai para busca textual.
@@ -1370,21 +1301,59 @@ def list_all_musicians_public(request):
     if min_rating:
         queryset = queryset.filter(average_rating__gte=min_rating)
 
-    queryset = queryset.order_by("-average_rating", "user__first_name")
+    ordering = ("-average_rating", "user__first_name")
+    if search:
+        ordering = ("-search_rank", *ordering)
+    queryset = queryset.order_by(*ordering)
 
     paginator = PageNumberPagination()
     paginator.page_size = limit
     page = paginator.paginate_queryset(queryset, request)
     if page is not None:
         serializer = MusicianPublicSerializer(page, many=True, context={"request": request})
-        resp_data = paginator.get_paginated_response(serializer.data).data
-        cache.set(cache_key, resp_data, timeout=60)
-        return Response(resp_data)
+        return paginator.get_paginated_response(serializer.data)
 
     serializer = MusicianPublicSerializer(queryset[:limit], many=True, context={"request": request})
-    result = serializer.data
-    cache.set(cache_key, result, timeout=60)
-    return Response(result)
+    return Response(serializer.data)
+
+
+@api_view(["GET"])
+@permission_classes([AllowAny])
+@throttle_classes([PublicRateThrottle])
+def list_musicians_catalog(request):
+    """
+    Catálogo público paginado com facetas do conjunto filtrado.
+
+    GET /api/musicians/catalog/?city=&state=&instrument=&genre=&search=&min_rating=&page=
+    Retorna: {count, next, previous, results, facets: {instruments, genres,
+              cities, states, ratings}}
+    """
+    params = canonical_catalog_params(request.query_params)
+    data = get_catalog_page(params)
+
+    musicians = Musician.objects.select_related("user").in_bulk(data["ids"])
+    page = [musicians[musician_id] for musician_id in data["ids"] if musician_id in musicians]
+    serializer = MusicianPublicSerializer(page, many=True, context={"request": request})
+
+    url = request.build_absolute_uri()
+    page_number = params["page"]
+    has_next = page_number * params["page_size"] < data["count"]
+    previous = None
+    if page_number > 1:
+        previous = (
+            replace_query_param(url, "page", page_number - 1)
+            if page_number > 2
+            else remove_query_param(url, "page")
+        )
+    return Response(
+        {
+            "count": data["count"],
+            "next": replace_query_param(url, "page", page_number + 1) if has_next else None,
+            "previous": previous,
+            "results": serializer.data,
+            "facets": data["facets"],
+        }
+    )
 
 
 @api_view(["GET"])
@@ -1397,56 +1366,66 @@ def list_available_musical_genres(request):
     GET /api/musicians/genres/?city=...&state=...
     Retorna: ["mpb", "sertanejo", ...]
     """
-    city = request.query_params.get("city")
-    state = request.query_params.get("state")
-
-    cache_key = "musician_genres_all"
-    if city:
-        cache_key += f"_city_{city.strip().lower()}"
-    if state:
-        cache_key += f"_state_{state.strip().lower()}"
+    genres = facet_counts(
+        FACET_GENRE, request.query_params.get("city"), request.query_params.get("state")
+    )
+    # Ordena por relevância (mais usados primeiro), depois por nome
+    return Response([genre for genre, _ in genres])
 
-    cached = cache.get(cache_key)
-    if cached is not None:
-        return Response(cached)
 
-    qs = Musician.objects.filter(is_active=True)
-    if city:
-        qs = qs.filter(city__iexact=city)
-    if state:
-        qs = qs.filter(state__iexact=state)
+@api_view(["GET"])
+@permission_classes([AllowAny])
+@throttle_classes([PublicRateThrottle])
+def list_musician_facets(request):
+    """
+    Facetas do catálogo de músicos ativos (contagens materializadas).
 
-    counter: Counter[str] = Counter()
-    for genres in qs.values_list("musical_genres", flat=True):
-        if not isinstance(genres, list):
-            continue
-        for g in genres:
-            if not isinstance(g, str):
-                continue
-            norm = normalize_genre_value(g)
-            if norm:
-                counter[norm] += 1
+    GET /api/musicians/facets/?city=...&state=...
+    Retorna: {"genres": [{value, count}], "instruments": [{value, label, count}],
+              "cities": [{city, state, count}]}
+    """
+    city = request.query_params.get("city")
+    state = request.query_params.get("state")
 
-    # Ordena por relevância (mais usados primeiro), depois por nome
-    payload = [g for g, _ in sorted(counter.items(), key=lambda kv: (-kv[1], kv[0]))]
-    cache.set(cache_key, payload, 60 * 60)  # 1 hour
-    return Response(payload)
+    return Response(
+        {
+            "genres": [
+                {"value": genre, "count": count}
+                for genre, count in facet_counts(FACET_GENRE, city, state)
+            ],
+            "instruments": [
+                {"value": instrument, "label": get_instrument_label(instrument), "count": count}
+                for instrument, count in facet_counts(FACET_INSTRUMENT, city, state)
+            ],
+            "cities": [
+                {"city": name, "state": uf, "count": count}
+                for name, uf, count in city_facet_counts(state)
+            ],
+        }
+    )
 
 
 @api_view(["GET"])
 @permission_classes([AllowAny])
 @throttle_classes([PublicRateThrottle])
+@conditional_view(
+    lambda request, musician_id: (
+        "musician:profile",
+        musician_id,
+        public_cache.stamp(f"musician:{musician_id}"),
+    )
+)
+@public_cache.cached_view(
+    "musician:profile",
+    soft_ttl=30 * 60,
+    hard_ttl=2 * 60 * 60,
+    tags=lambda request, musician_id: (f"musician:{musician_id}",),
+)
 def get_musician_public_profile(request, musician_id):
-    cache_key = f"musician_public_{musician_id}"
-    cached = cache.get(cache_key)
-    if cached:
-        return Response(cached)
-
     musician = get_object_or_404(
         Musician.objects.select_related("user"), id=musician_id, is_active=True
     )
     serializer = MusicianPublicSerializer(musician, context={"request": request})
-    cache.set(cache_key, serializer.data, 60 * 30)  # 30 min
     return Response(serializer.data)
 
 
@@ -8,6 +8,7 @@ Refatoração completa - todos os ViewSets foram migrados para módulos separado
 
 # ViewSets médios
 from .availabilities import AvailabilityViewSet
+from .availability_rules import AvailabilityRuleViewSet
 
 # ViewSets menores
 from .badges import BadgeViewSet
@@ -26,6 +27,7 @@ __all__ = [
     "InstrumentViewSet",
     # ViewSets médios
     "AvailabilityViewSet",
+    "AvailabilityRuleViewSet",
     "LeaderAvailabilityViewSet",
     "MusicianViewSet",
     # ViewSet grande (completo)
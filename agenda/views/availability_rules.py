@@ -0,0 +1,81 @@
+# agenda/views/availability_rules.py
+"""
+ViewSet das disponibilidades recorrentes (AvailabilityRule) do músico.
+"""
+
+from datetime import date
+
+from drf_spectacular.utils import OpenApiParameter, extend_schema
+from rest_framework import status, viewsets
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+
+from ..models import AvailabilityRule, AvailabilityRuleException, Musician
+from ..serializers import AvailabilityRuleSerializer
+from ..utils import get_user_organization
+
+
+@extend_schema(
+    parameters=[OpenApiParameter(name="id", type=int, location="path", description="ID da regra")]
+)
+class AvailabilityRuleViewSet(viewsets.ModelViewSet):
+    """
+    ViewSet para disponibilidades recorrentes do músico logado.
+
+    - CRUD apenas das próprias regras
+    - POST/DELETE {id}/exceptions/ adiciona/remove datas em que a regra não vale
+    - As ocorrências aparecem expandidas em /leader-availabilities/,
+      available_musicians e na agenda pública
+    """
+
+    serializer_class = AvailabilityRuleSerializer
+    permission_classes = [IsAuthenticated]
+
+    def _musician(self):
+        try:
+            return self.request.user.musician_profile
+        except Musician.DoesNotExist:
+            raise ValidationError({"detail": "Usuário não possui perfil de músico."})
+
+    def get_queryset(self):
+        try:
+            musician = self.request.user.musician_profile
+        except Musician.DoesNotExist:
+            return AvailabilityRule.objects.none()
+        return AvailabilityRule.objects.filter(leader=musician).prefetch_related("exceptions")
+
+    def perform_create(self, serializer):
+        serializer.save(
+            leader=self._musician(), organization=get_user_organization(self.request.user)
+        )
+
+    @action(detail=True, methods=["post", "delete"])
+    def exceptions(self, request, pk=None):
+        """
+        POST   /availability-rules/{id}/exceptions/  Body: {"date": "YYYY-MM-DD"}
+        DELETE /availability-rules/{id}/exceptions/?date=YYYY-MM-DD
+        Pula (ou volta a incluir) uma ocorrência da regra.
+        """
+        rule = self.get_object()
+        raw_date = (
+            request.data.get("date")
+            if request.method == "POST"
+            else request.query_params.get("date")
+        )
+        try:
+            target_date = date.fromisoformat(str(raw_date))
+        except ValueError:
+            return Response(
+                {"detail": "Formato de data inválido. Use YYYY-MM-DD."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        if request.method == "POST":
+            AvailabilityRuleException.objects.get_or_create(rule=rule, date=target_date)
+        else:
+            AvailabilityRuleException.objects.filter(rule=rule, date=target_date).delete()
+
+        rule = self.get_queryset().get(pk=rule.pk)
+        return Response(self.get_serializer(rule).data)
@@ -10,7 +10,7 @@ from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 
 from ..models import Connection, Musician
-from ..pagination import StandardResultsSetPagination
+from ..pagination import KeysetPagination
 from ..serializers import ConnectionSerializer
 
 
@@ -24,7 +24,7 @@ class ConnectionViewSet(viewsets.ModelViewSet):
 
     serializer_class = ConnectionSerializer
     permission_classes = [IsAuthenticated]
-    pagination_class = StandardResultsSetPagination
+    pagination_class = KeysetPagination
 
     def get_queryset(self):
         try:
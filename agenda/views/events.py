@@ -13,16 +13,26 @@ Este é o ViewSet mais complexo do sistema, responsável por:
 import logging
 from datetime import date, datetime, time, timedelta
 
-from django.core.cache import cache
-from django.db import models, transaction
-from django.db.models import Count, Q
+from django.db import transaction
+from django.db.models import Exists, OuterRef, Q
 from django.utils import timezone
 from rest_framework import status, viewsets
 from rest_framework.decorators import action
 from rest_framework.exceptions import PermissionDenied, ValidationError
-from rest_framework.permissions import IsAuthenticated
+from rest_framework.permissions import SAFE_METHODS, IsAdminUser, IsAuthenticated
 from rest_framework.response import Response
 
+from notifications.signals import enqueue_invitations_created
+
+from ..conditional_get import conditional_response, make_etag
+from ..conflict_index import (
+    ACTIVE_EVENT_STATUSES,
+    CONFLICT_BUFFER,
+    CONFLICT_BUFFER_MINUTES,
+    conflict_index,
+    sweep_overlaps,
+)
+from ..events_list_cache import events_list_cache
 from ..models import (
     Availability,
     Event,
@@ -31,7 +41,7 @@ from ..models import (
     Musician,
     MusicianRating,
 )
-from ..pagination import StandardResultsSetPagination
+from ..pagination import EventKeysetPagination
 from ..permissions import IsOwnerOrReadOnly
 from ..serializers import (
     AvailabilitySerializer,
@@ -69,30 +79,33 @@ class EventViewSet(viewsets.ModelViewSet):
         .all()
     )
     permission_classes = [IsAuthenticated]
-    pagination_class = StandardResultsSetPagination
-    events_list_cache_ttl_seconds = 30
-    events_list_cache_version_ttl_seconds = 60 * 60 * 24
+    pagination_class = EventKeysetPagination
+    conflicts_batch_max_slots = 100
+    confirmation_max_attempts = 5
 
     def get_permissions(self):
         """
         Permissões customizadas por action:
         - update/delete: apenas criador
+        - cache_stats: apenas staff
         - outras: apenas autenticado
         """
         if self.action in ["update", "partial_update", "destroy", "cancel"]:
             return [IsAuthenticated(), IsOwnerOrReadOnly()]
+        if self.action == "cache_stats":
+            return [IsAuthenticated(), IsAdminUser()]
         return [IsAuthenticated()]
 
     def get_throttles(self):
         """
         Throttles customizados por action:
         - create: limite de criação de eventos
-        - preview_conflicts: limite de chamadas de preview
+        - preview_conflicts/preview_conflicts_batch: limite de chamadas de preview
         - approve/reject: limite burst para ações sensíveis
         """
         if self.action == "create":
             return [CreateEventRateThrottle()]
-        if self.action == "preview_conflicts":
+        if self.action in ["preview_conflicts", "preview_conflicts_batch"]:
             return [PreviewConflictsRateThrottle()]
         if self.action in ["approve", "reject", "cancel"]:
             return [BurstRateThrottle()]
@@ -108,77 +121,90 @@ class EventViewSet(viewsets.ModelViewSet):
             return EventUpdateSerializer
         return EventDetailSerializer
 
-    def _events_list_version_key(self, user_id: int) -> str:
-        return f"events:list:v2:u{user_id}:version"
-
-    def _get_events_list_version(self, user_id: int) -> int:
-        key = self._events_list_version_key(user_id)
-        version = cache.get(key)
-        if isinstance(version, int) and version > 0:
-            return version
+    def dispatch(self, request, *args, **kwargs):
+        """
+        Escritas agrupam as invalidações da listagem disparadas pelos signals
+        (uma query de participantes + um set_many ao final da requisição).
+        """
+        if request.method in SAFE_METHODS:
+            return super().dispatch(request, *args, **kwargs)
+        with events_list_cache.batch():
+            return super().dispatch(request, *args, **kwargs)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        # Quem alterou algo sempre enxerga a alteração (ex.: staff editando evento alheio)
+        if (
+            request.method not in SAFE_METHODS
+            and response.status_code < 400
+            and request.user.is_authenticated
+        ):
+            events_list_cache.invalidate(user_ids=[request.user.id], if_changed=True)
+        return super().finalize_response(request, response, *args, **kwargs)
+
+    def _apply_invitations(self, event, invited_musicians_ids, creator_musician=None):
+        """
+        Cria disponibilidades pendentes para músicos convidados (apenas novos) em lote.
 
-        cache.set(key, 1, timeout=self.events_list_cache_version_ttl_seconds)
-        return 1
+        Custo constante: uma query de músicos (já marcando quem tem convite),
+        um bulk_create e um UPDATE dos contadores do evento. bulk_create não
+        dispara signals, então índices/caches são invalidados aqui e os
+        convites entram na outbox de notificações na mesma transação.
+        """
+        invited_musicians_ids = list(dict.fromkeys(invited_musicians_ids or []))
+        if not invited_musicians_ids and creator_musician is None:
+            return []
 
-    def _bump_events_list_version(self, user_id: int) -> None:
-        key = self._events_list_version_key(user_id)
-        try:
-            cache.incr(key)
-            return
-        except Exception:
-            pass
-
-        current_version = cache.get(key)
-        if not isinstance(current_version, int) or current_version <= 0:
-            current_version = 1
-        cache.set(
-            key,
-            current_version + 1,
-            timeout=self.events_list_cache_version_ttl_seconds,
+        invited = (
+            Musician.objects.filter(id__in=invited_musicians_ids, is_active=True)
+            .annotate(
+                already_invited=Exists(
+                    Availability.objects.filter(event=event, musician=OuterRef("pk"))
+                )
+            )
+            .values_list("id", "user_id", "already_invited")
         )
-
-    def _invalidate_events_list_cache(self, event: Event | None = None) -> None:
-        user_ids: set[int] = set()
-        request_user = getattr(self.request, "user", None)
-        if request_user and request_user.is_authenticated:
-            user_ids.add(request_user.id)
-
-        if event is not None:
-            if event.created_by_id:
-                user_ids.add(event.created_by_id)
-            participant_user_ids = event.availabilities.values_list("musician__user_id", flat=True)
-            user_ids.update(int(uid) for uid in participant_user_ids if uid)
-
-        for user_id in user_ids:
-            self._bump_events_list_version(user_id)
-
-    def _apply_invitations(self, event, invited_musicians_ids):
-        """Cria disponibilidades pendentes para músicos convidados (apenas novos)."""
-        if not invited_musicians_ids:
-            return
-
-        invited_musicians_ids = list(dict.fromkeys(invited_musicians_ids))
-        invited_musicians = Musician.objects.filter(id__in=invited_musicians_ids, is_active=True)
-
         if event.created_by_id:
-            invited_musicians = invited_musicians.exclude(user=event.created_by)
-
-        existing_ids = set(
-            event.availabilities.filter(
-                musician_id__in=invited_musicians.values_list("id", flat=True)
-            ).values_list("musician_id", flat=True)
-        )
-
-        for musician in invited_musicians:
-            if musician.id in existing_ids:
-                continue
-            Availability.objects.create(
-                musician=musician,
+            invited = invited.exclude(user_id=event.created_by_id)
+        new_invites = [
+            (musician_id, user_id) for musician_id, user_id, already in invited if not already
+        ]
+
+        objs = [
+            Availability(
+                musician_id=musician_id,
                 event=event,
                 response="pending",
                 notes="",
                 responded_at=None,
             )
+            for musician_id, _user_id in new_invites
+        ]
+        if creator_musician is not None:
+            # Criador sempre participa como 'available'
+            objs.append(
+                Availability(
+                    musician=creator_musician,
+                    event=event,
+                    response="available",
+                    notes="Evento criado por mim",
+                    responded_at=timezone.now(),
+                )
+            )
+        if not objs:
+            return []
+
+        Availability.objects.bulk_create(objs, ignore_conflicts=True)
+        Event.refresh_availability_counters(event.id)
+
+        user_ids = [user_id for _musician_id, user_id in new_invites]
+        if creator_musician is not None:
+            user_ids.append(creator_musician.user_id)
+        conflict_index.invalidate(user_ids=user_ids)
+        events_list_cache.invalidate(user_ids=user_ids, event_ids=[event.id])
+
+        invited_ids = [musician_id for musician_id, _user_id in new_invites]
+        enqueue_invitations_created(event.id, invited_ids)
+        return invited_ids
 
     def _replace_required_instruments(self, event, required_instruments):
         """Substitui instrumentos necessários quando enviados na atualização."""
@@ -201,7 +227,6 @@ class EventViewSet(viewsets.ModelViewSet):
 
         self._apply_invitations(updated_event, invited_musicians_ids)
         self._replace_required_instruments(updated_event, required_instruments)
-        self._invalidate_events_list_cache(event=updated_event)
 
         output = EventDetailSerializer(updated_event, context={"request": request}).data
         return Response(output)
@@ -221,37 +246,25 @@ class EventViewSet(viewsets.ModelViewSet):
         - ?past=true (eventos passados)
         - ?upcoming=true (eventos futuros)
         """
-        queryset = super().get_queryset()
-
-        # Adiciona anotações para contagem de disponibilidades (otimização N+1)
-        queryset = queryset.annotate(
-            avail_pending=Count("availabilities", filter=Q(availabilities__response="pending")),
-            avail_available=Count("availabilities", filter=Q(availabilities__response="available")),
-            avail_unavailable=Count(
-                "availabilities", filter=Q(availabilities__response="unavailable")
-            ),
-            avail_total=Count("availabilities"),
-        )
+        if self.action == "list":
+            # A listagem não usa availabilities/logs (contagens são colunas de Event)
+            queryset = EventListSerializer.setup_eager_loading(Event.objects.all())
+        else:
+            queryset = super().get_queryset()
 
         # Exibe eventos onde o usuário participa (criador ou availability).
         # Regra: para listagens (calendario/lista), nao retornamos eventos onde o musico marcou "unavailable",
         # para nao continuar bloqueando data na agenda do proprio musico.
+        # Participação via subquery id__in: sem JOIN em availabilities nem DISTINCT.
         if not self.request.user.is_staff:
             try:
                 musician = self.request.user.musician_profile
+                participations = Availability.objects.filter(musician=musician)
                 if self.action == "list":
-                    queryset = queryset.filter(
-                        models.Q(created_by=self.request.user)
-                        | models.Q(
-                            availabilities__musician=musician,
-                            availabilities__response__in=["pending", "available"],
-                        )
-                    ).distinct()
-                else:
-                    queryset = queryset.filter(
-                        models.Q(created_by=self.request.user)
-                        | models.Q(availabilities__musician=musician)
-                    ).distinct()
+                    participations = participations.filter(response__in=["pending", "available"])
+                queryset = queryset.filter(
+                    Q(created_by=self.request.user) | Q(id__in=participations.values("event_id"))
+                )
             except Musician.DoesNotExist:
                 queryset = queryset.filter(created_by=self.request.user)
 
@@ -273,22 +286,24 @@ class EventViewSet(viewsets.ModelViewSet):
         # (usado no Dashboard para "Respostas Pendentes")
         if self.request.query_params.get("pending_responses") == "true":
             queryset = queryset.filter(
+                Exists(Availability.objects.filter(event=OuterRef("pk"), response="pending")),
                 created_by=self.request.user,
                 status__in=["proposed", "confirmed", "approved"],
                 event_date__gte=timezone.localdate(),
-                avail_pending__gt=0,
             )
 
         # Pendentes de convite (eventos propostos onde o músico tem availability pendente)
         if self.request.query_params.get("pending_approval") == "true":
             try:
                 musician = self.request.user.musician_profile
+                pending_ids = Availability.objects.filter(
+                    musician=musician, response="pending"
+                ).values("event_id")
                 queryset = queryset.filter(
                     status__in=["proposed", "confirmed", "approved"],
                     event_date__gte=timezone.localdate(),
-                    availabilities__musician=musician,
-                    availabilities__response="pending",
-                ).distinct()
+                    id__in=pending_ids,
+                )
             except Musician.DoesNotExist:
                 return Event.objects.none()
 
@@ -326,16 +341,35 @@ class EventViewSet(viewsets.ModelViewSet):
         return queryset.order_by("-event_date", "-id")
 
     def list(self, request, *args, **kwargs):
-        params_key = "&".join(f"{k}={v}" for k, v in sorted(request.GET.items()))
-        version = self._get_events_list_version(request.user.id)
-        cache_key = f"events:list:v2:u{request.user.id}:v{version}:{params_key}"
-        cached = cache.get(cache_key)
-        if cached is not None:
-            return Response(cached)
+        paginator = self.pagination_class
+        cache_key = events_list_cache.cache_key(
+            request.user.id,
+            request.query_params,
+            default_page_size=paginator.page_size,
+            max_page_size=paginator.max_page_size,
+        )
+        # A chave já carrega a versão do usuário e os filtros canônicos; a data
+        # entra porque "past"/"upcoming" dependem do dia corrente
+        etag = make_etag(cache_key, timezone.now().date())
+
+        def build():
+            cached = events_list_cache.get(cache_key)
+            if cached is not None:
+                return Response(cached)
 
-        response = super().list(request, *args, **kwargs)
-        cache.set(cache_key, response.data, timeout=self.events_list_cache_ttl_seconds)
-        return response
+            response = super(EventViewSet, self).list(request, *args, **kwargs)
+            events_list_cache.set(cache_key, response.data)
+            return response
+
+        return conditional_response(request, build, etag=etag)
+
+    @action(detail=False, methods=["get"], url_path="cache-stats")
+    def cache_stats(self, request):
+        """
+        GET /events/cache-stats/ (staff)
+        Hits/misses/invalidações do cache da listagem, somados entre processos.
+        """
+        return Response(events_list_cache.stats())
 
     @action(detail=False, methods=["post"])
     def preview_conflicts(self, request):
@@ -343,67 +377,174 @@ class EventViewSet(viewsets.ModelViewSet):
         POST /events/preview_conflicts/
         Body: { "event_date": "YYYY-MM-DD", "start_time": "HH:MM", "end_time": "HH:MM" }
         Retorna eventos que conflitam com o período (incluindo buffer de 40 minutos).
+
+        Usa o índice em memória de conflitos (agenda/conflict_index.py): o banco
+        só é consultado para hidratar os eventos encontrados.
         """
-        data = request.data
         try:
-            event_date = date.fromisoformat(data.get("event_date"))
-            start_time_value = time.fromisoformat(data.get("start_time"))
-            end_time_value = time.fromisoformat(data.get("end_time"))
+            start_dt, end_dt = self._parse_conflict_slot(request.data)
         except Exception:
             return Response(
                 {"detail": "Formato inválido de data/horário."},
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        # Constrói datetime com detecção de cruzar meia-noite
-        start_dt = timezone.make_aware(datetime.combine(event_date, start_time_value))
-        if end_time_value <= start_time_value:
-            end_dt = timezone.make_aware(
-                datetime.combine(event_date + timedelta(days=1), end_time_value)
+        if request.user.is_staff:
+            # Staff enxerga todos os eventos: consulta direta de sobreposição
+            conflicts = self._conflict_candidates(request.user).filter(
+                start_datetime__lt=end_dt + CONFLICT_BUFFER,
+                end_datetime__gt=start_dt - CONFLICT_BUFFER,
             )
         else:
-            end_dt = timezone.make_aware(datetime.combine(event_date, end_time_value))
+            # Índice em memória responde sem banco; o banco só hidrata os conflitos
+            conflict_ids = conflict_index.conflicting_event_ids(
+                start_dt, end_dt, user_id=request.user.id
+            )
+            if not conflict_ids:
+                return Response(
+                    {
+                        "has_conflicts": False,
+                        "count": 0,
+                        "buffer_minutes": CONFLICT_BUFFER_MINUTES,
+                        "conflicts": [],
+                    }
+                )
+            conflicts = Event.objects.filter(id__in=conflict_ids, status__in=ACTIVE_EVENT_STATUSES)
+
+        conflicts = list(self._with_conflict_details(conflicts))
+
+        serializer = EventListSerializer(conflicts, many=True, context={"request": request})
+        return Response(
+            {
+                "has_conflicts": bool(conflicts),
+                "count": len(conflicts),
+                "buffer_minutes": CONFLICT_BUFFER_MINUTES,
+                "conflicts": serializer.data,
+            }
+        )
+
+    @action(detail=False, methods=["post"])
+    def preview_conflicts_batch(self, request):
+        """
+        POST /events/preview_conflicts_batch/
+        Body: { "slots": [{ "event_date": "YYYY-MM-DD", "start_time": "HH:MM", "end_time": "HH:MM" }] }
+        Verifica conflitos de vários horários de uma vez (turnê, residência recorrente).
 
-        buffer = timedelta(minutes=40)
-        # Adiciona anotações para otimizar N+1
-        conflicts = (
-            Event.objects.filter(
-                status__in=["proposed", "approved", "confirmed"],
-                start_datetime__lt=end_dt + buffer,
-                end_datetime__gt=start_dt - buffer,
+        Uma única query busca os eventos da janela coberta por todos os slots e a
+        associação slot x evento é feita em Python com sweep-line.
+        """
+        raw_slots = request.data.get("slots")
+        if not isinstance(raw_slots, list) or not raw_slots:
+            return Response(
+                {"detail": "Informe ao menos um horário em 'slots'."},
+                status=status.HTTP_400_BAD_REQUEST,
             )
-            .select_related("created_by", "approved_by")
-            .annotate(
-                avail_pending=Count("availabilities", filter=Q(availabilities__response="pending")),
-                avail_available=Count(
-                    "availabilities", filter=Q(availabilities__response="available")
-                ),
-                avail_unavailable=Count(
-                    "availabilities", filter=Q(availabilities__response="unavailable")
-                ),
-                avail_total=Count("availabilities"),
+        if len(raw_slots) > self.conflicts_batch_max_slots:
+            return Response(
+                {"detail": f"Máximo de {self.conflicts_batch_max_slots} horários por consulta."},
+                status=status.HTTP_400_BAD_REQUEST,
             )
-        )
 
-        if not request.user.is_staff:
+        slots = []
+        for position, item in enumerate(raw_slots):
             try:
-                musician = request.user.musician_profile
-                conflicts = conflicts.filter(
-                    Q(created_by=request.user) | Q(availabilities__musician=musician)
-                ).distinct()
-            except Musician.DoesNotExist:
-                conflicts = conflicts.filter(created_by=request.user)
+                slots.append(self._parse_conflict_slot(item))
+            except Exception:
+                return Response(
+                    {"detail": f"Formato inválido de data/horário no item {position + 1}."},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+
+        window_start = min(start for start, _ in slots) - CONFLICT_BUFFER
+        window_end = max(end for _, end in slots) + CONFLICT_BUFFER
+        events = list(
+            self._with_conflict_details(
+                self._conflict_candidates(request.user).filter(
+                    start_datetime__lt=window_end, end_datetime__gt=window_start
+                )
+            )
+        )
+
+        buffer_seconds = int(CONFLICT_BUFFER.total_seconds())
+        matches = sweep_overlaps(
+            [(int(start.timestamp()), int(end.timestamp())) for start, end in slots],
+            [
+                (
+                    int(event.start_datetime.timestamp()) - buffer_seconds,
+                    int(event.end_datetime.timestamp()) + buffer_seconds,
+                )
+                for event in events
+            ],
+        )
+
+        # Serializa cada evento conflitante uma única vez
+        matched_positions = sorted({j for found in matches for j in found})
+        serialized = dict(
+            zip(
+                matched_positions,
+                EventListSerializer(
+                    [events[j] for j in matched_positions],
+                    many=True,
+                    context={"request": request},
+                ).data,
+            )
+        )
+
+        results = []
+        for item, found in zip(raw_slots, matches):
+            results.append(
+                {
+                    "event_date": item.get("event_date"),
+                    "start_time": item.get("start_time"),
+                    "end_time": item.get("end_time"),
+                    "has_conflicts": bool(found),
+                    "count": len(found),
+                    "conflicts": [serialized[j] for j in found],
+                }
+            )
 
-        serializer = EventListSerializer(conflicts, many=True, context={"request": request})
         return Response(
             {
-                "has_conflicts": conflicts.exists(),
-                "count": conflicts.count(),
-                "buffer_minutes": 40,
-                "conflicts": serializer.data,
+                "buffer_minutes": CONFLICT_BUFFER_MINUTES,
+                "conflicting_slots": sum(1 for found in matches if found),
+                "results": results,
             }
         )
 
+    @staticmethod
+    def _parse_conflict_slot(data):
+        """
+        Converte { event_date, start_time, end_time } em (start_dt, end_dt) aware,
+        detectando horários que cruzam a meia-noite.
+        """
+        event_date = date.fromisoformat(data.get("event_date"))
+        start_time_value = time.fromisoformat(data.get("start_time"))
+        end_time_value = time.fromisoformat(data.get("end_time"))
+
+        start_dt = timezone.make_aware(datetime.combine(event_date, start_time_value))
+        if end_time_value <= start_time_value:
+            end_dt = timezone.make_aware(
+                datetime.combine(event_date + timedelta(days=1), end_time_value)
+            )
+        else:
+            end_dt = timezone.make_aware(datetime.combine(event_date, end_time_value))
+        return start_dt, end_dt
+
+    @staticmethod
+    def _conflict_candidates(user):
+        """Eventos ativos visíveis para checagem de conflito (staff vê todos)."""
+        queryset = Event.objects.filter(status__in=ACTIVE_EVENT_STATUSES)
+        if user.is_staff:
+            return queryset
+
+        participant_event_ids = Availability.objects.filter(musician__user=user).values("event_id")
+        return queryset.filter(Q(created_by=user) | Q(id__in=participant_event_ids))
+
+    @staticmethod
+    def _with_conflict_details(queryset):
+        """Adiciona relações usadas pelo EventListSerializer (otimização N+1)."""
+        return EventListSerializer.setup_eager_loading(queryset)
+
     def perform_create(self, serializer):
         """
         Cria evento e disponibilidades para músicos convidados.
@@ -419,9 +560,6 @@ class EventViewSet(viewsets.ModelViewSet):
         invited_musicians_ids = serializer.validated_data.pop("invited_musicians", [])
         required_instruments = serializer.validated_data.pop("required_instruments", [])
 
-        if invited_musicians_ids:
-            invited_musicians_ids = list(dict.fromkeys(invited_musicians_ids))
-
         # Transação atômica para garantir consistência
         with transaction.atomic():
             # Evento solo: confirmado automaticamente
@@ -456,44 +594,16 @@ class EventViewSet(viewsets.ModelViewSet):
             except Musician.DoesNotExist:
                 creator_musician = None
 
-            now = timezone.now()
-
-            # Criar availability do criador (sempre 'available')
-            if creator_musician:
-                Availability.objects.update_or_create(
-                    musician=creator_musician,
-                    event=event,
-                    defaults={
-                        "response": "available",
-                        "notes": "Evento criado por mim",
-                        "responded_at": now,
-                    },
-                )
-
-            # Se não for solo, criar availability para músicos convidados
-            if not is_solo and invited_musicians_ids:
-                invited_musicians = Musician.objects.filter(
-                    id__in=invited_musicians_ids, is_active=True
-                ).exclude(
-                    user=self.request.user
-                )  # Exclui o criador (já adicionado acima)
-
-                for musician in invited_musicians:
-                    Availability.objects.update_or_create(
-                        musician=musician,
-                        event=event,
-                        defaults={
-                            "response": "pending",
-                            "notes": "",
-                            "responded_at": None,
-                        },
-                    )
+            # Availability do criador ('available') + convidados (se não for solo) em lote
+            self._apply_invitations(
+                event,
+                [] if is_solo else invited_musicians_ids,
+                creator_musician=creator_musician,
+            )
 
             if not is_solo:
                 self._check_and_confirm_event(event)
 
-        self._invalidate_events_list_cache(event=event)
-
     def perform_destroy(self, instance):
         """
         Apenas o criador pode deletar o evento de forma definitiva.
@@ -510,8 +620,6 @@ class EventViewSet(viewsets.ModelViewSet):
             f"Deleted: {instance.title} (ID: {instance.id}) | "
             f"IP: {self.request.META.get('REMOTE_ADDR', '')}"
         )
-
-        self._invalidate_events_list_cache(event=instance)
         super().perform_destroy(instance)
 
     def _save_required_instruments(self, event, required_instruments):
@@ -593,84 +701,121 @@ class EventViewSet(viewsets.ModelViewSet):
 
         Se um evento ja confirmado perder alguma confirmacao (ex.: musico muda para unavailable),
         ele volta para proposed e limpamos approved_by/approved_at para nao exibir "Confirmado por ...".
-        Usa select_for_update para evitar race conditions.
+
+        Sem select_for_update: cada tentativa lê o estado atual e aplica um único
+        UPDATE ... WHERE condicionado a esse estado e às regras acima (EXISTS sobre as
+        availabilities, avaliado pelo banco). Respostas que não mudam o status não
+        bloqueiam ninguém; se outra requisição mudou o evento no meio, o UPDATE não
+        casa e a tentativa é refeita.
+
+        Depende do banco (Postgres, READ COMMITTED): Availability.save grava a
+        resposta e o contador F() do evento na mesma transação, o que trava a linha
+        do evento até o commit. O UPDATE condicional daqui, se cruzar com uma
+        resposta em andamento, espera esse lock e o Postgres reavalia status e
+        approved_by na versão nova da linha; e cada resposta só recalcula depois do
+        próprio commit, com um snapshot novo, então a última a recalcular vê todas.
+        Sem esse lock (ou com snapshot por transação, ex. REPEATABLE READ) o laço
+        pode decidir com respostas desatualizadas. Coberto por
+        EventConfirmationConcurrencyTest (só roda no Postgres).
         """
-        # Usa transação com lock para evitar race condition
-        with transaction.atomic():
-            # Re-busca o evento com lock exclusivo e tratamento de erro
-            try:
-                locked_event = Event.objects.select_for_update(nowait=False).get(pk=event.pk)
-            except Exception as e:
-                logger.error(f"Erro ao obter lock do evento {event.pk}: {e}")
-                raise ValidationError({"detail": "Conflito ao confirmar evento. Tente novamente."})
-
-            if locked_event.status in ["cancelled", "rejected"]:
-                logger.warning(
-                    f"Tentativa de confirmar evento {event.pk} com status {locked_event.status}"
-                )
+        current = Event.objects.filter(pk=event.pk)
+
+        for _attempt in range(self.confirmation_max_attempts):
+            snapshot = current.values(
+                "status", "approved_by_id", "created_by_id", "is_solo"
+            ).first()
+            if snapshot is None:
                 return
 
-            all_availabilities = locked_event.availabilities.select_for_update().all()
+            prev_status = snapshot["status"]
+            if prev_status in ["cancelled", "rejected"]:
+                logger.warning(f"Tentativa de confirmar evento {event.pk} com status {prev_status}")
+                return
 
-            # Convidados = todos exceto o criador
-            invitee_availabilities = all_availabilities
-            if locked_event.created_by_id:
-                invitee_availabilities = invitee_availabilities.exclude(
-                    musician__user=locked_event.created_by
+            unchanged = current.filter(
+                status=prev_status, approved_by_id=snapshot["approved_by_id"]
+            )
+            should_confirm = self._should_confirm_condition(event.pk, snapshot)
+            now = timezone.now()
+
+            # Confirma (ou completa approved_by de um evento já confirmado)
+            changes = {"status": "confirmed", "updated_at": now}
+            if not snapshot["approved_by_id"]:
+                approver_id = confirmed_by.pk if confirmed_by else snapshot["created_by_id"]
+                if approver_id:
+                    changes.update(approved_by_id=approver_id, approved_at=now)
+            if prev_status != "confirmed" or "approved_by_id" in changes:
+                candidates = (
+                    unchanged if should_confirm is None else unchanged.filter(should_confirm)
                 )
+                if self._apply_confirmation_change(event, candidates, changes, prev_status):
+                    return
+
+            # Desconfirma: nenhum convidado aceitou
+            if should_confirm is not None and prev_status in ["confirmed", "approved"]:
+                changes = {
+                    "status": "proposed",
+                    "approved_by_id": None,
+                    "approved_at": None,
+                    "updated_at": now,
+                }
+                if self._apply_confirmation_change(
+                    event, unchanged.exclude(should_confirm), changes, prev_status
+                ):
+                    return
+
+            # Nenhum UPDATE casou: ou o status já reflete as regras, ou outra
+            # requisição alterou o evento entre a leitura e o UPDATE (tenta de novo).
+            if unchanged.exists():
+                return
 
-            prev_status = locked_event.status
+        logger.error(f"Conflito persistente ao recalcular status do evento {event.pk}")
+        raise ValidationError({"detail": "Conflito ao confirmar evento. Tente novamente."})
 
-            # Determina se o evento deve estar confirmado
-            if locked_event.is_solo:
-                should_confirm = True
-            elif invitee_availabilities.exists():
-                # Confirma quando algum convidado aceitar.
-                should_confirm = invitee_availabilities.filter(response="available").exists()
-            else:
-                # Sem convidados: confirma automaticamente
-                should_confirm = True
-
-            if should_confirm:
-                if locked_event.status != "confirmed":
-                    locked_event.status = "confirmed"
-
-                if confirmed_by and not locked_event.approved_by:
-                    locked_event.approved_by = confirmed_by
-                    locked_event.approved_at = timezone.now()
-                elif not locked_event.approved_by and locked_event.created_by:
-                    locked_event.approved_by = locked_event.created_by
-                    locked_event.approved_at = timezone.now()
-
-                locked_event.save()
-
-                # Loga apenas quando houve mudanca de status.
-                if prev_status != "confirmed":
-                    approver = locked_event.approved_by
-                    approver_name = None
-                    if approver:
-                        approver_name = approver.get_full_name() or approver.username
-
-                    description = (
-                        f"Evento confirmado por {approver_name}."
-                        if approver_name
-                        else "Evento confirmado."
-                    )
-                    self._log_event(locked_event, "approved", description)
-            else:
-                # Se o evento estava confirmado, volta para "proposed"
-                if locked_event.status in ["confirmed", "approved"]:
-                    locked_event.status = "proposed"
-                    locked_event.approved_by = None
-                    locked_event.approved_at = None
-                    locked_event.save()
-
-                    if prev_status != "proposed":
-                        self._log_event(
-                            locked_event,
-                            "availability",
-                            "Evento voltou para Proposta Enviada (aguardando respostas dos músicos).",
-                        )
+    @staticmethod
+    def _should_confirm_condition(event_id, snapshot):
+        """
+        Condição (avaliada no UPDATE) para o evento estar confirmado:
+        nenhum convidado ou algum convidado 'available'. None = sempre (show solo).
+        """
+        if snapshot["is_solo"]:
+            return None
+
+        invitees = Availability.objects.filter(event_id=event_id)
+        if snapshot["created_by_id"]:
+            invitees = invitees.exclude(musician__user_id=snapshot["created_by_id"])
+        return ~Exists(invitees) | Exists(invitees.filter(response="available"))
+
+    def _apply_confirmation_change(self, event, candidates, changes, prev_status):
+        """
+        Aplica a transição se o UPDATE condicional casar (Event.apply_status_change,
+        que avisa notificações, índice de conflitos e cache da listagem) e loga a
+        mudança na mesma transação.
+        """
+        with transaction.atomic():
+            if not event.apply_status_change(candidates, changes, prev_status):
+                return False
+
+            new_status = changes["status"]
+            if new_status == "confirmed" and prev_status != "confirmed":
+                approver = event.approved_by
+                approver_name = None
+                if approver:
+                    approver_name = approver.get_full_name() or approver.username
+
+                description = (
+                    f"Evento confirmado por {approver_name}."
+                    if approver_name
+                    else "Evento confirmado."
+                )
+                self._log_event(event, "approved", description)
+            elif new_status == "proposed" and prev_status != "proposed":
+                self._log_event(
+                    event,
+                    "availability",
+                    "Evento voltou para Proposta Enviada (aguardando respostas dos músicos).",
+                )
+        return True
 
     @action(detail=True, methods=["post"], permission_classes=[IsAuthenticated])
     def approve(self, request, pk=None):
@@ -716,7 +861,6 @@ class EventViewSet(viewsets.ModelViewSet):
             self._log_event(event, "availability", f"Convite confirmado por {approver_name}.")
 
         self._check_and_confirm_event(event, confirmed_by=request.user)
-        self._invalidate_events_list_cache(event=event)
         serializer = EventDetailSerializer(event, context={"request": request})
         return Response(serializer.data)
 
@@ -771,7 +915,6 @@ class EventViewSet(viewsets.ModelViewSet):
 
         # Se o evento estava confirmado, pode precisar voltar para proposed.
         self._check_and_confirm_event(event)
-        self._invalidate_events_list_cache(event=event)
         serializer = EventDetailSerializer(event, context={"request": request})
         return Response(serializer.data)
 
@@ -806,7 +949,6 @@ class EventViewSet(viewsets.ModelViewSet):
         event.status = "cancelled"
         event.save()
         self._log_event(event, "cancelled", "Evento cancelado pelo criador.")
-        self._invalidate_events_list_cache(event=event)
 
         serializer = EventDetailSerializer(event, context={"request": request})
         return Response(serializer.data)
@@ -885,7 +1027,6 @@ class EventViewSet(viewsets.ModelViewSet):
         self._check_and_confirm_event(
             event, confirmed_by=request.user if response_value == "available" else None
         )
-        self._invalidate_events_list_cache(event=event)
 
         serializer = EventDetailSerializer(event, context={"request": request})
         return Response(serializer.data, status=status.HTTP_200_OK)
@@ -1035,31 +1176,17 @@ class EventViewSet(viewsets.ModelViewSet):
         """
         try:
             musician = request.user.musician_profile
-            events = Event.objects.filter(
-                availabilities__musician=musician,
-                availabilities__response__in=["pending", "available"],
-            ).distinct()
+            participations = Availability.objects.filter(
+                musician=musician, response__in=["pending", "available"]
+            )
+            events = Event.objects.filter(id__in=participations.values("event_id"))
 
             org = get_user_organization(request.user)
             if org:
                 events = events.filter(organization=org)
 
-            events = (
-                events.select_related("created_by", "approved_by")
-                .prefetch_related("availabilities__musician__user")
-                .annotate(
-                    avail_pending=Count(
-                        "availabilities", filter=Q(availabilities__response="pending")
-                    ),
-                    avail_available=Count(
-                        "availabilities", filter=Q(availabilities__response="available")
-                    ),
-                    avail_unavailable=Count(
-                        "availabilities",
-                        filter=Q(availabilities__response="unavailable"),
-                    ),
-                    avail_total=Count("availabilities"),
-                )
+            events = events.select_related("created_by", "approved_by").prefetch_related(
+                "availabilities__musician__user"
             )
 
             serializer = self.get_serializer(events, many=True)
@@ -1075,31 +1202,14 @@ class EventViewSet(viewsets.ModelViewSet):
         """
         try:
             musician = request.user.musician_profile
-            events = Event.objects.filter(
-                availabilities__musician=musician, availabilities__response="pending"
-            ).distinct()
+            pending = Availability.objects.filter(musician=musician, response="pending")
+            events = Event.objects.filter(id__in=pending.values("event_id"))
 
             org = get_user_organization(request.user)
             if org:
                 events = events.filter(organization=org)
 
-            events = (
-                events.select_related("created_by", "approved_by")
-                .prefetch_related("availabilities__musician__user")
-                .annotate(
-                    avail_pending=Count(
-                        "availabilities", filter=Q(availabilities__response="pending")
-                    ),
-                    avail_available=Count(
-                        "availabilities", filter=Q(availabilities__response="available")
-                    ),
-                    avail_unavailable=Count(
-                        "availabilities",
-                        filter=Q(availabilities__response="unavailable"),
-                    ),
-                    avail_total=Count("availabilities"),
-                )
-            )
+            events = EventListSerializer.setup_eager_loading(events)
 
             serializer = EventListSerializer(events, many=True, context={"request": request})
             return Response(serializer.data)
@@ -4,10 +4,13 @@ ViewSet para gerenciamento de disponibilidades de líderes/músicos.
 """
 
 import logging
-from datetime import date, timedelta
+from collections import defaultdict
+from datetime import date, time, timedelta
+from operator import attrgetter
 
-from django.db import models
-from django.db.models import Q
+from django.db import models, transaction
+from django.db.models import Q, Value
+from django.db.models.functions import Coalesce, Concat, NullIf, Trim
 from django.utils import timezone
 from drf_spectacular.utils import OpenApiParameter, extend_schema
 from rest_framework import status, viewsets
@@ -16,11 +19,30 @@ from rest_framework.exceptions import PermissionDenied, ValidationError
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 
-from ..instrument_utils import get_instrument_label
-from ..models import Event, LeaderAvailability, Musician
+from ..availability_rules import iter_rule_slots, merge_slots
+from ..availability_slots import (
+    availability_days_changed,
+    availability_mask,
+    free_during,
+    window_mask,
+)
+from ..conflict_index import ACTIVE_EVENT_STATUSES, CONFLICT_BUFFER
+from ..instrument_utils import filter_by_instrument, get_instrument_label
+from ..models import (
+    Availability,
+    AvailabilityRule,
+    Event,
+    LeaderAvailability,
+    Musician,
+    MusicianDaySlots,
+)
+from ..pagination import StandardResultsSetPagination
 from ..serializers import EventListSerializer, LeaderAvailabilitySerializer
-from ..utils import get_user_organization, split_availability_with_events
-from ..view_functions import expand_instrument_search, normalize_search_text
+from ..utils import (
+    get_user_organization,
+    split_availabilities_with_events,
+    split_availability_with_events,
+)
 
 
 @extend_schema(
@@ -53,8 +75,33 @@ class LeaderAvailabilityViewSet(viewsets.ModelViewSet):
         - ?mine=true (apenas minhas)
         - ?instrument=<instrument> (filtrar por instrumento do músico)
         """
-        queryset = LeaderAvailability.objects.filter(is_active=True).select_related("leader__user")
+        queryset = self._filter_by_params(
+            LeaderAvailability.objects.filter(is_active=True).select_related("leader__user")
+        )
+        if queryset is None:
+            return LeaderAvailability.objects.none()
+
+        # Filtro por data futura
+        if self.request.query_params.get("upcoming") == "true":
+            queryset = queryset.filter(date__gte=timezone.now().date())
+
+        # Filtro por data passada
+        if self.request.query_params.get("past") == "true":
+            queryset = queryset.filter(date__lt=timezone.now().date())
 
+        # Filtro por data específica
+        specific_date = self.request.query_params.get("date")
+        if specific_date:
+            queryset = queryset.filter(date=specific_date)
+
+        return queryset
+
+    def _filter_by_params(self, queryset):
+        """
+        Filtros de dono/visibilidade/músico/instrumento/busca, comuns a
+        LeaderAvailability e AvailabilityRule (mesmos nomes de campos).
+        Retorna None quando nada pode ser listado.
+        """
         mine_param = self.request.query_params.get("mine") == "true"
         public_param = self.request.query_params.get("public") == "true"
 
@@ -66,7 +113,7 @@ class LeaderAvailabilityViewSet(viewsets.ModelViewSet):
             musician = self.request.user.musician_profile
         except Musician.DoesNotExist:
             if mine_param:
-                return LeaderAvailability.objects.none()
+                return None
             musician = None
 
         filters = models.Q()
@@ -75,23 +122,10 @@ class LeaderAvailabilityViewSet(viewsets.ModelViewSet):
         if public_param:
             filters |= models.Q(is_public=True)
         if not filters:
-            return LeaderAvailability.objects.none()
+            return None
 
         queryset = queryset.filter(filters)
 
-        # Filtro por data futura
-        if self.request.query_params.get("upcoming") == "true":
-            queryset = queryset.filter(date__gte=timezone.now().date())
-
-        # Filtro por data passada
-        if self.request.query_params.get("past") == "true":
-            queryset = queryset.filter(date__lt=timezone.now().date())
-
-        # Filtro por data específica
-        specific_date = self.request.query_params.get("date")
-        if specific_date:
-            queryset = queryset.filter(date=specific_date)
-
         # Filtro por músico específico
         leader_id = self.request.query_params.get("leader")
         if leader_id and public_param:
@@ -100,28 +134,7 @@ class LeaderAvailabilityViewSet(viewsets.ModelViewSet):
         # Filtro por instrumento (checa campo primário OU lista de instrumentos)
         instrument = self.request.query_params.get("instrument")
         if instrument:
-            candidate_terms = set()
-            for term in expand_instrument_search(instrument):
-                raw_value = term.strip().lower()
-                if raw_value:
-                    candidate_terms.add(raw_value)
-                    candidate_terms.add(raw_value.replace(" ", "_"))
-                    candidate_terms.add(raw_value.replace("_", " "))
-                normalized = normalize_search_text(term)
-                if not normalized:
-                    continue
-                candidate_terms.add(normalized)
-                candidate_terms.add(normalized.replace(" ", "_"))
-                candidate_terms.add(normalized.replace("_", " "))
-
-            if candidate_terms:
-                instrument_q = Q()
-                for term in candidate_terms:
-                    instrument_q |= Q(leader__instrument__iexact=term)
-                    instrument_q |= Q(leader__instruments__icontains=term)
-                queryset = queryset.filter(instrument_q)
-            else:
-                queryset = queryset.none()
+            queryset = filter_by_instrument(queryset, instrument, prefix="leader__")
 
         # Busca por nome/username/instagram do músico (funciona em todos os modos)
         search = self.request.query_params.get("search")
@@ -136,12 +149,50 @@ class LeaderAvailabilityViewSet(viewsets.ModelViewSet):
 
         return queryset
 
+    def _rule_window(self):
+        """
+        Janela em que as regras recorrentes são expandidas na listagem, ou None
+        (past=true: ocorrências passadas não são listadas).
+        """
+        params = self.request.query_params
+        if params.get("past") == "true":
+            return None
+        specific_date = params.get("date")
+        if specific_date:
+            try:
+                target_date = date.fromisoformat(specific_date)
+            except ValueError:
+                return None
+            return target_date, target_date
+        today = timezone.now().date()
+        return today, today + timedelta(days=self.rule_list_days_ahead)
+
+    def list(self, request, *args, **kwargs):
+        """
+        Lista disponibilidades avulsas e as ocorrências das regras recorrentes
+        (expandidas só na janela: a data pedida ou os próximos
+        rule_list_days_ahead dias), intercaladas por data e horário.
+        """
+        queryset = self.filter_queryset(self.get_queryset())
+        window = self._rule_window()
+        rules = None
+        if window:
+            rules = self._filter_by_params(AvailabilityRule.objects.all())
+        if rules is None:
+            return Response(self.get_serializer(queryset, many=True).data)
+
+        slots = merge_slots(queryset, iter_rule_slots(rules, *window))
+        return Response(self.get_serializer(slots, many=True).data)
+
     def get_permissions(self):
         """
         Permissões: todos autenticados podem criar/editar suas próprias disponibilidades.
         """
         return [IsAuthenticated()]
 
+    bulk_max_items = 100
+    rule_list_days_ahead = 90
+
     def _split_availability_with_events(self, availability, events):
         """
         Divide uma disponibilidade removendo intervalos ocupados por eventos.
@@ -149,6 +200,21 @@ class LeaderAvailabilityViewSet(viewsets.ModelViewSet):
         """
         return split_availability_with_events(availability, events, LeaderAvailability)
 
+    @staticmethod
+    def _busy_events(musician, window_start, window_end):
+        """
+        Eventos ativos do músico (criados por ele ou convidado) que cruzam a janela,
+        considerando o buffer de 40 minutos. Uma única query, sem JOIN + DISTINCT.
+        """
+        participant_event_ids = Availability.objects.filter(musician=musician).values("event_id")
+        return list(
+            Event.objects.filter(
+                status__in=ACTIVE_EVENT_STATUSES,
+                start_datetime__lt=window_end + CONFLICT_BUFFER,
+                end_datetime__gt=window_start - CONFLICT_BUFFER,
+            ).filter(Q(created_by=musician.user) | Q(id__in=participant_event_ids))
+        )
+
     def perform_create(self, serializer):
         """
         Salva disponibilidade atribuindo o músico logado.
@@ -158,18 +224,12 @@ class LeaderAvailabilityViewSet(viewsets.ModelViewSet):
             org = get_user_organization(self.request.user)
             serializer.save(leader=musician, organization=org)
             created = serializer.instance
-            buffer = timedelta(minutes=40)
-            conflicting_events = Event.objects.filter(
-                status__in=["proposed", "approved", "confirmed"],
-                start_datetime__lt=created.end_datetime + buffer,
-                end_datetime__gt=created.start_datetime - buffer,
+            conflicting_events = self._busy_events(
+                musician, created.start_datetime, created.end_datetime
             )
-            conflicting_events = conflicting_events.filter(
-                Q(created_by=musician.user) | Q(availabilities__musician=musician)
-            ).distinct()
-            if conflicting_events.exists():
+            if conflicting_events:
                 # Ajusta disponibilidade recém-criada consumindo eventos já existentes
-                self._split_availability_with_events(created, list(conflicting_events))
+                self._split_availability_with_events(created, conflicting_events)
         except Musician.DoesNotExist:
             raise ValidationError({"detail": "Usuário não possui perfil de músico."})
 
@@ -204,17 +264,11 @@ class LeaderAvailabilityViewSet(viewsets.ModelViewSet):
                 raise PermissionDenied("Você não pode editar disponibilidades de outros músicos.")
 
             instance = serializer.save()
-            buffer = timedelta(minutes=40)
-            conflicting_events = Event.objects.filter(
-                status__in=["proposed", "approved", "confirmed"],
-                start_datetime__lt=instance.end_datetime + buffer,
-                end_datetime__gt=instance.start_datetime - buffer,
+            conflicting_events = self._busy_events(
+                musician, instance.start_datetime, instance.end_datetime
             )
-            conflicting_events = conflicting_events.filter(
-                Q(created_by=musician.user) | Q(availabilities__musician=musician)
-            ).distinct()
-            if conflicting_events.exists():
-                self._split_availability_with_events(instance, list(conflicting_events))
+            if conflicting_events:
+                self._split_availability_with_events(instance, conflicting_events)
         except Musician.DoesNotExist:
             raise ValidationError({"detail": "Usuário não possui perfil de músico."})
 
@@ -232,6 +286,88 @@ class LeaderAvailabilityViewSet(viewsets.ModelViewSet):
         except Musician.DoesNotExist:
             raise ValidationError({"detail": "Usuário não possui perfil de músico."})
 
+    @action(detail=False, methods=["post"], url_path="bulk")
+    def bulk(self, request):
+        """
+        POST /leader-availabilities/bulk/
+        Body: { "availabilities": [{ "date", "start_time", "end_time", "notes", "is_public" }] }
+        Importa várias disponibilidades (ex.: um mês inteiro) de uma vez.
+
+        Custo constante de queries: um bulk_create das disponibilidades, uma query
+        de eventos para a janela inteira, o split em lote (UPDATE + bulk_create) e
+        o upsert do bitmap diário (agenda/availability_slots.py).
+        """
+        items = request.data.get("availabilities")
+        if not isinstance(items, list) or not items:
+            return Response(
+                {"detail": "Informe ao menos uma disponibilidade em 'availabilities'."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        if len(items) > self.bulk_max_items:
+            return Response(
+                {"detail": f"Máximo de {self.bulk_max_items} disponibilidades por importação."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        try:
+            musician = request.user.musician_profile
+        except Musician.DoesNotExist:
+            raise ValidationError({"detail": "Usuário não possui perfil de músico."})
+
+        serializer = self.get_serializer(data=items, many=True)
+        serializer.is_valid(raise_exception=True)
+
+        org = get_user_organization(request.user)
+        now = timezone.now()
+        objs = []
+        for data in serializer.validated_data:
+            obj = LeaderAvailability(
+                leader=musician,
+                organization=org,
+                date=data["date"],
+                start_time=data["start_time"],
+                end_time=data["end_time"],
+                notes=data.get("notes"),
+                is_public=data.get("is_public", False),
+                is_active=True,
+                created_at=now,
+                updated_at=now,
+            )
+            obj.combine_datetimes()
+            objs.append(obj)
+
+        with transaction.atomic():
+            created = LeaderAvailability.objects.bulk_create(objs)
+            events = self._busy_events(
+                musician,
+                min(obj.start_datetime for obj in created),
+                max(obj.end_datetime for obj in created),
+            )
+            fragments = split_availabilities_with_events(created, events, LeaderAvailability)
+            # bulk_create não dispara signals (o split já cuida dos dias que dividiu)
+            availability_days_changed((obj.leader_id, obj.date) for obj in created)
+
+        active = [obj for obj in created if obj.is_active] + fragments
+        active.sort(key=lambda obj: obj.start_datetime)
+        return Response(
+            {
+                "created": len(created),
+                "split": sum(1 for obj in created if not obj.is_active),
+                "availabilities": [
+                    {
+                        "id": obj.id,
+                        "date": obj.date.isoformat(),
+                        "start_time": obj.start_time.strftime("%H:%M"),
+                        "end_time": obj.end_time.strftime("%H:%M"),
+                        "notes": obj.notes,
+                        "is_public": obj.is_public,
+                    }
+                    for obj in active
+                ],
+            },
+            status=status.HTTP_201_CREATED,
+        )
+
     @action(detail=True, methods=["get"])
     def conflicting_events(self, request, pk=None):
         """
@@ -239,7 +375,7 @@ class LeaderAvailabilityViewSet(viewsets.ModelViewSet):
         Retorna lista de eventos que conflitam com esta disponibilidade (incluindo buffer de 40 min).
         """
         availability = self.get_object()
-        conflicting = availability.get_conflicting_events()
+        conflicting = EventListSerializer.setup_eager_loading(availability.get_conflicting_events())
 
         serializer = EventListSerializer(conflicting, many=True, context={"request": request})
         return Response(serializer.data)
@@ -254,6 +390,17 @@ class LeaderAvailabilityViewSet(viewsets.ModelViewSet):
         Parâmetros opcionais:
         - instrument: filtra por instrumento
         - only_available: se 'true', retorna apenas músicos com disponibilidade
+        - start_time/end_time (HH:MM): janela do show. has_availability passa a
+          exigir disponibilidade pública cobrindo a janela inteira (bitmap
+          diário, agenda/availability_slots.py). end_time 00:00 = meia-noite.
+        - page/page_size: pagina a resposta ({count, next, previous, results}).
+          Sem eles, a lista completa é devolvida como antes.
+
+        Regras recorrentes públicas entram expandidas para a data (sem os
+        horários ocupados por eventos) e contam como disponibilidade.
+
+        A ordenação (disponíveis primeiro, depois nome) é feita no banco, e os
+        horários são carregados só para os músicos da página.
         """
         date_param = request.query_params.get("date")
         if not date_param:
@@ -270,12 +417,22 @@ class LeaderAvailabilityViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        # Busca todos os músicos ativos, exceto o próprio usuário
-        musicians = (
-            Musician.objects.filter(is_active=True)
-            .select_related("user")
-            .exclude(user=request.user)
-        )
+        window = None
+        start_param = request.query_params.get("start_time")
+        end_param = request.query_params.get("end_time")
+        if start_param or end_param:
+            try:
+                window = (time.fromisoformat(start_param), time.fromisoformat(end_param))
+            except (TypeError, ValueError):
+                return Response(
+                    {"detail": "Informe start_time e end_time no formato HH:MM."},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+            if window[1] <= window[0] and window[1] != time(0, 0):
+                return Response(
+                    {"detail": "end_time deve ser posterior a start_time."},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
 
         if not request.user.is_staff:
             try:
@@ -283,50 +440,88 @@ class LeaderAvailabilityViewSet(viewsets.ModelViewSet):
             except Musician.DoesNotExist:
                 return Response([])
 
+        if window:
+            has_availability = free_during(target_date, *window)
+        else:
+            has_availability = models.Exists(
+                LeaderAvailability.objects.filter(
+                    leader=models.OuterRef("pk"),
+                    date=target_date,
+                    is_active=True,
+                    is_public=True,
+                )
+            )
+
+        # Regras recorrentes: ocorrências públicas da data, já sem os eventos
+        rule_slots = defaultdict(list)
+        public_rules = AvailabilityRule.objects.filter(
+            is_public=True, leader__is_active=True
+        ).exclude(leader__user=request.user)
+        for slot in iter_rule_slots(public_rules, target_date, target_date):
+            if slot.date == target_date:
+                rule_slots[slot.leader_id].append(slot)
+        rule_leader_ids = self._rule_leaders_available(rule_slots, target_date, window)
+        if rule_leader_ids:
+            has_availability = models.ExpressionWrapper(
+                Q(has_availability) | Q(pk__in=rule_leader_ids),
+                output_field=models.BooleanField(),
+            )
+
+        # Busca todos os músicos ativos, exceto o próprio usuário
+        musicians = (
+            Musician.objects.filter(is_active=True)
+            .select_related("user")
+            .exclude(user=request.user)
+            .annotate(
+                has_availability=has_availability,
+                sort_name=Coalesce(
+                    NullIf(
+                        Trim(Concat("user__first_name", Value(" "), "user__last_name")), Value("")
+                    ),
+                    "user__username",
+                ),
+            )
+        )
+
         # Filtro opcional por instrumento (checa campo primário OU lista de instrumentos)
         instrument = request.query_params.get("instrument")
         if instrument:
-            candidate_terms = set()
-            for term in expand_instrument_search(instrument):
-                raw_value = term.strip().lower()
-                if raw_value:
-                    candidate_terms.add(raw_value)
-                    candidate_terms.add(raw_value.replace(" ", "_"))
-                    candidate_terms.add(raw_value.replace("_", " "))
-                normalized = normalize_search_text(term)
-                if not normalized:
-                    continue
-                candidate_terms.add(normalized)
-                candidate_terms.add(normalized.replace(" ", "_"))
-                candidate_terms.add(normalized.replace("_", " "))
-
-            if candidate_terms:
-                instrument_q = Q()
-                for term in candidate_terms:
-                    instrument_q |= Q(instrument__iexact=term)
-                    instrument_q |= Q(instruments__icontains=term)
-                musicians = musicians.filter(instrument_q)
-            else:
-                musicians = musicians.none()
-
-        # Busca disponibilidades públicas na data (para associar aos músicos)
+            musicians = filter_by_instrument(musicians, instrument)
+
+        if request.query_params.get("only_available", "").lower() == "true":
+            musicians = musicians.filter(has_availability=True)
+
+        # Ordena: músicos com disponibilidade primeiro, depois por nome
+        musicians = musicians.order_by("-has_availability", "sort_name", "id")
+
+        paginator = None
+        if "page" in request.query_params or "page_size" in request.query_params:
+            paginator = StandardResultsSetPagination()
+            page = paginator.paginate_queryset(musicians, request, view=self)
+        else:
+            page = list(musicians)
+
+        # Disponibilidades públicas na data, só dos músicos desta página
         availabilities_map = {}
         availabilities = LeaderAvailability.objects.filter(
-            is_active=True, is_public=True, date=target_date
-        ).select_related("leader")
+            leader_id__in=[musician.id for musician in page],
+            is_active=True,
+            is_public=True,
+            date=target_date,
+        ).order_by("start_time", "id")
         for avail in availabilities:
             availabilities_map.setdefault(avail.leader_id, []).append(avail)
 
-        only_available = request.query_params.get("only_available", "").lower() == "true"
-
         result = []
-        for musician in musicians:
+        for musician in page:
             avail_list = availabilities_map.get(musician.id, [])
-            primary_avail = min(avail_list, key=lambda x: x.start_time) if avail_list else None
-
-            # Se only_available=true, pula músicos sem disponibilidade
-            if only_available and not primary_avail:
-                continue
+            if musician.id in rule_slots:
+                avail_list = sorted(
+                    avail_list + rule_slots[musician.id], key=attrgetter("start_time")
+                )
+            primary_avail = None
+            if musician.has_availability:
+                primary_avail = self._primary_availability(avail_list, window)
 
             availability_slots = [
                 {
@@ -334,8 +529,9 @@ class LeaderAvailabilityViewSet(viewsets.ModelViewSet):
                     "start_time": slot.start_time.strftime("%H:%M"),
                     "end_time": slot.end_time.strftime("%H:%M"),
                     "notes": slot.notes,
+                    "rule_id": getattr(slot, "availability_rule_id", None),
                 }
-                for slot in sorted(avail_list, key=lambda x: x.start_time)
+                for slot in avail_list
             ]
 
             musician_data = {
@@ -343,7 +539,7 @@ class LeaderAvailabilityViewSet(viewsets.ModelViewSet):
                 "musician_name": musician.user.get_full_name() or musician.user.username,
                 "instrument": musician.instrument,
                 "instrument_display": get_instrument_label(musician.instrument),
-                "has_availability": primary_avail is not None,
+                "has_availability": musician.has_availability,
                 "availability_id": primary_avail.id if primary_avail else None,
                 "start_time": primary_avail.start_time.strftime("%H:%M") if primary_avail else None,
                 "end_time": primary_avail.end_time.strftime("%H:%M") if primary_avail else None,
@@ -353,7 +549,49 @@ class LeaderAvailabilityViewSet(viewsets.ModelViewSet):
             }
             result.append(musician_data)
 
-        # Ordena: músicos com disponibilidade primeiro, depois por nome
-        result.sort(key=lambda x: (not x["has_availability"], x["musician_name"]))
-
+        if paginator:
+            return paginator.get_paginated_response(result)
         return Response(result)
+
+    @staticmethod
+    def _rule_leaders_available(rule_slots, target_date, window) -> set:
+        """
+        Músicos livres pelas regras recorrentes. Com janela, a cobertura soma as
+        ocorrências ao bitmap das disponibilidades avulsas do dia.
+        """
+        if not window:
+            return set(rule_slots)
+
+        window_am, window_pm = window_mask(*window)
+        masks = {}
+        for leader_id, slots in rule_slots.items():
+            am, pm = 0, 0
+            for slot in slots:
+                slot_am, slot_pm = availability_mask(slot.start_time, slot.end_time)
+                am, pm = am | slot_am, pm | slot_pm
+            masks[leader_id] = (am, pm)
+        stored = MusicianDaySlots.objects.filter(
+            musician_id__in=masks, date=target_date
+        ).values_list("musician_id", "slots_am", "slots_pm")
+        for leader_id, am, pm in stored:
+            rule_am, rule_pm = masks[leader_id]
+            masks[leader_id] = (rule_am | am, rule_pm | pm)
+        return {
+            leader_id
+            for leader_id, (am, pm) in masks.items()
+            if am & window_am == window_am and pm & window_pm == window_pm
+        }
+
+    @staticmethod
+    def _primary_availability(avail_list, window):
+        """Primeira disponibilidade que cruza a janela (ou a primeira do dia, sem janela)."""
+        if window:
+            start, end = window
+            for avail in avail_list:
+                avail_end = avail.end_time if avail.end_time > avail.start_time else time.max
+                if (
+                    avail.start_time < (end if end != time(0, 0) else time.max)
+                    and avail_end > start
+                ):
+                    return avail
+        return avail_list[0] if avail_list else None
@@ -3,23 +3,42 @@
 ViewSet para gerenciamento de músicos.
 """
 
-from django.core.cache import cache
-from django.db.models import Case, Count, IntegerField, Q, When
+from django.http import StreamingHttpResponse
 from django.utils import timezone
 from rest_framework import status, viewsets
 from rest_framework.decorators import action, permission_classes
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
 
-from ..instrument_utils import INSTRUMENT_LABELS
+from ..calendar_feed import (
+    FEED_CONTENT_TYPE,
+    FeedContentNegotiation,
+    delta_since,
+    feed_querysets,
+    issue_sync_token,
+    iter_feed,
+)
+from ..conditional_get import conditional_response, make_etag
+from ..events_list_cache import events_list_cache
+from ..instrument_utils import INSTRUMENT_LABELS, filter_by_instrument
 from ..models import LeaderAvailability, Musician
+from ..musician_facets import FACET_INSTRUMENT, facet_counts
+from ..musician_search import search_musicians
 from ..pagination import StandardResultsSetPagination
+from ..public_cache import public_cache
+from ..public_calendar import (
+    calendar_events,
+    calendar_slots,
+    calendar_tags,
+    get_snapshot,
+    visitor_calendar,
+)
 from ..serializers import (
     MusicianSerializer,
     MusicianUpdateSerializer,
     PublicCalendarSerializer,
 )
-from ..view_functions import expand_instrument_search, normalize_search_text
+from ..throttles import PublicRateThrottle
 
 
 class MusicianViewSet(viewsets.ReadOnlyModelViewSet):
@@ -43,48 +62,12 @@ class MusicianViewSet(viewsets.ReadOnlyModelViewSet):
         queryset = self._scope_queryset(queryset)
         search = self.request.query_params.get("search")
         if search:
-            search_normalized = normalize_search_text(search)
-            genre_search = search_normalized.replace(" ", "_")
-            queryset = queryset.filter(
-                Q(user__first_name__icontains=search)
-                | Q(user__last_name__icontains=search)
-                | Q(user__first_name__icontains=search_normalized)
-                | Q(user__last_name__icontains=search_normalized)
-                | Q(user__username__icontains=search)
-                | Q(instagram__icontains=search)
-                | Q(bio__icontains=search)
-                | Q(instrument__icontains=search)
-                | Q(instrument__icontains=search_normalized)
-                | Q(instruments__icontains=search)
-                | Q(instruments__icontains=search_normalized)
-                | Q(musical_genres__icontains=search)
-                | Q(musical_genres__icontains=search_normalized)
-                | Q(musical_genres__icontains=genre_search)
+            queryset = search_musicians(queryset, search).order_by(
+                "-search_rank", "user__first_name"
             )
         instrument = self.request.query_params.get("instrument")
         if instrument and instrument != "all":
-            candidate_terms = set()
-            for term in expand_instrument_search(instrument):
-                raw_value = term.strip().lower()
-                if raw_value:
-                    candidate_terms.add(raw_value)
-                    candidate_terms.add(raw_value.replace(" ", "_"))
-                    candidate_terms.add(raw_value.replace("_", " "))
-                normalized = normalize_search_text(term)
-                if not normalized:
-                    continue
-                candidate_terms.add(normalized)
-                candidate_terms.add(normalized.replace(" ", "_"))
-                candidate_terms.add(normalized.replace("_", " "))
-
-            if candidate_terms:
-                instrument_q = Q()
-                for term in candidate_terms:
-                    instrument_q |= Q(instrument__iexact=term)
-                    instrument_q |= Q(instruments__icontains=term)
-                queryset = queryset.filter(instrument_q)
-            else:
-                queryset = queryset.none()
+            queryset = filter_by_instrument(queryset, instrument)
         return queryset
 
     @action(detail=False, methods=["get", "patch"], permission_classes=[IsAuthenticated])
@@ -107,7 +90,6 @@ class MusicianViewSet(viewsets.ReadOnlyModelViewSet):
             )
             serializer.is_valid(raise_exception=True)
             serializer.save()
-            cache.delete(f"musician_public_{musician.id}")
             output = MusicianSerializer(musician, context={"request": request})
             return Response(output.data)
 
@@ -123,26 +105,15 @@ class MusicianViewSet(viewsets.ReadOnlyModelViewSet):
         """
         instrument_labels = INSTRUMENT_LABELS
 
-        # Busca instrumentos únicos com contagem
-        instruments_data = (
-            self._scope_queryset(Musician.objects.filter(is_active=True))
-            .exclude(instrument__isnull=True)
-            .exclude(instrument="")
-            .values("instrument")
-            .annotate(count=Count("id"))
-            .order_by("instrument")
-        )
-
-        result = []
-        for item in instruments_data:
-            instrument = item["instrument"]
-            result.append(
-                {
-                    "value": instrument,
-                    "label": instrument_labels.get(instrument, instrument.capitalize()),
-                    "count": item["count"],
-                }
-            )
+        # Contagens materializadas (MusicianFacetCount), sem varrer Musician
+        result = [
+            {
+                "value": instrument,
+                "label": instrument_labels.get(instrument, instrument.capitalize()),
+                "count": count,
+            }
+            for instrument, count in sorted(facet_counts(FACET_INSTRUMENT))
+        ]
 
         return Response(result)
 
@@ -194,11 +165,12 @@ class MusicianViewSet(viewsets.ReadOnlyModelViewSet):
             "events": [...],
             "availabilities": [...]
         }
+
+        Visitantes leem o snapshot pré-serializado (agenda/public_calendar.py);
+        o dono consulta ao vivo.
         """
         from rest_framework.permissions import IsAuthenticated
 
-        from ..models import Availability, Event
-
         try:
             musician = self.get_object()
         except Exception:
@@ -237,90 +209,101 @@ class MusicianViewSet(viewsets.ReadOnlyModelViewSet):
         start_date = today - timezone.timedelta(days=days_back)
         end_date = today + timezone.timedelta(days=days_ahead)
 
-        # 2. Filtro base para todos os eventos futuros do músico
-        event_filter = {
-            "event_date__gte": start_date,
-            "event_date__lte": end_date,
-        }
-
-        # 3. Filtra eventos SEMPRE pelo músico do perfil visitado
-        # Usa subquery para evitar perda de eventos por JOIN em availabilities
-        availability_event_ids = Availability.objects.filter(
-            musician=musician,
-            event__event_date__gte=start_date,
-            event__event_date__lte=end_date,
-        ).values("event_id")
-
-        events_queryset = Event.objects.filter(**event_filter).filter(
-            Q(created_by=musician.user) | Q(id__in=availability_event_ids)
+        # Carimbo de versão: eventos do músico (criados ou como convidado),
+        # perfil/disponibilidades no cache público e os parâmetros da consulta
+        etag = make_etag(
+            "public-calendar",
+            musician.id,
+            events_list_cache.version(musician.user_id),
+            public_cache.stamp(*calendar_tags(musician.id)),
+            is_owner,
+            include_private,
+            days_ahead,
+            days_back,
+            today,
         )
 
-        # 4. Se não for dono, filtra apenas eventos confirmados/aprovados
-        if not is_owner:
-            events_queryset = events_queryset.filter(
-                Q(status__in=["confirmed", "approved"])
-                | Q(is_private=True, status__in=["proposed", "confirmed", "approved"])
+        def build():
+            # Visitantes: recorte do snapshot pré-serializado do músico
+            if not is_owner:
+                snapshot = get_snapshot(musician, today)
+                return Response(
+                    visitor_calendar(
+                        snapshot,
+                        request,
+                        start_date=start_date,
+                        end_date=end_date,
+                        days_ahead=days_ahead,
+                    )
+                )
+
+            # Dono: consulta ao vivo (inclui propostas e disponibilidades privadas)
+            events = list(calendar_events(musician, start_date, end_date, is_owner=True))
+            availabilities = list(
+                calendar_slots(musician, today, end_date, public_only=not include_private)
             )
 
-        events_queryset = events_queryset.distinct()
-
-        # Ordenar e anotar disponibilidade
-        events_queryset = events_queryset.order_by("event_date", "start_time")
-
-        # Anotar contagem de disponibilidades para otimização (N+1 → N+2)
-        events_queryset = events_queryset.annotate(
-            avail_pending=Count(
-                Case(
-                    When(availabilities__response="pending", then=1),
-                    default=0,
-                ),
-                output_field=IntegerField(),
-            ),
-            avail_available=Count(
-                Case(
-                    When(availabilities__response="available", then=1),
-                    default=0,
-                ),
-                output_field=IntegerField(),
-            ),
-            avail_unavailable=Count(
-                Case(
-                    When(availabilities__response="unavailable", then=1),
-                    default=0,
-                ),
-                output_field=IntegerField(),
-            ),
-            avail_total=Count("availabilities"),
-        )
+            response_data = {
+                "events": events,
+                "availabilities": availabilities,
+                "is_owner": is_owner,
+                "days_ahead": days_ahead,
+            }
+            serializer = PublicCalendarSerializer(
+                response_data, context={"request": request, "is_owner": is_owner}
+            )
+            return Response(serializer.data)
+
+        return conditional_response(request, build, etag=etag)
+
+    @action(
+        detail=True,
+        methods=["get"],
+        url_path="calendar-feed",
+        permission_classes=[AllowAny],
+        throttle_classes=[PublicRateThrottle],
+        content_negotiation_class=FeedContentNegotiation,
+    )
+    def calendar_feed(self, request, pk=None):
+        """
+        GET /musicians/{id}/calendar-feed/
+        Agenda pública em iCalendar (assinatura no Google/Apple Calendar).
 
-        # Converter para lista
-        events = list(events_queryset)
-
-        # 2. Buscar disponibilidades do músico
-        availabilities_queryset = LeaderAvailability.objects.filter(
-            leader=musician,
-            is_active=True,
-            date__gte=today,
-            date__lte=end_date,
-        ).order_by("date", "start_time")
-
-        # Apenas o dono com include_private=true pode ver disponibilidades privadas
-        if not (is_owner and include_private):
-            availabilities_queryset = availabilities_queryset.filter(is_public=True)
-
-        availabilities = list(availabilities_queryset)
-
-        # 3. Serializar resposta
-        response_data = {
-            "events": events,
-            "availabilities": availabilities,
-            "is_owner": is_owner,
-            "days_ahead": days_ahead,
-        }
+        Query Parameters:
+        - sync_token: X-Sync-Token de uma resposta anterior; devolve só o que
+          mudou desde então (X-Sync-Mode: delta) ou o feed completo quando o
+          token é inválido ou anterior a uma remoção (X-Sync-Mode: full)
+        """
+        try:
+            musician = self.get_object()
+        except Exception:
+            return Response(
+                {"detail": "Músico não encontrado"},
+                status=status.HTTP_404_NOT_FOUND,
+            )
 
-        # Usar serializer apropriado
-        serializer = PublicCalendarSerializer(
-            response_data, context={"request": request, "is_owner": is_owner}
+        today = timezone.now().date()
+        raw_token = request.query_params.get("sync_token")
+        since = delta_since(musician, raw_token)
+        etag = make_etag(
+            "calendar-feed",
+            musician.id,
+            events_list_cache.version(musician.user_id),
+            public_cache.stamp(*calendar_tags(musician.id)),
+            today,
+            raw_token if since is not None else "",
         )
 
-        return Response(serializer.data)
+        def build():
+            sync_token = issue_sync_token()
+            events, availabilities = feed_querysets(musician, today, since)
+            response = StreamingHttpResponse(
+                iter_feed(musician, events, availabilities, sync_token=sync_token),
+                content_type=FEED_CONTENT_TYPE,
+            )
+            response["Content-Disposition"] = f'inline; filename="agenda-{musician.id}.ics"'
+            response["X-Sync-Token"] = sync_token
+            response["X-Sync-Mode"] = "full" if since is None else "delta"
+            return response
+
+        return conditional_response(request, build, etag=etag, private=False)
@@ -4,6 +4,7 @@ from datetime import timedelta
 from pathlib import Path
 from urllib.parse import parse_qs, unquote, urlparse
 
+from corsheaders.defaults import default_headers
 from decouple import Config, RepositoryEnv
 from decouple import config as decouple_config
 
@@ -363,6 +364,10 @@ if DEBUG:
 
 CORS_URLS_REGEX = r"^/api/.*$"
 
+# GET condicional (agenda/conditional_get.py) e sync token do feed ICS visíveis ao fetch
+CORS_ALLOW_HEADERS = (*default_headers, "if-none-match", "if-modified-since")
+CORS_EXPOSE_HEADERS = ["ETag", "Last-Modified", "X-Sync-Token", "X-Sync-Mode"]
+
 if not DEBUG:
     if CORS_ALLOW_CREDENTIALS and not CORS_ALLOWED_ORIGINS:
         raise RuntimeError(
@@ -401,6 +406,7 @@ GOOGLE_CLIENT_SECRET = config("GOOGLE_CLIENT_SECRET", default="")
 TELEGRAM_BOT_TOKEN = config("TELEGRAM_BOT_TOKEN", default="")
 TELEGRAM_BOT_USERNAME = config("TELEGRAM_BOT_USERNAME", default="")
 TELEGRAM_WEBHOOK_SECRET = config("TELEGRAM_WEBHOOK_SECRET", default="")
+TELEGRAM_API_URL = config("TELEGRAM_API_URL", default="https://api.telegram.org")
 
 
 # =========================================================
@@ -130,6 +130,7 @@ build_and_deploy() {
 
     # Evita janela longa de indisponibilidade: builda imagens com a stack antiga no ar
     # e depois aplica o update em rolling-recreate do Compose.
+    # O notification-worker usa a imagem do backend e e recriado junto no "up -d".
     run_with_timeout "$DOCKER_BUILD_TIMEOUT_SECONDS" "docker compose build backend frontend" \
         docker compose --env-file "$ENV_FILE" -f "$COMPOSE_FILE" build backend frontend
 
@@ -243,6 +244,19 @@ check_health() {
     else
         echo -e "  Backend: ${RED}FALHOU${NC} (${backend_code})"
     fi
+
+    # Worker da outbox nao expoe porta: usa o healthcheck (heartbeat) do container
+    local worker_id worker_health
+    worker_id=$(docker compose --env-file "$ENV_FILE" -f "$COMPOSE_FILE" ps -q notification-worker 2>/dev/null || true)
+    worker_health=$(docker inspect --format '{{.State.Health.Status}}' "$worker_id" 2>/dev/null || echo "ausente")
+
+    if [ "$worker_health" = "healthy" ]; then
+        echo -e "  Notificacoes: ${GREEN}OK${NC} (${worker_health})"
+    elif [ "$worker_health" = "starting" ]; then
+        echo -e "  Notificacoes: ${YELLOW}INICIANDO${NC} (${worker_health})"
+    else
+        echo -e "  Notificacoes: ${RED}FALHOU${NC} (${worker_health})"
+    fi
 }
 
 show_logs() {
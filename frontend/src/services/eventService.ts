@@ -60,6 +60,24 @@ export const eventService = {
     return response.data;
   },
 
+  previewConflictsBatch: async (
+    slots: Array<{ event_date: string; start_time: string; end_time: string }>
+  ): Promise<{
+    buffer_minutes: number;
+    conflicting_slots: number;
+    results: Array<{
+      event_date: string;
+      start_time: string;
+      end_time: string;
+      has_conflicts: boolean;
+      count: number;
+      conflicts: Event[];
+    }>;
+  }> => {
+    const response = await api.post('/events/preview_conflicts_batch/', { slots });
+    return response.data;
+  },
+
   setAvailability: async (
     id: number,
     responseValue: 'available' | 'unavailable',
@@ -15,6 +15,20 @@ export const leaderAvailabilityService = {
     return response.data;
   },
 
+  createBulk: async (
+    availabilities: LeaderAvailabilityCreate[]
+  ): Promise<{
+    created: number;
+    split: number;
+    availabilities: Array<Pick<
+      LeaderAvailability,
+      'id' | 'date' | 'start_time' | 'end_time' | 'notes' | 'is_public'
+    >>;
+  }> => {
+    const response = await api.post('/leader-availabilities/bulk/', { availabilities });
+    return response.data;
+  },
+
   update: async (id: number, payload: LeaderAvailabilityCreate): Promise<LeaderAvailability> => {
     const response = await api.put(`/leader-availabilities/${id}/`, payload);
     return response.data;
@@ -6,10 +6,10 @@ from unittest.mock import patch
 from django.contrib.auth.models import User
 from django.test import TestCase
 from rest_framework import status
-from rest_framework.test import APITestCase
+from rest_framework.test import APIClient, APITestCase
 
 from agenda.models import Availability, Event, Musician, Organization
-from notifications.models import NotificationPreference
+from notifications.models import NotificationLog, NotificationPreference
 from notifications.services.marketplace_notifications import notify_new_gig_in_city
 
 from .models import Gig, GigApplication, GigChatMessage
@@ -534,11 +534,7 @@ class MarketplaceNotificationServiceTest(TestCase):
             is_active=True,
         )
 
-    @patch(
-        "notifications.services.marketplace_notifications.notification_service.send_notification"
-    )
-    @patch("notifications.services.marketplace_notifications.send_event_notification_email")
-    def test_notify_new_gig_in_city_sends_email_and_telegram(self, email_mock, telegram_mock):
+    def test_notify_new_gig_in_city_enqueues_email_and_telegram(self):
         gig = Gig.objects.create(
             title="Show em Monte Carmelo",
             city="Monte Carmelo/MG",
@@ -556,13 +552,52 @@ class MarketplaceNotificationServiceTest(TestCase):
 
         notify_new_gig_in_city(gig.id)
 
-        self.assertEqual(email_mock.call_count, 1)
-        self.assertEqual(email_mock.call_args.kwargs["to_email"], self.recipient.email)
-        self.assertEqual(telegram_mock.call_count, 1)
-        self.assertEqual(telegram_mock.call_args.kwargs["user"], self.recipient)
+        logs = NotificationLog.objects.filter(content_type="marketplace_new_gig", object_id=gig.id)
+        self.assertEqual(
+            sorted(logs.values_list("user_id", "channel", "status")),
+            [
+                (self.recipient.id, "email", "pending"),
+                (self.recipient.id, "telegram", "pending"),
+            ],
+        )
+
+    def test_new_gig_fan_out_is_batched_and_reports_progress(self):
+        for i in range(5):
+            user = User.objects.create_user(
+                username=f"mc{i}", email=f"mc{i}@example.com", password="testpass123"
+            )
+            Musician.objects.create(
+                user=user, instrument="guitar", city="Monte Carmelo", state="MG", is_active=True
+            )
+        NotificationPreference.objects.create(user=self.recipient, notify_quote_requests=False)
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.creator)
+
+        with patch("notifications.services.marketplace_notifications.FANOUT_BATCH_SIZE", 2):
+            with self.captureOnCommitCallbacks(execute=True) as callbacks:
+                response = self.client.post(
+                    "/api/marketplace/gigs/",
+                    {"title": "Baile", "city": "Monte Carmelo/MG"},
+                    format="json",
+                )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(callbacks, [])
+
+        url = f"/api/marketplace/gigs/{response.data['id']}/notification-progress/"
+        progress = self.client.get(url).data
+        # Quem desativou avisos de vagas fica de fora
+        self.assertEqual(progress["total"], 5)
+        self.assertEqual(progress["pending"], 5)
+        self.assertFalse(progress["done"])
+
+        NotificationLog.objects.update(status="sent")
+        progress = self.client.get(url).data
+        self.assertEqual((progress["sent"], progress["done"]), (5, True))
+
+        self.client.force_authenticate(user=self.recipient)
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_403_FORBIDDEN)
 
-    @patch("notifications.services.marketplace_notifications.send_event_notification_email")
-    def test_notify_new_gig_in_city_logs_when_no_recipients(self, email_mock):
+    def test_notify_new_gig_in_city_logs_when_no_recipients(self):
         gig = Gig.objects.create(
             title="Show sem destinatarios",
             city="Monte Carmelo/MG",
@@ -578,4 +613,4 @@ class MarketplaceNotificationServiceTest(TestCase):
 
         output = "\n".join(logs.output)
         self.assertIn("nenhum destinatario", output)
-        self.assertEqual(email_mock.call_count, 0)
+        self.assertFalse(NotificationLog.objects.exists())
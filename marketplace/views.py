@@ -1,5 +1,4 @@
 import logging
-import threading
 from decimal import Decimal, InvalidOperation
 
 from django.core.cache import cache
@@ -14,7 +13,9 @@ from rest_framework.response import Response
 
 from agenda.models import Availability, Event, Musician
 from agenda.validators import sanitize_string
+from notifications.services import outbox
 from notifications.services.marketplace_notifications import (
+    NEW_GIG_CONTENT_TYPE,
     notify_gig_application_created,
     notify_gig_chat_message,
     notify_gig_closed,
@@ -85,17 +86,14 @@ class GigViewSet(viewsets.ModelViewSet):
             contact_name=contact_name,
             contact_email=contact_email,
         )
-        gig_id = gig.id
 
-        def _send_notifications():
-            try:
-                notify_new_gig_in_city(gig_id)
-            except Exception:
-                logger.exception("Falha ao notificar músicos sobre nova vaga %s", gig_id)
-
-        transaction.on_commit(
-            lambda: threading.Thread(target=_send_notifications, daemon=True).start()
-        )
+        # Notificações entram na outbox na mesma transação da vaga; o envio é
+        # do worker process_notification_outbox (progresso em notification-progress)
+        try:
+            with transaction.atomic():
+                notify_new_gig_in_city(gig.id)
+        except Exception:
+            logger.exception("Falha ao notificar músicos sobre nova vaga %s", gig.id)
 
     def perform_update(self, serializer):
         gig = self.get_object()
@@ -391,6 +389,16 @@ class GigViewSet(viewsets.ModelViewSet):
         serializer = GigApplicationSerializer(applications, many=True)
         return Response(serializer.data)
 
+    @action(detail=True, methods=["get"], url_path="notification-progress")
+    def notification_progress(self, request, pk=None):
+        """Progresso do envio dos avisos de nova vaga - somente para quem criou a vaga."""
+        gig = self.get_object()
+        if gig.created_by != request.user and not request.user.is_staff:
+            return Response(
+                {"detail": "Acesso restrito ao criador da vaga."}, status=status.HTTP_403_FORBIDDEN
+            )
+        return Response(outbox.progress(NEW_GIG_CONTENT_TYPE, gig.id))
+
     @action(detail=True, methods=["post"])
     def hire(self, request, pk=None):
         """Contrata um ou mais músicos para a vaga, rejeitando os demais pendentes."""
@@ -19,10 +19,26 @@ class NotificationPreferenceAdmin(admin.ModelAdmin):
 
 @admin.register(NotificationLog)
 class NotificationLogAdmin(admin.ModelAdmin):
-    list_display = ["user", "notification_type", "channel", "status", "created_at", "sent_at"]
+    list_display = [
+        "user",
+        "notification_type",
+        "channel",
+        "status",
+        "attempts",
+        "created_at",
+        "sent_at",
+    ]
     list_filter = ["notification_type", "channel", "status"]
     search_fields = ["user__username", "subject", "message"]
-    readonly_fields = ["created_at", "sent_at", "delivered_at", "read_at"]
+    readonly_fields = [
+        "created_at",
+        "sent_at",
+        "delivered_at",
+        "read_at",
+        "attempts",
+        "next_attempt_at",
+        "locked_until",
+    ]
     date_hierarchy = "created_at"
 
 
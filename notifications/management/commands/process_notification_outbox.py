@@ -0,0 +1,60 @@
+"""
+Worker da outbox de notificacoes (NotificationLog pendentes).
+
+Uso:
+    python manage.py process_notification_outbox                 # Loop continuo
+    python manage.py process_notification_outbox --once          # Um lote e sai
+    python manage.py process_notification_outbox --concurrency 8 --batch-size 100
+    python manage.py process_notification_outbox --heartbeat-file /tmp/outbox.heartbeat
+
+Com --heartbeat-file o worker toca o arquivo a cada volta do loop; o healthcheck do
+container (docker-compose.prod.yml) acusa o worker parado quando o arquivo envelhece.
+"""
+
+import time
+from pathlib import Path
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from notifications.services.outbox import process_batch
+
+
+class Command(BaseCommand):
+    help = "Envia as notificacoes pendentes da outbox, com retentativas e backoff."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=50, help="Linhas por lote.")
+        parser.add_argument(
+            "--concurrency", type=int, default=4, help="Envios simultaneos por lote."
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=2.0,
+            help="Segundos de espera quando a fila esta vazia.",
+        )
+        parser.add_argument("--once", action="store_true", help="Processa um lote e sai.")
+        parser.add_argument(
+            "--heartbeat-file",
+            default="",
+            help="Arquivo tocado a cada volta do loop (healthcheck).",
+        )
+
+    def handle(self, *args, **options):
+        batch_size = max(options["batch_size"], 1)
+        concurrency = max(options["concurrency"], 1)
+        heartbeat = Path(options["heartbeat_file"]) if options["heartbeat_file"] else None
+
+        while True:
+            processed, sent = process_batch(batch_size, concurrency)
+            if heartbeat:
+                heartbeat.touch()
+            if processed:
+                self.stdout.write(f"{processed} notificacao(oes) processada(s), {sent} enviada(s).")
+            if options["once"]:
+                return
+            if processed < batch_size:
+                time.sleep(options["interval"])
+            # Processo de longa duracao: respeita CONN_MAX_AGE e descarta conexoes quebradas
+            close_old_connections()
@@ -0,0 +1,77 @@
+# Generated by Django 5.2.12 on 2026-10-16 23:45
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("notifications", "0003_add_marketplace_notification_type"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="notificationlog",
+            name="attempts",
+            field=models.PositiveSmallIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="notificationlog",
+            name="locked_until",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="notificationlog",
+            name="next_attempt_at",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="notificationlog",
+            name="payload",
+            field=models.JSONField(blank=True, default=dict),
+        ),
+        migrations.AlterField(
+            model_name="notificationlog",
+            name="notification_type",
+            field=models.CharField(
+                choices=[
+                    ("event_invite", "Convite para Evento"),
+                    ("event_reminder", "Lembrete de Evento"),
+                    ("event_confirmed", "Evento Confirmado"),
+                    ("event_cancelled", "Evento Cancelado"),
+                    ("event_date_changed", "Data do Evento Alterada"),
+                    ("availability_response", "Resposta de Disponibilidade"),
+                    ("quote_request_new", "Novo Pedido de Orçamento"),
+                    ("quote_proposal_received", "Proposta Recebida"),
+                    ("quote_reservation_created", "Reserva Criada"),
+                    ("quote_booking_confirmed", "Reserva Confirmada"),
+                    ("marketplace_activity", "Atualizacao de Vagas"),
+                ],
+                max_length=30,
+            ),
+        ),
+        migrations.AlterField(
+            model_name="notificationlog",
+            name="status",
+            field=models.CharField(
+                choices=[
+                    ("pending", "Pendente"),
+                    ("sending", "Enviando"),
+                    ("sent", "Enviado"),
+                    ("delivered", "Entregue"),
+                    ("failed", "Falhou"),
+                    ("read", "Lido"),
+                ],
+                default="pending",
+                max_length=20,
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="notificationlog",
+            index=models.Index(
+                fields=["status", "next_attempt_at"], name="notificatio_status_764f04_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.2.12 on 2026-10-16 23:55
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("notifications", "0004_notification_outbox"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="notificationlog",
+            index=models.Index(
+                fields=["content_type", "object_id"], name="notificatio_content_a87b22_idx"
+            ),
+        ),
+    ]
@@ -96,6 +96,7 @@ class NotificationLog(models.Model):
 
     STATUS_CHOICES = [
         ("pending", "Pendente"),
+        ("sending", "Enviando"),
         ("sent", "Enviado"),
         ("delivered", "Entregue"),
         ("failed", "Falhou"),
@@ -123,6 +124,12 @@ class NotificationLog(models.Model):
     external_id = models.CharField(max_length=100, blank=True, null=True)
     error_message = models.TextField(blank=True, null=True)
 
+    # Outbox: dados extras do envio e controle de tentativas do worker
+    payload = models.JSONField(default=dict, blank=True)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(null=True, blank=True)
+    locked_until = models.DateTimeField(null=True, blank=True)
+
     # Timestamps
     created_at = models.DateTimeField(auto_now_add=True)
     sent_at = models.DateTimeField(null=True, blank=True)
@@ -136,6 +143,8 @@ class NotificationLog(models.Model):
         indexes = [
             models.Index(fields=["user", "status"]),
             models.Index(fields=["notification_type", "created_at"]),
+            models.Index(fields=["status", "next_attempt_at"]),
+            models.Index(fields=["content_type", "object_id"]),
         ]
 
     def __str__(self):
@@ -144,6 +153,7 @@ class NotificationLog(models.Model):
     def mark_sent(self, external_id=None):
         self.status = "sent"
         self.sent_at = timezone.now()
+        self.locked_until = None
         if external_id:
             self.external_id = external_id
         self.save()
@@ -151,6 +161,15 @@ class NotificationLog(models.Model):
     def mark_failed(self, error_message):
         self.status = "failed"
         self.error_message = error_message
+        self.locked_until = None
+        self.save()
+
+    def schedule_retry(self, error_message, delay):
+        """Volta para a fila; o worker tenta de novo depois de `delay`."""
+        self.status = "pending"
+        self.error_message = error_message
+        self.next_attempt_at = timezone.now() + delay
+        self.locked_until = None
         self.save()
 
 
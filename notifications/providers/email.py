@@ -36,6 +36,8 @@ class EmailProvider(BaseProvider):
                 "event_title": payload.data.get("event_title", ""),
                 "event_lines": payload.data.get("event_lines", []),
                 "preview_text": payload.data.get("preview_text", payload.title),
+                # Templates especificos (ex: pedidos de orcamento) trazem o proprio contexto
+                **payload.data.get("context", {}),
             }
 
             # Determina o template baseado no tipo de notificação (se disponível)
@@ -46,7 +48,7 @@ class EmailProvider(BaseProvider):
                 to_email=user.email,
                 subject=payload.title,
                 context=context,
-                show_unsubscribe=True,
+                show_unsubscribe=payload.data.get("show_unsubscribe", True),
                 fail_silently=False,
             )
 
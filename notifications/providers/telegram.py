@@ -1,16 +1,30 @@
 import logging
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Iterable
 
 import requests
 from django.conf import settings
+from django.core.cache import cache
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 from notifications.services.base import BaseProvider, NotificationPayload, NotificationResult
 
 logger = logging.getLogger(__name__)
 
-# Configuração de retry
-MAX_RETRIES = 3
-RETRY_DELAY = 1  # segundos (exponencial: 1, 2, 4)
+# Pool HTTP: conexoes keep-alive por host e timeout por requisicao
+POOL_SIZE = 10
+REQUEST_TIMEOUT = 10  # segundos
+
+# Limites da Bot API: 30 msg/s no total e 1 msg/s por chat, somando todos os processos
+# (gunicorn e worker da outbox); contados no cache (Redis em producao)
+GLOBAL_RATE = 30
+PER_CHAT_RATE = 1
+RATE_LIMIT_MAX_WAIT = 5  # segundos; so o worker da outbox espera (rate_limit_wait)
+RATE_LIMIT_KEY_PREFIX = "telegram:rate"
 
 # Branding
 SEPARATOR = "━━━━━━━━━━━━━━━━━"
@@ -30,6 +44,118 @@ NOTIFICATION_EMOJI = {
 }
 
 
+# Espera permitida aos envios da thread atual (ver rate_limit_wait)
+_wait = threading.local()
+
+
+@contextmanager
+def rate_limit_wait(seconds: float = RATE_LIMIT_MAX_WAIT):
+    """
+    Deixa os envios desta thread esperarem ate `seconds` pela vez no limite da
+    Bot API. Fora do bloco (ex.: requisicoes web) nao ha espera: sem vaga o envio
+    falha na hora e a outbox tenta de novo com backoff.
+
+    Uso (worker da outbox):
+        with rate_limit_wait():
+            provider.send(payload, user)
+    """
+    previous = getattr(_wait, "seconds", 0.0)
+    _wait.seconds = seconds
+    try:
+        yield
+    finally:
+        _wait.seconds = previous
+
+
+def current_max_wait() -> float:
+    return getattr(_wait, "seconds", 0.0)
+
+
+class TelegramRateLimiter:
+    """
+    Limite global e por chat da Bot API, compartilhado por todos os processos
+    via cache: contadores por janela de 1 s do relogio de parede e uma pausa
+    global (retry_after de um 429) com prazo gravado no cache.
+    """
+
+    WINDOW_TTL = 5  # segundos que o contador de uma janela fica no cache
+
+    def __init__(
+        self,
+        global_rate: int = GLOBAL_RATE,
+        per_chat_rate: int = PER_CHAT_RATE,
+        clock=time.time,
+        sleep=time.sleep,
+    ):
+        self.global_rate = global_rate
+        self.per_chat_rate = per_chat_rate
+        self._clock = clock
+        self._sleep = sleep
+
+    @staticmethod
+    def _key(*parts) -> str:
+        return ":".join([RATE_LIMIT_KEY_PREFIX, *map(str, parts)])
+
+    def _take(self, key: str, limit: int) -> bool:
+        """Conta um envio na janela `key`; False se ela ja estava cheia."""
+        cache.add(key, 0, timeout=self.WINDOW_TTL)
+        return cache.incr(key) <= limit
+
+    def acquire(self, chat_id, max_wait: float = 0.0) -> bool:
+        """Reserva a vez de `chat_id`, esperando ate `max_wait` s; False se nao couber."""
+        deadline = self._clock() + max_wait
+        while True:
+            now = self._clock()
+            paused_until = cache.get(self._key("pause"), 0)
+            if paused_until > now:
+                resume_at = paused_until
+            else:
+                window = int(now)
+                if self._take(self._key("chat", chat_id, window), self.per_chat_rate) and (
+                    self._take(self._key("global", window), self.global_rate)
+                ):
+                    return True
+                resume_at = window + 1
+            if resume_at > deadline:
+                return False
+            self._sleep(resume_at - now)
+
+    def pause(self, seconds: float) -> None:
+        """Nenhum envio, de nenhum chat ou processo, nos proximos `seconds`."""
+        until = self._clock() + seconds
+        if until > cache.get(self._key("pause"), 0):
+            cache.set(self._key("pause"), until, timeout=int(seconds) + 1)
+
+
+_session = None
+_session_lock = threading.Lock()
+rate_limiter = TelegramRateLimiter()
+
+
+def get_session() -> requests.Session:
+    """
+    Session compartilhada pelo processo: conexoes keep-alive com a Bot API,
+    no maximo POOL_SIZE por host (pool_block espera uma conexao livre).
+    Erros de conexao sao repetidos uma vez, sem espera; o resto fica com o
+    backoff do outbox.
+    """
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(
+                    pool_connections=1,
+                    pool_maxsize=POOL_SIZE,
+                    pool_block=True,
+                    max_retries=Retry(total=1, connect=1, read=0, status=0, other=0),
+                )
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                _session = session
+    return _session
+
+
 class TelegramProvider(BaseProvider):
     """
     Provider para envio via Telegram Bot API.
@@ -39,7 +165,7 @@ class TelegramProvider(BaseProvider):
     - TELEGRAM_BOT_USERNAME: Username do bot (ex: @GigFlowAgendaBot)
     """
 
-    BASE_URL = "https://api.telegram.org/bot{token}"
+    API_URL = "https://api.telegram.org"
 
     @property
     def channel_name(self) -> str:
@@ -60,66 +186,107 @@ class TelegramProvider(BaseProvider):
             return False
 
     def _get_api_url(self, method: str) -> str:
-        return f"{self.BASE_URL.format(token=self.bot_token)}/{method}"
+        api_url = getattr(settings, "TELEGRAM_API_URL", "") or self.API_URL
+        return f"{api_url.rstrip('/')}/bot{self.bot_token}/{method}"
+
+    @staticmethod
+    def _get_chat_id(user):
+        try:
+            return user.notification_preferences.telegram_chat_id
+        except Exception:
+            return None
 
     def send(self, payload: NotificationPayload, user) -> NotificationResult:
         if not self.is_configured():
             return NotificationResult(success=False, error_message="Telegram nao configurado")
 
-        try:
-            prefs = user.notification_preferences
-            chat_id = prefs.telegram_chat_id
-        except Exception:
+        chat_id = self._get_chat_id(user)
+        if not chat_id:
             return NotificationResult(
                 success=False, error_message="Usuario sem chat_id configurado"
             )
 
-        message = self._format_telegram_message(payload)
-
-        last_error = None
-        for attempt in range(MAX_RETRIES):
-            try:
-                response = requests.post(
-                    self._get_api_url("sendMessage"),
-                    json={
-                        "chat_id": chat_id,
-                        "text": message,
-                        "parse_mode": "HTML",
-                        "disable_web_page_preview": False,
-                    },
-                    timeout=10,
+        return self._send_to_chat(chat_id, self._format_telegram_message(payload))
+
+    def send_many(
+        self, messages: Iterable[tuple[NotificationPayload, object]]
+    ) -> list[NotificationResult]:
+        """
+        Envia varias notificacoes em paralelo pelo pool de conexoes, respeitando
+        os limites global e por chat. Retorna um resultado por (payload, user),
+        na mesma ordem.
+        """
+        messages = list(messages)
+        if not self.is_configured():
+            return [
+                NotificationResult(success=False, error_message="Telegram nao configurado")
+                for _ in messages
+            ]
+
+        # chat_id resolvido aqui: as threads so fazem HTTP, sem acesso ao banco
+        jobs = [
+            (self._get_chat_id(user), self._format_telegram_message(payload))
+            for payload, user in messages
+        ]
+        # As threads do pool nao herdam o rate_limit_wait desta thread
+        max_wait = current_max_wait()
+
+        def run(job):
+            chat_id, text = job
+            if not chat_id:
+                return NotificationResult(
+                    success=False, error_message="Usuario sem chat_id configurado"
                 )
+            return self._send_to_chat(chat_id, text, max_wait=max_wait)
+
+        if len(jobs) <= 1:
+            return [run(job) for job in jobs]
+        with ThreadPoolExecutor(max_workers=min(POOL_SIZE, len(jobs))) as pool:
+            return list(pool.map(run, jobs))
+
+    def _send_to_chat(
+        self, chat_id, text: str, parse_mode: str = "HTML", max_wait: float | None = None
+    ) -> NotificationResult:
+        if max_wait is None:
+            max_wait = current_max_wait()
+        if not rate_limiter.acquire(chat_id, max_wait=max_wait):
+            return NotificationResult(
+                success=False, error_message="Limite de envio do Telegram atingido"
+            )
 
-                data = response.json()
-
-                if data.get("ok"):
-                    message_id = data.get("result", {}).get("message_id")
-                    logger.info(f"Telegram enviado para chat_id {chat_id}")
-                    return NotificationResult(success=True, external_id=str(message_id))
-                else:
-                    # Erro de API (chat_id invalido, bot bloqueado, etc) - nao fazer retry
-                    error = data.get("description", "Erro desconhecido")
-                    logger.error(f"Telegram API error: {error}")
-                    return NotificationResult(success=False, error_message=error)
-
-            except (requests.exceptions.Timeout, requests.exceptions.ConnectionError) as e:
-                last_error = str(e)
-                if attempt < MAX_RETRIES - 1:
-                    delay = RETRY_DELAY * (2**attempt)
-                    logger.warning(
-                        f"Telegram retry {attempt + 1}/{MAX_RETRIES} para chat_id {chat_id} em {delay}s: {e}"
-                    )
-                    time.sleep(delay)
-                continue
-            except Exception as e:
-                logger.exception("Erro ao enviar mensagem Telegram")
-                return NotificationResult(success=False, error_message=str(e))
-
-        logger.error(f"Telegram falhou apos {MAX_RETRIES} tentativas para chat_id {chat_id}")
-        return NotificationResult(
-            success=False,
-            error_message=f"Falha apos {MAX_RETRIES} tentativas: {last_error}",
-        )
+        try:
+            response = get_session().post(
+                self._get_api_url("sendMessage"),
+                json={
+                    "chat_id": chat_id,
+                    "text": text,
+                    "parse_mode": parse_mode,
+                    "disable_web_page_preview": False,
+                },
+                timeout=REQUEST_TIMEOUT,
+            )
+            data = response.json()
+        except requests.exceptions.RequestException as e:
+            # Falha de rede: o outbox tenta de novo com backoff
+            logger.warning(f"Telegram indisponivel para chat_id {chat_id}: {e}")
+            return NotificationResult(success=False, error_message=str(e))
+        except Exception as e:
+            logger.exception("Erro ao enviar mensagem Telegram")
+            return NotificationResult(success=False, error_message=str(e))
+
+        if data.get("ok"):
+            message_id = data.get("result", {}).get("message_id")
+            logger.info(f"Telegram enviado para chat_id {chat_id}")
+            return NotificationResult(success=True, external_id=str(message_id))
+
+        # Erro de API (chat_id invalido, bot bloqueado, flood etc.)
+        error = data.get("description", "Erro desconhecido")
+        retry_after = (data.get("parameters") or {}).get("retry_after")
+        if retry_after:
+            # 429 da Bot API: segura todos os envios, nao so os deste chat
+            rate_limiter.pause(retry_after)
+        logger.error(f"Telegram API error: {error}")
+        return NotificationResult(success=False, error_message=error)
 
     def _format_telegram_message(self, payload: NotificationPayload) -> str:
         """Formata mensagem com HTML para Telegram, com emoji e assinatura."""
@@ -159,30 +326,7 @@ class TelegramProvider(BaseProvider):
         if not self.is_configured():
             return NotificationResult(success=False, error_message="Telegram nao configurado")
 
-        try:
-            response = requests.post(
-                self._get_api_url("sendMessage"),
-                json={
-                    "chat_id": chat_id,
-                    "text": text,
-                    "parse_mode": parse_mode,
-                },
-                timeout=10,
-            )
-
-            data = response.json()
-            if data.get("ok"):
-                return NotificationResult(
-                    success=True, external_id=str(data.get("result", {}).get("message_id"))
-                )
-            else:
-                return NotificationResult(
-                    success=False, error_message=data.get("description", "Erro")
-                )
-
-        except Exception as e:
-            logger.exception("Erro ao enviar mensagem Telegram")
-            return NotificationResult(success=False, error_message=str(e))
+        return self._send_to_chat(chat_id, text, parse_mode=parse_mode)
 
     def get_bot_info(self) -> dict:
         """Retorna informacoes do bot"""
@@ -190,7 +334,7 @@ class TelegramProvider(BaseProvider):
             return {}
 
         try:
-            response = requests.get(self._get_api_url("getMe"), timeout=10)
+            response = get_session().get(self._get_api_url("getMe"), timeout=REQUEST_TIMEOUT)
             data = response.json()
             if data.get("ok"):
                 return data.get("result", {})
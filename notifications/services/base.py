@@ -1,10 +1,24 @@
 import logging
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
+from datetime import timedelta
 from typing import Any, Dict, Optional
 
+from django.utils import timezone
+
 logger = logging.getLogger(__name__)
 
+# Outbox: tentativas por notificacao, backoff exponencial e lease da reserva
+OUTBOX_MAX_ATTEMPTS = 5
+OUTBOX_RETRY_BASE = timedelta(seconds=30)
+OUTBOX_RETRY_MAX = timedelta(hours=1)
+OUTBOX_LEASE = timedelta(minutes=5)
+
+
+def retry_delay(attempts: int) -> timedelta:
+    """Espera antes da proxima tentativa: 30s, 1min, 2min, ... ate 1h."""
+    return min(OUTBOX_RETRY_BASE * (2 ** max(attempts - 1, 0)), OUTBOX_RETRY_MAX)
+
 
 @dataclass
 class NotificationPayload:
@@ -78,6 +92,93 @@ class NotificationService:
         """Retorna provider pelo nome do canal"""
         return self._providers.get(channel)
 
+    def enqueue(
+        self,
+        user,
+        notification_type: str,
+        title: str,
+        body: str,
+        data: Dict[str, Any] = None,
+        force_channel: str = None,
+        check_preferences: bool = True,
+    ):
+        """
+        Grava a notificacao na outbox (NotificationLog pendente) sem enviar.
+
+        Roda na transacao de quem chama: se a requisicao falhar, a notificacao
+        some junto. O envio fica com o worker (process_notification_outbox).
+
+        Returns:
+            NotificationLog, ou None se o usuario desabilitou o tipo
+        """
+        logs = self.enqueue_many(
+            [user],
+            notification_type,
+            title,
+            body,
+            data=data,
+            force_channel=force_channel,
+            check_preferences=check_preferences,
+        )
+        return logs[0] if logs else None
+
+    def enqueue_many(
+        self,
+        users,
+        notification_type: str,
+        title: str,
+        body: str,
+        data: Dict[str, Any] = None,
+        force_channel: str = None,
+        check_preferences: bool = True,
+        status: str = "pending",
+    ) -> list:
+        """
+        Mesma notificacao para varios usuarios, com numero fixo de queries
+        (preferencias em lote + um bulk_create).
+        """
+        from notifications.models import NotificationLog, NotificationPreference
+
+        users = list(users)
+        if not users:
+            return []
+
+        prefs_by_user = {
+            prefs.user_id: prefs for prefs in NotificationPreference.objects.filter(user__in=users)
+        }
+        missing = [
+            NotificationPreference(user=user) for user in users if user.id not in prefs_by_user
+        ]
+        if missing:
+            NotificationPreference.objects.bulk_create(missing, ignore_conflicts=True)
+            prefs_by_user.update({prefs.user_id: prefs for prefs in missing})
+
+        data = data or {}
+        now = timezone.now()
+        logs = []
+        for user in users:
+            prefs = prefs_by_user[user.id]
+            if check_preferences and not self._should_notify(prefs, notification_type):
+                logger.info(
+                    f"Usuario {user.username} desabilitou notificacoes do tipo {notification_type}"
+                )
+                continue
+            logs.append(
+                NotificationLog(
+                    user=user,
+                    notification_type=notification_type,
+                    channel=force_channel or prefs.get_active_channel(),
+                    subject=title,
+                    message=body,
+                    content_type=data.get("content_type", ""),
+                    object_id=data.get("object_id"),
+                    payload=data,
+                    status=status,
+                    next_attempt_at=now,
+                )
+            )
+        return NotificationLog.objects.bulk_create(logs)
+
     def send_notification(
         self,
         user,
@@ -88,7 +189,11 @@ class NotificationService:
         force_channel: str = None,
     ) -> NotificationResult:
         """
-        Envia notificacao para o usuario usando canal preferido.
+        Envia notificacao para o usuario usando canal preferido, na hora.
+
+        Para fluxos de requisicao prefira enqueue(): aqui a chamada espera o
+        provider. A linha ja nasce reservada ("sending"), entao o worker so
+        a pega se este envio falhar (retentativa) ou travar (lease vencido).
 
         Args:
             user: User object
@@ -101,41 +206,47 @@ class NotificationService:
         Returns:
             NotificationResult
         """
-        from notifications.models import (
-            NotificationChannel,
-            NotificationLog,
-            NotificationPreference,
+        logs = self.enqueue_many(
+            [user],
+            notification_type,
+            title,
+            body,
+            data=data,
+            force_channel=force_channel,
+            status="sending",
         )
-
-        # Busca ou cria preferencias
-        prefs, _ = NotificationPreference.objects.get_or_create(user=user)
-
-        # Verifica se usuario quer receber este tipo de notificacao
-        if not self._should_notify(prefs, notification_type):
-            logger.info(
-                f"Usuario {user.username} desabilitou notificacoes do tipo {notification_type}"
-            )
+        if not logs:
             return NotificationResult(
                 success=True, error_message="Notificacao desabilitada pelo usuario"
             )
 
-        # Determina canal
-        if force_channel:
-            channel = force_channel
-        else:
-            channel = prefs.get_active_channel()
+        log = logs[0]
+        log.attempts = 1
+        log.locked_until = timezone.now() + OUTBOX_LEASE
+        log.save(update_fields=["attempts", "locked_until"])
+        return self.deliver(log)
+
+    def deliver(self, log) -> NotificationResult:
+        """
+        Envia uma linha da outbox ja reservada (status "sending").
 
-        # Cria payload
+        Sucesso marca como enviada; falha agenda nova tentativa com backoff
+        exponencial ate OUTBOX_MAX_ATTEMPTS, depois marca como falha. Usuario
+        que o canal nao alcanca (sem email, Telegram desconectado) falha direto.
+        """
+        from notifications.models import NotificationPreference
+
+        user = log.user
+        prefs, _ = NotificationPreference.objects.get_or_create(user=user)
         payload = NotificationPayload(
             recipient_id=user.id,
-            notification_type=notification_type,
-            title=title,
-            body=body,
-            data=data or {},
+            notification_type=log.notification_type,
+            title=log.subject,
+            body=log.message,
+            data=log.payload or {},
         )
 
-        # Tenta enviar
-        used_channel = channel
+        channel = log.channel
         provider = self.get_provider(channel)
         if not provider or not provider.is_configured():
             # Fallback para email
@@ -143,55 +254,71 @@ class NotificationService:
                 logger.info(f"Fallback para email (provider {channel} nao disponivel)")
                 provider = self.get_provider("email")
                 channel = "email"
-                used_channel = "email"
 
         if not provider:
             logger.error("Nenhum provider disponivel")
+            log.channel = channel
+            log.mark_failed("Nenhum provider disponivel")
             return NotificationResult(success=False, error_message="Nenhum provider disponivel")
 
-        # Cria log
-        log = NotificationLog.objects.create(
-            user=user,
-            notification_type=notification_type,
-            channel=channel,
-            subject=title,
-            message=body,
-            content_type=data.get("content_type", "") if data else "",
-            object_id=data.get("object_id") if data else None,
-        )
-
-        # Envia
         try:
             result = provider.send(payload, user)
+        except Exception as e:
+            logger.exception(f"Erro ao enviar notificacao: {e}")
+            result = NotificationResult(success=False, error_message=str(e))
 
-            if result.success:
-                log.mark_sent(result.external_id)
-                logger.info(f"Notificacao enviada para {user.username} via {channel}")
-            else:
-                log.mark_failed(result.error_message)
-                logger.warning(
-                    f"Falha ao enviar para {user.username} via {channel}: {result.error_message}"
-                )
+        if not result.success:
+            logger.warning(
+                f"Falha ao enviar para {user.username} via {channel}: {result.error_message}"
+            )
+            # Tenta fallback se configurado
+            if channel != "email" and prefs.fallback_to_email:
+                email_provider = self.get_provider("email")
+                if email_provider and email_provider.can_send_to(user):
+                    logger.info("Tentando fallback para email...")
+                    try:
+                        fallback = email_provider.send(payload, user)
+                    except Exception as e:
+                        logger.exception(f"Erro no fallback para email: {e}")
+                        fallback = NotificationResult(success=False, error_message=str(e))
+                    if fallback.success:
+                        logger.info("Fallback para email bem sucedido")
+                        result = fallback
+                        channel = "email"
+
+        log.channel = channel
+        result.channel = channel
+        if result.success:
+            log.mark_sent(result.external_id)
+            self._record_event_log(log)
+            logger.info(f"Notificacao enviada para {user.username} via {channel}")
+        elif log.attempts < OUTBOX_MAX_ATTEMPTS and provider.can_send_to(user):
+            log.schedule_retry(result.error_message, retry_delay(log.attempts))
+        else:
+            log.mark_failed(result.error_message)
+        return result
+
+    def _record_event_log(self, log):
+        """
+        Registra no historico do evento os envios via Telegram que pediram
+        isso em payload["event_log"] ({"event_id", "description"}).
+        """
+        entry = (log.payload or {}).get("event_log")
+        if not entry or log.channel != "telegram":
+            return
 
-                # Tenta fallback se configurado
-                if not result.success and channel != "email" and prefs.fallback_to_email:
-                    email_provider = self.get_provider("email")
-                    if email_provider and email_provider.can_send_to(user):
-                        logger.info(f"Tentando fallback para email...")
-                        result = email_provider.send(payload, user)
-                        if result.success:
-                            used_channel = "email"
-                            log.channel = "email"
-                            log.mark_sent(result.external_id)
-                            logger.info(f"Fallback para email bem sucedido")
-
-            result.channel = used_channel
-            return result
+        from agenda.models import EventLog
 
+        name = log.user.get_full_name() or log.user.username
+        try:
+            EventLog.objects.create(
+                event_id=entry["event_id"],
+                performed_by=None,
+                action="notification",
+                description=entry["description"].format(name=name),
+            )
         except Exception as e:
-            logger.exception(f"Erro ao enviar notificacao: {e}")
-            log.mark_failed(str(e))
-            return NotificationResult(success=False, error_message=str(e))
+            logger.error(f"Erro ao registrar envio no historico do evento: {e}")
 
     def _should_notify(self, prefs, notification_type: str) -> bool:
         """Verifica se usuario quer receber este tipo de notificacao"""
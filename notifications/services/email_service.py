@@ -6,18 +6,78 @@ Handles all email sending with Django templates, providing:
 - Plain text fallback versions
 - Preview text support
 - Unsubscribe links
+- Batched delivery over a single connection (send_bulk / batch)
+- Templates compiled once per process (get_email_template)
 """
 
 import logging
-from typing import Any
+import threading
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Iterable
 
 from django.conf import settings
-from django.core.mail import EmailMultiAlternatives
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.dispatch import receiver
 from django.template import TemplateDoesNotExist
-from django.template.loader import render_to_string
+from django.template.loader import get_template
+from django.test.signals import setting_changed
+from django.utils.autoreload import file_changed
 
 logger = logging.getLogger(__name__)
 
+# Connection shared by every send() inside EmailService.batch() (per thread)
+_batch = threading.local()
+
+# Compiled email templates by name; None marks a template that does not exist
+_compiled_templates: dict[str, Any] = {}
+
+
+def get_email_template(name: str):
+    """
+    Compiled template for `name`, loaded once per process.
+
+    Misses are cached too, so a missing optional template (e.g. the .txt
+    version) costs a single loader lookup. Raises TemplateDoesNotExist.
+    """
+    try:
+        template = _compiled_templates[name]
+    except KeyError:
+        try:
+            template = get_template(name)
+        except TemplateDoesNotExist:
+            template = None
+        _compiled_templates[name] = template
+    if template is None:
+        raise TemplateDoesNotExist(name)
+    return template
+
+
+def clear_email_template_cache() -> None:
+    _compiled_templates.clear()
+
+
+@receiver(setting_changed)
+def _clear_on_templates_setting(sender, setting, **kwargs):
+    if setting == "TEMPLATES":
+        clear_email_template_cache()
+
+
+@receiver(file_changed)
+def _clear_on_template_file_change(sender, file_path, **kwargs):
+    # runserver: Django resets its own loaders; drop our copies as well
+    if file_path.suffix in (".html", ".txt"):
+        clear_email_template_cache()
+
+
+@dataclass
+class EmailResult:
+    """Per-recipient result of EmailService.send_bulk."""
+
+    to_email: str
+    success: bool
+    error: str | None = None
+
 
 class EmailService:
     """
@@ -78,28 +138,170 @@ class EmailService:
             }
         )
 
-        # Render HTML template
-        html_template = f"{cls.TEMPLATES_BASE_PATH}{template_name}.html"
         try:
-            html_content = render_to_string(html_template, context)
+            html_template, text_template = cls._load_templates(template_name)
         except TemplateDoesNotExist:
-            logger.error(f"Email template not found: {html_template}")
             if not fail_silently:
                 raise
             return False
 
-        # Render plain text template (fallback to auto-generated if not found)
-        text_template = f"{cls.TEMPLATES_BASE_PATH}txt/{template_name}.txt"
+        email = cls._build_message(
+            html_template, text_template, to_email, subject, context, from_email
+        )
+
+        # Send email
+        try:
+            cls._send_message(email, fail_silently=fail_silently)
+            logger.info(f"Email sent successfully: {template_name} to {to_email}")
+            return True
+        except Exception as e:
+            logger.error(f"Failed to send email {template_name} to {to_email}: {e}")
+            if not fail_silently:
+                raise
+            return False
+
+    @classmethod
+    def send_bulk(
+        cls,
+        template_name: str,
+        subject: str,
+        recipients: Iterable[tuple[str, dict[str, Any] | None]],
+        shared_context: dict[str, Any] | None = None,
+        from_email: str | None = None,
+        show_unsubscribe: bool = False,
+    ) -> list[EmailResult]:
+        """
+        Send the same template to many recipients over a single connection.
+
+        Templates are loaded once; each recipient's context is
+        `shared_context` overlaid with its own dict. One failure does not stop
+        the batch.
+
+        Args:
+            template_name: Name of the template (without path/extension).
+            subject: Email subject line (shared).
+            recipients: Iterable of (to_email, context overlay) pairs.
+            shared_context: Context variables common to every recipient.
+            from_email: Sender email (defaults to GigFlow).
+            show_unsubscribe: If True, shows unsubscribe link in footer.
+
+        Returns:
+            list[EmailResult]: One result per recipient, in order.
+        """
+        recipients = list(recipients)
+        try:
+            html_template, text_template = cls._load_templates(template_name)
+        except TemplateDoesNotExist as e:
+            return [EmailResult(to_email, False, str(e)) for to_email, _ in recipients]
+
+        base_context = {
+            **(shared_context or {}),
+            "frontend_url": getattr(settings, "FRONTEND_URL", ""),
+            "show_unsubscribe": show_unsubscribe,
+        }
+        results = []
+        with cls.batch():
+            for to_email, overlay in recipients:
+                context = {**base_context, **(overlay or {}), "user_email": to_email}
+                try:
+                    email = cls._build_message(
+                        html_template, text_template, to_email, subject, context, from_email
+                    )
+                    sent = cls._send_message(email)
+                    results.append(EmailResult(to_email, bool(sent)))
+                except Exception as e:
+                    logger.error(f"Failed to send email {template_name} to {to_email}: {e}")
+                    results.append(EmailResult(to_email, False, str(e)))
+
+        sent_count = sum(result.success for result in results)
+        logger.info(f"Bulk email {template_name}: {sent_count}/{len(results)} sent")
+        return results
+
+    @classmethod
+    @contextmanager
+    def batch(cls, connection=None):
+        """
+        Reuse one email connection for every send() in the block, in the
+        current thread, instead of a new SMTP/TLS handshake per message.
+        The connection is opened lazily on the first message. Nested blocks
+        share the outer connection.
+
+        Usage:
+            with EmailService.batch():
+                for user in users:
+                    EmailService.send(...)
+        """
+        if getattr(_batch, "connection", None) is not None:
+            yield _batch.connection
+            return
+
+        _batch.connection = connection or get_connection()
+        _batch.opened = False
+        try:
+            yield _batch.connection
+        finally:
+            batch_connection = _batch.connection
+            _batch.connection = None
+            if _batch.opened:
+                batch_connection.close()
+
+    @classmethod
+    def _send_message(cls, email, fail_silently: bool = False) -> int:
+        connection = getattr(_batch, "connection", None)
+        if connection is None:
+            return email.send(fail_silently=fail_silently)
+
+        if not _batch.opened:
+            connection.open()
+            _batch.opened = True
         try:
-            text_content = render_to_string(text_template, context)
+            return connection.send_messages([email])
+        except Exception:
+            # Connection may be broken: reopen on the next message
+            connection.close()
+            _batch.opened = False
+            raise
+
+    @classmethod
+    def _load_templates(cls, template_name: str):
+        """(html, text) compiled templates; text is None when there is no .txt version."""
+        html_template_name = f"{cls.TEMPLATES_BASE_PATH}{template_name}.html"
+        try:
+            html_template = get_email_template(html_template_name)
         except TemplateDoesNotExist:
+            logger.error(f"Email template not found: {html_template_name}")
+            raise
+
+        text_template_name = f"{cls.TEMPLATES_BASE_PATH}txt/{template_name}.txt"
+        known = text_template_name in _compiled_templates
+        try:
+            text_template = get_email_template(text_template_name)
+        except TemplateDoesNotExist:
+            text_template = None
+            if not known:
+                logger.warning(
+                    f"Plain text template not found: {text_template_name}, using fallback"
+                )
+        return html_template, text_template
+
+    @classmethod
+    def _build_message(
+        cls,
+        html_template,
+        text_template,
+        to_email: str,
+        subject: str,
+        context: dict[str, Any],
+        from_email: str | None = None,
+    ) -> EmailMultiAlternatives:
+        html_content = html_template.render(context)
+        if text_template is not None:
+            text_content = text_template.render(context)
+        else:
             # Generate basic text version from context
             text_content = cls._generate_text_fallback(subject, context)
-            logger.warning(f"Plain text template not found: {text_template}, using fallback")
 
-        # Prepare email
         sender = from_email or getattr(settings, "DEFAULT_FROM_EMAIL", cls.DEFAULT_FROM_EMAIL)
-
         email = EmailMultiAlternatives(
             subject=subject,
             body=text_content,
@@ -107,17 +309,7 @@ class EmailService:
             to=[to_email],
         )
         email.attach_alternative(html_content, "text/html")
-
-        # Send email
-        try:
-            email.send(fail_silently=fail_silently)
-            logger.info(f"Email sent successfully: {template_name} to {to_email}")
-            return True
-        except Exception as e:
-            logger.error(f"Failed to send email {template_name} to {to_email}: {e}")
-            if not fail_silently:
-                raise
-            return False
+        return email
 
     @classmethod
     def _generate_text_fallback(cls, subject: str, context: dict[str, Any]) -> str:
@@ -6,10 +6,14 @@ from django.conf import settings
 
 from notifications.models import NotificationPreference, NotificationType
 from notifications.services.base import notification_service
-from notifications.services.email_service import send_event_notification_email
 
 logger = logging.getLogger(__name__)
 
+# Destinatarios por lote no fan-out de novas vagas
+FANOUT_BATCH_SIZE = 500
+# content_type dos avisos de nova vaga na outbox (progresso por vaga)
+NEW_GIG_CONTENT_TYPE = "marketplace_new_gig"
+
 
 def _frontend_marketplace_url(gig_id: int | None = None) -> str:
     frontend_url = getattr(settings, "FRONTEND_URL", "http://localhost:5173")
@@ -24,13 +28,8 @@ def _format_fee(amount: Decimal | None) -> str:
     return f"R$ {amount:,.2f}".replace(",", "_").replace(".", ",").replace("_", ".")
 
 
-def _can_notify(user) -> tuple[bool, NotificationPreference]:
-    prefs, _ = NotificationPreference.objects.get_or_create(user=user)
-    return prefs.notify_quote_requests, prefs
-
-
-def _notify_user(
-    user,
+def _notify_users(
+    users,
     *,
     title: str,
     body: str,
@@ -38,63 +37,73 @@ def _notify_user(
     object_id: int | None = None,
     include_email: bool = True,
     include_telegram: bool = True,
-) -> tuple[bool, bool]:
-    email_sent = False
-    telegram_sent = False
-
-    can_notify, prefs = _can_notify(user)
-    if not can_notify:
-        return email_sent, telegram_sent
-
-    url = _frontend_marketplace_url(gig_id)
-
-    if include_email and user.email:
-        try:
-            email_sent = bool(
-                send_event_notification_email(
-                    to_email=user.email,
-                    template_name="notification",
-                    subject=title,
-                    context={
-                        "title": title,
-                        "body": body,
-                        "first_name": user.first_name or user.username,
-                        "action_url": url,
-                        "action_text": "Abrir Vagas",
-                        "preview_text": title,
-                    },
-                )
+    content_type: str = "marketplace_gig",
+) -> tuple[int, int]:
+    """
+    Coloca a notificacao na outbox para os usuarios (email e/ou Telegram).
+    O envio fica com o worker process_notification_outbox.
+
+    Custo fixo por chamada, qualquer que seja o numero de usuarios:
+    preferencias, Telegram conectado e um bulk_create por canal.
+    Retorna (emails, telegrams) enfileirados.
+    """
+    users = list(users)
+    if not users:
+        return 0, 0
+
+    data = {
+        "url": _frontend_marketplace_url(gig_id),
+        "content_type": content_type,
+        "object_id": object_id or gig_id,
+        "action_text": "Abrir Vagas",
+    }
+    email_count = 0
+    telegram_count = 0
+
+    if include_email:
+        email_users = [user for user in users if user.email]
+        email_count = len(
+            notification_service.enqueue_many(
+                email_users,
+                NotificationType.MARKETPLACE_ACTIVITY,
+                title,
+                body,
+                data=data,
+                force_channel="email",
             )
-        except Exception as exc:
-            logger.error("Erro ao enviar email de marketplace para %s: %s", user.username, exc)
-
-    if include_telegram and prefs.telegram_verified and prefs.telegram_chat_id:
-        try:
-            result = notification_service.send_notification(
-                user=user,
-                notification_type=NotificationType.MARKETPLACE_ACTIVITY,
-                title=title,
-                body=body,
-                data={
-                    "url": url,
-                    "content_type": "marketplace_gig",
-                    "object_id": object_id or gig_id,
-                },
+        )
+
+    if include_telegram:
+        connected = set(
+            NotificationPreference.objects.filter(user__in=users, telegram_verified=True)
+            .exclude(telegram_chat_id__isnull=True)
+            .exclude(telegram_chat_id="")
+            .values_list("user_id", flat=True)
+        )
+        telegram_count = len(
+            notification_service.enqueue_many(
+                [user for user in users if user.id in connected],
+                NotificationType.MARKETPLACE_ACTIVITY,
+                title,
+                body,
+                data=data,
                 force_channel="telegram",
             )
-            telegram_sent = bool(getattr(result, "success", False))
-        except Exception as exc:
-            logger.error("Erro ao enviar Telegram de marketplace para %s: %s", user.username, exc)
+        )
+
+    return email_count, telegram_count
 
-    if not email_sent and not telegram_sent:
+
+def _notify_user(user, **kwargs) -> tuple[bool, bool]:
+    email_count, telegram_count = _notify_users([user], **kwargs)
+    if not email_count and not telegram_count:
         logger.info(
             "[marketplace] Usuario %s nao teve envio em nenhum canal (email_incluido=%s, telegram_incluido=%s)",
             user.username,
-            include_email,
-            include_telegram,
+            kwargs.get("include_email", True),
+            kwargs.get("include_telegram", True),
         )
-
-    return email_sent, telegram_sent
+    return bool(email_count), bool(telegram_count)
 
 
 def _extract_city_name(raw_city: str | None) -> str:
@@ -140,6 +149,10 @@ def notify_new_gig_in_city(gig_id: int) -> None:
     - Email sempre (se houver email), Telegram apenas se o usuário estiver conectado/verificado.
     - Respeita preferências do usuário (notify_quote_requests).
     - Não notifica o criador da vaga.
+
+    Grava na outbox em lotes de FANOUT_BATCH_SIZE destinatários (custo fixo de
+    queries por lote). O progresso do envio sai de outbox.progress() e de
+    /gigs/{id}/notification-progress/.
     """
     try:
         from agenda.models import Musician
@@ -194,6 +207,7 @@ def notify_new_gig_in_city(gig_id: int) -> None:
     # Busca candidatos por match simples de cidade; o matching "tolerante" final e feito em Python.
     musicians = (
         Musician.objects.select_related("user")
+        .only("id", "city", "user__id", "user__username", "user__email", "user__first_name")
         .filter(is_active=True)
         .exclude(user_id=gig.created_by_id)
         .exclude(city__isnull=True)
@@ -204,36 +218,6 @@ def notify_new_gig_in_city(gig_id: int) -> None:
     # - cidade exatamente igual (case-insensitive)
     # - ou cidade começando com o nome (cobre formatos como "Cidade/UF")
     musicians = musicians.filter(city__istartswith=city_name)
-    db_count = musicians.count()
-    logger.info("[marketplace] Vaga %s — %d musico(s) candidato(s) no DB", gig_id, db_count)
-
-    # Comparacao final tolerante (ex: "São Paulo" vs "Sao Paulo")
-    recipients = []
-    for musician in musicians:
-        m_city_key = _normalize_city_key(_extract_city_name(musician.city))
-        if m_city_key == city_key:
-            recipients.append(musician.user)
-
-    logger.info(
-        "[marketplace] Vaga %s — %d destinatario(s) apos filtro Python",
-        gig_id,
-        len(recipients),
-    )
-
-    if not recipients:
-        logger.info(
-            "[marketplace] Vaga %s — nenhum destinatario em %r (city_key=%r). "
-            "DB retornou %d musico(s), nenhum passou no filtro Python.",
-            gig_id,
-            city_raw,
-            city_key,
-            db_count,
-        )
-        return
-
-    logger.info(
-        "[marketplace] Vaga %s — iniciando notificacao para %d usuario(s)", gig_id, len(recipients)
-    )
 
     title = f"Nova vaga em {city_name}: {gig.title}"
     date_text = gig.event_date.strftime("%d/%m/%Y") if gig.event_date else "A combinar"
@@ -257,37 +241,47 @@ def notify_new_gig_in_city(gig_id: int) -> None:
         f"Abra o app para ver os detalhes e se candidatar."
     )
 
-    users_with_delivery = 0
-    users_without_delivery = 0
-    email_sent_count = 0
-    telegram_sent_count = 0
-
-    for user in recipients:
-        email_sent, telegram_sent = _notify_user(
-            user,
+    # Comparacao final tolerante (ex: "São Paulo" vs "Sao Paulo")
+    candidates = list(musicians)
+    recipients = [
+        musician.user
+        for musician in candidates
+        if _normalize_city_key(_extract_city_name(musician.city)) == city_key
+    ]
+
+    email_count = 0
+    telegram_count = 0
+    for start in range(0, len(recipients), FANOUT_BATCH_SIZE):
+        emails, telegrams = _notify_users(
+            recipients[start : start + FANOUT_BATCH_SIZE],
             title=title,
             body=body,
             gig_id=gig.id,
             object_id=gig.id,
+            content_type=NEW_GIG_CONTENT_TYPE,
+        )
+        email_count += emails
+        telegram_count += telegrams
+
+    if not recipients:
+        logger.info(
+            "[marketplace] Vaga %s — nenhum destinatario em %r (city_key=%r). "
+            "DB retornou %d musico(s), nenhum passou no filtro Python.",
+            gig_id,
+            city_raw,
+            city_key,
+            len(candidates),
         )
-        if email_sent:
-            email_sent_count += 1
-        if telegram_sent:
-            telegram_sent_count += 1
-        if email_sent or telegram_sent:
-            users_with_delivery += 1
-        else:
-            users_without_delivery += 1
+        return
 
     logger.info(
-        "[marketplace] Vaga %s — notificacoes processadas para %d/%d usuario(s) "
-        "(email=%d, telegram=%d, sem_envio=%d)",
+        "[marketplace] Vaga %s — %d destinatario(s) de %d candidato(s); "
+        "enfileirados email=%d, telegram=%d",
         gig_id,
-        users_with_delivery,
         len(recipients),
-        email_sent_count,
-        telegram_sent_count,
-        users_without_delivery,
+        len(candidates),
+        email_count,
+        telegram_count,
     )
 
 
@@ -404,16 +398,15 @@ def notify_gig_chat_message(gig, chat_message, recipients) -> None:
         "Abra o app para responder no chat da contratacao."
     )
 
-    for user in recipients:
-        _notify_user(
-            user,
-            title=title,
-            body=body,
-            gig_id=gig.id,
-            object_id=chat_message.id,
-            include_email=False,
-            include_telegram=True,
-        )
+    _notify_users(
+        recipients,
+        title=title,
+        body=body,
+        gig_id=gig.id,
+        object_id=chat_message.id,
+        include_email=False,
+        include_telegram=True,
+    )
 
 
 def notify_gig_closed(gig, closed_status: str, affected_applications) -> None:
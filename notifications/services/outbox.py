@@ -0,0 +1,125 @@
+"""
+Worker da outbox de notificacoes.
+
+As notificacoes entram como NotificationLog pendentes na transacao da
+requisicao (notification_service.enqueue). Aqui o worker:
+
+- reserva um lote com SELECT ... FOR UPDATE SKIP LOCKED (varios workers nao
+  disputam as mesmas linhas) e marca como "sending" com um lease;
+- envia com concorrencia limitada (pool de threads), cada thread com a sua
+  fatia do lote e uma unica conexao de email (EmailService.batch); o
+  Telegram espera pela vez no limite da Bot API so aqui (rate_limit_wait);
+- falhas voltam para a fila com backoff exponencial (NotificationService.deliver).
+
+Linhas "sending" com lease vencido (worker que morreu no meio) sao reservadas
+de novo. Comando: python manage.py process_notification_outbox.
+
+Fan-outs grandes (ex: nova vaga para todos os musicos da cidade) acompanham
+o envio com progress(content_type, object_id).
+"""
+
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+from django.db import connection, transaction
+from django.db.models import Count, F, Q
+from django.utils import timezone
+
+from notifications.models import NotificationLog
+from notifications.providers.telegram import rate_limit_wait
+from notifications.services.base import OUTBOX_LEASE, OUTBOX_MAX_ATTEMPTS, notification_service
+from notifications.services.email_service import EmailService
+
+logger = logging.getLogger(__name__)
+
+
+def claim_batch(limit: int = 50) -> list[int]:
+    """Reserva ate `limit` notificacoes prontas para envio e retorna seus ids."""
+    now = timezone.now()
+    with transaction.atomic():
+        ids = list(
+            NotificationLog.objects.select_for_update(skip_locked=True)
+            .filter(
+                Q(status="pending", next_attempt_at__lte=now)
+                | Q(status="sending", locked_until__lt=now)
+            )
+            .order_by("next_attempt_at")
+            .values_list("id", flat=True)[:limit]
+        )
+        if ids:
+            NotificationLog.objects.filter(id__in=ids).update(
+                status="sending", locked_until=now + OUTBOX_LEASE, attempts=F("attempts") + 1
+            )
+    return ids
+
+
+def deliver(log_id: int) -> bool:
+    """Envia uma notificacao reservada. Retorna True se foi enviada."""
+    log = NotificationLog.objects.select_related("user").filter(pk=log_id, status="sending").first()
+    if log is None:
+        return False
+    if log.attempts > OUTBOX_MAX_ATTEMPTS:
+        # Lease venceu varias vezes (worker caindo no meio do envio)
+        log.mark_failed(log.error_message or "Tentativas esgotadas")
+        return False
+    try:
+        return notification_service.deliver(log).success
+    except Exception:
+        logger.exception("Erro ao entregar notificacao %s", log_id)
+        return False
+
+
+def _deliver_chunk(log_ids: list[int]) -> list[bool]:
+    """
+    Entrega uma fatia do lote reaproveitando a conexao de email. So aqui o
+    Telegram pode esperar pela vez no limite da Bot API.
+    """
+    with EmailService.batch(), rate_limit_wait():
+        return [deliver(log_id) for log_id in log_ids]
+
+
+def _deliver_chunk_in_thread(log_ids: list[int]) -> list[bool]:
+    try:
+        return _deliver_chunk(log_ids)
+    finally:
+        connection.close()
+
+
+def process_batch(limit: int = 50, concurrency: int = 4) -> tuple[int, int]:
+    """
+    Reserva e envia um lote. Retorna (processadas, enviadas).
+    Com concurrency=1 envia na thread atual.
+    """
+    ids = claim_batch(limit)
+    if not ids:
+        return 0, 0
+
+    workers = min(concurrency, len(ids))
+    if workers <= 1:
+        results = _deliver_chunk(ids)
+    else:
+        chunks = [ids[index::workers] for index in range(workers)]
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            results = [
+                sent for chunk in pool.map(_deliver_chunk_in_thread, chunks) for sent in chunk
+            ]
+    return len(ids), sum(results)
+
+
+def progress(content_type: str, object_id: int) -> dict:
+    """
+    Progresso do envio das notificacoes de um objeto (ex: uma vaga):
+    {"total", "pending", "sending", "sent", "failed", "done"}.
+    """
+    counts = dict(
+        NotificationLog.objects.filter(content_type=content_type, object_id=object_id)
+        .values_list("status")
+        .annotate(total=Count("id"))
+        .order_by()
+    )
+    result = {status: counts.get(status, 0) for status in ("pending", "sending", "failed")}
+    # delivered/read tambem ja sairam do worker
+    result["sent"] = sum(counts.get(status, 0) for status in ("sent", "delivered", "read"))
+    result["total"] = sum(counts.values())
+    result["done"] = result["pending"] + result["sending"] == 0
+    return result
@@ -2,6 +2,8 @@
 Servico de notificacoes para Quote Requests.
 
 Envia notificacoes via Email (sempre) e Telegram (se configurado pelo usuario).
+Ambos entram na outbox (notification_service.enqueue) na transacao da
+requisicao; o envio fica com o worker process_notification_outbox.
 """
 
 import logging
@@ -10,16 +12,47 @@ from django.conf import settings
 
 from notifications.models import NotificationType
 from notifications.services.base import notification_service
-from notifications.services.email_service import (
-    send_booking_confirmed_email,
-    send_new_quote_request_email,
-    send_proposal_received_email,
-    send_reservation_email,
-)
 
 logger = logging.getLogger(__name__)
 
 
+def _enqueue_email(user, notification_type, subject, body, template, context, data):
+    """Email com template especifico, independente da preferencia de canal."""
+    if not user.email:
+        return
+    try:
+        notification_service.enqueue(
+            user=user,
+            notification_type=notification_type,
+            title=subject,
+            body=body,
+            data={**data, "template": template, "context": context, "show_unsubscribe": False},
+            force_channel="email",
+            check_preferences=False,
+        )
+        logger.info("Email %s enfileirado para %s", template, user.email)
+    except Exception as e:
+        logger.error("Erro ao enfileirar email %s: %s", template, e)
+
+
+def _enqueue_telegram(user, notification_type, title, body, data):
+    """Telegram via notification_service (se usuario preferir)."""
+    try:
+        prefs = getattr(user, "notification_preferences", None)
+        if prefs and prefs.telegram_verified and prefs.preferred_channel == "telegram":
+            notification_service.enqueue(
+                user=user,
+                notification_type=notification_type,
+                title=title,
+                body=body,
+                data=data,
+                force_channel="telegram",
+            )
+            logger.info("Telegram %s enfileirado para %s", notification_type, user.username)
+    except Exception as e:
+        logger.error("Erro ao enfileirar Telegram %s: %s", notification_type, e)
+
+
 def notify_new_quote_request(quote_request):
     """
     Notifica musico sobre novo pedido de orcamento (Email + Telegram).
@@ -36,49 +69,35 @@ def notify_new_quote_request(quote_request):
     location = f"{quote_request.location_city}, {quote_request.location_state}"
     event_date = quote_request.event_date.strftime("%d/%m/%Y")
 
-    # Email via funcao dedicada (mantem template especifico)
-    try:
-        send_new_quote_request_email(
-            to_email=user.email,
-            musician_name=user.first_name,
-            contractor_name=contractor.name,
-            event_type=quote_request.event_type,
-            event_date=event_date,
-            location=location,
-            quote_url=quote_url,
-        )
-        logger.info("Email de novo pedido enviado para %s", user.email)
-    except Exception as e:
-        logger.error("Erro ao enviar email de novo pedido: %s", e)
-
-    # Telegram via notification_service (se usuario preferir)
-    try:
-        prefs = getattr(user, "notification_preferences", None)
-        if prefs and prefs.telegram_verified and prefs.preferred_channel == "telegram":
-            title = "Novo pedido de orcamento"
-            body = (
-                f"{contractor.name} enviou um pedido de orcamento.\n\n"
-                f"📋 Detalhes\n"
-                f" • Evento: {quote_request.event_type}\n"
-                f" • Data: {event_date}\n"
-                f" • Local: {location}\n\n"
-                f"Acesse o app para enviar sua proposta."
-            )
-            notification_service.send_notification(
-                user=user,
-                notification_type=NotificationType.QUOTE_REQUEST_NEW,
-                title=title,
-                body=body,
-                data={
-                    "url": quote_url,
-                    "content_type": "quote_request",
-                    "object_id": quote_request.id,
-                },
-                force_channel="telegram",
-            )
-            logger.info("Telegram de novo pedido enviado para %s", user.username)
-    except Exception as e:
-        logger.error("Erro ao enviar Telegram de novo pedido: %s", e)
+    title = "Novo pedido de orcamento"
+    body = (
+        f"{contractor.name} enviou um pedido de orcamento.\n\n"
+        f"📋 Detalhes\n"
+        f" • Evento: {quote_request.event_type}\n"
+        f" • Data: {event_date}\n"
+        f" • Local: {location}\n\n"
+        f"Acesse o app para enviar sua proposta."
+    )
+    data = {"url": quote_url, "content_type": "quote_request", "object_id": quote_request.id}
+
+    # Email com template especifico
+    _enqueue_email(
+        user,
+        NotificationType.QUOTE_REQUEST_NEW,
+        subject=f"Novo pedido de orçamento - {contractor.name}",
+        body=body,
+        template="quote_request_new",
+        context={
+            "first_name": user.first_name,
+            "contractor_name": contractor.name,
+            "event_type": quote_request.event_type,
+            "event_date": event_date,
+            "location": location,
+            "quote_url": quote_url,
+        },
+        data=data,
+    )
+    _enqueue_telegram(user, NotificationType.QUOTE_REQUEST_NEW, title, body, data)
 
 
 def notify_proposal_received(quote_request, proposal):
@@ -97,50 +116,33 @@ def notify_proposal_received(quote_request, proposal):
     quote_url = f"{frontend_url}/contratante/pedidos/{quote_request.id}"
     musician_name = f"{musician.user.first_name} {musician.user.last_name}".strip()
 
-    # Email
-    try:
-        send_proposal_received_email(
-            to_email=user.email,
-            contractor_name=contractor.name,
-            musician_name=musician_name,
-            event_type=quote_request.event_type,
-            proposed_value=str(proposal.proposed_value) if proposal.proposed_value else None,
-            quote_url=quote_url,
-        )
-        logger.info("Email de proposta enviado para %s", user.email)
-    except Exception as e:
-        logger.error("Erro ao enviar email de proposta: %s", e)
-
-    # Telegram
-    try:
-        prefs = getattr(user, "notification_preferences", None)
-        if prefs and prefs.telegram_verified and prefs.preferred_channel == "telegram":
-            title = "Nova proposta recebida"
-            value_text = (
-                f"R$ {proposal.proposed_value}" if proposal.proposed_value else "A combinar"
-            )
-            body = (
-                f"{musician_name} enviou uma proposta.\n\n"
-                f"💰 Proposta\n"
-                f" • Evento: {quote_request.event_type}\n"
-                f" • Valor proposto: {value_text}\n\n"
-                f"Acesse o app para aceitar ou recusar."
-            )
-            notification_service.send_notification(
-                user=user,
-                notification_type=NotificationType.QUOTE_PROPOSAL_RECEIVED,
-                title=title,
-                body=body,
-                data={
-                    "url": quote_url,
-                    "content_type": "quote_proposal",
-                    "object_id": proposal.id,
-                },
-                force_channel="telegram",
-            )
-            logger.info("Telegram de proposta enviado para %s", user.username)
-    except Exception as e:
-        logger.error("Erro ao enviar Telegram de proposta: %s", e)
+    title = "Nova proposta recebida"
+    value_text = f"R$ {proposal.proposed_value}" if proposal.proposed_value else "A combinar"
+    body = (
+        f"{musician_name} enviou uma proposta.\n\n"
+        f"💰 Proposta\n"
+        f" • Evento: {quote_request.event_type}\n"
+        f" • Valor proposto: {value_text}\n\n"
+        f"Acesse o app para aceitar ou recusar."
+    )
+    data = {"url": quote_url, "content_type": "quote_proposal", "object_id": proposal.id}
+
+    _enqueue_email(
+        user,
+        NotificationType.QUOTE_PROPOSAL_RECEIVED,
+        subject=f"Nova proposta de {musician_name} - GigFlow",
+        body=body,
+        template="proposal_received",
+        context={
+            "first_name": contractor.name,
+            "musician_name": musician_name,
+            "event_type": quote_request.event_type,
+            "proposed_value": str(proposal.proposed_value) if proposal.proposed_value else None,
+            "quote_url": quote_url,
+        },
+        data=data,
+    )
+    _enqueue_telegram(user, NotificationType.QUOTE_PROPOSAL_RECEIVED, title, body, data)
 
 
 def notify_reservation_created(quote_request):
@@ -159,49 +161,34 @@ def notify_reservation_created(quote_request):
     location = f"{quote_request.location_city}, {quote_request.location_state}"
     event_date = quote_request.event_date.strftime("%d/%m/%Y")
 
-    # Email
-    try:
-        send_reservation_email(
-            to_email=user.email,
-            musician_name=user.first_name,
-            contractor_name=contractor.name,
-            event_type=quote_request.event_type,
-            event_date=event_date,
-            location=location,
-            quote_url=quote_url,
-        )
-        logger.info("Email de reserva enviado para %s", user.email)
-    except Exception as e:
-        logger.error("Erro ao enviar email de reserva: %s", e)
-
-    # Telegram
-    try:
-        prefs = getattr(user, "notification_preferences", None)
-        if prefs and prefs.telegram_verified and prefs.preferred_channel == "telegram":
-            title = "Proposta aceita! Reserva criada"
-            body = (
-                f"{contractor.name} aceitou sua proposta!\n\n"
-                f"📋 Detalhes da reserva\n"
-                f" • Evento: {quote_request.event_type}\n"
-                f" • Data: {event_date}\n"
-                f" • Local: {location}\n\n"
-                f"⚡ ACAO NECESSARIA: Confirme a reserva no app."
-            )
-            notification_service.send_notification(
-                user=user,
-                notification_type=NotificationType.QUOTE_RESERVATION_CREATED,
-                title=title,
-                body=body,
-                data={
-                    "url": quote_url,
-                    "content_type": "quote_request",
-                    "object_id": quote_request.id,
-                },
-                force_channel="telegram",
-            )
-            logger.info("Telegram de reserva enviado para %s", user.username)
-    except Exception as e:
-        logger.error("Erro ao enviar Telegram de reserva: %s", e)
+    title = "Proposta aceita! Reserva criada"
+    body = (
+        f"{contractor.name} aceitou sua proposta!\n\n"
+        f"📋 Detalhes da reserva\n"
+        f" • Evento: {quote_request.event_type}\n"
+        f" • Data: {event_date}\n"
+        f" • Local: {location}\n\n"
+        f"⚡ ACAO NECESSARIA: Confirme a reserva no app."
+    )
+    data = {"url": quote_url, "content_type": "quote_request", "object_id": quote_request.id}
+
+    _enqueue_email(
+        user,
+        NotificationType.QUOTE_RESERVATION_CREATED,
+        subject=f"Proposta aceita! Reserva de {contractor.name}",
+        body=body,
+        template="reservation_created",
+        context={
+            "first_name": user.first_name,
+            "contractor_name": contractor.name,
+            "event_type": quote_request.event_type,
+            "event_date": event_date,
+            "location": location,
+            "quote_url": quote_url,
+        },
+        data=data,
+    )
+    _enqueue_telegram(user, NotificationType.QUOTE_RESERVATION_CREATED, title, body, data)
 
 
 def notify_booking_confirmed(quote_request):
@@ -221,46 +208,31 @@ def notify_booking_confirmed(quote_request):
     event_date = quote_request.event_date.strftime("%d/%m/%Y")
     musician_name = f"{musician.user.first_name} {musician.user.last_name}".strip()
 
-    # Email
-    try:
-        send_booking_confirmed_email(
-            to_email=user.email,
-            contractor_name=contractor.name,
-            musician_name=musician_name,
-            event_type=quote_request.event_type,
-            event_date=event_date,
-            location=location,
-            quote_url=quote_url,
-        )
-        logger.info("Email de confirmacao enviado para %s", user.email)
-    except Exception as e:
-        logger.error("Erro ao enviar email de confirmacao: %s", e)
-
-    # Telegram
-    try:
-        prefs = getattr(user, "notification_preferences", None)
-        if prefs and prefs.telegram_verified and prefs.preferred_channel == "telegram":
-            title = "Reserva confirmada!"
-            body = (
-                f"🎉 {musician_name} confirmou a reserva!\n\n"
-                f"📋 Detalhes do evento\n"
-                f" • Evento: {quote_request.event_type}\n"
-                f" • Data: {event_date}\n"
-                f" • Local: {location}\n\n"
-                f"Tudo certo! Agora e so aguardar o dia do evento."
-            )
-            notification_service.send_notification(
-                user=user,
-                notification_type=NotificationType.QUOTE_BOOKING_CONFIRMED,
-                title=title,
-                body=body,
-                data={
-                    "url": quote_url,
-                    "content_type": "booking",
-                    "object_id": quote_request.id,
-                },
-                force_channel="telegram",
-            )
-            logger.info("Telegram de confirmacao enviado para %s", user.username)
-    except Exception as e:
-        logger.error("Erro ao enviar Telegram de confirmacao: %s", e)
+    title = "Reserva confirmada!"
+    body = (
+        f"🎉 {musician_name} confirmou a reserva!\n\n"
+        f"📋 Detalhes do evento\n"
+        f" • Evento: {quote_request.event_type}\n"
+        f" • Data: {event_date}\n"
+        f" • Local: {location}\n\n"
+        f"Tudo certo! Agora e so aguardar o dia do evento."
+    )
+    data = {"url": quote_url, "content_type": "booking", "object_id": quote_request.id}
+
+    _enqueue_email(
+        user,
+        NotificationType.QUOTE_BOOKING_CONFIRMED,
+        subject=f"Reserva confirmada por {musician_name}!",
+        body=body,
+        template="booking_confirmed",
+        context={
+            "first_name": contractor.name,
+            "musician_name": musician_name,
+            "event_type": quote_request.event_type,
+            "event_date": event_date,
+            "location": location,
+            "quote_url": quote_url,
+        },
+        data=data,
+    )
+    _enqueue_telegram(user, NotificationType.QUOTE_BOOKING_CONFIRMED, title, body, data)
@@ -5,7 +5,7 @@ from django.db.models.signals import post_save, pre_save
 from django.dispatch import receiver
 from django.utils import timezone
 
-from agenda.models import Availability, Event, EventLog
+from agenda.models import Availability, Event, event_status_changed
 
 logger = logging.getLogger(__name__)
 
@@ -69,6 +69,7 @@ def notify_on_availability_created(sender, instance, created, **kwargs):
     """
     Envia notificacao quando um musico e convidado para um evento.
     Dispara apenas na criacao (created=True) e quando response='pending'.
+    Convites em lote (bulk_create) nao passam por aqui: usam enqueue_invitations_created.
     """
     if not created:
         return
@@ -81,13 +82,11 @@ def notify_on_availability_created(sender, instance, created, **kwargs):
     if event.created_by and instance.musician.user == event.created_by:
         return
 
-    user = instance.musician.user
-    musician_name = user.get_full_name() or user.username
+    _send_event_invite(event, instance.musician.user)
 
-    # Import aqui para evitar circular import
-    from notifications.models import NotificationType
-    from notifications.services.base import notification_service
 
+def _event_invite_message(event):
+    """Titulo, corpo e dados do convite (event.created_by ja carregado)."""
     # Monta URL do evento
     frontend_url = getattr(settings, "FRONTEND_URL", "http://localhost:5173")
     event_url = f"{frontend_url}/eventos/{event.id}"
@@ -110,30 +109,78 @@ def notify_on_availability_created(sender, instance, created, **kwargs):
 
     body += "\n⏳ Aguardando sua resposta\nAbra o app para confirmar sua disponibilidade."
 
+    data = {
+        "content_type": "event",
+        "object_id": event.id,
+        "url": event_url,
+        "event_title": event.title,
+        "event_date": event_date,
+        "event_log": {
+            "event_id": event.id,
+            "description": "Convite enviado via Telegram para {name}.",
+        },
+    }
+    return title, body, data
+
+
+def _send_event_invite(event, user):
+    """Coloca o convite de um evento na outbox de notificacoes."""
+    # Import aqui para evitar circular import
+    from notifications.models import NotificationType
+    from notifications.services.base import notification_service
+
+    title, body, data = _event_invite_message(event)
     try:
-        result = notification_service.send_notification(
+        notification_service.enqueue(
             user=user,
             notification_type=NotificationType.EVENT_INVITE,
             title=title,
             body=body,
-            data={
-                "content_type": "event",
-                "object_id": event.id,
-                "url": event_url,
-                "event_title": event.title,
-                "event_date": event_date,
-            },
+            data=data,
         )
-        if result.success and result.channel == "telegram":
-            EventLog.objects.create(
-                event=event,
-                performed_by=None,
-                action="notification",
-                description=f"Convite enviado via Telegram para {musician_name}.",
-            )
-        logger.info(f"Notificacao de convite enviada para {user.username}")
+        logger.info(f"Notificacao de convite enfileirada para {user.username}")
     except Exception as e:
-        logger.error(f"Erro ao enviar notificacao de convite: {e}")
+        logger.error(f"Erro ao enfileirar notificacao de convite: {e}")
+
+
+def notify_invitations_created(event_id, musician_ids):
+    """
+    Convites criados em lote: carrega evento e convidados uma vez e grava um
+    convite por musico (exceto o criador do evento) na outbox, com numero
+    fixo de queries. Roda na transacao de quem chama, sem thread propria.
+    """
+    from agenda.models import Musician
+    from notifications.models import NotificationType
+    from notifications.services.base import notification_service
+
+    event = Event.objects.select_related("created_by").filter(pk=event_id).first()
+    if not event:
+        return
+
+    users = [
+        musician.user
+        for musician in Musician.objects.filter(id__in=musician_ids)
+        .exclude(user_id=event.created_by_id)
+        .select_related("user")
+    ]
+    title, body, data = _event_invite_message(event)
+    notification_service.enqueue_many(users, NotificationType.EVENT_INVITE, title, body, data=data)
+
+
+def enqueue_invitations_created(event_id, musician_ids):
+    """
+    Grava os convites na outbox na mesma transacao dos Availability criados:
+    rollback descarta os convites, e o envio fica com o worker
+    (process_notification_outbox), fora da requisicao.
+    """
+    musician_ids = list(musician_ids)
+    if not musician_ids:
+        return
+
+    try:
+        notify_invitations_created(event_id, musician_ids)
+    except Exception:
+        logger.exception("Falha ao enfileirar convites do evento %s", event_id)
 
 
 @receiver(post_save, sender=Availability)
@@ -183,7 +230,7 @@ def notify_on_availability_response(sender, instance, created, **kwargs):
     )
 
     try:
-        result = notification_service.send_notification(
+        notification_service.enqueue(
             user=user,
             notification_type=NotificationType.AVAILABILITY_RESPONSE,
             title=title,
@@ -194,18 +241,15 @@ def notify_on_availability_response(sender, instance, created, **kwargs):
                 "url": event_url,
                 "musician_name": musician_name,
                 "response": instance.response,
+                "event_log": {
+                    "event_id": event.id,
+                    "description": "Aviso de resposta enviado via Telegram para o organizador.",
+                },
             },
         )
-        if result.success and result.channel == "telegram":
-            EventLog.objects.create(
-                event=event,
-                performed_by=None,
-                action="notification",
-                description="Aviso de resposta enviado via Telegram para o organizador.",
-            )
-        logger.info(f"Notificacao de resposta enviada para {user.username}")
+        logger.info(f"Notificacao de resposta enfileirada para {user.username}")
     except Exception as e:
-        logger.error(f"Erro ao enviar notificacao de resposta: {e}")
+        logger.error(f"Erro ao enfileirar notificacao de resposta: {e}")
 
 
 @receiver(post_save, sender=Event)
@@ -224,6 +268,11 @@ def notify_on_event_confirmed(sender, instance, created, **kwargs):
     if instance.status != "confirmed":
         return
 
+    _enqueue_event_confirmed(instance)
+
+
+def _enqueue_event_confirmed(instance):
+    """Coloca na outbox o aviso de confirmacao para quem aceitou."""
     from notifications.models import NotificationType
     from notifications.services.base import notification_service
 
@@ -240,36 +289,31 @@ def notify_on_event_confirmed(sender, instance, created, **kwargs):
     )
 
     # Notifica todos os musicos que aceitaram
-    telegram_sent = 0
-    for availability in instance.availabilities.filter(response="available"):
-        user = availability.musician.user
-
-        try:
-            result = notification_service.send_notification(
-                user=user,
-                notification_type=NotificationType.EVENT_CONFIRMED,
-                title=title,
-                body=body,
-                data={
-                    "content_type": "event",
-                    "object_id": instance.id,
-                    "url": event_url,
+    users = [
+        availability.musician.user
+        for availability in instance.availabilities.filter(response="available").select_related(
+            "musician__user"
+        )
+    ]
+    try:
+        notification_service.enqueue_many(
+            users,
+            NotificationType.EVENT_CONFIRMED,
+            title,
+            body,
+            data={
+                "content_type": "event",
+                "object_id": instance.id,
+                "url": event_url,
+                "event_log": {
+                    "event_id": instance.id,
+                    "description": "Aviso de confirmacao enviado via Telegram para {name}.",
                 },
-            )
-            if result.success and result.channel == "telegram":
-                telegram_sent += 1
-            logger.info(f"Notificacao de confirmacao enviada para {user.username}")
-        except Exception as e:
-            logger.error(f"Erro ao notificar {user.username}: {e}")
-
-    if telegram_sent:
-        label = "musico" if telegram_sent == 1 else "musicos"
-        EventLog.objects.create(
-            event=instance,
-            performed_by=None,
-            action="notification",
-            description=f"Aviso de confirmacao enviado via Telegram para {telegram_sent} {label}.",
+            },
         )
+        logger.info(f"Notificacao de confirmacao enfileirada para {len(users)} musico(s)")
+    except Exception as e:
+        logger.error(f"Erro ao enfileirar confirmacao do evento {instance.id}: {e}")
 
 
 @receiver(post_save, sender=Event)
@@ -287,6 +331,11 @@ def notify_on_event_cancelled(sender, instance, created, **kwargs):
     if instance.status != "cancelled":
         return
 
+    _enqueue_event_cancelled(instance)
+
+
+def _enqueue_event_cancelled(instance):
+    """Coloca na outbox o aviso de cancelamento para os envolvidos."""
     from notifications.models import NotificationType
     from notifications.services.base import notification_service
 
@@ -302,39 +351,41 @@ def notify_on_event_cancelled(sender, instance, created, **kwargs):
     )
 
     # Notifica todos os musicos envolvidos (exceto quem cancelou)
-    telegram_sent = 0
-    for availability in instance.availabilities.all():
-        user = availability.musician.user
-
-        # Nao notifica quem cancelou
-        if instance.created_by and user == instance.created_by:
-            continue
-
-        try:
-            result = notification_service.send_notification(
-                user=user,
-                notification_type=NotificationType.EVENT_CANCELLED,
-                title=title,
-                body=body,
-                data={
-                    "content_type": "event",
-                    "object_id": instance.id,
+    users = [
+        availability.musician.user
+        for availability in instance.availabilities.select_related("musician__user")
+        if availability.musician.user_id != instance.created_by_id
+    ]
+    try:
+        notification_service.enqueue_many(
+            users,
+            NotificationType.EVENT_CANCELLED,
+            title,
+            body,
+            data={
+                "content_type": "event",
+                "object_id": instance.id,
+                "event_log": {
+                    "event_id": instance.id,
+                    "description": "Aviso de cancelamento enviado via Telegram para {name}.",
                 },
-            )
-            if result.success and result.channel == "telegram":
-                telegram_sent += 1
-            logger.info(f"Notificacao de cancelamento enviada para {user.username}")
-        except Exception as e:
-            logger.error(f"Erro ao notificar {user.username}: {e}")
-
-    if telegram_sent:
-        label = "musico" if telegram_sent == 1 else "musicos"
-        EventLog.objects.create(
-            event=instance,
-            performed_by=None,
-            action="notification",
-            description=f"Aviso de cancelamento enviado via Telegram para {telegram_sent} {label}.",
+            },
         )
+        logger.info(f"Notificacao de cancelamento enfileirada para {len(users)} musico(s)")
+    except Exception as e:
+        logger.error(f"Erro ao enfileirar cancelamento do evento {instance.id}: {e}")
+
+
+@receiver(event_status_changed, sender=Event)
+def notify_on_event_status_changed(sender, instance, previous_status, **kwargs):
+    """
+    Transicoes feitas por UPDATE condicional (Event.apply_status_change): nao
+    passam por pre_save, o status anterior vem no proprio signal.
+    """
+    if instance.status == "confirmed":
+        _enqueue_event_confirmed(instance)
+    elif instance.status == "cancelled":
+        _enqueue_event_cancelled(instance)
 
 
 @receiver(post_save, sender=Event)
@@ -372,38 +423,31 @@ def notify_on_event_date_changed(sender, instance, created, **kwargs):
         f"Verifique sua disponibilidade no app."
     )
 
-    telegram_sent = 0
-    for availability in instance.availabilities.filter(response__in=["pending", "available"]):
-        user = availability.musician.user
-
-        if instance.created_by and user == instance.created_by:
-            continue
-
-        try:
-            result = notification_service.send_notification(
-                user=user,
-                notification_type=NotificationType.EVENT_DATE_CHANGED,
-                title=title,
-                body=body,
-                data={
-                    "content_type": "event",
-                    "object_id": instance.id,
-                    "url": event_url,
-                    "old_date": old_date_str,
-                    "new_date": new_date_str,
+    users = [
+        availability.musician.user
+        for availability in instance.availabilities.filter(
+            response__in=["pending", "available"]
+        ).select_related("musician__user")
+        if availability.musician.user_id != instance.created_by_id
+    ]
+    try:
+        notification_service.enqueue_many(
+            users,
+            NotificationType.EVENT_DATE_CHANGED,
+            title,
+            body,
+            data={
+                "content_type": "event",
+                "object_id": instance.id,
+                "url": event_url,
+                "old_date": old_date_str,
+                "new_date": new_date_str,
+                "event_log": {
+                    "event_id": instance.id,
+                    "description": "Aviso de alteracao de data enviado via Telegram para {name}.",
                 },
-            )
-            if result.success and result.channel == "telegram":
-                telegram_sent += 1
-            logger.info(f"Notificacao de data alterada enviada para {user.username}")
-        except Exception as e:
-            logger.error(f"Erro ao notificar {user.username}: {e}")
-
-    if telegram_sent:
-        label = "musico" if telegram_sent == 1 else "musicos"
-        EventLog.objects.create(
-            event=instance,
-            performed_by=None,
-            action="notification",
-            description=f"Aviso de alteracao de data enviado via Telegram para {telegram_sent} {label}.",
+            },
         )
+        logger.info(f"Notificacao de data alterada enfileirada para {len(users)} musico(s)")
+    except Exception as e:
+        logger.error(f"Erro ao enfileirar alteracao de data do evento {instance.id}: {e}")
@@ -0,0 +1,104 @@
+# notifications/tests/test_email_bulk.py
+"""
+Testes do envio de emails em lote (EmailService.send_bulk/batch): uma única
+conexão para o lote e resultado por destinatário.
+"""
+
+from smtplib import SMTPException
+
+from django.contrib.auth.models import User
+from django.core import mail
+from django.core.mail.backends import locmem
+from django.test import TestCase, override_settings
+
+from notifications.models import NotificationType
+from notifications.services.base import notification_service
+from notifications.services.email_service import EmailService
+from notifications.services.outbox import process_batch
+
+
+class CountingBackend(locmem.EmailBackend):
+    """locmem que conta conexões criadas e recusa endereços "falha@"."""
+
+    created = 0
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        type(self).created += 1
+
+    def send_messages(self, messages):
+        if any(to.startswith("falha@") for message in messages for to in message.to):
+            raise SMTPException("Destinatario recusado")
+        return super().send_messages(messages)
+
+
+@override_settings(EMAIL_BACKEND="notifications.tests.test_email_bulk.CountingBackend")
+class EmailBulkTest(TestCase):
+    def setUp(self):
+        CountingBackend.created = 0
+
+    def context(self):
+        return {"title": "Aviso", "body": "Oi"}
+
+    def test_send_bulk_uses_one_connection_with_per_recipient_context(self):
+        results = EmailService.send_bulk(
+            "notification",
+            "Nova vaga",
+            [("ana@test.com", {"first_name": "Ana"}), ("bia@test.com", {"first_name": "Bia"})],
+            shared_context={"title": "Nova vaga", "body": "Show no sábado"},
+        )
+
+        self.assertEqual(
+            [(r.to_email, r.success) for r in results],
+            [
+                ("ana@test.com", True),
+                ("bia@test.com", True),
+            ],
+        )
+        self.assertEqual(CountingBackend.created, 1)
+        self.assertEqual(
+            [message.to for message in mail.outbox], [["ana@test.com"], ["bia@test.com"]]
+        )
+        self.assertIn("Ana", mail.outbox[0].body)
+        self.assertIn("Bia", mail.outbox[1].body)
+        self.assertIn("Show no sábado", mail.outbox[1].body)
+
+    def test_failed_recipient_does_not_stop_batch(self):
+        results = EmailService.send_bulk(
+            "notification",
+            "Aviso",
+            [("ana@test.com", None), ("falha@test.com", None), ("bia@test.com", None)],
+            shared_context={"title": "Aviso", "body": "Oi"},
+        )
+
+        self.assertEqual([r.success for r in results], [True, False, True])
+        self.assertEqual(results[1].error, "Destinatario recusado")
+        self.assertEqual(len(mail.outbox), 2)
+
+    def test_missing_template_fails_every_recipient(self):
+        results = EmailService.send_bulk("nao_existe", "Aviso", [("ana@test.com", None)])
+        self.assertFalse(results[0].success)
+        self.assertEqual(CountingBackend.created, 0)
+
+    def test_batch_shares_connection_between_sends(self):
+        with EmailService.batch():
+            for name in ("ana", "bia", "caio"):
+                EmailService.send("notification", f"{name}@test.com", "Aviso", self.context())
+        self.assertEqual(CountingBackend.created, 1)
+
+        EmailService.send("notification", "duda@test.com", "Aviso", self.context())
+        self.assertEqual(CountingBackend.created, 2)
+        self.assertEqual(len(mail.outbox), 4)
+
+    def test_outbox_worker_batches_emails(self):
+        users = [
+            User.objects.create_user(username=name, email=f"{name}@test.com", password="x")
+            for name in ("ana", "bia", "caio")
+        ]
+        notification_service.enqueue_many(
+            users, NotificationType.MARKETPLACE_ACTIVITY, "Nova vaga", "Show no sábado"
+        )
+
+        self.assertEqual(process_batch(concurrency=1), (3, 3))
+        self.assertEqual(CountingBackend.created, 1)
+        self.assertEqual(len(mail.outbox), 3)
@@ -0,0 +1,71 @@
+# notifications/tests/test_email_templates.py
+"""
+Testes do cache de templates de email compilados (get_email_template): cada
+template é carregado uma vez por processo, inclusive quando não existe.
+"""
+
+from unittest.mock import patch
+
+from django.core import mail
+from django.template import TemplateDoesNotExist
+from django.template.loader import get_template
+from django.test import TestCase, override_settings
+
+from notifications.services import email_service
+from notifications.services.email_service import (
+    EmailService,
+    clear_email_template_cache,
+    get_email_template,
+)
+
+
+@override_settings(EMAIL_BACKEND="django.core.mail.backends.locmem.EmailBackend")
+class EmailTemplateCacheTest(TestCase):
+    def setUp(self):
+        clear_email_template_cache()
+        self.addCleanup(clear_email_template_cache)
+
+    def send(self, to_email):
+        context = {"title": "Aviso", "body": "Oi"}
+        return EmailService.send("notification", to_email, "Aviso", context)
+
+    def test_templates_are_loaded_once_per_process(self):
+        with patch.object(email_service, "get_template", wraps=get_template) as loader:
+            for name in ("ana", "bia", "caio"):
+                self.assertTrue(self.send(f"{name}@test.com"))
+
+        loaded = [call.args[0] for call in loader.call_args_list]
+        self.assertEqual(sorted(loaded), sorted(set(loaded)))
+        self.assertIn("emails/notification.html", loaded)
+        self.assertEqual(len(mail.outbox), 3)
+        self.assertIn("Oi", mail.outbox[2].alternatives[0][0])
+
+    def test_missing_template_is_cached(self):
+        with patch.object(email_service, "get_template", wraps=get_template) as loader:
+            for _ in range(2):
+                with self.assertRaises(TemplateDoesNotExist):
+                    get_email_template("emails/nao_existe.html")
+        self.assertEqual(loader.call_count, 1)
+
+    def test_missing_text_template_uses_fallback_and_warns_once(self):
+        def html_only(name):
+            if name.endswith(".txt"):
+                raise TemplateDoesNotExist(name)
+            return get_template(name)
+
+        with patch.object(email_service, "get_template", side_effect=html_only) as loader:
+            with self.assertLogs(email_service.logger, "INFO") as logs:
+                self.send("ana@test.com")
+                self.send("bia@test.com")
+
+        self.assertEqual(loader.call_count, 2)
+        warnings = [line for line in logs.output if "Plain text template not found" in line]
+        self.assertEqual(len(warnings), 1)
+        self.assertEqual(len(mail.outbox), 2)
+        self.assertIn("GigFlow - Sua agenda de shows profissional", mail.outbox[1].body)
+        self.assertIn("Oi", mail.outbox[1].body)
+
+    def test_templates_setting_change_clears_cache(self):
+        get_email_template("emails/notification.html")
+        with override_settings(TEMPLATES=[]):
+            self.assertEqual(email_service._compiled_templates, {})
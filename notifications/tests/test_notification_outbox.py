@@ -0,0 +1,197 @@
+# notifications/tests/test_notification_outbox.py
+"""
+Testes da outbox de notificações: os signals só gravam NotificationLog
+pendentes e o worker (process_notification_outbox) envia, com retentativas.
+"""
+
+import tempfile
+from datetime import date, time, timedelta
+from io import StringIO
+from pathlib import Path
+from unittest.mock import patch
+
+from django.contrib.auth.models import User
+from django.core import mail
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+
+from agenda.models import Availability, Event, EventLog, Musician
+from notifications.models import NotificationLog, NotificationPreference, NotificationType
+from notifications.services.base import (
+    OUTBOX_MAX_ATTEMPTS,
+    BaseProvider,
+    NotificationResult,
+    notification_service,
+)
+from notifications.services.outbox import claim_batch, process_batch
+
+
+class FakeTelegramProvider(BaseProvider):
+    def __init__(self, success=True):
+        self.success = success
+        self.sent = []
+
+    @property
+    def channel_name(self):
+        return "telegram"
+
+    def is_configured(self):
+        return True
+
+    def can_send_to(self, user):
+        return True
+
+    def send(self, payload, user):
+        self.sent.append((user.username, payload.title))
+        if self.success:
+            return NotificationResult(success=True, external_id="42")
+        return NotificationResult(success=False, error_message="Telegram fora do ar")
+
+
+class NotificationOutboxTest(TestCase):
+    def setUp(self):
+        self.leader = User.objects.create_user(
+            username="lider", email="lider@test.com", password="senha12345", first_name="Lia"
+        )
+        self.musician_user = User.objects.create_user(
+            username="sara", email="sara@test.com", password="senha12345", first_name="Sara"
+        )
+        self.musician = Musician.objects.create(user=self.musician_user, instrument="vocal")
+        NotificationPreference.objects.create(
+            user=self.leader,
+            preferred_channel="telegram",
+            telegram_chat_id="123",
+            telegram_verified=True,
+            fallback_to_email=False,
+        )
+        self.event = Event.objects.create(
+            title="Show",
+            location="Bar",
+            event_date=date.today() + timedelta(days=3),
+            start_time=time(20, 0),
+            end_time=time(23, 0),
+            created_by=self.leader,
+        )
+        self.telegram = FakeTelegramProvider()
+        providers = patch.dict(notification_service._providers, {"telegram": self.telegram})
+        providers.start()
+        self.addCleanup(providers.stop)
+
+    def _respond(self):
+        availability = Availability.objects.create(
+            event=self.event, musician=self.musician, response="pending"
+        )
+        availability.response = "available"
+        availability.save()
+        return NotificationLog.objects.get(
+            user=self.leader, notification_type=NotificationType.AVAILABILITY_RESPONSE
+        )
+
+    def test_signal_only_enqueues(self):
+        log = self._respond()
+
+        self.assertEqual(log.status, "pending")
+        self.assertEqual(log.channel, "telegram")
+        self.assertEqual(log.payload["response"], "available")
+        self.assertEqual(self.telegram.sent, [])
+
+    def test_worker_sends_and_records_event_log(self):
+        log = self._respond()
+
+        self.assertEqual(process_batch(concurrency=1), (2, 2))
+
+        log.refresh_from_db()
+        self.assertEqual(log.status, "sent")
+        self.assertEqual(log.external_id, "42")
+        self.assertEqual(log.attempts, 1)
+        self.assertIn(("lider", log.subject), self.telegram.sent)
+        self.assertTrue(
+            EventLog.objects.filter(
+                event=self.event,
+                action="notification",
+                description="Aviso de resposta enviado via Telegram para o organizador.",
+            ).exists()
+        )
+        # Nada mais a enviar
+        self.assertEqual(process_batch(concurrency=1), (0, 0))
+
+    def test_failures_back_off_then_fail(self):
+        self.telegram.success = False
+        log = self._respond()
+        NotificationLog.objects.exclude(pk=log.pk).delete()
+
+        process_batch(concurrency=1)
+        log.refresh_from_db()
+        self.assertEqual((log.status, log.attempts), ("pending", 1))
+        self.assertEqual(log.error_message, "Telegram fora do ar")
+        self.assertGreater(log.next_attempt_at, timezone.now())
+        # Ainda no backoff: o worker não pega de novo
+        self.assertEqual(claim_batch(), [])
+
+        for attempt in range(2, OUTBOX_MAX_ATTEMPTS + 1):
+            NotificationLog.objects.filter(pk=log.pk).update(next_attempt_at=timezone.now())
+            process_batch(concurrency=1)
+        log.refresh_from_db()
+        self.assertEqual((log.status, log.attempts), ("failed", OUTBOX_MAX_ATTEMPTS))
+        self.assertEqual(len(self.telegram.sent), OUTBOX_MAX_ATTEMPTS)
+
+    def test_expired_lease_is_reclaimed(self):
+        log = self._respond()
+        self.assertIn(log.pk, claim_batch())
+        self.assertEqual(claim_batch(), [])
+
+        NotificationLog.objects.filter(pk=log.pk).update(
+            locked_until=timezone.now() - timedelta(seconds=1)
+        )
+        self.assertEqual(claim_batch(), [log.pk])
+        log.refresh_from_db()
+        self.assertEqual((log.status, log.attempts), ("sending", 2))
+
+    def test_send_notification_is_not_picked_up_again(self):
+        result = notification_service.send_notification(
+            user=self.leader,
+            notification_type=NotificationType.EVENT_REMINDER,
+            title="Lembrete",
+            body="Show amanha",
+        )
+
+        self.assertTrue(result.success)
+        self.assertEqual(result.channel, "telegram")
+        self.assertEqual(claim_batch(), [])
+
+    def test_template_email_and_command(self):
+        notification_service.enqueue(
+            user=self.musician_user,
+            notification_type=NotificationType.QUOTE_REQUEST_NEW,
+            title="Novo pedido de orçamento - Bar do Zé",
+            body="Bar do Zé enviou um pedido de orcamento.",
+            data={
+                "template": "quote_request_new",
+                "context": {"first_name": "Sara", "contractor_name": "Bar do Zé"},
+            },
+            force_channel="email",
+            check_preferences=False,
+        )
+
+        out = StringIO()
+        call_command("process_notification_outbox", "--once", "--concurrency", "1", stdout=out)
+
+        self.assertIn("1 enviada(s)", out.getvalue())
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertEqual(mail.outbox[0].subject, "Novo pedido de orçamento - Bar do Zé")
+        self.assertIn("Bar do Zé", mail.outbox[0].body)
+
+    def test_command_touches_heartbeat_file(self):
+        with tempfile.TemporaryDirectory() as directory:
+            heartbeat = Path(directory) / "outbox.heartbeat"
+
+            call_command(
+                "process_notification_outbox",
+                "--once",
+                "--heartbeat-file",
+                str(heartbeat),
+                stdout=StringIO(),
+            )
+
+            self.assertTrue(heartbeat.exists())
@@ -0,0 +1,205 @@
+# notifications/tests/test_telegram_provider.py
+"""
+Testes do TelegramProvider contra um servidor HTTP local que imita a Bot API:
+session compartilhada com keep-alive, send_many e limites de envio (no cache,
+compartilhados entre processos).
+"""
+
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from django.core.cache import cache
+from django.test import SimpleTestCase, override_settings
+
+from notifications.providers import telegram
+from notifications.providers.telegram import TelegramProvider, TelegramRateLimiter
+from notifications.services.base import NotificationPayload
+
+
+class StubBotAPI(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        server = self.server
+        with server.lock:
+            server.requests.append((self.path, body))
+            server.clients.add(self.client_address)
+            message_id = len(server.requests)
+        if body["chat_id"] == "bloqueado":
+            data = {"ok": False, "description": "Forbidden: bot was blocked by the user"}
+        elif body["chat_id"] == "flood":
+            data = {
+                "ok": False,
+                "description": "Too Many Requests: retry after 7",
+                "parameters": {"retry_after": 7},
+            }
+        else:
+            data = {"ok": True, "result": {"message_id": message_id}}
+        raw = json.dumps(data).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(raw)))
+        self.end_headers()
+        self.wfile.write(raw)
+
+    def log_message(self, *args):
+        pass
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+        self.slept = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.slept.append(seconds)
+        self.now += seconds
+
+
+def user_with_chat(chat_id):
+    return SimpleNamespace(
+        notification_preferences=SimpleNamespace(telegram_chat_id=chat_id, telegram_verified=True)
+    )
+
+
+def payload(title="Novo convite"):
+    return NotificationPayload(
+        recipient_id=1, notification_type="event_invite", title=title, body="Show", data={}
+    )
+
+
+class TelegramProviderTest(SimpleTestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), StubBotAPI)
+        cls.server.lock = threading.Lock()
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+        super().tearDownClass()
+
+    def setUp(self):
+        cache.clear()
+        self.server.requests = []
+        self.server.clients = set()
+        telegram._session = None
+        self.addCleanup(setattr, telegram, "_session", None)
+        limiter = patch.object(telegram, "rate_limiter", TelegramRateLimiter(1000, 1000))
+        limiter.start()
+        self.addCleanup(limiter.stop)
+        url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        settings = override_settings(TELEGRAM_BOT_TOKEN="TOKEN", TELEGRAM_API_URL=url)
+        settings.enable()
+        self.addCleanup(settings.disable)
+        self.provider = TelegramProvider()
+
+    def test_send_reuses_one_keep_alive_connection(self):
+        for chat_id in ("1", "2", "3"):
+            result = self.provider.send(payload(), user_with_chat(chat_id))
+            self.assertTrue(result.success)
+
+        self.assertEqual(len(self.server.requests), 3)
+        self.assertEqual(len(self.server.clients), 1)
+        path, body = self.server.requests[0]
+        self.assertEqual(path, "/botTOKEN/sendMessage")
+        self.assertIn("<b>Novo convite</b>", body["text"])
+
+    def test_send_many_returns_results_in_order(self):
+        messages = [
+            (payload("A"), user_with_chat("1")),
+            (payload("B"), user_with_chat("bloqueado")),
+            (payload("C"), user_with_chat(None)),
+            (payload("D"), user_with_chat("4")),
+        ]
+        results = self.provider.send_many(messages)
+
+        self.assertEqual([r.success for r in results], [True, False, False, True])
+        self.assertEqual(results[1].error_message, "Forbidden: bot was blocked by the user")
+        self.assertEqual(results[2].error_message, "Usuario sem chat_id configurado")
+        self.assertEqual(len(self.server.requests), 3)
+        self.assertLessEqual(len(self.server.clients), telegram.POOL_SIZE)
+
+    def test_retry_after_pauses_every_chat(self):
+        result = self.provider.send(payload(), user_with_chat("flood"))
+
+        self.assertFalse(result.success)
+        self.assertFalse(telegram.rate_limiter.acquire("flood", max_wait=5))
+        self.assertFalse(telegram.rate_limiter.acquire("outro", max_wait=5))
+
+    def test_only_rate_limit_wait_blocks_waits_for_a_slot(self):
+        clock = FakeClock()
+        limiter = TelegramRateLimiter(clock=clock, sleep=clock.sleep)
+        with patch.object(telegram, "rate_limiter", limiter):
+            self.assertTrue(self.provider.send(payload(), user_with_chat("1")).success)
+            # Fora do worker (requisição web): sem vaga, falha sem dormir
+            result = self.provider.send(payload(), user_with_chat("1"))
+            self.assertEqual(result.error_message, "Limite de envio do Telegram atingido")
+            self.assertEqual(clock.slept, [])
+
+            with telegram.rate_limit_wait():
+                self.assertTrue(self.provider.send(payload(), user_with_chat("1")).success)
+        self.assertEqual(clock.slept, [1.0])
+
+    def test_network_error_returns_without_sleeping(self):
+        with (
+            override_settings(TELEGRAM_API_URL="http://127.0.0.1:1"),
+            patch.object(telegram.time, "sleep") as sleep,
+        ):
+            result = self.provider.send(payload(), user_with_chat("1"))
+
+        self.assertFalse(result.success)
+        sleep.assert_not_called()
+
+
+class TelegramRateLimiterTest(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+        self.clock = FakeClock()
+        self.limiter = self._limiter()
+
+    def _limiter(self):
+        return TelegramRateLimiter(
+            global_rate=30, per_chat_rate=1, clock=self.clock, sleep=self.clock.sleep
+        )
+
+    def test_per_chat_limit_spaces_messages_one_second_apart(self):
+        for _ in range(3):
+            self.assertTrue(self.limiter.acquire("1", max_wait=5))
+        self.assertEqual(self.clock.slept, [1.0, 1.0])
+
+    def test_global_limit_caps_burst_across_chats(self):
+        for chat_id in range(31):
+            self.assertTrue(self.limiter.acquire(chat_id, max_wait=5))
+        self.assertEqual(self.clock.slept, [1.0])
+
+    def test_wait_above_max_is_refused_without_sleeping(self):
+        self.assertTrue(self.limiter.acquire("1"))
+        self.assertFalse(self.limiter.acquire("1", max_wait=0.5))
+        self.assertEqual(self.clock.slept, [])
+        self.clock.now += 1
+        self.assertTrue(self.limiter.acquire("1"))
+
+    def test_limits_are_shared_between_processes(self):
+        other_process = self._limiter()
+
+        self.assertTrue(self.limiter.acquire("1"))
+        self.assertFalse(other_process.acquire("1"))
+        self.assertTrue(other_process.acquire("2"))
+
+    def test_pause_holds_every_chat(self):
+        self.limiter.pause(7)
+
+        self.assertFalse(self.limiter.acquire("2", max_wait=5))
+        self.assertTrue(self.limiter.acquire("2", max_wait=7))
+        self.assertEqual(self.clock.slept, [7.0])
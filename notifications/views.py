@@ -13,6 +13,7 @@ from rest_framework.response import Response
 from rest_framework.throttling import AnonRateThrottle
 from rest_framework.views import APIView
 
+from agenda.conditional_get import conditional_response, make_etag
 from agenda.validators import sanitize_string
 
 from .models import (
@@ -312,9 +313,24 @@ class NotificationPreferenceView(APIView):
     permission_classes = [IsAuthenticated]
 
     def get(self, request):
-        prefs, _ = NotificationPreference.objects.get_or_create(user=request.user)
-        serializer = NotificationPreferenceSerializer(prefs)
-        return Response(serializer.data)
+        def build():
+            prefs, _ = NotificationPreference.objects.get_or_create(user=request.user)
+            serializer = NotificationPreferenceSerializer(prefs)
+            return Response(serializer.data)
+
+        updated_at = (
+            NotificationPreference.objects.filter(user=request.user)
+            .values_list("updated_at", flat=True)
+            .first()
+        )
+        if updated_at is None:
+            return build()
+        return conditional_response(
+            request,
+            build,
+            etag=make_etag("notification-preferences", request.user.id, updated_at.isoformat()),
+            last_modified=updated_at,
+        )
 
     def put(self, request):
         prefs, _ = NotificationPreference.objects.get_or_create(user=request.user)